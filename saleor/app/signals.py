@@ -4,3 +4,16 @@ from ..core.tasks import delete_from_storage_task
 def delete_brand_images(sender, instance, **kwargs):
     if img := instance.brand_logo_default:
         delete_from_storage_task.delay(img.name)
+
+
+def invalidate_deleted_app_token_cache(sender, instance, **kwargs):
+    from ..graphql.app.dataloaders.app import invalidate_app_token_cache
+
+    invalidate_app_token_cache([instance.pk])
+
+
+def invalidate_inactive_app_token_cache(sender, instance, **kwargs):
+    from ..graphql.app.dataloaders.app import invalidate_app_token_cache
+
+    if not instance.is_active or instance.removed_at:
+        invalidate_app_token_cache(instance.tokens.values_list("pk", flat=True))
@@ -4,6 +4,7 @@ from django.db.models import Exists, OuterRef, Q
 
 from ..page.models import Page
 from ..product.models import Product, ProductVariant
+from ..product.supplier_keys import update_product_supplier_keys
 from .models import (
     AssignedPageAttributeValue,
     AssignedProductAttributeValue,
@@ -44,6 +45,9 @@ def associate_attribute_values_to_instance(
     # Associate the attribute and the passed values
     _associate_attribute_to_instance(instance, attr_val_map)
 
+    if isinstance(instance, Product):
+        update_product_supplier_keys([instance.pk])
+
 
 def validate_attribute_owns_values(attr_val_map: dict[int, list]) -> None:
     if not attr_val_map:
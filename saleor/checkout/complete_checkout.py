@@ -62,6 +62,7 @@ from ..tax.utils import (
     get_tax_class_kwargs_for_order_line,
 )
 from ..warehouse.availability import check_stock_and_preorder_quantity_bulk
+from ..warehouse.availability_store import schedule_variant_availability_refresh
 from ..warehouse.management import allocate_preorders, allocate_stocks
 from ..warehouse.models import Reservation, Stock
 from ..warehouse.reservations import is_reservation_enabled
@@ -1983,6 +1984,10 @@ def _reserve_stocks_without_availability_check(
                 )
             )
     Reservation.objects.bulk_create(reservations)
+    schedule_variant_availability_refresh(
+        {reservation.stock.product_variant_id for reservation in reservations},
+        stored=False,
+    )
     return reservations
 
 
@@ -2,6 +2,8 @@
 
 from typing import TYPE_CHECKING
 
+from django.conf import settings
+
 from ..core.utils.apportionment import hamilton
 
 if TYPE_CHECKING:
@@ -28,27 +30,26 @@ def get_pack_for_product(
 
     allocation[variant] = pack_size x (variant_stock / total_stock)
     """
-    from ..warehouse.availability import get_available_quantity
+    from ..warehouse.availability import get_available_quantities
 
     variants = list(product.variants.all())
     if not variants:
         return []
 
-    country_code = channel.default_country.code
-    variant_stock = {}
-    total_stock = 0
-
-    for variant in variants:
-        available = get_available_quantity(
-            variant,
-            country_code,
-            channel.slug,
-            check_reservations=True,
-            warehouse_ids=warehouse_ids,
-        )
-        if available > 0:
-            variant_stock[variant] = available
-            total_stock += available
+    available_quantities = get_available_quantities(
+        variants,
+        channel.default_country.code,
+        channel.slug,
+        check_reservations=True,
+        warehouse_ids=warehouse_ids,
+        use_availability_store=settings.VARIANT_AVAILABILITY_STORE_ENABLED,
+    )
+    variant_stock = {
+        variant: available_quantities[variant.pk]
+        for variant in variants
+        if available_quantities[variant.pk] > 0
+    }
+    total_stock = sum(variant_stock.values())
 
     if total_stock == 0:
         return []
@@ -1,5 +1,7 @@
 """Tests for pack allocation utilities."""
 
+from ...product.models import ProductVariant
+from ...warehouse.models import Stock
 from ..pack_utils import get_pack_for_product
 
 
@@ -118,3 +120,27 @@ def test_get_pack_for_product_proportional_allocation(
     # Result: 1, 9
     assert variant_allocations[variants[0]] == 1
     assert variant_allocations[variants[1]] == 9
+
+
+def test_get_pack_for_product_query_count_independent_of_variants(
+    product_with_two_variants, channel_USD, warehouse, django_assert_num_queries
+):
+    # given
+    product = product_with_two_variants
+    variants = ProductVariant.objects.bulk_create(
+        [ProductVariant(product=product, sku=f"Extra size #{i}") for i in range(10)]
+    )
+    Stock.objects.bulk_create(
+        [
+            Stock(warehouse=warehouse, product_variant=variant, quantity=5)
+            for variant in variants
+        ]
+    )
+
+    # when
+    # variants, their stocks and the stocks' reservations
+    with django_assert_num_queries(3):
+        result = get_pack_for_product(product, 24, channel_USD)
+
+    # then
+    assert sum(qty for _, qty in result) == 24
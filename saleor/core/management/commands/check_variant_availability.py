@@ -0,0 +1,69 @@
+"""Measure drift of the materialized variant availability.
+
+Compares VariantChannelAvailability rows with the live stock computation for
+all variants with stock or stored rows, or a random sample of them, and
+reports mismatches; pass -v 2 to list them. With --fix the compared variants
+are refreshed afterwards, which also builds the store from scratch.
+"""
+
+import random
+
+from django.core.management.base import BaseCommand
+
+from ....warehouse.availability_store import (
+    REFRESH_BATCH_SIZE,
+    find_availability_drift,
+    get_zone_warehouses,
+    refresh_variant_availability,
+)
+from ....warehouse.models import Stock, VariantChannelAvailability
+
+
+class Command(BaseCommand):
+    help = "Compare stored variant availability with the live computation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sample",
+            type=int,
+            help="Check this many randomly chosen variants instead of all",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Refresh the checked variants after reporting drift",
+        )
+
+    def handle(self, *args, **options):
+        variant_ids = set(
+            Stock.objects.values_list("product_variant_id", flat=True)
+        ) | set(
+            VariantChannelAvailability.objects.values_list(
+                "product_variant_id", flat=True
+            )
+        )
+        if options["sample"] and options["sample"] < len(variant_ids):
+            variant_ids = set(random.sample(sorted(variant_ids), options["sample"]))
+        variant_ids = sorted(variant_ids)
+
+        drifted = []
+        for start in range(0, len(variant_ids), REFRESH_BATCH_SIZE):
+            batch = variant_ids[start : start + REFRESH_BATCH_SIZE]
+            drifted.extend(find_availability_drift(batch))
+
+        drifted_variants = {drift.variant_id for drift in drifted}
+        self.stdout.write(
+            f"Checked {len(variant_ids)} variant(s): {len(drifted)} row(s) of "
+            f"{len(drifted_variants)} variant(s) drifted"
+        )
+        if options["verbosity"] > 1:
+            for drift in drifted:
+                self.stdout.write(
+                    f"  variant {drift.variant_id} channel {drift.channel_id} "
+                    f"{drift.country_code}: stored {drift.stored_quantity}, "
+                    f"live {drift.live_quantity}"
+                )
+
+        if options["fix"]:
+            refresh_variant_availability(variant_ids, get_zone_warehouses())
+            self.stdout.write(f"Refreshed {len(variant_ids)} variant(s)")
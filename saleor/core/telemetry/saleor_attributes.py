@@ -12,7 +12,11 @@ GRAPHQL_FIELD_NAME: Final = "graphql.field_name"
 GRAPHQL_OPERATION_COST: Final = "graphql.operation.cost"
 GRAPHQL_OPERATION_IDENTIFIER: Final = "graphql.operation.identifier"
 GRAPHQL_PARENT_TYPE: Final = "graphql.parent_type"
+GRAPHQL_PERSISTED_QUERY_CACHE_HIT: Final = "graphql.persisted_query.cache_hit"
+GRAPHQL_PREFETCH_BATCHES_SAVED: Final = "graphql.prefetch.batches_saved"
+GRAPHQL_PREFETCH_QUERY_COUNT: Final = "graphql.prefetch.query_count"
 GRAPHQL_RESOLVER_ROW_COUNT: Final = "graphql.resolver.row_count"
+GRAPHQL_RESPONSE_CACHE_HIT: Final = "graphql.response_cache.hit"
 
 # Http
 SALEOR_SOURCE_SERVICE_NAME: Final = "saleor.source.service.name"
@@ -21,6 +25,7 @@ SALEOR_SOURCE_SERVICE_NAME: Final = "saleor.source.service.name"
 SALEOR_APP_ID: Final = "saleor.app.id"
 SALEOR_APP_IDENTIFIER: Final = "saleor.app.identifier"
 SALEOR_APP_NAME: Final = "saleor.app.name"
+SALEOR_APP_TOKEN_CACHE_HIT: Final = "saleor.app_token.cache_hit"
 
 # Webhooks
 SALEOR_WEBHOOK_EXECUTION_MODE: Final = "saleor.webhook.execution_mode"
@@ -29,3 +34,7 @@ SALEOR_WEBHOOK_PAYLOAD_SIZE: Final = "saleor.webhook.payload.size"
 
 # Circuit Breaker
 SALEOR_CIRCUIT_BREAKER_STATE: Final = "saleor.circuit_breaker.state"
+
+# Inventory
+SALEOR_RECEIPT_COMPLETION_PHASE: Final = "saleor.receipt_completion.phase"
+SALEOR_SWEEPER_TABLE: Final = "saleor.sweeper.table"
@@ -36,6 +36,10 @@ class Unit(Enum):
     BYTE = "By"
     COST = "{cost}"
     EVENT = "{event}"
+    ROW = "{row}"
+    PREPAYMENT = "{prepayment}"
+    PAYMENT = "{payment}"
+    BATCH = "{batch}"
 
 
 UNIT_CONVERSIONS: dict[tuple[Unit, Unit], float] = {
@@ -1,20 +1,51 @@
 import hashlib
+import hmac
+import time
 from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 
+from django.conf import settings
 from django.contrib.auth.hashers import check_password
 from django.core.cache import cache
 
 from ....app.models import App, AppToken
 from ...core.dataloaders import DataLoader
+from ...metrics import (
+    record_app_token_cache_lookup,
+    record_app_token_verification_duration,
+)
 
-# Cache timeout for the app token loader
-CACHE_TIMEOUT = 30 * 60 * 60 * 24  # 30 days
+# Cache timeout for the app token loader. Entries are also invalidated when
+# their token is deleted or its app deactivated, the timeout bounds how long a
+# missed invalidation can go unnoticed.
+CACHE_TIMEOUT = 10 * 60  # 10 minutes
 
 
 def create_app_cache_key_from_token(token: str) -> str:
-    """Create a cache key for the app based on the token."""
-    return f"AppByTokenLoader:{hashlib.md5(token.encode('utf-8')).hexdigest()}"
+    """Create a cache key for the app based on the token.
+
+    The token is digested with HMAC keyed by SECRET_KEY, so the keys stored in
+    the cache cannot be matched against guessed tokens without the secret.
+    """
+    digest = hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), token.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    return f"AppByTokenLoader:{digest}"
+
+
+def create_app_token_cache_key_reference(token_id: int) -> str:
+    """Create a cache key under which the cache key of the token is stored."""
+    return f"AppByTokenLoader:token:{token_id}"
+
+
+def invalidate_app_token_cache(token_ids: Iterable[int]) -> None:
+    """Drop cached verifications of the given tokens."""
+    for token_id in token_ids:
+        reference_key = create_app_token_cache_key_reference(token_id)
+        if cache_key := cache.get(reference_key):
+            cache.delete(cache_key)
+        cache.delete(reference_key)
 
 
 class AppByIdLoader(DataLoader[str, App]):
@@ -54,13 +85,24 @@ class AppByTokenLoader(DataLoader[str, App]):
     ):
         """Check if the token is valid and return the app ID."""
         cached_data = cache.get(token_info.cache_key)
+        record_app_token_cache_lookup(hit=bool(cached_data))
         if cached_data:
             cached_app_id, cached_token_id = cached_data
             if token_id == cached_token_id:
                 return cached_app_id
-        elif check_password(token_info.raw_token, auth_token):
+            return None
+
+        start = time.monotonic()
+        is_valid = check_password(token_info.raw_token, auth_token)
+        record_app_token_verification_duration(time.monotonic() - start)
+        if is_valid:
             cache_data = (app_id, token_id)
             cache.set(token_info.cache_key, cache_data, CACHE_TIMEOUT)
+            cache.set(
+                create_app_token_cache_key_reference(token_id),
+                token_info.cache_key,
+                CACHE_TIMEOUT,
+            )
             return app_id
         return None
 
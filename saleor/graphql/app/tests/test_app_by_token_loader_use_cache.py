@@ -4,7 +4,11 @@ from django.utils import timezone
 
 from ....app.models import App, AppToken
 from ...context import SaleorContext
-from ..dataloaders.app import AppByTokenLoader, create_app_cache_key_from_token
+from ..dataloaders.app import (
+    AppByTokenLoader,
+    create_app_cache_key_from_token,
+    create_app_token_cache_key_reference,
+)
 
 
 @patch("saleor.graphql.app.dataloaders.app.cache")
@@ -256,8 +260,9 @@ def test_app_by_token_loader_one_of_tokens_in_cache(
     cached_app_id2, cached_token_id2 = mocked_cache.get(expected_cache_key2)
     assert token2.id == cached_token_id2
     assert fetched_app2.id == app.id == cached_app_id2
-    # Check that the cache was set once during given test section and second time inside dataloader
-    assert mocked_cache.set.call_count == 2
+    # Check that the cache was set once during given test section and then
+    # inside dataloader for the entry and its reference
+    assert mocked_cache.set.call_count == 3
 
 
 @patch("saleor.graphql.app.dataloaders.app.cache")
@@ -297,5 +302,79 @@ def test_app_by_token_loader_tokens_with_same_last_4(
     cached_app_id2, cached_token_id2 = mocked_cache.get(expected_cache_key2)
     assert token2.id == cached_token_id2
     assert fetched_app2.id == app2.id == cached_app_id2
-    # Check that the cache was set once during given test section and second time inside dataloader
-    assert mocked_cache.set.call_count == 2
+    # Check that the entry and its reference were cached for both tokens
+    assert mocked_cache.set.call_count == 4
+
+
+def test_create_app_cache_key_from_token_is_keyed(settings):
+    # given
+    raw_token = "test_token"
+    cache_key = create_app_cache_key_from_token(raw_token)
+
+    # when
+    settings.SECRET_KEY = "other-secret"
+
+    # then
+    assert create_app_cache_key_from_token(raw_token) != cache_key
+    assert raw_token not in cache_key
+
+
+@patch("saleor.graphql.app.dataloaders.app.check_password")
+@patch("saleor.graphql.app.dataloaders.app.cache")
+def test_app_by_token_loader_does_not_hash_cached_token(
+    mocked_cache, mocked_check_password, app, setup_mock_for_cache
+):
+    # given
+    dummy_cache = {}
+    setup_mock_for_cache(dummy_cache, mocked_cache)
+    mocked_check_password.return_value = True
+    raw_token = "test_token"
+    app.tokens.create(name="test_token", auth_token=raw_token)
+    AppByTokenLoader(SaleorContext()).batch_load([raw_token])
+
+    # when
+    loaded_apps = AppByTokenLoader(SaleorContext()).batch_load([raw_token])
+
+    # then
+    assert loaded_apps[0].id == app.id
+    mocked_check_password.assert_called_once()
+
+
+@patch("saleor.graphql.app.dataloaders.app.cache")
+def test_app_token_delete_invalidates_cache(mocked_cache, app, setup_mock_for_cache):
+    # given
+    dummy_cache = {}
+    setup_mock_for_cache(dummy_cache, mocked_cache)
+    raw_token = "test_token"
+    token, _ = app.tokens.create(name="test_token", auth_token=raw_token)
+    AppByTokenLoader(SaleorContext()).batch_load([raw_token])
+    cache_key = create_app_cache_key_from_token(raw_token)
+    reference_key = create_app_token_cache_key_reference(token.id)
+    assert mocked_cache.get(cache_key) == (app.id, token.id)
+    assert mocked_cache.get(reference_key) == cache_key
+
+    # when
+    token.delete()
+
+    # then
+    assert mocked_cache.get(cache_key) is None
+    assert mocked_cache.get(reference_key) is None
+
+
+@patch("saleor.graphql.app.dataloaders.app.cache")
+def test_app_deactivation_invalidates_cache(mocked_cache, app, setup_mock_for_cache):
+    # given
+    dummy_cache = {}
+    setup_mock_for_cache(dummy_cache, mocked_cache)
+    raw_token = "test_token"
+    app.tokens.create(name="test_token", auth_token=raw_token)
+    AppByTokenLoader(SaleorContext()).batch_load([raw_token])
+    cache_key = create_app_cache_key_from_token(raw_token)
+    assert mocked_cache.get(cache_key) is not None
+
+    # when
+    app.is_active = False
+    app.save(update_fields=["is_active"])
+
+    # then
+    assert mocked_cache.get(cache_key) is None
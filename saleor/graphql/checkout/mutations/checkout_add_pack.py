@@ -102,19 +102,16 @@ class CheckoutAddPack(BaseMutation):
         min_required = int(assigned_attr.value.name)
 
         # Calculate total available stock across all variants
-        from ....warehouse.availability import get_available_quantity
+        from ....warehouse.availability import get_available_quantities
 
-        variants = product.variants.all()
-        total_available = 0
-
-        for variant in variants:
-            available = get_available_quantity(
-                variant,
+        total_available = sum(
+            get_available_quantities(
+                product.variants.all(),
                 country_code,
                 channel.slug,
                 check_reservations=True,
-            )
-            total_available += available
+            ).values()
+        )
 
         # Calculate what would remain after this order
         total_quantity = current_quantity + pack_quantity
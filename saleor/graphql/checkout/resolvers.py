@@ -172,21 +172,20 @@ def resolve_get_pack_allocation(
                     min_required = int(assigned_value.value.name)
 
                     # Calculate total available stock across all variants
-                    from ...warehouse.availability import get_available_quantity
+                    from ...warehouse.availability import get_available_quantities
 
-                    country_code = channel.default_country.code
-                    variants = product.variants.all()
-                    total_available = 0
-
-                    for variant in variants:
-                        available = get_available_quantity(
-                            variant,
-                            country_code,
+                    total_available = sum(
+                        get_available_quantities(
+                            product.variants.all(),
+                            channel.default_country.code,
                             channel.slug,
                             check_reservations=True,
                             warehouse_ids=warehouse_ids,
-                        )
-                        total_available += available
+                            database_connection_name=get_database_connection_name(
+                                info.context
+                            ),
+                        ).values()
+                    )
 
                     # Calculate what would remain after this order
                     total_qty = current_qty + pack_qty
@@ -1,12 +1,15 @@
 import json
 from collections.abc import Callable, Iterable
 from decimal import Decimal, InvalidOperation
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 import graphene
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Field, Func, Q, QuerySet, Value
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
+from django.db.models.lookups import GreaterThan, LessThan
 from graphene.relay import Connection
 from graphql import GraphQLError
 from graphql.language.ast import FragmentSpread, InlineFragment, SelectionSet
@@ -17,6 +20,7 @@ from graphql_relay.utils import base64, unbase64
 from ...channel.exceptions import ChannelNotDefined, NoDefaultChannel
 from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..core.context import ChannelContext, ChannelQsContext
+from ..core.descriptions import ADDED_IN_323
 from ..core.enums import OrderDirection
 from ..core.types import BaseConnection, NonNullList
 from ..utils.sorting import sort_queryset_for_connection
@@ -142,6 +146,71 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class RowValue(Func):
+    """Row constructor, e.g. `(name, id)`, to compare several values at once."""
+
+    function = ""
+
+    def __init__(self, *expressions):
+        super().__init__(*expressions, output_field=Field())
+
+
+def _get_keyset_fields(
+    qs: QuerySet, sorting_fields: list[str], cursor: list[str]
+) -> list[Field] | None:
+    """Return model fields to filter by the cursor with a row value comparison.
+
+    Comparing rows, e.g. `(name, id) > ('name', 1)`, matches the order of the
+    queryset only when all its fields are sorted in the same direction and none
+    of them is null. Such a filter can be served by an index on the fields.
+    """
+    if None in cursor:
+        return None
+    ordering = qs.query.order_by
+    if not all(isinstance(field_name, str) for field_name in ordering):
+        return None
+    if len({field_name.startswith("-") for field_name in ordering}) != 1:
+        return None
+    if [field_name.lstrip("-") for field_name in ordering] != sorting_fields:
+        return None
+
+    opts = qs.model._meta
+    fields = []
+    for field_name in sorting_fields:
+        if field_name in qs.query.annotations:
+            return None
+        try:
+            field = opts.pk if field_name == "pk" else opts.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation or field.null:
+            return None
+        fields.append(field)
+    return fields
+
+
+def _prepare_keyset_filter(
+    cursor: list[str], fields: list[Field], sorting_direction: str
+) -> GreaterThan | LessThan:
+    try:
+        values = [
+            field.to_python(value) for field, value in zip(fields, cursor, strict=True)
+        ]
+    except ValidationError as e:
+        raise GraphQLError("Received cursor is invalid.") from e
+
+    lookup = GreaterThan if sorting_direction == "gt" else LessThan
+    return lookup(
+        RowValue(*[F(field.attname) for field in fields]),
+        RowValue(
+            *[
+                Value(value, output_field=field)
+                for field, value in zip(fields, values, strict=True)
+            ]
+        ),
+    )
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -273,16 +342,18 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(
+    filter_kwargs: Q | GreaterThan | LessThan
+    if not cursor:
+        filter_kwargs = Q()
+    elif keyset_fields := _get_keyset_fields(qs, sorting_fields, cursor):
+        filter_kwargs = _prepare_keyset_filter(cursor, keyset_fields, sorting_direction)
+    else:
+        filter_kwargs = _prepare_filter(
             cursor,
             sorting_fields,
             sorting_direction,
             _get_id_coercion(qs),
         )
-        if cursor
-        else Q()
-    )
     try:
         filtered_qs = qs.filter(filter_kwargs)
     except ValueError as e:
@@ -294,13 +365,25 @@ def connection_from_queryset_slice(
 
     if "total_count" in connection_type._meta.fields:
 
+        @cache
+        def get_total_count_and_exactness():
+            return get_queryset_total_count(qs)
+
         def get_total_count():
-            return qs.count()
+            return get_total_count_and_exactness()[0]
+
+        def get_total_count_is_exact():
+            return get_total_count_and_exactness()[1]
+
+        extra_fields = {}
+        if "total_count_is_exact" in connection_type._meta.fields:
+            extra_fields["total_count_is_exact"] = get_total_count_is_exact
 
         return connection_type(
             edges=edges,
             page_info=pageinfo_type(**page_info),
             total_count=get_total_count,
+            **extra_fields,
         )
 
     return connection_type(
@@ -309,6 +392,35 @@ def connection_from_queryset_slice(
     )
 
 
+def get_queryset_total_count(qs: QuerySet) -> tuple[int, bool]:
+    """Return the number of rows of the queryset and whether it is exact.
+
+    When GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD is set and the query planner
+    estimates at least that many rows, the estimate is returned instead of
+    counting all of them.
+    """
+    threshold = settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD
+    if threshold:
+        estimated_count = _get_estimated_count(qs)
+        if estimated_count is not None and estimated_count >= threshold:
+            return estimated_count, False
+    return qs.count(), True
+
+
+def _get_estimated_count(qs: QuerySet) -> int | None:
+    try:
+        plan = json.loads(qs.order_by().explain(format="json"))
+    except ValueError:
+        # The database doesn't support plans in JSON format
+        return None
+    if isinstance(plan, list):
+        plan = plan[0] if plan else {}
+    try:
+        return int(plan["Plan"]["Plan Rows"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 def create_connection_slice(
     iterable,
     info: "ResolveInfo",
@@ -459,6 +571,8 @@ def slice_connection_iterable(
 
     if "total_count" in connection_type._meta.fields:
         slice.total_count = _len
+    if "total_count_is_exact" in connection_type._meta.fields:
+        slice.total_count_is_exact = True
 
     return slice
 
@@ -711,18 +825,32 @@ class CountableConnection(NonNullConnection):
         abstract = True
 
     total_count = graphene.Int(description="A total count of items in the collection.")
+    total_count_is_exact = graphene.Boolean(
+        description=(
+            "Whether `totalCount` is exact. For large collections it may be "
+            "estimated by the database instead of counted." + ADDED_IN_323
+        )
+    )
 
     @staticmethod
     def resolve_total_count(root, _info):
-        try:
-            if isinstance(root, dict):
-                total_count = root["total_count"]
-            else:
-                total_count = root.total_count
-        except (AttributeError, KeyError):
-            return None
+        return _resolve_connection_value(root, "total_count")
+
+    @staticmethod
+    def resolve_total_count_is_exact(root, _info):
+        return _resolve_connection_value(root, "total_count_is_exact")
+
+
+def _resolve_connection_value(root, name: str):
+    try:
+        if isinstance(root, dict):
+            value = root[name]
+        else:
+            value = getattr(root, name)
+    except (AttributeError, KeyError):
+        return None
 
-        if callable(total_count):
-            return total_count()
+    if callable(value):
+        return value()
 
-        return total_count
+    return value
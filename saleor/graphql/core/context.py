@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from ...account.models import User
     from ...app.models import App
     from .dataloaders import DataLoader
+    from .prefetch import PrefetchStats
 
 
 class SaleorContext(HttpRequest):
@@ -18,6 +19,7 @@ class SaleorContext(HttpRequest):
     decoded_auth_token: dict[str, Any] | None
     allow_replica: bool = True
     dataloaders: dict[str, "DataLoader"]
+    prefetch_stats: "PrefetchStats"
     app: "App | None"
     user: "User | None"  # type: ignore[assignment]
     requestor: "App | User | None"
@@ -22,6 +22,8 @@ class DataLoader[K, R](BaseLoader):
     thread_id: int
     context: SaleorContext
     database_connection_name: str
+    # Number of batches loaded, to tell which primed loaders skipped loading
+    batch_count: int
 
     def __new__(cls, context: SaleorContext):
         key = cls.context_key
@@ -46,11 +48,13 @@ class DataLoader[K, R](BaseLoader):
             self.thread_id = thread_id
             self.context = context
             self.database_connection_name = get_database_connection_name(context)
+            self.batch_count = 0
             super().__init__()
 
     def batch_load_fn(  # pylint: disable=method-hidden
         self, keys: Iterable[K]
     ) -> Promise[list[R]]:
+        self.batch_count += 1
         with tracer.start_as_current_span(
             self.__class__.__name__, end_on_exit=False
         ) as span:
@@ -0,0 +1,96 @@
+"""Priming of dataloaders with data of whole connection pages.
+
+Fields of connection nodes are resolved with dataloaders, which load each
+relation in a separate batch. A prefetch planner inspects the fields
+requested for the nodes when a page is resolved, loads what they need up
+front, with queries shared by several loaders, and primes the loaders with
+the results.
+
+Prefetching is measured per operation: a primed loader that didn't load any
+batch until the end of the operation saved one, and each query made by the
+planners is subtracted from the saved batches.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from graphql.language.ast import Field, FragmentSpread, InlineFragment, SelectionSet
+
+from . import SaleorContext
+from .dataloaders import DataLoader
+
+if TYPE_CHECKING:
+    from . import ResolveInfo
+
+
+@dataclass
+class PrefetchStats:
+    query_count: int = 0
+    primed_loaders: dict[str, DataLoader] = field(default_factory=dict)
+
+    @property
+    def batches_saved(self) -> int:
+        skipped_batches = sum(
+            1 for loader in self.primed_loaders.values() if not loader.batch_count
+        )
+        return skipped_batches - self.query_count
+
+
+def get_prefetch_stats(context: SaleorContext) -> PrefetchStats:
+    if not hasattr(context, "prefetch_stats"):
+        context.prefetch_stats = PrefetchStats()
+    return context.prefetch_stats
+
+
+def pop_prefetch_stats(context: SaleorContext) -> PrefetchStats | None:
+    """Return stats of prefetching in the operation and reset them."""
+    return context.__dict__.pop("prefetch_stats", None)
+
+
+def record_prefetch_query(context: SaleorContext) -> None:
+    get_prefetch_stats(context).query_count += 1
+
+
+def prime_loader[K, R](loader: DataLoader[K, R], values: Iterable[tuple[K, R]]):
+    """Prime the loader with the values, skipping keys it has loaded already."""
+    get_prefetch_stats(loader.context).primed_loaders[loader.context_key] = loader
+    for key, value in values:
+        loader.prime(key, value)
+
+
+def get_connection_node_fields(info: "ResolveInfo") -> set[str]:
+    """Return names of fields requested for nodes of the resolved connection."""
+    node_fields: set[str] = set()
+    for field_ast in info.field_asts:
+        for edges in _get_fields(field_ast.selection_set, "edges", info):
+            for node in _get_fields(edges.selection_set, "node", info):
+                node_fields.update(
+                    node_field.name.value
+                    for node_field in _get_fields(node.selection_set, None, info)
+                )
+    return node_fields
+
+
+def _get_fields(
+    selection_set: SelectionSet | None, name: str | None, info: "ResolveInfo"
+) -> list[Field]:
+    """Return fields of the selection set with the name, or all if it's None.
+
+    Fields of fragments spread in the selection set are included.
+    """
+    if selection_set is None:
+        return []
+
+    fields = []
+    for selection in selection_set.selections:
+        if isinstance(selection, Field):
+            if name is None or selection.name.value == name:
+                fields.append(selection)
+        elif isinstance(selection, InlineFragment):
+            fields.extend(_get_fields(selection.selection_set, name, info))
+        elif isinstance(selection, FragmentSpread):
+            fragment = info.fragments.get(selection.name.value)
+            if fragment is not None:
+                fields.extend(_get_fields(fragment.selection_set, name, info))
+    return fields
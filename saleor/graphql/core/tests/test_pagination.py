@@ -1,11 +1,19 @@
 import base64
+import json
 import math
+from unittest.mock import patch
 
 import graphene
 import pytest
+from django.db.models import F
 
 from ....tests.models import Book
-from ..connection import CountableConnection, create_connection_slice
+from ..connection import (
+    CountableConnection,
+    _get_keyset_fields,
+    connection_from_queryset_slice,
+    create_connection_slice,
+)
 from ..fields import ConnectionField
 
 
@@ -353,3 +361,122 @@ def test_query_with_pagination_and_inline_fragments(books):
     assert not result.errors
     content = result.data
     assert len(content["books"]["edges"]) == page_size
+
+
+def test_pagination_keyset_with_multiple_sorting_fields(db):
+    # given
+    Book.objects.bulk_create([Book(name=f"Book{index % 3}") for index in range(10)])
+    qs = Book.objects.order_by("name", "pk")
+    sort_by = {"field": ["name", "pk"], "direction": ""}
+    expected_ids = list(qs.values_list("pk", flat=True))
+
+    # when
+    ids = []
+    end_cursor = None
+    has_next_page = True
+    while has_next_page:
+        connection = connection_from_queryset_slice(
+            qs,
+            {"first": 3, "after": end_cursor, "sort_by": sort_by},
+            BookTypeCountableConnection,
+        )
+        ids.extend(edge.node.pk for edge in connection.edges)
+        has_next_page = connection.page_info.has_next_page
+        end_cursor = connection.page_info.end_cursor
+
+    # then
+    assert ids == expected_ids
+
+
+def test_get_keyset_fields():
+    # given
+    qs = Book.objects.order_by("-name", "-pk")
+
+    # when
+    fields = _get_keyset_fields(qs, ["name", "pk"], ["Book1", "1"])
+
+    # then
+    assert fields == [Book._meta.get_field("name"), Book._meta.pk]
+
+
+@pytest.mark.parametrize(
+    ("qs", "cursor"),
+    [
+        (Book.objects.order_by("name", "-pk"), ["Book1", "1"]),
+        (Book.objects.order_by("name", "pk"), [None, "1"]),
+        (
+            Book.objects.annotate(title=F("name")).order_by("title", "pk"),
+            ["Book1", "1"],
+        ),
+    ],
+)
+def test_get_keyset_fields_not_matching_order(qs, cursor):
+    # when
+    fields = _get_keyset_fields(
+        qs, [field.lstrip("-") for field in qs.query.order_by], cursor
+    )
+
+    # then
+    assert fields is None
+
+
+QUERY_TOTAL_COUNT = """
+    query BooksTotalCount {
+        books(first: 1) {
+            totalCount
+            totalCountIsExact
+        }
+    }
+"""
+
+
+def test_total_count_exact_below_estimate_threshold(books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100
+
+    # when
+    with patch(
+        "django.db.models.QuerySet.explain",
+        return_value=json.dumps({"Plan": {"Plan Rows": 20}}),
+    ):
+        result = schema.execute(QUERY_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"] == {
+        "totalCount": len(books),
+        "totalCountIsExact": True,
+    }
+
+
+def test_total_count_estimated_above_threshold(books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100
+
+    # when
+    with patch(
+        "django.db.models.QuerySet.explain",
+        return_value=json.dumps({"Plan": {"Plan Rows": 1500}}),
+    ):
+        result = schema.execute(QUERY_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"] == {
+        "totalCount": 1500,
+        "totalCountIsExact": False,
+    }
+
+
+def test_total_count_not_estimated_by_default(books):
+    # when
+    with patch("django.db.models.QuerySet.explain") as mocked_explain:
+        result = schema.execute(QUERY_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"] == {
+        "totalCount": len(books),
+        "totalCountIsExact": True,
+    }
+    mocked_explain.assert_not_called()
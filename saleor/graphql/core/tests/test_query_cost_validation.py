@@ -4,6 +4,7 @@ from django.test import override_settings
 
 from ...query_cost_map import COST_MAP
 from ..const import DEFAULT_NESTED_LIST_LIMIT
+from ..validators.query_cost import cost_plan_cache
 
 
 @override_settings(GRAPHQL_QUERY_MAX_COMPLEXITY=1)
@@ -548,3 +549,38 @@ def test_query_with_not_required_limit_argument_not_provided(
     assert (
         query_cost == 100 * 1 + 100 * DEFAULT_NESTED_LIST_LIMIT
     )  # 100 attributes + 100 product types (limit value) per attribute
+
+
+QUERY_PRODUCTS_WITH_FIRST = """
+    query productsCost($first: Int, $channel: String) {
+        products(first: $first, channel: $channel) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+def test_query_cost_plan_reused_for_different_variables(api_client, channel_USD):
+    # given
+    cost_plan_cache.clear()
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_FIRST, {"first": 10, "channel": channel_USD.slug}
+    )
+    first_cost = response.json()["extensions"]["cost"]["requestedQueryCost"]
+    cached_plans = list(cost_plan_cache.values())
+
+    # when
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_FIRST, {"first": 20, "channel": channel_USD.slug}
+    )
+
+    # then
+    second_cost = response.json()["extensions"]["cost"]["requestedQueryCost"]
+    assert first_cost == 10
+    assert second_cost == 20
+    assert len(cached_plans) == 1
+    assert list(cost_plan_cache.values()) == cached_plans
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from functools import reduce
 from operator import add, mul
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
 from graphql import (
     GraphQLArgument,
@@ -17,13 +17,18 @@ from graphql.language.ast import (
     FragmentDefinition,
     FragmentSpread,
     InlineFragment,
+    ListValue,
+    ObjectValue,
     OperationDefinition,
+    Variable,
 )
 from graphql.type import GraphQLField
-from graphql.validation import validate
+from graphql.utils.type_info import TypeInfo
 from graphql.validation.rules.base import ValidationRule
 from graphql.validation.validation import ValidationContext
 
+from ....core.utils.cache import CacheDict
+
 CostAwareNode = (
     Field | FragmentDefinition | FragmentSpread | InlineFragment | OperationDefinition
 )
@@ -31,12 +36,38 @@ CostAwareNode = (
 GraphQLFieldMap = dict[str, GraphQLField]
 
 
+class FieldCostPlan(NamedTuple):
+    node: Field
+    field: GraphQLField
+    parent_type_name: str | None
+    # Argument values, when the document sets them without variables
+    static_args: dict[str, Any] | None
+    selection: "SelectionCostPlan | None"
+
+
+class FragmentCostPlan(NamedTuple):
+    # None for a spread of a fragment the document does not define
+    type_name: str | None
+    interface_names: tuple[str, ...]
+    selection: "SelectionCostPlan | None"
+
+
+SelectionCostPlan = list[FieldCostPlan | FragmentCostPlan]
+
+# Cost plans of operations, keyed by document fingerprint and operation index
+cost_plan_cache: CacheDict = CacheDict(1000)
+
+# Cost maps already validated against a schema
+validated_cost_maps: CacheDict = CacheDict(10)
+
+
 class CostValidator(ValidationRule):
     maximum_cost: int
     default_cost: int = 0
     default_complexity: int = 1
     variables: dict | None = None
     cost_map: dict[str, dict[str, Any]] | None = None
+    fingerprint: str | None = None
 
     def __init__(
         self,
@@ -46,10 +77,12 @@ class CostValidator(ValidationRule):
         default_complexity: int = 1,
         variables: dict | None = None,
         cost_map: dict[str, dict[str, Any]] | None = None,
+        fingerprint: str | None = None,
     ):  # pylint: disable=super-init-not-called
         self.maximum_cost = maximum_cost
         self.variables = variables
         self.cost_map = cost_map
+        self.fingerprint = fingerprint
         self.default_cost = default_cost
         self.default_complexity = default_complexity
         self.cost = 0
@@ -59,44 +92,135 @@ class CostValidator(ValidationRule):
         self.context = context
         return self
 
-    def compute_node_cost(self, node: CostAwareNode, type_def, parent_multipliers=None):
-        if parent_multipliers is None:
-            parent_multipliers = []
+    def get_cost_plan(self, node: OperationDefinition, key) -> SelectionCostPlan | None:
+        """Return the cost plan of the operation, compiled once per document."""
+        schema = self.context.get_schema()
+        cache_key = (self.fingerprint, key)
+        if self.fingerprint:
+            cached = cost_plan_cache.get(cache_key)
+            if cached and cached[0] is schema:
+                return cached[1]
+
+        plan = None
+        if node.operation == "query":
+            plan = self.compile_cost_plan(node, schema.get_query_type())
+        if node.operation == "mutation":
+            plan = self.compile_cost_plan(node, schema.get_mutation_type())
+        if node.operation == "subscription":
+            plan = self.compile_cost_plan(node, schema.get_subscription_type())
+
+        if self.fingerprint:
+            cost_plan_cache[cache_key] = (schema, plan)
+        return plan
+
+    def compile_cost_plan(
+        self, node: CostAwareNode, type_def
+    ) -> SelectionCostPlan | None:
+        """Resolve fields and fragments of the node's selection in the schema.
+
+        The plan does not depend on variables, so it can be reused by every
+        request sending the same document.
+        """
         if isinstance(node, FragmentSpread) or not node.selection_set:
-            return 0
+            return None
         fields: GraphQLFieldMap = {}
         if isinstance(type_def, GraphQLObjectType | GraphQLInterfaceType):
             fields = type_def.fields
-        total = 0
-        fragment_map_cost: dict[str, int] = defaultdict(int)
-        fragment_name_to_interface_names: dict[str, set[str]] = defaultdict(set)
+        parent_type_name = type_def.name if type_def and type_def.name else None
+        plan: SelectionCostPlan = []
         for child_node in node.selection_set.selections:
-            self.operation_multipliers = parent_multipliers[:]
-            node_cost = self.default_cost
             if isinstance(child_node, Field):
                 field = fields.get(child_node.name.value)
                 if not field:
                     continue
-                field_type = get_named_type(field.type)
+                plan.append(
+                    FieldCostPlan(
+                        node=child_node,
+                        field=field,
+                        parent_type_name=parent_type_name,
+                        static_args=get_static_argument_values(field, child_node),
+                        selection=self.compile_cost_plan(
+                            child_node, get_named_type(field.type)
+                        ),
+                    )
+                )
+            if isinstance(child_node, FragmentSpread):
+                fragment = self.context.get_fragment(child_node.name.value)
+                if not fragment:
+                    plan.append(FragmentCostPlan(None, (), None))
+                    continue
+                fragment_type = self.context.get_schema().get_type(
+                    fragment.type_condition.name.value
+                )
+                if not fragment_type:
+                    continue
+                plan.append(self.compile_fragment_cost_plan(fragment, fragment_type))
 
-                try:
-                    field_args: dict[str, Any] = get_argument_values(
-                        field.args,
-                        child_node.arguments,
-                        self.variables,
+            if isinstance(child_node, InlineFragment):
+                inline_fragment_type = type_def
+                if child_node.type_condition and child_node.type_condition.name:
+                    inline_fragment_type = self.context.get_schema().get_type(
+                        child_node.type_condition.name.value
                     )
-                except Exception as e:
-                    report_error(self.context, e)
-                    field_args = {}
+                if not inline_fragment_type:
+                    continue
+                plan.append(
+                    self.compile_fragment_cost_plan(child_node, inline_fragment_type)
+                )
+        return plan
+
+    def compile_fragment_cost_plan(
+        self, node: FragmentDefinition | InlineFragment, type_def
+    ) -> FragmentCostPlan:
+        interface_names: tuple[str, ...] = ()
+        if isinstance(type_def, GraphQLObjectType) and type_def.interfaces:
+            interface_names = tuple(interface.name for interface in type_def.interfaces)
+        return FragmentCostPlan(
+            type_name=type_def.name,
+            interface_names=interface_names,
+            selection=self.compile_cost_plan(node, type_def),
+        )
 
-                field_args = self.update_empty_args_with_default(field_args, field.args)
+    def evaluate_cost_plan(
+        self, plan: SelectionCostPlan | None, parent_multipliers=None
+    ) -> int:
+        """Compute the cost of a plan for the variables of the request."""
+        if parent_multipliers is None:
+            parent_multipliers = []
+        if not plan:
+            return 0
+        total = 0
+        fragment_map_cost: dict[str, int] = defaultdict(int)
+        fragment_name_to_interface_names: dict[str, set[str]] = defaultdict(set)
+        for child in plan:
+            self.operation_multipliers = parent_multipliers[:]
+            node_cost = self.default_cost
+            if isinstance(child, FieldCostPlan):
+                if child.static_args is not None:
+                    field_args = dict(child.static_args)
+                else:
+                    try:
+                        field_args = get_argument_values(
+                            child.field.args,
+                            child.node.arguments,
+                            self.variables,
+                        )
+                    except Exception as e:
+                        report_error(self.context, e)
+                        field_args = {}
+
+                field_args = self.update_empty_args_with_default(
+                    field_args, child.field.args
+                )
 
                 if not self.cost_map:
                     return 0
 
                 cost_map_args = (
-                    self.get_args_from_cost_map(child_node, type_def.name, field_args)
-                    if type_def and type_def.name
+                    self.get_args_from_cost_map(
+                        child.node, child.parent_type_name, field_args
+                    )
+                    if child.parent_type_name
                     else None
                 )
                 if cost_map_args is not None:
@@ -104,48 +228,17 @@ class CostValidator(ValidationRule):
                         node_cost = self.compute_cost(**cost_map_args)
                     except (TypeError, ValueError) as e:
                         report_error(self.context, e)
-                child_cost = self.compute_node_cost(
-                    child_node, field_type, self.operation_multipliers
+                child_cost = self.evaluate_cost_plan(
+                    child.selection, self.operation_multipliers
                 )
                 node_cost += child_cost
-            if isinstance(child_node, FragmentSpread):
-                fragment = self.context.get_fragment(child_node.name.value)
-                if fragment:
-                    fragment_type = self.context.get_schema().get_type(
-                        fragment.type_condition.name.value
-                    )
-                    if not fragment_type:
-                        continue
-
-                    fragment_map_cost[fragment_type.name] += self.compute_node_cost(
-                        fragment, fragment_type, self.operation_multipliers
-                    )
-                    if (
-                        isinstance(fragment_type, GraphQLObjectType)
-                        and fragment_type.interfaces
-                    ):
-                        fragment_name_to_interface_names[fragment_type.name].update(
-                            interface.name for interface in fragment_type.interfaces
-                        )
-
-            if isinstance(child_node, InlineFragment):
-                inline_fragment_type = type_def
-                if child_node.type_condition and child_node.type_condition.name:
-                    inline_fragment_type = self.context.get_schema().get_type(
-                        child_node.type_condition.name.value
-                    )
-                if not inline_fragment_type:
-                    continue
-
-                fragment_map_cost[inline_fragment_type.name] += self.compute_node_cost(
-                    child_node, inline_fragment_type, self.operation_multipliers
+            elif child.type_name:
+                fragment_map_cost[child.type_name] += self.evaluate_cost_plan(
+                    child.selection, self.operation_multipliers
                 )
-                if (
-                    isinstance(inline_fragment_type, GraphQLObjectType)
-                    and inline_fragment_type.interfaces
-                ):
-                    fragment_name_to_interface_names[inline_fragment_type.name].update(
-                        interface.name for interface in inline_fragment_type.interfaces
+                if child.interface_names:
+                    fragment_name_to_interface_names[child.type_name].update(
+                        child.interface_names
                     )
 
             total += node_cost
@@ -172,23 +265,12 @@ class CostValidator(ValidationRule):
     def enter_operation_definition(self, node, key, parent, path, ancestors):  # pylint: disable=unused-argument
         if self.cost_map:
             try:
-                validate_cost_map(self.cost_map, self.context.get_schema())
+                validate_cost_map_once(self.cost_map, self.context.get_schema())
             except GraphQLError as cost_map_error:
                 self.context.report_error(cost_map_error)
                 return
 
-        if node.operation == "query":
-            self.cost += self.compute_node_cost(
-                node, self.context.get_schema().get_query_type()
-            )
-        if node.operation == "mutation":
-            self.cost += self.compute_node_cost(
-                node, self.context.get_schema().get_mutation_type()
-            )
-        if node.operation == "subscription":
-            self.cost += self.compute_node_cost(
-                node, self.context.get_schema().get_subscription_type()
-            )
+        self.cost += self.evaluate_cost_plan(self.get_cost_plan(node, key))
 
     def leave_operation_definition(self, node, key, parent, path, ancestors):  # pylint: disable=unused-argument
         if self.cost > self.maximum_cost:
@@ -296,6 +378,35 @@ def validate_cost_map(cost_map: dict[str, dict[str, Any]], schema: GraphQLSchema
                 )
 
 
+def validate_cost_map_once(cost_map: dict[str, dict[str, Any]], schema: GraphQLSchema):
+    cached = validated_cost_maps.get(id(cost_map))
+    if cached and cached[0] is cost_map and cached[1] is schema:
+        return
+    validate_cost_map(cost_map, schema)
+    validated_cost_maps[id(cost_map)] = (cost_map, schema)
+
+
+def get_static_argument_values(field: GraphQLField, node: Field) -> dict | None:
+    """Return argument values of the field if they do not depend on variables."""
+    if any(_contains_variable(argument.value) for argument in node.arguments or []):
+        return None
+    try:
+        return get_argument_values(field.args, node.arguments)
+    except Exception:
+        # Left to be reported when the cost is evaluated
+        return None
+
+
+def _contains_variable(value) -> bool:
+    if isinstance(value, Variable):
+        return True
+    if isinstance(value, ListValue):
+        return any(_contains_variable(item) for item in value.values)
+    if isinstance(value, ObjectValue):
+        return any(_contains_variable(field.value) for field in value.fields)
+    return False
+
+
 def report_error(context: ValidationContext, error: Exception):
     context.report_error(GraphQLError(str(error)))
 
@@ -317,6 +428,7 @@ def cost_validator(
     default_complexity: int = 1,
     variables: dict | None = None,
     cost_map: dict[str, dict[str, Any]] | None = None,
+    fingerprint: str | None = None,
 ) -> CostValidator:
     return CostValidator(
         maximum_cost=maximum_cost,
@@ -324,6 +436,7 @@ def cost_validator(
         default_complexity=default_complexity,
         variables=variables,
         cost_map=cost_map,
+        fingerprint=fingerprint,
     )
 
 
@@ -333,17 +446,29 @@ def validate_query_cost(
     variables,
     cost_map,
     maximum_cost,
+    fingerprint=None,
 ):
+    """Return the cost of the query and errors of its cost validation.
+
+    Given the document fingerprint, cost plans of the document are cached and
+    only evaluated against the variables on later calls.
+    """
     validator = cost_validator(
         maximum_cost,
         variables=variables,
         cost_map=cost_map,
+        fingerprint=fingerprint,
     )
-    error = validate(
-        schema,
-        query.document_ast,
-        [validator],  # type: ignore[list-item] # cost validator is an instance that pretends to be a class # noqa: E501
-    )
+    document_ast = query.document_ast
+    context = ValidationContext(schema, document_ast, TypeInfo(schema))
+    validator(context)
+    # The validator only acts on operations, so it is applied to them directly
+    # instead of visiting every node of the document
+    for key, definition in enumerate(document_ast.definitions):
+        if isinstance(definition, OperationDefinition):
+            validator.enter(definition, key, document_ast.definitions, [], [])
+            validator.leave(definition, key, document_ast.definitions, [], [])
+    error = context.get_errors()
     if error:
         return validator.cost, error
     return validator.cost, None
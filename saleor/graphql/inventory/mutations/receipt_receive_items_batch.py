@@ -1,11 +1,10 @@
 import graphene
 from django.core.exceptions import ValidationError
-from django.db import transaction
 
 from ....inventory.error_codes import ReceiptErrorCode
 from ....inventory.exceptions import ReceiptNotInProgress
 from ....inventory.models import Receipt as ReceiptModel
-from ....inventory.receipt_workflow import receive_item
+from ....inventory.receipt_workflow import ReceiveItemData, receive_items_batch
 from ....permission.enums import WarehousePermissions
 from ....product.models import ProductVariant
 from ...core import ResolveInfo
@@ -14,6 +13,8 @@ from ...core.mutations import BaseMutation
 from ...core.utils import from_global_id_or_error
 from ..types import Receipt, ReceiptError
 
+MAX_ITEMS_PER_BATCH = 1000
+
 
 class ReceiveItemInput(graphene.InputObjectType):
     variant_id = graphene.ID(
@@ -27,6 +28,13 @@ class ReceiveItemInput(graphene.InputObjectType):
     notes = graphene.String(
         description="Optional notes about this item.",
     )
+    client_event_id = graphene.String(
+        description=(
+            "Client-assigned ID of the scan that received the item. An item "
+            "with an ID already recorded on the receipt is skipped, so a batch "
+            "can be resent safely."
+        ),
+    )
 
 
 class ReceiptReceiveItemsBatch(BaseMutation):
@@ -36,6 +44,11 @@ class ReceiptReceiveItemsBatch(BaseMutation):
         Receipt,
         description="The updated receipt.",
     )
+    skipped_client_event_ids = graphene.List(
+        graphene.NonNull(graphene.String),
+        required=True,
+        description="Client event IDs of items skipped as already recorded.",
+    )
 
     class Arguments:
         receipt_id = graphene.ID(
@@ -45,7 +58,10 @@ class ReceiptReceiveItemsBatch(BaseMutation):
         items = graphene.List(
             graphene.NonNull(ReceiveItemInput),
             required=True,
-            description="List of items to receive.",
+            description=(
+                f"List of items to receive, in the order they were scanned, at "
+                f"most {MAX_ITEMS_PER_BATCH}."
+            ),
         )
 
     class Meta:
@@ -69,6 +85,15 @@ class ReceiptReceiveItemsBatch(BaseMutation):
                     )
                 }
             )
+        if len(items) > MAX_ITEMS_PER_BATCH:
+            raise ValidationError(
+                {
+                    "items": ValidationError(
+                        f"At most {MAX_ITEMS_PER_BATCH} items can be sent at once.",
+                        code=ReceiptErrorCode.INVALID.value,
+                    )
+                }
+            )
 
         # Get receipt
         _, receipt_pk = from_global_id_or_error(receipt_id, "Receipt")
@@ -84,17 +109,29 @@ class ReceiptReceiveItemsBatch(BaseMutation):
                 }
             ) from None
 
-        # Resolve all variants upfront
-        resolved_items = []
+        # Resolve all variants with one query
+        variant_pks = []
         for i, item in enumerate(items):
-            variant_id = item["variant_id"]
-            quantity = item["quantity"]
-            notes = item.get("notes", "")
-
-            _, variant_pk = from_global_id_or_error(variant_id, "ProductVariant")
+            variant_pk = cls.get_global_id_or_error(
+                item["variant_id"], "ProductVariant", field="items"
+            )
             try:
-                variant = ProductVariant.objects.get(pk=variant_pk)
-            except ProductVariant.DoesNotExist:
+                variant_pks.append(int(variant_pk))
+            except ValueError:
+                raise ValidationError(
+                    {
+                        "items": ValidationError(
+                            f"Invalid product variant ID at index {i}.",
+                            code=ReceiptErrorCode.INVALID.value,
+                        )
+                    }
+                ) from None
+        variants = ProductVariant.objects.in_bulk(variant_pks)
+
+        resolved_items = []
+        for i, (item, variant_pk) in enumerate(zip(items, variant_pks, strict=True)):
+            variant = variants.get(variant_pk)
+            if variant is None:
                 raise ValidationError(
                     {
                         "items": ValidationError(
@@ -102,9 +139,9 @@ class ReceiptReceiveItemsBatch(BaseMutation):
                             code=ReceiptErrorCode.NOT_FOUND.value,
                         )
                     }
-                ) from None
+                )
 
-            if quantity <= 0:
+            if item["quantity"] <= 0:
                 raise ValidationError(
                     {
                         "items": ValidationError(
@@ -114,19 +151,19 @@ class ReceiptReceiveItemsBatch(BaseMutation):
                     }
                 )
 
-            resolved_items.append((variant, quantity, notes))
+            resolved_items.append(
+                ReceiveItemData(
+                    product_variant=variant,
+                    quantity=item["quantity"],
+                    notes=item.get("notes") or "",
+                    client_event_id=item.get("client_event_id") or None,
+                )
+            )
 
-        # Execute all receive_item calls in a single transaction
         try:
-            with transaction.atomic():
-                for variant, quantity, notes in resolved_items:
-                    receive_item(
-                        receipt=receipt,
-                        product_variant=variant,
-                        quantity=quantity,
-                        user=info.context.user,
-                        notes=notes,
-                    )
+            _, skipped = receive_items_batch(
+                receipt=receipt, items=resolved_items, user=info.context.user
+            )
         except ReceiptNotInProgress as e:
             raise ValidationError(
                 {
@@ -148,4 +185,6 @@ class ReceiptReceiveItemsBatch(BaseMutation):
 
         # Refresh receipt to get updated lines
         receipt.refresh_from_db()
-        return ReceiptReceiveItemsBatch(receipt=receipt)
+        return ReceiptReceiveItemsBatch(
+            receipt=receipt, skipped_client_event_ids=skipped
+        )
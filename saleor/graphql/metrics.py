@@ -87,6 +87,58 @@ METRIC_REQUEST_DURATION = meter.create_metric(
     bucket_boundaries=DEFAULT_DURATION_BUCKETS,
 )
 
+METRIC_APP_TOKEN_CACHE_LOOKUP_COUNT = meter.create_metric(
+    "saleor.app_token.cache.lookup.count",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.REQUEST,
+    description="Number of app token verification cache lookups.",
+)
+
+METRIC_APP_TOKEN_VERIFICATION_DURATION = meter.create_metric(
+    "saleor.app_token.verification.duration",
+    scope=Scope.CORE,
+    type=MetricType.HISTOGRAM,
+    unit=Unit.SECOND,
+    description="Duration of hashing an app token to verify it.",
+    bucket_boundaries=DEFAULT_DURATION_BUCKETS,
+)
+
+METRIC_PERSISTED_QUERY_LOOKUP_COUNT = meter.create_metric(
+    "saleor.graphql.persisted_query.lookup.count",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.REQUEST,
+    description="Number of persisted query lookups.",
+)
+
+METRIC_PERSISTED_QUERY_COST_LOOKUP_COUNT = meter.create_metric(
+    "saleor.graphql.persisted_query.cost.lookup.count",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.REQUEST,
+    description="Number of lookups of computed persisted query costs.",
+)
+
+METRIC_RESPONSE_CACHE_LOOKUP_COUNT = meter.create_metric(
+    "saleor.graphql.response_cache.lookup.count",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.REQUEST,
+    description="Number of response cache lookups.",
+)
+
+METRIC_PREFETCH_BATCHES_SAVED = meter.create_metric(
+    "saleor.graphql.prefetch.batches_saved",
+    scope=Scope.CORE,
+    type=MetricType.UP_DOWN_COUNTER,
+    unit=Unit.BATCH,
+    description=(
+        "Number of dataloader batches saved by priming dataloaders, less queries "
+        "made to prime them."
+    ),
+)
+
 
 # Helper functions
 def record_graphql_query_count(
@@ -155,3 +207,47 @@ def record_request_count(
 def record_request_duration() -> AbstractContextManager[dict[str, AttributeValue]]:
     attributes: dict[str, AttributeValue] = {}
     return meter.record_duration(METRIC_REQUEST_DURATION, attributes=attributes)
+
+
+def record_app_token_cache_lookup(*, hit: bool) -> None:
+    attributes = {saleor_attributes.SALEOR_APP_TOKEN_CACHE_HIT: hit}
+    meter.record(
+        METRIC_APP_TOKEN_CACHE_LOOKUP_COUNT, 1, Unit.REQUEST, attributes=attributes
+    )
+
+
+def record_app_token_verification_duration(duration: float) -> None:
+    meter.record(METRIC_APP_TOKEN_VERIFICATION_DURATION, duration, Unit.SECOND)
+
+
+def record_persisted_query_lookup(*, hit: bool) -> None:
+    attributes = {saleor_attributes.GRAPHQL_PERSISTED_QUERY_CACHE_HIT: hit}
+    meter.record(
+        METRIC_PERSISTED_QUERY_LOOKUP_COUNT, 1, Unit.REQUEST, attributes=attributes
+    )
+
+
+def record_persisted_query_cost_lookup(*, hit: bool) -> None:
+    attributes = {saleor_attributes.GRAPHQL_PERSISTED_QUERY_CACHE_HIT: hit}
+    meter.record(
+        METRIC_PERSISTED_QUERY_COST_LOOKUP_COUNT,
+        1,
+        Unit.REQUEST,
+        attributes=attributes,
+    )
+
+
+def record_response_cache_lookup(*, hit: bool) -> None:
+    attributes = {saleor_attributes.GRAPHQL_RESPONSE_CACHE_HIT: hit}
+    meter.record(
+        METRIC_RESPONSE_CACHE_LOOKUP_COUNT, 1, Unit.REQUEST, attributes=attributes
+    )
+
+
+def record_prefetch_batches_saved(
+    batches_saved: int, *, operation_type: str | None = ""
+) -> None:
+    attributes = {graphql_attributes.GRAPHQL_OPERATION_TYPE: operation_type or ""}
+    meter.record(
+        METRIC_PREFETCH_BATCHES_SAVED, batches_saved, Unit.BATCH, attributes=attributes
+    )
@@ -0,0 +1,174 @@
+import graphene
+from django.core.exceptions import ValidationError
+
+from ....order.actions import PickScanData, apply_pick_scans
+from ....order.error_codes import OrderErrorCode
+from ....order.models import Pick as PickModel
+from ....permission.enums import OrderPermissions
+from ...core import ResolveInfo
+from ...core.doc_category import DOC_CATEGORY_ORDERS
+from ...core.mutations import BaseMutation
+from ...core.types import OrderError
+from ...core.utils import from_global_id_or_error
+from ..types import Pick
+
+MAX_SCANS_PER_BATCH = 1000
+
+
+class PickScanInput(graphene.InputObjectType):
+    client_event_id = graphene.String(
+        required=True,
+        description=(
+            "Client-assigned ID of the scan. A scan with an ID already recorded "
+            "on the pick is skipped."
+        ),
+    )
+    pick_item_id = graphene.ID(
+        required=True,
+        description="ID of the pick item to update.",
+    )
+    quantity_picked = graphene.Int(
+        required=True,
+        description="Quantity picked.",
+    )
+    notes = graphene.String(
+        description="Optional notes about picking this item.",
+    )
+
+
+class PickScanItems(BaseMutation):
+    """Apply a batch of scans to a pick, skipping scans already recorded."""
+
+    pick = graphene.Field(
+        Pick,
+        description="The updated pick.",
+    )
+    skipped_client_event_ids = graphene.List(
+        graphene.NonNull(graphene.String),
+        required=True,
+        description="Client event IDs of scans skipped as already recorded.",
+    )
+
+    class Arguments:
+        pick_id = graphene.ID(
+            required=True,
+            description="ID of the pick the scanned items belong to.",
+        )
+        scans = graphene.List(
+            graphene.NonNull(PickScanInput),
+            required=True,
+            description=(
+                f"Scans in the order they were made, at most {MAX_SCANS_PER_BATCH}."
+            ),
+        )
+
+    class Meta:
+        description = (
+            "Update quantities picked from a batch of scans in one transaction. "
+            "Scans are identified by client event ID, so a batch can be resent "
+            "safely."
+        )
+        permissions = (OrderPermissions.MANAGE_ORDERS,)
+        error_type_class = OrderError
+        error_type_field = "order_errors"
+        doc_category = DOC_CATEGORY_ORDERS
+
+    @classmethod
+    def perform_mutation(cls, root, info: ResolveInfo, /, **data):
+        pick_id = data["pick_id"]
+        scans = data["scans"]
+
+        if not scans:
+            raise ValidationError(
+                {
+                    "scans": ValidationError(
+                        "At least one scan is required.",
+                        code=OrderErrorCode.INVALID.value,
+                    )
+                }
+            )
+        if len(scans) > MAX_SCANS_PER_BATCH:
+            raise ValidationError(
+                {
+                    "scans": ValidationError(
+                        f"At most {MAX_SCANS_PER_BATCH} scans can be sent at once.",
+                        code=OrderErrorCode.INVALID.value,
+                    )
+                }
+            )
+
+        _, pick_pk = from_global_id_or_error(pick_id, "Pick")
+        try:
+            pick = PickModel.objects.get(pk=pick_pk)
+        except PickModel.DoesNotExist:
+            raise ValidationError(
+                {
+                    "pick_id": ValidationError(
+                        "Pick not found.",
+                        code=OrderErrorCode.NOT_FOUND.value,
+                    )
+                }
+            ) from None
+
+        resolved_scans = []
+        for i, scan in enumerate(scans):
+            pick_item_global_pk = cls.get_global_id_or_error(
+                scan["pick_item_id"], "PickItem", field="scans"
+            )
+            try:
+                pick_item_pk = int(pick_item_global_pk)
+            except ValueError:
+                raise ValidationError(
+                    {
+                        "scans": ValidationError(
+                            f"Invalid pick item ID at index {i}.",
+                            code=OrderErrorCode.INVALID.value,
+                        )
+                    }
+                ) from None
+
+            if not scan["client_event_id"]:
+                raise ValidationError(
+                    {
+                        "scans": ValidationError(
+                            f"Client event ID is required at index {i}.",
+                            code=OrderErrorCode.REQUIRED.value,
+                        )
+                    }
+                )
+
+            if scan["quantity_picked"] < 0:
+                raise ValidationError(
+                    {
+                        "scans": ValidationError(
+                            f"Quantity must be non-negative at index {i}.",
+                            code=OrderErrorCode.INVALID.value,
+                        )
+                    }
+                )
+
+            resolved_scans.append(
+                PickScanData(
+                    client_event_id=scan["client_event_id"],
+                    pick_item_id=pick_item_pk,
+                    quantity_picked=scan["quantity_picked"],
+                    notes=scan.get("notes") or "",
+                )
+            )
+
+        try:
+            skipped = apply_pick_scans(
+                pick=pick, scans=resolved_scans, user=info.context.user
+            )
+        except ValueError as e:
+            raise ValidationError(
+                {
+                    "scans": ValidationError(
+                        str(e),
+                        code=OrderErrorCode.INVALID.value,
+                    )
+                }
+            ) from e
+
+        pick.refresh_from_db()
+        return PickScanItems(pick=pick, skipped_client_event_ids=skipped)
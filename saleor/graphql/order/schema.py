@@ -78,6 +78,7 @@ from .mutations.order_update_shipping import OrderUpdateShipping
 from .mutations.order_update_shipping_cost import OrderUpdateShippingCost
 from .mutations.order_void import OrderVoid
 from .mutations.pick_complete import PickComplete
+from .mutations.pick_scan_items import PickScanItems
 from .mutations.pick_start import PickStart
 from .mutations.pick_update_item import PickUpdateItem
 from .queries.xero_bank_accounts import (
@@ -476,4 +477,5 @@ class OrderMutations(graphene.ObjectType):
 
     pick_start = PickStart.Field()
     pick_update_item = PickUpdateItem.Field()
+    pick_scan_items = PickScanItems.Field()
     pick_complete = PickComplete.Field()
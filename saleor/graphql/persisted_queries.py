@@ -0,0 +1,166 @@
+"""Automatic persisted queries.
+
+Clients can send the SHA-256 hash of a query in the persistedQuery request
+extension, as in the Apollo protocol, instead of the query text. A hash that
+is not known yet is answered with a PersistedQueryNotFound error, after which
+the client sends the query text along with the hash to register it.
+
+Query texts are kept in the shared cache, together with the cost of each
+query computed for every shape of variables it was sent with, so repeated
+operations skip both the transfer of the query and the cost computation.
+Parsing and validation are skipped by the document cache of the backend.
+"""
+
+import hashlib
+import json
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument, GraphQLSchema
+from graphql.error import GraphQLError
+
+from .. import __version__ as saleor_version
+from .core.validators.query_cost import (
+    QueryCostError,
+    cost_validator,
+    validate_query_cost,
+)
+from .metrics import record_persisted_query_cost_lookup, record_persisted_query_lookup
+from .query_cost_map import COST_MAP
+
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class PersistedQuery(NamedTuple):
+    query_hash: str
+    query: str
+    # Cost computed before for the shape of variables of the request
+    cost: int | None
+
+
+def get_persisted_query_hash(data) -> str | None:
+    """Return the query hash sent in the persistedQuery extension, if any."""
+    extensions = data.get("extensions") if isinstance(data, dict) else None
+    if not isinstance(extensions, dict) or "persistedQuery" not in extensions:
+        return None
+    if not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+        raise PersistedQueryNotSupported()
+
+    persisted_query = extensions["persistedQuery"]
+    if (
+        not isinstance(persisted_query, dict)
+        or persisted_query.get("version") != PERSISTED_QUERY_VERSION
+    ):
+        raise GraphQLError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not isinstance(query_hash, str) or not query_hash:
+        raise GraphQLError("Persisted query hash is required.")
+    return query_hash.lower()
+
+
+def load_persisted_query(
+    query_hash: str, query: str | None, variables: dict | None
+) -> PersistedQuery:
+    """Return the persisted query with the given hash.
+
+    When the query text is sent along with the hash, it is checked against
+    the hash and registered.
+    """
+    query_key = _query_cache_key(query_hash)
+    cost_key = _cost_cache_key(query_hash, variables)
+    cached = cache.get_many([query_key, cost_key])
+    stored_query = cached.get(query_key)
+    record_persisted_query_lookup(hit=stored_query is not None)
+
+    if query:
+        if not isinstance(query, str) or _hash_query(query) != query_hash:
+            raise GraphQLError("Provided sha256Hash does not match query.")
+        if stored_query is None:
+            cache.set(
+                query_key, query, timeout=settings.GRAPHQL_PERSISTED_QUERY_CACHE_TIMEOUT
+            )
+        stored_query = query
+    elif stored_query is None:
+        raise PersistedQueryNotFound()
+
+    return PersistedQuery(query_hash, stored_query, cached.get(cost_key))
+
+
+def validate_persisted_query_cost(
+    schema: GraphQLSchema,
+    persisted_query: PersistedQuery,
+    document: GraphQLDocument,
+    variables: dict | None,
+    fingerprint: str | None = None,
+):
+    """Return the cost of the query and its cost errors, like validate_query_cost.
+
+    The cost is computed once for each shape of variables and reused after.
+    """
+    maximum_cost = settings.GRAPHQL_QUERY_MAX_COMPLEXITY
+    record_persisted_query_cost_lookup(hit=persisted_query.cost is not None)
+    if persisted_query.cost is not None:
+        if persisted_query.cost <= maximum_cost:
+            return persisted_query.cost, None
+        validator = cost_validator(maximum_cost)
+        validator.cost = persisted_query.cost
+        return persisted_query.cost, [validator.get_cost_exceeded_error()]
+
+    query_cost, cost_errors = validate_query_cost(
+        schema, document, variables, COST_MAP, maximum_cost, fingerprint
+    )
+    # Other errors may come from invalid variables, which the shape hides
+    if all(isinstance(error, QueryCostError) for error in cost_errors or []):
+        cache.set(
+            _cost_cache_key(persisted_query.query_hash, variables),
+            query_cost,
+            timeout=settings.GRAPHQL_PERSISTED_QUERY_CACHE_TIMEOUT,
+        )
+    return query_cost, cost_errors
+
+
+def _hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _query_cache_key(query_hash: str) -> str:
+    return f"persisted-query-{query_hash}"
+
+
+def _cost_cache_key(query_hash: str, variables: dict | None) -> str:
+    shape = json.dumps(_variables_shape(variables), sort_keys=True, default=str)
+    shape_hash = hashlib.sha256(shape.encode("utf-8")).hexdigest()
+    # Costs depend on the cost map, which may change between versions
+    return f"persisted-query-cost-{saleor_version}-{query_hash}-{shape_hash}"
+
+
+def _variables_shape(value: Any) -> Any:
+    """Reduce variables to the values the query cost depends on.
+
+    Cost multipliers are taken from integer arguments and from lengths of
+    lists, so other values only keep their type.
+    """
+    if isinstance(value, dict):
+        return {key: _variables_shape(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return ["list", len(value)]
+    if value is None or isinstance(value, bool | int | float):
+        return value
+    if isinstance(value, str):
+        try:
+            int(value)
+        except ValueError:
+            return "str"
+        return value
+    return type(value).__name__
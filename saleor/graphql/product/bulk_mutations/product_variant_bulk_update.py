@@ -13,6 +13,7 @@ from ....permission.enums import ProductPermissions
 from ....product import models
 from ....product.error_codes import ProductErrorCode, ProductVariantBulkErrorCode
 from ....warehouse import models as warehouse_models
+from ....warehouse.availability_store import schedule_variant_availability_refresh
 from ....warehouse.management import delete_stocks, stock_bulk_update
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.utils import get_webhooks_for_event
@@ -755,6 +756,9 @@ class ProductVariantBulkUpdate(BaseMutation):
             warehouse_models.Stock.objects.bulk_create(
                 stocks_to_create, ignore_conflicts=True
             )
+        schedule_variant_availability_refresh(
+            stock.product_variant_id for stock in stocks_to_create
+        )
         if stocks_to_update:
             stock_bulk_update(stocks_to_update, ["quantity"])
 
@@ -55,7 +55,8 @@ class PriceListDeactivate(BaseMutation):
 
         if not data.get("force"):
             product_ids = list(
-                price_list.items.filter(is_valid=True, product_id__isnull=False)
+                price_list.current_items()
+                .filter(is_valid=True, product_id__isnull=False)
                 .values_list("product_id", flat=True)
                 .distinct()
             )
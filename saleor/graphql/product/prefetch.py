@@ -0,0 +1,258 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db.models import F
+
+from ...core.db.connection import allow_writer_in_context
+from ...permission.utils import has_one_of_permissions
+from ...product.models import (
+    ALL_PRODUCTS_PERMISSIONS,
+    ProductChannelListing,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ..core import ResolveInfo, SaleorContext
+from ..core.context import ChannelContext, get_database_connection_name
+from ..core.prefetch import (
+    get_connection_node_fields,
+    prime_loader,
+    record_prefetch_query,
+)
+from ..utils import get_user_or_app_from_context
+from .dataloaders import (
+    AvailableProductVariantsByProductIdAndChannel,
+    ProductByIdLoader,
+    ProductChannelListingByProductIdAndChannelSlugLoader,
+    ProductChannelListingByProductIdLoader,
+    ProductVariantByIdLoader,
+    ProductVariantsByProductIdAndChannel,
+    ProductVariantsByProductIdLoader,
+    VariantChannelListingByVariantIdAndChannelSlugLoader,
+    VariantsChannelListingByProductIdAndChannelSlugLoader,
+)
+
+# Fields of products whose resolvers load the product itself, e.g. to get its
+# product type
+PRODUCT_FIELDS = {
+    "assignedAttribute",
+    "assignedAttributes",
+    "attribute",
+    "attributes",
+    "pricing",
+}
+# Fields of products resolved from their listing in the channel
+CHANNEL_LISTING_FIELDS = {
+    "availableForPurchase",
+    "availableForPurchaseAt",
+    "isAvailable",
+    "isAvailableForPurchase",
+    "pricing",
+}
+# Fields of products resolved from listings of their variants in the channel
+VARIANT_CHANNEL_LISTING_FIELDS = {"isAvailable", "pricing", "variants"}
+
+
+def prefetch_products(info: ResolveInfo, connection, channel_slug: str | None):
+    """Prime dataloaders with data requested for products of the page.
+
+    Product and variant channel listings are loaded with one query for all
+    loaders keyed by them, and variants available in the channel are selected
+    from variant channel listings instead of another query.
+    """
+    if not settings.GRAPHQL_PREFETCH_ENABLED:
+        return
+    products = [
+        edge.node.node if isinstance(edge.node, ChannelContext) else edge.node
+        for edge in connection.edges
+    ]
+    fields = get_connection_node_fields(info)
+    if not products or not fields:
+        return
+
+    context = info.context
+    if fields & PRODUCT_FIELDS:
+        prime_loader(
+            ProductByIdLoader(context), ((product.id, product) for product in products)
+        )
+
+    product_ids = [product.id for product in products]
+    with allow_writer_in_context(context):
+        if "channelListings" in fields or (
+            channel_slug and fields & CHANNEL_LISTING_FIELDS
+        ):
+            _prefetch_product_channel_listings(
+                context,
+                product_ids,
+                channel_slug if fields & CHANNEL_LISTING_FIELDS else None,
+                all_channels="channelListings" in fields,
+            )
+
+        variant_channel_listings: list[ProductVariantChannelListing] = []
+        if channel_slug and fields & VARIANT_CHANNEL_LISTING_FIELDS:
+            variant_channel_listings = _prefetch_variant_channel_listings(
+                context, product_ids, channel_slug
+            )
+
+        if "variants" in fields or (channel_slug and "isAvailable" in fields):
+            _prefetch_variants(
+                context,
+                product_ids,
+                channel_slug,
+                variant_channel_listings,
+                prime_variant_channel_listings="variants" in fields,
+            )
+
+
+def _prefetch_product_channel_listings(
+    context: SaleorContext,
+    product_ids: list[int],
+    channel_slug: str | None,
+    all_channels: bool,
+):
+    listings = ProductChannelListing.objects.using(
+        get_database_connection_name(context)
+    ).filter(product_id__in=product_ids)
+    if all_channels:
+        listings = listings.annotate(channel_slug=F("channel__slug"))
+    else:
+        listings = listings.filter(channel__slug=channel_slug)
+    record_prefetch_query(context)
+    listings_list = list(listings.iterator(chunk_size=1000))
+
+    if all_channels:
+        listings_by_product_id = _group_by(listings_list, "product_id")
+        prime_loader(
+            ProductChannelListingByProductIdLoader(context),
+            (
+                (product_id, listings_by_product_id.get(product_id, []))
+                for product_id in product_ids
+            ),
+        )
+
+    if channel_slug:
+        listing_by_product_id = {
+            listing.product_id: listing
+            for listing in listings_list
+            if not all_channels or getattr(listing, "channel_slug") == channel_slug
+        }
+        prime_loader(
+            ProductChannelListingByProductIdAndChannelSlugLoader(context),
+            (
+                ((product_id, channel_slug), listing_by_product_id.get(product_id))
+                for product_id in product_ids
+            ),
+        )
+
+
+def _prefetch_variant_channel_listings(
+    context: SaleorContext, product_ids: list[int], channel_slug: str
+) -> list[ProductVariantChannelListing]:
+    # Listings without price are kept to select variants of staff users, and
+    # annotated like by the loaders of listings of single variants
+    listings = (
+        ProductVariantChannelListing.objects.using(
+            get_database_connection_name(context)
+        )
+        .filter(channel__slug=channel_slug, variant__product_id__in=product_ids)
+        .annotate_preorder_quantity_allocated()
+        .annotate(product_id=F("variant__product_id"))
+        .order_by("pk")
+    )
+    record_prefetch_query(context)
+    listings_list = list(listings.iterator(chunk_size=1000))
+
+    priced_listings_by_product_id = _group_by(
+        (listing for listing in listings_list if listing.price_amount is not None),
+        "product_id",
+    )
+    prime_loader(
+        VariantsChannelListingByProductIdAndChannelSlugLoader(context),
+        (
+            (
+                (product_id, channel_slug),
+                priced_listings_by_product_id.get(product_id, []),
+            )
+            for product_id in product_ids
+        ),
+    )
+    return listings_list
+
+
+def _prefetch_variants(
+    context: SaleorContext,
+    product_ids: list[int],
+    channel_slug: str | None,
+    variant_channel_listings: list[ProductVariantChannelListing],
+    prime_variant_channel_listings: bool,
+):
+    variants = ProductVariant.objects.using(
+        get_database_connection_name(context)
+    ).filter(product_id__in=product_ids)
+    record_prefetch_query(context)
+    variants_list = list(variants.iterator(chunk_size=1000))
+    prime_loader(
+        ProductVariantByIdLoader(context),
+        ((variant.id, variant) for variant in variants_list),
+    )
+
+    requestor = get_user_or_app_from_context(context)
+    has_required_permissions = has_one_of_permissions(
+        requestor, ALL_PRODUCTS_PERMISSIONS
+    )
+    if not channel_slug:
+        if has_required_permissions:
+            variants_by_product_id = _group_by(variants_list, "product_id")
+            prime_loader(
+                ProductVariantsByProductIdLoader(context),
+                (
+                    (product_id, variants_by_product_id.get(product_id, []))
+                    for product_id in product_ids
+                ),
+            )
+        return
+
+    listing_by_variant_id = {
+        listing.variant_id: listing for listing in variant_channel_listings
+    }
+    priced_listing_by_variant_id = {
+        variant_id: listing
+        for variant_id, listing in listing_by_variant_id.items()
+        if listing.price_amount is not None
+    }
+    if has_required_permissions:
+        loader = ProductVariantsByProductIdAndChannel(context)
+        listed_variant_ids = listing_by_variant_id.keys()
+    else:
+        loader = AvailableProductVariantsByProductIdAndChannel(context)
+        listed_variant_ids = priced_listing_by_variant_id.keys()
+    variants_by_product_id = _group_by(
+        (variant for variant in variants_list if variant.id in listed_variant_ids),
+        "product_id",
+    )
+    prime_loader(
+        loader,
+        (
+            ((product_id, channel_slug), variants_by_product_id.get(product_id, []))
+            for product_id in product_ids
+        ),
+    )
+
+    if prime_variant_channel_listings:
+        prime_loader(
+            VariantChannelListingByVariantIdAndChannelSlugLoader(context),
+            (
+                (
+                    (variant.id, channel_slug),
+                    priced_listing_by_variant_id.get(variant.id),
+                )
+                for variant in variants_list
+            ),
+        )
+
+
+def _group_by[T](items: Iterable[T], attname: str) -> dict[int, list[T]]:
+    grouped: defaultdict[int, list[T]] = defaultdict(list)
+    for item in items:
+        grouped[getattr(item, attname)].append(item)
+    return grouped
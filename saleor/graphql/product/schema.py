@@ -115,6 +115,7 @@ from .mutations.digital_contents import (
     DigitalContentUpdate,
     DigitalContentUrlCreate,
 )
+from .prefetch import prefetch_products
 from .resolvers import (
     resolve_categories,
     resolve_category_by_translated_slug,
@@ -389,7 +390,7 @@ class ProductQueries(graphene.ObjectType):
 
     @staticmethod
     def resolve_price_list(_root, info: ResolveInfo, *, id):
-        from django.db.models import Count, Q
+        from django.db.models import Count, F, Q
 
         from ...product.models import PriceList as PriceListModel
 
@@ -399,8 +400,15 @@ class ProductQueries(graphene.ObjectType):
             PriceListModel.objects.using(db)
             .select_related("replaced_by")
             .annotate(
-                _item_count=Count("items"),
-                _valid_item_count=Count("items", filter=Q(items__is_valid=True)),
+                _item_count=Count(
+                    "items", filter=Q(items__generation=F("items_generation"))
+                ),
+                _valid_item_count=Count(
+                    "items",
+                    filter=Q(
+                        items__generation=F("items_generation"), items__is_valid=True
+                    ),
+                ),
             )
             .filter(pk=pk)
             .first()
@@ -410,7 +418,7 @@ class ProductQueries(graphene.ObjectType):
     def resolve_price_lists(
         _root, info: ResolveInfo, *, status=None, warehouse_id=None, **kwargs
     ):
-        from django.db.models import Count, Q
+        from django.db.models import Count, F, Q
 
         from ...product.models import PriceList as PriceListModel
 
@@ -419,8 +427,15 @@ class ProductQueries(graphene.ObjectType):
             PriceListModel.objects.using(db)
             .select_related("replaced_by")
             .annotate(
-                _item_count=Count("items"),
-                _valid_item_count=Count("items", filter=Q(items__is_valid=True)),
+                _item_count=Count(
+                    "items", filter=Q(items__generation=F("items_generation"))
+                ),
+                _valid_item_count=Count(
+                    "items",
+                    filter=Q(
+                        items__generation=F("items_generation"), items__is_valid=True
+                    ),
+                ),
             )
         )
         if status:
@@ -613,7 +628,11 @@ class ProductQueries(graphene.ObjectType):
             qs = filter_connection_queryset(
                 qs, kwargs, allow_replica=info.context.allow_replica
             )
-            return create_connection_slice(qs, info, kwargs, ProductCountableConnection)
+            products = create_connection_slice(
+                qs, info, kwargs, ProductCountableConnection
+            )
+            prefetch_products(info, products, channel)
+            return products
 
         if channel:
             return (
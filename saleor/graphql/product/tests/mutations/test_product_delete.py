@@ -62,6 +62,7 @@ def test_delete_product(
 def test_delete_product_with_image(
     mocked_recalculate_orders_task,
     delete_from_storage_task_mock,
+    django_capture_on_commit_callbacks,
     staff_api_client,
     product_with_image,
     variant_with_image,
@@ -85,9 +86,10 @@ def test_delete_product_with_image(
     variables = {"id": node_id}
 
     # when
-    response = staff_api_client.post_graphql(
-        query, variables, permissions=[permission_manage_products]
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_graphql(
+            query, variables, permissions=[permission_manage_products]
+        )
 
     # then
     content = get_graphql_content(response)
@@ -13,6 +13,7 @@ def test_product_media_delete(
     delete_from_storage_task_mock,
     product_updated_mock,
     product_media_deleted_mock,
+    django_capture_on_commit_callbacks,
     staff_api_client,
     product_with_image,
     permission_manage_products,
@@ -35,9 +36,10 @@ def test_product_media_delete(
     variables = {"id": node_id}
 
     # when
-    response = staff_api_client.post_graphql(
-        query, variables, permissions=[permission_manage_products]
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_graphql(
+            query, variables, permissions=[permission_manage_products]
+        )
     content = get_graphql_content(response)
 
     # then
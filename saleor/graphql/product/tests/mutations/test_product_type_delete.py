@@ -38,6 +38,7 @@ def test_product_type_delete_mutation(
 @patch("saleor.product.signals.delete_from_storage_task.delay")
 def test_product_type_delete_mutation_deletes_also_images(
     delete_from_storage_task_mock,
+    django_capture_on_commit_callbacks,
     staff_api_client,
     product_type,
     product_with_image,
@@ -48,9 +49,12 @@ def test_product_type_delete_mutation_deletes_also_images(
     media_obj = product_with_image.media.first()
     media_path = media_obj.image.name
     variables = {"id": graphene.Node.to_global_id("ProductType", product_type.id)}
-    response = staff_api_client.post_graphql(
-        query, variables, permissions=[permission_manage_product_types_and_attributes]
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_graphql(
+            query,
+            variables,
+            permissions=[permission_manage_product_types_and_attributes],
+        )
     content = get_graphql_content(response)
     data = content["data"]["productTypeDelete"]
     assert data["productType"]["name"] == product_type.name
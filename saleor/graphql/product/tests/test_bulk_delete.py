@@ -582,6 +582,7 @@ def test_delete_products_invalid_object_typed_of_given_ids(
 def test_delete_products_with_images(
     mocked_recalculate_orders_task,
     delete_from_storage_task_mock,
+    django_capture_on_commit_callbacks,
     staff_api_client,
     product_list,
     image_list,
@@ -600,9 +601,10 @@ def test_delete_products_with_images(
             for product in product_list
         ]
     }
-    response = staff_api_client.post_graphql(
-        query, variables, permissions=[permission_manage_products]
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = staff_api_client.post_graphql(
+            query, variables, permissions=[permission_manage_products]
+        )
     content = get_graphql_content(response)
 
     assert content["data"]["productBulkDelete"]["count"] == 3
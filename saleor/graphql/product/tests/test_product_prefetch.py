@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCTS_WITH_VARIANTS = """
+    fragment ProductDetails on Product {
+        name
+        isAvailableForPurchase
+        pricing {
+            priceRange {
+                start {
+                    gross {
+                        amount
+                    }
+                }
+            }
+        }
+        variants {
+            name
+            pricing {
+                price {
+                    gross {
+                        amount
+                    }
+                }
+            }
+        }
+    }
+
+    query PrefetchedProducts($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    ...ProductDetails
+                }
+            }
+        }
+    }
+"""
+
+
+def _query_products(api_client, channel):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post_graphql(
+            QUERY_PRODUCTS_WITH_VARIANTS, {"channel": channel.slug}
+        )
+    return get_graphql_content(response)["data"], len(queries)
+
+
+def test_products_prefetch_doesnt_change_data(
+    api_client, product_list, channel_USD, settings
+):
+    # given
+    settings.GRAPHQL_PREFETCH_ENABLED = False
+    expected_data, queries_without_prefetch = _query_products(api_client, channel_USD)
+
+    # when
+    settings.GRAPHQL_PREFETCH_ENABLED = True
+    data, queries_with_prefetch = _query_products(api_client, channel_USD)
+
+    # then
+    assert data == expected_data
+    assert len(data["products"]["edges"]) == len(product_list)
+    assert queries_with_prefetch < queries_without_prefetch
+
+
+@patch("saleor.graphql.views.record_prefetch_batches_saved")
+def test_products_prefetch_records_batches_saved(
+    mocked_record_prefetch_batches_saved, api_client, product_list, channel_USD
+):
+    # when
+    _query_products(api_client, channel_USD)
+
+    # then
+    mocked_record_prefetch_batches_saved.assert_called_once()
+    batches_saved = mocked_record_prefetch_batches_saved.call_args.args[0]
+    assert batches_saved > 0
+
+
+@patch("saleor.graphql.views.record_prefetch_batches_saved")
+def test_products_prefetch_disabled(
+    mocked_record_prefetch_batches_saved,
+    api_client,
+    product_list,
+    channel_USD,
+    settings,
+):
+    # given
+    settings.GRAPHQL_PREFETCH_ENABLED = False
+
+    # when
+    _query_products(api_client, channel_USD)
+
+    # then
+    mocked_record_prefetch_batches_saved.assert_not_called()
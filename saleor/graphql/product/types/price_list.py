@@ -90,6 +90,16 @@ class PriceList(ModelObjectType[models.PriceList]):
         required=True,
         description="Whether an async task is currently running for this price list.",
     )
+    processed_rows = graphene.Int(
+        required=True,
+        description="Number of sheet rows written by the current or last processing run.",
+    )
+    total_rows = graphene.Int(
+        description=(
+            "Estimated number of sheet rows to process; exact once processing "
+            "has completed."
+        ),
+    )
     warehouse = graphene.Field(
         "saleor.graphql.warehouse.types.Warehouse",
         required=True,
@@ -151,7 +161,7 @@ class PriceList(ModelObjectType[models.PriceList]):
     @staticmethod
     def resolve_items(root: models.PriceList, info, **kwargs):
         db = get_database_connection_name(info.context)
-        qs = root.items.using(db).select_related("product").all()
+        qs = root.current_items().using(db).select_related("product")
         filter_input = kwargs.pop("filter", None)
         if filter_input and filter_input.get("is_valid") is not None:
             qs = qs.filter(is_valid=filter_input["is_valid"])
@@ -165,14 +175,14 @@ class PriceList(ModelObjectType[models.PriceList]):
         if hasattr(root, "_item_count"):
             return root._item_count
         db = get_database_connection_name(info.context)
-        return root.items.using(db).count()
+        return root.current_items().using(db).count()
 
     @staticmethod
     def resolve_valid_item_count(root: models.PriceList, info):
         if hasattr(root, "_valid_item_count"):
             return root._valid_item_count
         db = get_database_connection_name(info.context)
-        return root.items.using(db).filter(is_valid=True).count()
+        return root.current_items().using(db).filter(is_valid=True).count()
 
     @staticmethod
     def resolve_warehouse(root: models.PriceList, info):
@@ -12,6 +12,7 @@ from graphql import GraphQLError
 from ...core.tracing import traced_atomic_transaction
 from ...order import OrderStatus
 from ...order import models as order_models
+from ...warehouse.availability_store import schedule_variant_availability_refresh
 from ...warehouse.models import Stock
 from ..core.enums import ProductErrorCode
 from .sorters import ProductOrderField
@@ -95,6 +96,7 @@ def create_stocks(
     except IntegrityError as e:
         msg = "Stock for one of warehouses already exists for this product variant."
         raise ValidationError(msg) from e
+    schedule_variant_availability_refresh([variant.pk])
     return new_stocks
 
 
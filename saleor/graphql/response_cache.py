@@ -0,0 +1,223 @@
+"""Cache of full responses to anonymous storefront queries.
+
+Responses are cached for queries sent without an auth token whose root fields
+are all listed in GRAPHQL_RESPONSE_CACHE_ROOT_FIELDS. They are keyed by the
+document fingerprint, operation name and variables; the channel and language
+of a storefront query are arguments, so they are covered by the key.
+
+Each response is stored with tags of what it contains: models resolved while
+executing it, including every node of a list, and the lists of models it
+read. Writes invalidate tags through the plugin manager events (see
+ResponseCachePlugin), by storing the time of invalidation under the tag; list
+tags are invalidated only by events that can change which models a list
+holds, such as creating or deleting them. Stock, allocation and reservation
+writes, which send no such event, invalidate their variants and products once
+they commit (see schedule_variant_availability_refresh). A response is used
+only if none of its tags was invalidated after its execution started, so a
+response computed concurrently with a write is never served after the write.
+"""
+
+import hashlib
+import json
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from graphql import GraphQLDocument
+from graphql.execution import ExecutionResult
+from graphql.language.ast import Field, OperationDefinition
+from graphql.type import GraphQLList, GraphQLNonNull, get_named_type
+from promise import is_thenable
+
+from .. import __version__ as saleor_version
+from ..core.auth import get_token_from_request
+from ..product.models import Product, ProductVariant
+from .core import ResolveInfo
+from .core.context import ChannelContext
+
+# Tag of every response, for writes that can change any of them
+ALL_RESPONSES_TAG = "all"
+
+
+def entity_tag(model: type[Model], pk: Any) -> str:
+    return f"{model._meta.label_lower}:{pk}"
+
+
+def list_tag(model: type[Model]) -> str:
+    return f"{model._meta.label_lower}:list"
+
+
+def invalidate_response_cache(tags: Iterable[str]) -> None:
+    """Mark responses with any of the tags as stale."""
+    now = time.time()
+    cache.set_many(
+        {_tag_cache_key(tag): now for tag in set(tags)},
+        timeout=_get_tag_timeout(),
+    )
+
+
+def invalidate_variant_responses(
+    variant_ids: Iterable[int], using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """Mark responses with the variants or their products as stale.
+
+    Called for stock, allocation and reservation writes, which change the
+    availability of variants without sending a plugin event. Lists are tagged
+    with the products they contain, so only lists holding these products are
+    invalidated; one filtered by availability picks up a product that starts
+    to match when its cached response expires.
+    """
+    if not settings.GRAPHQL_RESPONSE_CACHE_ENABLED:
+        return
+    variant_ids = set(variant_ids)
+    product_ids = set(
+        ProductVariant.objects.using(using)
+        .filter(pk__in=variant_ids)
+        .values_list("product_id", flat=True)
+    )
+    invalidate_response_cache(
+        [
+            *(entity_tag(ProductVariant, pk) for pk in variant_ids),
+            *(entity_tag(Product, pk) for pk in product_ids),
+        ]
+    )
+
+
+def is_response_cacheable(request, document: GraphQLDocument, operation_name) -> bool:
+    if not settings.GRAPHQL_RESPONSE_CACHE_ENABLED:
+        return False
+    if get_token_from_request(request):
+        return False
+    if document.get_operation_type(operation_name) != "query":
+        return False
+
+    root_fields = get_root_field_names(document, operation_name)
+    return bool(root_fields) and root_fields.issubset(
+        settings.GRAPHQL_RESPONSE_CACHE_ROOT_FIELDS
+    )
+
+
+def get_root_field_names(
+    document: GraphQLDocument, operation_name: str | None
+) -> set[str] | None:
+    """Return names of root fields of the operation, or None if not only fields."""
+    names = set()
+    for definition in document.document_ast.definitions:
+        if not isinstance(definition, OperationDefinition):
+            continue
+        if operation_name and (
+            not definition.name or definition.name.value != operation_name
+        ):
+            continue
+        for selection in definition.selection_set.selections:
+            if not isinstance(selection, Field):
+                return None
+            names.add(selection.name.value)
+    return names
+
+
+def get_response_cache_key(
+    fingerprint: str, operation_name: str | None, variables: dict | None
+) -> str:
+    request_data = json.dumps(
+        [operation_name, variables], sort_keys=True, default=str
+    ).encode("utf-8")
+    request_hash = hashlib.sha256(request_data).hexdigest()
+    return f"response-cache-{saleor_version}-{fingerprint}-{request_hash}"
+
+
+def get_cached_response(key: str) -> ExecutionResult | None:
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    response, tags, started_at = entry
+    invalidated_at = cache.get_many([_tag_cache_key(tag) for tag in tags])
+    # A missing tag may have been evicted after an invalidation
+    if len(invalidated_at) < len(tags) or any(
+        timestamp >= started_at for timestamp in invalidated_at.values()
+    ):
+        return None
+    return response
+
+
+def set_cached_response(
+    key: str, response: ExecutionResult, tags: set[str], started_at: float
+) -> None:
+    tags = tags | {ALL_RESPONSES_TAG}
+    tag_keys = [_tag_cache_key(tag) for tag in tags]
+    invalidated_at = cache.get_many(tag_keys)
+    for tag_key in tag_keys:
+        if tag_key not in invalidated_at:
+            cache.add(tag_key, 0, timeout=_get_tag_timeout())
+    if any(timestamp >= started_at for timestamp in invalidated_at.values()):
+        return
+    cache.set(
+        key,
+        (response, sorted(tags), started_at),
+        timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT,
+    )
+
+
+class ResponseCacheTagMiddleware:
+    """Collect tags of models resolved while executing a query."""
+
+    def __init__(self):
+        self.tags: set[str] = set()
+        self.list_models: dict[tuple[str, str], type[Model] | None] = {}
+
+    def resolve(self, next_, root, info: ResolveInfo, **kwargs):
+        field_key = (info.parent_type.name, info.field_name)
+        if field_key not in self.list_models:
+            self.list_models[field_key] = _get_list_model(info)
+        if model := self.list_models[field_key]:
+            self.tags.add(list_tag(model))
+
+        result = next_(root, info, **kwargs)
+        if is_thenable(result):
+            return result.then(self.tag_value)
+        return self.tag_value(result)
+
+    def tag_value(self, value):
+        if isinstance(value, list | tuple):
+            for item in value:
+                self.tag_value(item)
+            return value
+        node = value.node if isinstance(value, ChannelContext) else value
+        if isinstance(node, Model):
+            self.tags.add(entity_tag(type(node), node.pk))
+        return value
+
+
+def _get_list_model(info: ResolveInfo) -> type[Model] | None:
+    """Return the model of a field returning many of them, or of a root field.
+
+    Adding or removing a model changes such fields without changing any of the
+    models resolved in them.
+    """
+    return_type = info.return_type
+    if isinstance(return_type, GraphQLNonNull):
+        return_type = return_type.of_type
+    graphene_type = getattr(get_named_type(return_type), "graphene_type", None)
+    meta = getattr(graphene_type, "_meta", None)
+    # Connections keep the type of their nodes in meta
+    node_type = getattr(meta, "node", None)
+    returns_many = isinstance(return_type, GraphQLList) or node_type is not None
+    if not returns_many and info.parent_type is not info.schema.get_query_type():
+        return None
+    if node_type is not None:
+        meta = getattr(node_type, "_meta", None)
+    return getattr(meta, "model", None)
+
+
+def _tag_cache_key(tag: str) -> str:
+    return f"response-cache-tag-{tag}"
+
+
+def _get_tag_timeout() -> int:
+    # Tags outlive the responses stored with them. A tag that expired anyway
+    # counts as invalidated, so it only costs a cache miss.
+    return 2 * settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
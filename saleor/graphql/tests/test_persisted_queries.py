@@ -0,0 +1,177 @@
+import hashlib
+from unittest.mock import patch
+
+import graphene
+import pytest
+from django.core.cache import cache
+
+from ..persisted_queries import _cost_cache_key, _query_cache_key, _variables_shape
+from .utils import get_graphql_content, get_graphql_content_from_response
+
+QUERY_CATEGORY = """
+    query PersistedCategory($id: ID!) {
+        category(id: $id) {
+            name
+        }
+    }
+"""
+
+QUERY_CATEGORIES = """
+    query PersistedCategories($first: Int) {
+        categories(first: $first) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+def _hash(query):
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_persisted_query_not_found(api_client):
+    # when
+    response = api_client.post({"extensions": _extensions(_hash(QUERY_CATEGORY))})
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_sent_by_hash(api_client, category):
+    # given
+    query_hash = _hash(QUERY_CATEGORY)
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    response = api_client.post(
+        {
+            "query": QUERY_CATEGORY,
+            "variables": variables,
+            "extensions": _extensions(query_hash),
+        }
+    )
+    get_graphql_content(response)
+
+    # when
+    response = api_client.post(
+        {"variables": variables, "extensions": _extensions(query_hash)}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["category"]["name"] == category.name
+    assert cache.get(_query_cache_key(query_hash)) == QUERY_CATEGORY
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    # when
+    response = api_client.post(
+        {"query": QUERY_CATEGORY, "extensions": _extensions(_hash(QUERY_CATEGORIES))}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match query."
+    )
+    assert cache.get(_query_cache_key(_hash(QUERY_CATEGORIES))) is None
+
+
+def test_persisted_query_unsupported_version(api_client):
+    # when
+    response = api_client.post(
+        {
+            "query": QUERY_CATEGORY,
+            "extensions": {
+                "persistedQuery": {"version": 2, "sha256Hash": _hash(QUERY_CATEGORY)}
+            },
+        }
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Unsupported persisted query version."
+
+
+def test_persisted_queries_disabled(api_client, settings):
+    # given
+    settings.GRAPHQL_PERSISTED_QUERIES_ENABLED = False
+
+    # when
+    response = api_client.post({"extensions": _extensions(_hash(QUERY_CATEGORY))})
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+@patch("saleor.graphql.persisted_queries.validate_query_cost")
+def test_persisted_query_cost_computed_once_per_variables_shape(
+    mocked_validate_query_cost, api_client
+):
+    # given
+    mocked_validate_query_cost.return_value = (10, None)
+    query_hash = _hash(QUERY_CATEGORIES)
+    api_client.post(
+        {
+            "query": QUERY_CATEGORIES,
+            "variables": {"first": 10},
+            "extensions": _extensions(query_hash),
+        }
+    )
+
+    # when
+    response = api_client.post(
+        {"variables": {"first": 10}, "extensions": _extensions(query_hash)}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"]["requestedQueryCost"] == 10
+    mocked_validate_query_cost.assert_called_once()
+    assert cache.get(_cost_cache_key(query_hash, {"first": 10})) == 10
+    assert cache.get(_cost_cache_key(query_hash, {"first": 20})) is None
+
+
+def test_persisted_query_cached_cost_over_maximum(api_client, settings):
+    # given
+    settings.GRAPHQL_QUERY_MAX_COMPLEXITY = 5
+    query_hash = _hash(QUERY_CATEGORIES)
+    cache.set(_query_cache_key(query_hash), QUERY_CATEGORIES)
+    cache.set(_cost_cache_key(query_hash, {"first": 10}), 10)
+
+    # when
+    response = api_client.post(
+        {"variables": {"first": 10}, "extensions": _extensions(query_hash)}
+    )
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["extensions"]["cost"] == {
+        "requestedQueryCost": 10,
+        "maximumAvailable": 5,
+    }
+
+
+def test_variables_shape_keeps_values_cost_depends_on():
+    # when
+    shape = _variables_shape(
+        {"first": 10, "channel": "default", "ids": ["a", "b"], "last": "5"}
+    )
+
+    # then
+    assert shape == {"first": 10, "channel": "str", "ids": ["list", 2], "last": "5"}
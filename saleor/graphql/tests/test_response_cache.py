@@ -0,0 +1,163 @@
+from unittest.mock import patch
+
+import graphene
+import pytest
+from django.core.cache import cache
+
+from ...product.models import Category, Product
+from ..response_cache import entity_tag, invalidate_response_cache, list_tag
+from .utils import get_graphql_content
+
+QUERY_CATEGORY = """
+    query ResponseCacheCategory($id: ID!) {
+        category(id: $id) {
+            name
+        }
+    }
+"""
+
+QUERY_PRODUCTS = """
+    query ResponseCacheProducts($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+QUERY_SHOP = """
+    query ResponseCacheShop {
+        shop {
+            name
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def response_cache_enabled(settings):
+    settings.GRAPHQL_RESPONSE_CACHE_ENABLED = True
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _query_category(client, category):
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    response = client.post_graphql(QUERY_CATEGORY, variables)
+    return get_graphql_content(response)["data"]["category"]["name"]
+
+
+def test_response_cached_for_anonymous_query(api_client, category):
+    # given
+    _query_category(api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="Changed")
+
+    # when
+    name = _query_category(api_client, category)
+
+    # then
+    assert name == category.name
+
+
+def test_response_cache_invalidated_by_entity_tag(api_client, category):
+    # given
+    _query_category(api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="Changed")
+
+    # when
+    invalidate_response_cache([entity_tag(Category, category.pk)])
+    name = _query_category(api_client, category)
+
+    # then
+    assert name == "Changed"
+
+
+def test_response_cache_invalidated_by_list_tag(api_client, category):
+    # given
+    _query_category(api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="Changed")
+
+    # when
+    invalidate_response_cache([list_tag(Category)])
+    name = _query_category(api_client, category)
+
+    # then
+    assert name == "Changed"
+
+
+def test_list_response_invalidated_by_tag_of_contained_product(
+    api_client, product_list, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+    api_client.post_graphql(QUERY_PRODUCTS, variables)
+    product = product_list[0]
+    Product.objects.filter(pk=product.pk).update(name="Changed")
+
+    def query_names():
+        content = get_graphql_content(
+            api_client.post_graphql(QUERY_PRODUCTS, variables)
+        )
+        return {edge["node"]["name"] for edge in content["data"]["products"]["edges"]}
+
+    # when
+    invalidate_response_cache([entity_tag(Product, 0)])
+    names_after_other_product = query_names()
+    invalidate_response_cache([entity_tag(Product, product.pk)])
+    names_after_product = query_names()
+
+    # then
+    assert product.name in names_after_other_product
+    assert "Changed" in names_after_product
+
+
+@patch("saleor.graphql.response_cache.cache")
+def test_response_cache_tags_expire(mocked_cache, settings):
+    # when
+    invalidate_response_cache(["tag"])
+
+    # then
+    timeout = mocked_cache.set_many.call_args.kwargs["timeout"]
+    assert timeout is not None
+    assert timeout >= settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+
+
+def test_response_cache_disabled(api_client, category, settings):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_ENABLED = False
+    _query_category(api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="Changed")
+
+    # when
+    name = _query_category(api_client, category)
+
+    # then
+    assert name == "Changed"
+
+
+def test_response_not_cached_for_authenticated_query(user_api_client, category):
+    # given
+    _query_category(user_api_client, category)
+    Category.objects.filter(pk=category.pk).update(name="Changed")
+
+    # when
+    name = _query_category(user_api_client, category)
+
+    # then
+    assert name == "Changed"
+
+
+@patch("saleor.graphql.views.set_cached_response")
+def test_response_not_cached_for_root_field_not_allowed(
+    mocked_set_cached_response, api_client, site_settings
+):
+    # when
+    content = get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    # then
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    mocked_set_cached_response.assert_not_called()
@@ -1,6 +1,7 @@
 import hashlib
 import importlib
 import json
+import time
 from inspect import isclass
 from typing import Any
 from urllib.parse import urljoin
@@ -33,16 +34,31 @@ from ..core.telemetry import Scope, SpanKind, saleor_attributes, tracer
 from ..webhook import observability
 from .api import API_PATH, schema
 from .context import clear_context, get_context_value
+from .core.prefetch import pop_prefetch_stats
 from .core.validators.query_cost import validate_query_cost
 from .error import clear_errors
 from .metrics import (
     record_graphql_query_cost,
     record_graphql_query_count,
     record_graphql_query_duration,
+    record_prefetch_batches_saved,
     record_request_count,
     record_request_duration,
+    record_response_cache_lookup,
+)
+from .persisted_queries import (
+    get_persisted_query_hash,
+    load_persisted_query,
+    validate_persisted_query_cost,
 )
 from .query_cost_map import COST_MAP, QUERY_COST_FAILED_OPERATION
+from .response_cache import (
+    ResponseCacheTagMiddleware,
+    get_cached_response,
+    get_response_cache_key,
+    is_response_cacheable,
+    set_cached_response,
+)
 from .utils import (
     format_error,
     get_source_service_name_value,
@@ -278,7 +294,15 @@ class GraphQLView(View):
             span.set_attribute(saleor_attributes.COMPONENT, "graphql")
 
             query, variables, operation_name = self.get_graphql_params(request, data)
-            document, error = self.parse_query(query)
+            persisted_query = None
+            try:
+                if query_hash := get_persisted_query_hash(data):
+                    persisted_query = load_persisted_query(query_hash, query, variables)
+                    query = persisted_query.query
+            except GraphQLError as e:
+                document, error = None, ExecutionResult(errors=[e], invalid=True)
+            else:
+                document, error = self.parse_query(query)
 
             with observability.report_gql_operation() as operation:
                 operation.query = document
@@ -354,13 +378,23 @@ class GraphQLView(View):
                     saleor_attributes.SALEOR_SOURCE_SERVICE_NAME, source_service_name
                 )
 
-            query_cost, cost_errors = validate_query_cost(
-                schema,
-                document,
-                variables,
-                COST_MAP,
-                settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
-            )
+            if persisted_query:
+                query_cost, cost_errors = validate_persisted_query_cost(
+                    schema,
+                    persisted_query,
+                    document,
+                    variables,
+                    operation_fingerprint,
+                )
+            else:
+                query_cost, cost_errors = validate_query_cost(
+                    schema,
+                    document,
+                    variables,
+                    COST_MAP,
+                    settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
+                    operation_fingerprint,
+                )
             span.set_attribute(saleor_attributes.GRAPHQL_OPERATION_COST, query_cost)
 
             if settings.GRAPHQL_QUERY_MAX_COMPLEXITY and cost_errors:
@@ -401,13 +435,29 @@ class GraphQLView(View):
                     key = generate_cache_key(raw_query_string)
                     response = cache.get(key)
 
+                should_use_response_cache = (
+                    not query_contains_schema
+                    and is_response_cacheable(request, document, operation_name)
+                )
+                if should_use_response_cache:
+                    response_cache_key = get_response_cache_key(
+                        operation_fingerprint, operation_name, variables
+                    )
+                    response = get_cached_response(response_cache_key)
+                    record_response_cache_lookup(hit=response is not None)
+
                 if not response:
+                    middleware = self.middleware
+                    if should_use_response_cache:
+                        tag_middleware = ResponseCacheTagMiddleware()
+                        middleware = [*(self.middleware or []), tag_middleware]
+                        execution_started_at = time.time()
                     response = document.execute(
                         root=self.get_root_value(),
                         variables=variables,
                         operation_name=operation_name,
                         context=context,
-                        middleware=self.middleware,
+                        middleware=middleware,
                         **extra_options,
                     )
                     if response.errors:
@@ -419,6 +469,13 @@ class GraphQLView(View):
 
                     if should_use_cache_for_scheme:
                         cache.set(key, response)
+                    if should_use_response_cache and not response.errors:
+                        set_cached_response(
+                            response_cache_key,
+                            response,
+                            tag_middleware.tags,
+                            execution_started_at,
+                        )
 
                 record_graphql_query_count(
                     operation_type=operation_type,
@@ -453,6 +510,18 @@ class GraphQLView(View):
                 query_duration_attrs[error_attributes.ERROR_TYPE] = error_type
                 return ExecutionResult(errors=[e], invalid=True)
             finally:
+                if prefetch_stats := pop_prefetch_stats(context):
+                    span.set_attribute(
+                        saleor_attributes.GRAPHQL_PREFETCH_QUERY_COUNT,
+                        prefetch_stats.query_count,
+                    )
+                    span.set_attribute(
+                        saleor_attributes.GRAPHQL_PREFETCH_BATCHES_SAVED,
+                        prefetch_stats.batches_saved,
+                    )
+                    record_prefetch_batches_saved(
+                        prefetch_stats.batches_saved, operation_type=operation_type
+                    )
                 clear_context(context)
 
     @staticmethod
@@ -7,6 +7,7 @@ from django.db.models import F, Q
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions
 from ....warehouse import models
+from ....warehouse.availability_store import schedule_variant_availability_refresh
 from ....warehouse.error_codes import StockBulkUpdateErrorCode
 from ....warehouse.lock_objects import stock_qs_select_for_update
 from ....webhook.event_types import WebhookEventAsyncType
@@ -283,8 +284,8 @@ class StockBulkUpdate(BaseMutation):
     def _get_stock(
         cls, warehouse_selector, variant_selector, warehouse_value, variant_value
     ):
-        return (
-            lambda stock: str(getattr(stock, warehouse_selector)) == warehouse_value
+        return lambda stock: (
+            str(getattr(stock, warehouse_selector)) == warehouse_value
             and str(getattr(stock, variant_selector)) == variant_value
         )
 
@@ -400,6 +401,9 @@ class StockBulkUpdate(BaseMutation):
 
         # Stocks are locked in `get_stocks`
         models.Stock.objects.bulk_update(stocks_to_update, fields=["quantity"])
+        schedule_variant_availability_refresh(
+            stock.product_variant_id for stock in stocks_to_update
+        )
 
         return stocks_to_update
 
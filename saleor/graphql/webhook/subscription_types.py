@@ -1771,6 +1771,29 @@ class XeroCheckPrepaymentStatus(SubscriptionObjectType):
         return data["prepayment_id"]
 
 
+class XeroCheckPrepaymentStatuses(SubscriptionObjectType):
+    prepayment_ids = NonNullList(
+        graphene.String,
+        description="The Xero prepayment IDs to check.",
+        required=True,
+    )
+
+    class Meta:
+        root_type = None
+        enable_dry_run = False
+        interfaces = (Event,)
+        description = (
+            "Sync event to check whether multiple Xero prepayments have been paid. "
+            "The app should return the status of each prepayment in one response."
+        )
+        doc_category = DOC_CATEGORY_ORDERS
+
+    @staticmethod
+    def resolve_prepayment_ids(root, _info: ResolveInfo):
+        _, data = root
+        return data["prepayment_ids"]
+
+
 class UserBase(AbstractType):
     user = graphene.Field(
         "saleor.graphql.account.types.User",
@@ -3453,6 +3476,7 @@ ASYNC_WEBHOOK_TYPES_MAP = {
     WebhookEventSyncType.XERO_FULFILLMENT_CREATED: XeroFulfillmentCreated,
     WebhookEventSyncType.XERO_FULFILLMENT_APPROVED: XeroFulfillmentApproved,
     WebhookEventSyncType.XERO_CHECK_PREPAYMENT_STATUS: XeroCheckPrepaymentStatus,
+    WebhookEventSyncType.XERO_CHECK_PREPAYMENT_STATUSES: XeroCheckPrepaymentStatuses,
     WebhookEventAsyncType.CUSTOMER_CREATED: CustomerCreated,
     WebhookEventAsyncType.CUSTOMER_UPDATED: CustomerUpdated,
     WebhookEventAsyncType.CUSTOMER_METADATA_UPDATED: CustomerMetadataUpdated,
@@ -184,7 +184,32 @@ def adjustment_created_event(
 
     Records when an adjustment is created (before processing).
     """
-    return PurchaseOrderEvent.objects.create(
+    event = _prepare_adjustment_created_event(adjustment, user, app)
+    event.save()
+    return event
+
+
+def adjustment_created_events(
+    *,
+    adjustments: list[PurchaseOrderItemAdjustment],
+    user: User | None = None,
+    app: App | None = None,
+) -> list[PurchaseOrderEvent]:
+    """Log creation of many inventory adjustments with a single insert."""
+    return PurchaseOrderEvent.objects.bulk_create(
+        [
+            _prepare_adjustment_created_event(adjustment, user, app)
+            for adjustment in adjustments
+        ]
+    )
+
+
+def _prepare_adjustment_created_event(
+    adjustment: PurchaseOrderItemAdjustment,
+    user: User | None,
+    app: App | None,
+) -> PurchaseOrderEvent:
+    return PurchaseOrderEvent(
         type=PurchaseOrderEvents.ADJUSTMENT_CREATED,
         purchase_order=adjustment.purchase_order_item.order,
         purchase_order_item=adjustment.purchase_order_item,
@@ -210,7 +235,32 @@ def adjustment_processed_event(
 
     Records when an adjustment is processed and stock/allocations updated.
     """
-    return PurchaseOrderEvent.objects.create(
+    event = _prepare_adjustment_processed_event(adjustment, user, app)
+    event.save()
+    return event
+
+
+def adjustment_processed_events(
+    *,
+    adjustments: list[PurchaseOrderItemAdjustment],
+    user: User | None = None,
+    app: App | None = None,
+) -> list[PurchaseOrderEvent]:
+    """Log processing of many inventory adjustments with a single insert."""
+    return PurchaseOrderEvent.objects.bulk_create(
+        [
+            _prepare_adjustment_processed_event(adjustment, user, app)
+            for adjustment in adjustments
+        ]
+    )
+
+
+def _prepare_adjustment_processed_event(
+    adjustment: PurchaseOrderItemAdjustment,
+    user: User | None,
+    app: App | None,
+) -> PurchaseOrderEvent:
+    return PurchaseOrderEvent(
         type=PurchaseOrderEvents.ADJUSTMENT_PROCESSED,
         purchase_order=adjustment.purchase_order_item.order,
         purchase_order_item=adjustment.purchase_order_item,
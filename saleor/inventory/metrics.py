@@ -0,0 +1,33 @@
+from contextlib import AbstractContextManager
+
+from opentelemetry.util.types import AttributeValue
+
+from ..core.telemetry import (
+    DEFAULT_DURATION_BUCKETS,
+    MetricType,
+    Scope,
+    Unit,
+    meter,
+    saleor_attributes,
+)
+
+# Initialize metrics
+METRIC_RECEIPT_COMPLETION_PHASE_DURATION = meter.create_metric(
+    "saleor.inventory.receipt_completion.phase.duration",
+    scope=Scope.CORE,
+    type=MetricType.HISTOGRAM,
+    unit=Unit.SECOND,
+    description="Duration of each phase of completing a receipt.",
+    bucket_boundaries=DEFAULT_DURATION_BUCKETS,
+)
+
+
+def record_receipt_completion_phase(
+    phase: str,
+) -> AbstractContextManager[dict[str, AttributeValue]]:
+    attributes: dict[str, AttributeValue] = {
+        saleor_attributes.SALEOR_RECEIPT_COMPLETION_PHASE: phase
+    }
+    return meter.record_duration(
+        METRIC_RECEIPT_COMPLETION_PHASE_DURATION, attributes=attributes
+    )
@@ -0,0 +1,55 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def populate_quantity_available(apps, schema_editor):
+    PurchaseOrderItem = apps.get_model("inventory", "PurchaseOrderItem")
+    PurchaseOrderItemAdjustment = apps.get_model(
+        "inventory", "PurchaseOrderItemAdjustment"
+    )
+    processed_adjustments = (
+        PurchaseOrderItemAdjustment.objects.filter(
+            purchase_order_item=OuterRef("pk"), processed_at__isnull=False
+        )
+        .order_by()
+        .values("purchase_order_item")
+        .annotate(total=Sum("quantity_change"))
+        .values("total")
+    )
+    PurchaseOrderItem.objects.update(
+        quantity_available=Greatest(
+            F("quantity_ordered")
+            + Coalesce(Subquery(processed_adjustments), Value(0))
+            - F("quantity_allocated")
+            - F("quantity_fulfilled"),
+            Value(0),
+            output_field=models.IntegerField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0013_alter_purchaseorderitem_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="purchaseorderitem",
+            name="quantity_available",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            populate_quantity_available, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorderitem",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                condition=models.Q(("quantity_available__gt", 0)),
+                fields=["product_variant"],
+                name="poi_variant_available_idx",
+            ),
+        ),
+    ]
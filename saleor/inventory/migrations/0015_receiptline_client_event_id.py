@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0014_purchaseorderitem_quantity_available"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receiptline",
+            name="client_event_id",
+            field=models.CharField(
+                blank=True,
+                help_text=(
+                    "ID the scanning client assigned to the scan creating this line"
+                ),
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="receiptline",
+            unique_together={("receipt", "client_event_id")},
+        ),
+    ]
@@ -3,7 +3,7 @@ from decimal import Decimal
 from django.conf import settings
 from django.contrib.postgres.indexes import BTreeIndex
 from django.db import models
-from django.db.models import F, Q, Sum, Value
+from django.db.models import F, OuterRef, Q, Subquery, Sum, Value
 from django.db.models.fields import IntegerField
 from django.db.models.functions import Coalesce, Greatest
 from django.utils.timezone import now
@@ -121,36 +121,54 @@ class PurchaseOrderRequestedAllocation(models.Model):
         unique_together = [["purchase_order", "allocation"]]
 
 
+def available_quantity_expression():
+    """Return the available quantity of a POI computed from its source fields.
+
+    Calculates: quantity_ordered + processed_adjustments - quantity_allocated - quantity_fulfilled
+
+    A subquery rather than a join, so it can be used in UPDATE statements and
+    alongside select_for_update().
+    """
+    processed_adjustments = (
+        PurchaseOrderItemAdjustment.objects.filter(
+            purchase_order_item=OuterRef("pk"), processed_at__isnull=False
+        )
+        .order_by()
+        .values("purchase_order_item")
+        .annotate(total=Sum("quantity_change"))
+        .values("total")
+    )
+    return Greatest(
+        F("quantity_ordered")
+        + Coalesce(Subquery(processed_adjustments), Value(0))
+        - F("quantity_allocated")
+        - F("quantity_fulfilled"),
+        Value(0),
+        output_field=IntegerField(),
+    )
+
+
 class PurchaseOrderItemQuerySet(models.QuerySet):
     def annotate_available_quantity(self):
-        """Annotate available_quantity in a single query.
+        """Annotate available_quantity from the stored quantity_available."""
+        return self.annotate(_available_quantity=F("quantity_available"))
 
-        Calculates: quantity_ordered + processed_adjustments - quantity_allocated - quantity_fulfilled
+    def refresh_available_quantity(self) -> int:
+        """Recompute the stored quantity_available of the POIs in one UPDATE.
 
-        This eliminates N+1 queries when accessing available_quantity in loops.
+        Call after writes that change quantity_ordered, quantity_allocated or
+        quantity_fulfilled in bulk, or that process adjustments.
         """
-        return self.annotate(
-            processed_adjustments=Coalesce(
-                Sum(
-                    "adjustments__quantity_change",
-                    filter=Q(adjustments__processed_at__isnull=False),
-                ),
-                Value(0),
-                output_field=IntegerField(),
-            ),
-            _available_quantity=Greatest(
-                F("quantity_ordered")
-                + F("processed_adjustments")
-                - F("quantity_allocated")
-                - F("quantity_fulfilled"),
-                Value(0),
-                output_field=IntegerField(),
-            ),
-        )
+        return self.update(quantity_available=available_quantity_expression())
 
 
 PurchaseOrderItemManager = models.Manager.from_queryset(PurchaseOrderItemQuerySet)
 
+# Fields quantity_available is computed from
+AVAILABLE_QUANTITY_FIELDS = frozenset(
+    ["quantity_ordered", "quantity_allocated", "quantity_fulfilled"]
+)
+
 
 class PurchaseOrderItem(models.Model):
     """A variant + quantity on a PurchaseOrder. Like the invoice line item.
@@ -177,36 +195,32 @@ class PurchaseOrderItem(models.Model):
     # Tracks how much of this batch has been fulfilled (shipped out)
     # via FulfillmentSource
     quantity_fulfilled = models.PositiveIntegerField(default=0)
+    # Denormalized available_quantity, so FIFO lookups can filter and lock on
+    # it. Kept up to date by save() and refresh_available_quantity()
+    quantity_available = models.PositiveIntegerField(default=0)
 
     objects = PurchaseOrderItemManager()
 
+    class Meta:
+        indexes = [
+            BTreeIndex(
+                fields=["product_variant"],
+                name="poi_variant_available_idx",
+                condition=Q(quantity_available__gt=0),
+            ),
+        ]
+
     @property
     def available_quantity(self):
         """Amount available for allocation.
 
         Calculates: quantity_ordered + processed_adjustments - quantity_allocated - quantity_fulfilled
 
-        Uses annotated value if available (from annotate_available_quantity()),
-        otherwise queries database. Only processed adjustments (processed_at is set)
-        are included in the calculation. This allows adjustments to be created but
-        not applied until explicitly processed.
+        Read from the stored quantity_available. Only processed adjustments
+        (processed_at is set) are included in the calculation. This allows
+        adjustments to be created but not applied until explicitly processed.
         """
-        # Check if we have the annotated value from annotate_available_quantity()
-        if hasattr(self, "_available_quantity"):
-            return self._available_quantity
-
-        # Fallback to query (for single-object access without annotation)
-        from django.db.models import Sum
-
-        processed_adjustments = (
-            self.adjustments.filter(processed_at__isnull=False).aggregate(
-                total=Sum("quantity_change")
-            )["total"]
-            or 0
-        )
-
-        base = self.quantity_ordered + processed_adjustments
-        return max(0, base - self.quantity_allocated - self.quantity_fulfilled)
+        return self.quantity_available
 
     @property
     def quantity_received(self):
@@ -325,6 +339,12 @@ class PurchaseOrderItem(models.Model):
         if self.shipment_id:
             self.clean()
         super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not AVAILABLE_QUANTITY_FIELDS.isdisjoint(
+            update_fields
+        ):
+            type(self).objects.filter(pk=self.pk).refresh_available_quantity()
+            self.refresh_from_db(fields=["quantity_available"])
 
 
 class PurchaseOrderItemAdjustment(models.Model):
@@ -422,6 +442,17 @@ class PurchaseOrderItemAdjustment(models.Model):
             models.Index(fields=["affects_payable", "-created_at"]),
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if self.processed_at is not None and (
+            update_fields is None
+            or not {"processed_at", "quantity_change"}.isdisjoint(update_fields)
+        ):
+            PurchaseOrderItem.objects.filter(
+                pk=self.purchase_order_item_id
+            ).refresh_available_quantity()
+
     def __str__(self):
         direction = "loss" if self.quantity_change < 0 else "gain"
         return (
@@ -538,12 +569,21 @@ class ReceiptLine(models.Model):
         blank=True, help_text="Notes about this specific line (damage, etc.)"
     )
 
+    # Set for lines created from batched scans, so a resent scan is skipped
+    client_event_id = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="ID the scanning client assigned to the scan creating this line",
+    )
+
     class Meta:
         ordering = ["received_at"]
         indexes = [
             models.Index(fields=["receipt", "purchase_order_item"]),
             models.Index(fields=["received_at"]),
         ]
+        unique_together = [["receipt", "client_event_id"]]
 
     def __str__(self):
         return (
@@ -2,21 +2,24 @@
 
 import logging
 from collections import defaultdict
+from typing import NamedTuple
 
 from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
 from saleor.order.models import Order, OrderLine
-from saleor.product.models import ProductVariant
+from saleor.product.models import Product, ProductVariant
 
 from ..warehouse.models import Allocation, AllocationSource, Stock, Warehouse
 from . import PurchaseOrderItemStatus
-from .events import adjustment_created_event, adjustment_processed_event
+from .events import adjustment_created_events, adjustment_processed_events
 from .exceptions import (
     CannotReallocateVariants,
     ReceiptLineNotInProgress,
     ReceiptNotInProgress,
 )
+from .metrics import record_receipt_completion_phase
 from .models import (
     PurchaseOrderItem,
     PurchaseOrderItemAdjustment,
@@ -110,6 +113,111 @@ def receive_item(receipt, product_variant, quantity, user=None, notes=""):
     return receipt_line
 
 
+class ReceiveItemData(NamedTuple):
+    product_variant: ProductVariant
+    quantity: int
+    notes: str = ""
+    client_event_id: str | None = None
+
+
+@transaction.atomic
+def receive_items_batch(receipt, items, user=None):
+    """Record a batch of received items on a receipt in one transaction.
+
+    Each item creates a ReceiptLine as receive_item would, in order, with the
+    POIs filled FIFO across the whole batch. Items with a client event ID
+    that already has a line on the receipt, or is repeated earlier in the
+    batch, are skipped, so a client can resend a batch safely.
+
+    Args:
+        receipt: Receipt being received
+        items: ReceiveItemData in the order they were received
+        user: User who received the items
+
+    Returns:
+        Tuple of the created ReceiptLines and client event IDs of the
+        skipped items
+
+    Raises:
+        ReceiptNotInProgress: If the receipt is not in progress
+        ValueError: If a quantity is not positive or a variant is not in the
+            shipment. No line is created then.
+
+    """
+    from django.db.models import Sum
+    from django.db.models.functions import Coalesce
+
+    from . import ReceiptStatus
+    from .models import Receipt
+
+    # Batches for the same receipt are recorded one at a time
+    receipt = Receipt.objects.select_for_update().get(pk=receipt.pk)
+    if receipt.status != ReceiptStatus.IN_PROGRESS:
+        raise ReceiptNotInProgress(receipt)
+
+    seen = set(
+        ReceiptLine.objects.filter(
+            receipt=receipt,
+            client_event_id__in=[
+                item.client_event_id for item in items if item.client_event_id
+            ],
+        ).values_list("client_event_id", flat=True)
+    )
+
+    pois_by_variant: dict[int, list[PurchaseOrderItem]] = defaultdict(list)
+    received: dict[int, int] = {}
+    pois = (
+        PurchaseOrderItem.objects.filter(
+            shipment_id=receipt.shipment_id,
+            product_variant_id__in={item.product_variant.pk for item in items},
+        )
+        .annotate(total_received=Coalesce(Sum("receipt_lines__quantity_received"), 0))
+        .order_by("pk")
+    )
+    for poi in pois:
+        pois_by_variant[poi.product_variant_id].append(poi)
+        received[poi.pk] = poi.total_received
+
+    skipped = []
+    receipt_lines = []
+    for item in items:
+        if item.client_event_id:
+            if item.client_event_id in seen:
+                skipped.append(item.client_event_id)
+                continue
+            seen.add(item.client_event_id)
+
+        if item.quantity <= 0:
+            raise ValueError(f"Quantity must be positive, got {item.quantity}")
+        candidates = pois_by_variant.get(item.product_variant.pk)
+        if not candidates:
+            raise ValueError(
+                f"Product variant {item.product_variant.sku} not found in "
+                f"shipment {receipt.shipment_id}"
+            )
+
+        # FIFO: fill POIs in order, picking the first with remaining capacity
+        poi = next(
+            (c for c in candidates if received[c.pk] < c.quantity_ordered),
+            candidates[0],
+        )
+        received[poi.pk] += item.quantity
+        receipt_lines.append(
+            ReceiptLine(
+                receipt=receipt,
+                purchase_order_item=poi,
+                quantity_received=item.quantity,
+                received_by=user,
+                notes=item.notes,
+                client_event_id=item.client_event_id or None,
+            )
+        )
+
+    ReceiptLine.objects.bulk_create(receipt_lines)
+
+    return receipt_lines, skipped
+
+
 @transaction.atomic
 def update_receipt_lines(receipt, lines_data, user=None):
     """Upsert receipt lines by purchase order item.
@@ -152,119 +260,14 @@ def update_receipt_lines(receipt, lines_data, user=None):
     return receipt
 
 
-def _remove_allocation_source(
-    ass: AllocationSource,
-    *,
-    allocation: "Allocation | None" = None,
-    stock: Stock | None = None,
-    poi: "PurchaseOrderItem | None" = None,
-) -> None:
-    """Delete an AllocationSource and update all dependent quantities.
-
-    Updates: AllocationSource (deleted), Allocation (deleted if qty hits 0),
-    Stock.quantity_allocated, POI.quantity_allocated.
-
-    OrderLine quantities are NOT touched here — callers that need OrderLine
-    sync should use the net-change approach after all removes/adds are done.
-
-    Pass pre-locked ``allocation``, ``stock``, and ``poi`` when calling inside
-    a batch that touches multiple AllocationSources sharing the same row.
-    Without this, FK cache objects are stale and concurrent saves overwrite
-    each other's decrements.
-    """
-    qty = ass.quantity
-    allocation = allocation or ass.allocation
-    stock = stock or allocation.stock
-    poi = poi or ass.purchase_order_item
-
-    logger.debug(
-        "remove_alloc_source: AS %s qty=%d | alloc %s (%d -> %d) | "
-        "stock %s variant=%s (%d -> %d) | poi %s (%d -> %d)",
-        ass.pk,
-        qty,
-        allocation.pk,
-        allocation.quantity_allocated,
-        allocation.quantity_allocated - qty,
-        stock.pk,
-        stock.product_variant_id,
-        stock.quantity_allocated,
-        stock.quantity_allocated - qty,
-        poi.pk,
-        poi.quantity_allocated,
-        poi.quantity_allocated - qty,
-    )
-
-    ass.delete()
-
-    allocation.quantity_allocated -= qty
-    if allocation.quantity_allocated == 0:
-        logger.debug("remove_alloc_source: deleting empty allocation %s", allocation.pk)
-        allocation.delete()
-    else:
-        allocation.save(update_fields=["quantity_allocated"])
+class _ReallocationPlan(NamedTuple):
+    """Arguments of _apply_reallocation for one product, computed in memory."""
 
-    stock.quantity_allocated -= qty
-    stock.save(update_fields=["quantity_allocated"])
-
-    poi.quantity_allocated -= qty
-    poi.save(update_fields=["quantity_allocated"])
-
-
-def _add_allocation_source(
-    poi: PurchaseOrderItem,
-    order_line: "OrderLine",
-    stock: Stock,
-    quantity: int,
-) -> AllocationSource:
-    """Create an AllocationSource and update all dependent quantities.
-
-    Updates: Allocation (created or incremented), Stock.quantity_allocated,
-    POI.quantity_allocated, AllocationSource (created).
-
-    OrderLine quantities are NOT touched here — callers that need OrderLine
-    sync should use the net-change approach after all removes/adds are done.
-    """
-    allocation, created = Allocation.objects.get_or_create(
-        order_line=order_line,
-        stock=stock,
-        defaults={"quantity_allocated": 0},
-    )
-
-    logger.debug(
-        "add_alloc_source: poi %s order_line %s (order %s) variant=%s qty=%d | "
-        "alloc %s %s (%d -> %d) | stock %s (%d -> %d) | poi (%d -> %d)",
-        poi.pk,
-        order_line.pk,
-        order_line.order_id,
-        stock.product_variant_id,
-        quantity,
-        allocation.pk,
-        "NEW" if created else "EXISTING",
-        allocation.quantity_allocated,
-        allocation.quantity_allocated + quantity,
-        stock.pk,
-        stock.quantity_allocated,
-        stock.quantity_allocated + quantity,
-        poi.quantity_allocated,
-        poi.quantity_allocated + quantity,
-    )
-
-    allocation.quantity_allocated += quantity
-    allocation.save(update_fields=["quantity_allocated"])
-
-    stock.quantity_allocated += quantity
-    stock.save(update_fields=["quantity_allocated"])
-
-    poi.quantity_allocated += quantity
-    poi.save(update_fields=["quantity_allocated"])
-
-    ass = AllocationSource.objects.create(
-        purchase_order_item=poi,
-        allocation=allocation,
-        quantity=quantity,
-    )
-    logger.debug("add_alloc_source: created AS %s", ass.pk)
-    return ass
+    removals: list[AllocationSource]
+    distribution: dict[tuple[Order, ProductVariant], int]
+    poi_by_variant: dict[ProductVariant, list[PurchaseOrderItem]]
+    received_by_poi: dict[PurchaseOrderItem, int]
+    warehouse: Warehouse
 
 
 def _apply_reallocation(
@@ -280,6 +283,11 @@ def _apply_reallocation(
     manual POIA substitute resolution. The caller computes what the new
     distribution should be; this function applies it.
 
+    Every affected row is locked once, in primary key order, and the changes
+    are computed on the locked instances and written with bulk queries, so
+    the number of queries does not grow with the size of the distribution.
+    Removals and distribution may span several products.
+
     Args:
         removals: AllocationSources to delete (the "old world").
         distribution: {(order, variant): qty} — the desired end state.
@@ -291,7 +299,8 @@ def _apply_reallocation(
 
     """
     from ..core.utils.apportionment import hamilton
-    from ..order.models import Order
+    from ..warehouse.availability_store import schedule_variant_availability_refresh
+    from ..warehouse.reconciliation import mark_stocks_for_reconciliation
 
     if not removals and not distribution:
         logger.debug(
@@ -329,18 +338,19 @@ def _apply_reallocation(
     # Additionally, when AllocationSources are loaded with select_related,
     # multiple removals sharing the same Stock/POI get separate Python
     # objects with stale caches — the locked maps below are the single
-    # source of truth.
+    # source of truth. Rows are locked in primary key order so concurrent
+    # reallocations wait on each other instead of deadlocking.
 
     variant_ids = set()
     order_ids = set()
     poi_ids = set()
-    alloc_ids = set()
+    line_ids = set()
 
     for a in removals:
         variant_ids.add(a.purchase_order_item.product_variant_id)
         order_ids.add(a.allocation.order_line.order_id)
         poi_ids.add(a.purchase_order_item_id)
-        alloc_ids.add(a.allocation_id)
+        line_ids.add(a.allocation.order_line_id)
     for order, variant in distribution:
         variant_ids.add(variant.pk)
         order_ids.add(order.pk)
@@ -351,34 +361,56 @@ def _apply_reallocation(
     # Lock Stock rows
     stock_map = {
         s.product_variant_id: s
-        for s in Stock.objects.select_for_update().filter(
-            warehouse=warehouse,
-            product_variant_id__in=variant_ids,
-        )
+        for s in Stock.objects.select_for_update()
+        .filter(warehouse=warehouse, product_variant_id__in=variant_ids)
+        .order_by("pk")
     }
     # Create Stock for new variants (substitution targets)
-    for _order, variant in distribution:
-        if variant.pk not in stock_map:
-            stock_map[variant.pk], _ = Stock.objects.get_or_create(
-                warehouse=warehouse,
-                product_variant=variant,
-                defaults={"quantity": 0, "quantity_allocated": 0},
+    missing_stock_variant_ids = {
+        variant.pk for _order, variant in distribution if variant.pk not in stock_map
+    }
+    if missing_stock_variant_ids:
+        Stock.objects.bulk_create(
+            [
+                Stock(
+                    warehouse=warehouse,
+                    product_variant_id=variant_id,
+                    quantity=0,
+                    quantity_allocated=0,
+                )
+                for variant_id in missing_stock_variant_ids
+            ],
+            ignore_conflicts=True,
+        )
+        stock_map.update(
+            (s.product_variant_id, s)
+            for s in Stock.objects.select_for_update()
+            .filter(
+                warehouse=warehouse, product_variant_id__in=missing_stock_variant_ids
             )
+            .order_by("pk")
+        )
 
     # Lock Orders whose OrderLines we'll modify
     if order_ids:
-        list(Order.objects.select_for_update().filter(pk__in=order_ids))
+        list(Order.objects.select_for_update().filter(pk__in=order_ids).order_by("pk"))
 
-    # Lock Allocations — multiple ASes can share the same Allocation row
-    # and their FK cache objects hold stale quantity_allocated values
-    alloc_map = {
-        a.pk: a for a in Allocation.objects.select_for_update().filter(pk__in=alloc_ids)
-    }
+    # Lock Allocations of every affected line — multiple ASes can share the
+    # same Allocation row, and re-adding to a line reuses its Allocation
+    allocations = list(
+        Allocation.objects.select_for_update()
+        .filter(order_line_id__in=line_ids)
+        .order_by("pk")
+    )
+    alloc_map = {a.pk: a for a in allocations}
+    alloc_by_line_stock = {(a.order_line_id, a.stock_id): a for a in allocations}
 
     # Lock POIs — fresh instances avoid stale FK cache from select_related
     poi_map = {
         p.pk: p
-        for p in PurchaseOrderItem.objects.select_for_update().filter(pk__in=poi_ids)
+        for p in PurchaseOrderItem.objects.select_for_update()
+        .filter(pk__in=poi_ids)
+        .order_by("pk")
     }
 
     # Replace POI references with locked versions
@@ -390,27 +422,41 @@ def _apply_reallocation(
     for poi, qty in received_by_poi.items():
         locked_received_by_poi[poi_map.get(poi.pk, poi)] = qty
 
-    # Derive current state from removals so callers don't have to pass it
+    # Derive current state from removals so callers don't have to pass it.
+    # New lines copy prices from a line of the same product in the order.
     order_line_by_order_variant: dict[tuple, OrderLine] = {}
-    price_template: dict = {}
+    price_template: dict[tuple, OrderLine] = {}
     for a in removals:
         order = a.allocation.order_line.order
         variant = a.purchase_order_item.product_variant
         order_line_by_order_variant[(order, variant)] = a.allocation.order_line
-        price_template[order] = a.allocation.order_line
+        price_template[(order, variant.product_id)] = a.allocation.order_line
+
+    changed_allocations: dict[int, Allocation] = {}
+    changed_stocks: dict[int, Stock] = {}
+    changed_pois: dict[int, PurchaseOrderItem] = {}
 
     # --- delete old world ---
     logger.debug(
         "apply_reallocation: tearing down %d allocation sources", len(removals)
     )
     for a in removals:
-        _remove_allocation_source(
-            a,
-            allocation=alloc_map.get(a.allocation_id),
-            stock=stock_map.get(a.purchase_order_item.product_variant_id),
-            poi=poi_map.get(a.purchase_order_item_id),
-        )
-
+        allocation = alloc_map[a.allocation_id]
+        stock = stock_map.get(a.purchase_order_item.product_variant_id)
+        stock = stock or allocation.stock
+        poi = poi_map[a.purchase_order_item_id]
+
+        allocation.quantity_allocated -= a.quantity
+        stock.quantity_allocated -= a.quantity
+        poi.quantity_allocated -= a.quantity
+        changed_allocations[allocation.pk] = allocation
+        changed_stocks[stock.pk] = stock
+        changed_pois[poi.pk] = poi
+
+    AllocationSource.objects.filter(pk__in=[a.pk for a in removals]).delete()
+
+    lines_to_delete: list[OrderLine] = []
+    lines_to_update: list[OrderLine] = []
     for (order, variant), line in order_line_by_order_variant.items():
         new_qty = distribution.get((order, variant), 0)
         if new_qty == 0:
@@ -420,7 +466,7 @@ def _apply_reallocation(
                 order.pk,
                 variant.sku,
             )
-            line.delete()
+            lines_to_delete.append(line)
         else:
             logger.debug(
                 "apply_reallocation: updating order_line %s qty %d -> %d "
@@ -434,13 +480,16 @@ def _apply_reallocation(
             line.quantity = new_qty
             line.total_price_net_amount = line.unit_price_net_amount * new_qty
             line.total_price_gross_amount = line.unit_price_gross_amount * new_qty
-            line.save(
-                update_fields=[
-                    "quantity",
-                    "total_price_net_amount",
-                    "total_price_gross_amount",
-                ]
-            )
+            lines_to_update.append(line)
+
+    # Allocations of deleted lines go with them
+    deleted_line_ids = {line.pk for line in lines_to_delete}
+    if deleted_line_ids:
+        OrderLine.objects.filter(pk__in=deleted_line_ids).delete()
+    OrderLine.objects.bulk_update(
+        lines_to_update,
+        ["quantity", "total_price_net_amount", "total_price_gross_amount"],
+    )
 
     # --- rebuild new world from distribution ---
     logger.debug(
@@ -451,10 +500,11 @@ def _apply_reallocation(
         if distribution.get((order, variant), 0) > 0:
             order_line_map[(order, variant)] = line
 
+    new_lines = []
     for (order, variant), qty in distribution.items():
         if (order, variant) not in order_line_map:
-            template = price_template[order]
-            order_line_map[(order, variant)] = OrderLine.objects.create(
+            template = price_template[(order, variant.product_id)]
+            order_line_map[(order, variant)] = OrderLine(
                 order=order,
                 variant=variant,
                 product_name=variant.product.name,
@@ -473,19 +523,52 @@ def _apply_reallocation(
                 is_shipping_required=template.is_shipping_required,
                 is_gift_card=template.is_gift_card,
             )
+            new_lines.append(order_line_map[(order, variant)])
+    OrderLine.objects.bulk_create(new_lines)
 
+    new_sources = []
     for (order, variant), qty in distribution.items():
         order_line = order_line_map[(order, variant)]
         stock = stock_map[variant.pk]
         pois = locked_poi_by_variant[variant]
         if len(pois) == 1:
-            _add_allocation_source(pois[0], order_line, stock, qty)
+            poi_dist = {pois[0]: qty}
         else:
             poi_weights = {poi: locked_received_by_poi[poi] for poi in pois}
             poi_dist = hamilton(poi_weights, qty)
-            for poi, poi_qty in poi_dist.items():
-                if poi_qty > 0:
-                    _add_allocation_source(poi, order_line, stock, poi_qty)
+
+        allocation = alloc_by_line_stock.get((order_line.pk, stock.pk))
+        if allocation is None:
+            allocation = Allocation(
+                order_line=order_line, stock=stock, quantity_allocated=0
+            )
+            alloc_by_line_stock[(order_line.pk, stock.pk)] = allocation
+        for poi, poi_qty in poi_dist.items():
+            if poi_qty <= 0:
+                continue
+            logger.debug(
+                "apply_reallocation: adding source poi %s order_line %s "
+                "(order %s) variant=%s qty=%d",
+                poi.pk,
+                order_line.pk,
+                order.pk,
+                variant.pk,
+                poi_qty,
+            )
+            allocation.quantity_allocated += poi_qty
+            stock.quantity_allocated += poi_qty
+            poi.quantity_allocated += poi_qty
+            if allocation.pk:
+                changed_allocations[allocation.pk] = allocation
+            changed_stocks[stock.pk] = stock
+            changed_pois[poi.pk] = poi
+            new_sources.append(
+                AllocationSource(
+                    purchase_order_item=poi,
+                    allocation=allocation,
+                    quantity=poi_qty,
+                )
+            )
 
     # --- adjust Stock.quantity to reflect actual received quantities ---
     # When variants are swapped (e.g. ordered 6×S+4×M, received 4×S+6×M),
@@ -515,19 +598,50 @@ def _apply_reallocation(
                 delta,
             )
             stock.quantity += delta
-            stock.save(update_fields=["quantity"])
+            changed_stocks[stock.pk] = stock
 
+    # --- write ---
+    emptied_allocation_ids = [
+        a.pk
+        for a in changed_allocations.values()
+        if a.quantity_allocated == 0 and a.order_line_id not in deleted_line_ids
+    ]
+    if emptied_allocation_ids:
+        logger.debug(
+            "apply_reallocation: deleting empty allocations %s", emptied_allocation_ids
+        )
+        Allocation.objects.filter(pk__in=emptied_allocation_ids).delete()
+    Allocation.objects.bulk_update(
+        [
+            a
+            for a in changed_allocations.values()
+            if a.quantity_allocated != 0 and a.order_line_id not in deleted_line_ids
+        ],
+        ["quantity_allocated"],
+    )
+    Allocation.objects.bulk_create(
+        [a for a in alloc_by_line_stock.values() if a.pk is None]
+    )
+    AllocationSource.objects.bulk_create(new_sources)
+    Stock.objects.bulk_update(
+        changed_stocks.values(), ["quantity", "quantity_allocated"]
+    )
+    PurchaseOrderItem.objects.bulk_update(changed_pois.values(), ["quantity_allocated"])
+    PurchaseOrderItem.objects.filter(pk__in=changed_pois).refresh_available_quantity()
 
-@transaction.atomic
-def _variant_reallocate(
+    schedule_variant_availability_refresh(
+        {stock.product_variant_id for stock in changed_stocks.values()}
+    )
+    mark_stocks_for_reconciliation(changed_stocks)
+
+
+def _plan_variant_reallocation(
     rs: list[ReceiptLine],
     ass: list[AllocationSource],
-) -> bool:
-    """Reallocate variants of some product across unfulfilled order lines using Hamilton's method.
+) -> _ReallocationPlan | None:
+    """Compute the Hamilton redistribution of some product's received variants.
 
-    Computes a new distribution and delegates to _apply_reallocation.
-
-    Returns True if reallocation was performed, False if skipped (no-op).
+    Returns None when received quantities match the allocations (no-op).
 
     Raises:
         CannotReallocateVariants: if received < order entitlement at product level
@@ -537,7 +651,7 @@ def _variant_reallocate(
 
     if not ass:
         logger.debug("variant_reallocate: no allocation sources, nothing to do")
-        return False
+        return None
 
     logger.debug(
         "variant_reallocate: %d receipt lines, %d allocation sources",
@@ -582,7 +696,7 @@ def _variant_reallocate(
 
     if not mismatched:
         logger.debug("variant_reallocate: no mismatches, nothing to do")
-        return False
+        return None
 
     mismatched_ass = [
         a for a in ass if a.purchase_order_item.product_variant in mismatched
@@ -638,22 +752,12 @@ def _variant_reallocate(
                 distribution[(order, variant)] = qty
                 remaining_quota[order] -= qty
 
-    warehouse = ass[0].allocation.stock.warehouse
-
     logger.debug(
         "variant_reallocate: final distribution=%s remaining_quota=%s",
         {(o.pk, v.sku): q for (o, v), q in distribution.items()},
         {o.pk: q for o, q in remaining_quota.items()},
     )
 
-    _apply_reallocation(
-        removals=mismatched_ass,
-        distribution=distribution,
-        poi_by_variant=poi_by_variant,
-        received_by_poi=received_by_poi,
-        warehouse=warehouse,
-    )
-
     total_distributed = sum(distribution.values())
     if total_order_entitlement != total_distributed:
         raise CannotReallocateVariants(
@@ -670,6 +774,34 @@ def _variant_reallocate(
                 f"{expected_total}, got {order_distributed.get(order, 0)}"
             )
 
+    return _ReallocationPlan(
+        removals=mismatched_ass,
+        distribution=distribution,
+        poi_by_variant=poi_by_variant,
+        received_by_poi=received_by_poi,
+        warehouse=ass[0].allocation.stock.warehouse,
+    )
+
+
+@transaction.atomic
+def _variant_reallocate(
+    rs: list[ReceiptLine],
+    ass: list[AllocationSource],
+) -> bool:
+    """Reallocate variants of some product across unfulfilled order lines using Hamilton's method.
+
+    Computes a new distribution and delegates to _apply_reallocation.
+
+    Returns True if reallocation was performed, False if skipped (no-op).
+
+    Raises:
+        CannotReallocateVariants: if received < order entitlement at product level
+
+    """
+    plan = _plan_variant_reallocation(rs, ass)
+    if plan is None:
+        return False
+    _apply_reallocation(**plan._asdict())
     return True
 
 
@@ -681,6 +813,11 @@ def complete_receipt(receipt, user=None, manager=None):
     Falls back to creating POIAs when reallocation fails (shortage, reallocation
     not allowed, etc).
 
+    Works on the whole shipment at once: its rows are locked up front,
+    reallocations of all products are planned in memory and applied together,
+    and statuses and adjustments are written in bulk. The duration of each
+    phase is recorded in the receipt completion metric.
+
     Returns:
         dict with summary: {
             'receipt': Receipt,
@@ -701,202 +838,272 @@ def complete_receipt(receipt, user=None, manager=None):
     )
     from .models import PurchaseOrder, PurchaseOrderItemAdjustment
 
-    receipt = type(receipt).objects.select_for_update().get(pk=receipt.pk)
-    if receipt.status != ReceiptStatus.IN_PROGRESS:
-        raise ReceiptNotInProgress(receipt)
-
-    shipment = receipt.shipment
-    logger.debug(
-        "complete_receipt: receipt=%s shipment=%s",
-        receipt.pk,
-        shipment.pk,
-    )
+    with record_receipt_completion_phase("lock"):
+        receipt = type(receipt).objects.select_for_update().get(pk=receipt.pk)
+        if receipt.status != ReceiptStatus.IN_PROGRESS:
+            raise ReceiptNotInProgress(receipt)
 
-    all_pois = (
-        PurchaseOrderItem.objects.select_for_update()
-        .filter(shipment=shipment)
-        .select_related("product_variant__product")
-        .prefetch_related("receipt_lines")
-    )
+        shipment = receipt.shipment
+        logger.debug(
+            "complete_receipt: receipt=%s shipment=%s",
+            receipt.pk,
+            shipment.pk,
+        )
 
-    adjustments_pending = []
+        all_pois = list(
+            PurchaseOrderItem.objects.select_for_update(of=("self",))
+            .filter(shipment=shipment)
+            .select_related("order", "product_variant__product")
+            .prefetch_related("receipt_lines")
+            .order_by("pk")
+        )
+        received = {
+            poi.pk: sum(rl.quantity_received for rl in poi.receipt_lines.all())
+            for poi in all_pois
+        }
 
-    pois_with_discrepancies = []
-    for poi in all_pois:
-        if poi.quantity_received != poi.quantity_ordered:
-            pois_with_discrepancies.append(poi)
-            logger.debug(
-                "complete_receipt: poi %s variant=%s DISCREPANCY "
-                "ordered=%d received=%d (delta=%+d)",
-                poi.pk,
-                poi.product_variant.sku,
-                poi.quantity_ordered,
-                poi.quantity_received,
-                poi.quantity_received - poi.quantity_ordered,
-            )
-        else:
-            logger.debug(
-                "complete_receipt: poi %s variant=%s OK "
-                "ordered=%d received=%d -> RECEIVED",
-                poi.pk,
-                poi.product_variant.sku,
-                poi.quantity_ordered,
-                poi.quantity_received,
-            )
-            poi.status = PurchaseOrderItemStatus.RECEIVED
-            poi.save(update_fields=["status", "updated_at"])
+    with record_receipt_completion_phase("plan"):
+        pois_with_discrepancies = []
+        for poi in all_pois:
+            if received[poi.pk] != poi.quantity_ordered:
+                pois_with_discrepancies.append(poi)
+                logger.debug(
+                    "complete_receipt: poi %s variant=%s DISCREPANCY "
+                    "ordered=%d received=%d (delta=%+d)",
+                    poi.pk,
+                    poi.product_variant.sku,
+                    poi.quantity_ordered,
+                    received[poi.pk],
+                    received[poi.pk] - poi.quantity_ordered,
+                )
 
-    pois_by_product = defaultdict(list)
-    for poi in pois_with_discrepancies:
-        pois_by_product[poi.product_variant.product].append(poi)
+        pois_by_product = defaultdict(list)
+        for poi in pois_with_discrepancies:
+            pois_by_product[poi.product_variant.product].append(poi)
 
-    logger.debug(
-        "complete_receipt: %d products with discrepancies, %d POIs total",
-        len(pois_by_product),
-        len(pois_with_discrepancies),
-    )
+        logger.debug(
+            "complete_receipt: %d products with discrepancies, %d POIs total",
+            len(pois_by_product),
+            len(pois_with_discrepancies),
+        )
 
-    for product, product_pois in pois_by_product.items():
-        rs = [rl for poi in product_pois for rl in poi.receipt_lines.all()]
-        ass = list(
-            AllocationSource.objects.filter(
-                purchase_order_item__in=product_pois,
-                allocation__order_line__order__allow_variant_reallocation=True,
-            ).select_related(
-                "allocation__order_line__order",
-                "allocation__stock",
-                "purchase_order_item__product_variant",
+        ass_by_product: dict[int, list[AllocationSource]] = defaultdict(list)
+        if pois_with_discrepancies:
+            eligible_ass = (
+                AllocationSource.objects.filter(
+                    purchase_order_item__in=pois_with_discrepancies,
+                    allocation__order_line__order__allow_variant_reallocation=True,
+                )
+                .select_related(
+                    "allocation__order_line__order",
+                    "allocation__stock__warehouse",
+                    "purchase_order_item__product_variant",
+                )
+                .order_by("pk")
             )
-        )
+            for a in eligible_ass:
+                ass_by_product[a.purchase_order_item.product_variant.product_id].append(
+                    a
+                )
 
-        logger.debug(
-            "complete_receipt: product %s (%s) — %d POIs, %d receipt lines, "
-            "%d reallocation-eligible allocation sources",
-            product.pk,
-            product.name,
-            len(product_pois),
-            len(rs),
-            len(ass),
-        )
+        plans: dict[Product, _ReallocationPlan] = {}
+        for product, product_pois in pois_by_product.items():
+            rs = [rl for poi in product_pois for rl in poi.receipt_lines.all()]
+            ass = ass_by_product[product.pk]
 
-        reallocation_succeeded = False
-        try:
-            reallocation_succeeded = _variant_reallocate(rs, ass)
             logger.debug(
-                "complete_receipt: product %s reallocation succeeded",
+                "complete_receipt: product %s (%s) — %d POIs, %d receipt lines, "
+                "%d reallocation-eligible allocation sources",
                 product.pk,
+                product.name,
+                len(product_pois),
+                len(rs),
+                len(ass),
             )
-        except CannotReallocateVariants as e:
+
+            try:
+                plan = _plan_variant_reallocation(rs, ass)
+            except CannotReallocateVariants as e:
+                logger.debug(
+                    "complete_receipt: product %s reallocation failed: %s",
+                    product.pk,
+                    e,
+                )
+                continue
+            if plan is not None:
+                plans[product] = plan
+
+    with record_receipt_completion_phase("apply"):
+        # Reallocations of different products touch disjoint lines and
+        # sources, so one pass per warehouse applies all of them
+        plans_by_warehouse: dict[int, list[_ReallocationPlan]] = defaultdict(list)
+        for plan in plans.values():
+            plans_by_warehouse[plan.warehouse.pk].append(plan)
+        for warehouse_plans in plans_by_warehouse.values():
+            _apply_reallocation(
+                removals=[a for plan in warehouse_plans for a in plan.removals],
+                distribution={
+                    key: qty
+                    for plan in warehouse_plans
+                    for key, qty in plan.distribution.items()
+                },
+                poi_by_variant={
+                    variant: pois
+                    for plan in warehouse_plans
+                    for variant, pois in plan.poi_by_variant.items()
+                },
+                received_by_poi={
+                    poi: qty
+                    for plan in warehouse_plans
+                    for poi, qty in plan.received_by_poi.items()
+                },
+                warehouse=warehouse_plans[0].warehouse,
+            )
+        for product in plans:
             logger.debug(
-                "complete_receipt: product %s reallocation failed: %s",
+                "complete_receipt: product %s reallocation succeeded",
                 product.pk,
-                e,
             )
 
-        if reallocation_succeeded:
-            total_ordered = sum(p.quantity_ordered for p in product_pois)
-            total_received = sum(p.quantity_received for p in product_pois)
-            if total_received == total_ordered:
-                for poi in product_pois:
-                    poi.refresh_from_db()
-                    received = poi.quantity_received
-                    if received != poi.quantity_ordered:
-                        logger.debug(
-                            "complete_receipt: poi %s variant=%s adjusting "
-                            "quantity_ordered %d -> %d (reallocation)",
-                            poi.pk,
-                            poi.product_variant.sku,
-                            poi.quantity_ordered,
-                            received,
-                        )
-                        poi.quantity_ordered = received
-                        poi.save(update_fields=["quantity_ordered", "updated_at"])
-
-        for poi in product_pois:
-            poi.refresh_from_db()
-            discrepancy = poi.quantity_received - poi.quantity_ordered
-            if discrepancy == 0:
+    with record_receipt_completion_phase("adjustments"):
+        adjustments_pending = []
+        for poi in all_pois:
+            if received[poi.pk] == poi.quantity_ordered:
                 logger.debug(
-                    "complete_receipt: poi %s variant=%s resolved by "
-                    "reallocation -> RECEIVED",
+                    "complete_receipt: poi %s variant=%s OK "
+                    "ordered=%d received=%d -> RECEIVED",
                     poi.pk,
                     poi.product_variant.sku,
+                    poi.quantity_ordered,
+                    received[poi.pk],
                 )
                 poi.status = PurchaseOrderItemStatus.RECEIVED
-                poi.save(update_fields=["status", "updated_at"])
-            else:
-                reason = (
-                    PurchaseOrderItemAdjustmentReason.DELIVERY_SHORT
-                    if discrepancy < 0
-                    else PurchaseOrderItemAdjustmentReason.CYCLE_COUNT_POSITIVE
-                )
-                adjustment = PurchaseOrderItemAdjustment.objects.create(
-                    purchase_order_item=poi,
-                    quantity_change=discrepancy,
-                    reason=reason,
-                    affects_payable=True,
-                    notes=(
-                        f"Auto-created during receipt completion "
-                        f"(Receipt #{receipt.id})"
-                    ),
-                    created_by=user,
-                )
-                logger.debug(
-                    "complete_receipt: poi %s variant=%s unresolved "
-                    "discrepancy=%+d -> POIA %s (%s) -> REQUIRES_ATTENTION",
-                    poi.pk,
-                    poi.product_variant.sku,
-                    discrepancy,
-                    adjustment.pk,
-                    reason,
-                )
-                adjustment_created_event(adjustment=adjustment, user=user)
-                poi.status = PurchaseOrderItemStatus.REQUIRES_ATTENTION
-                poi.save(update_fields=["status", "updated_at"])
-                adjustments_pending.append(adjustment)
-
-    # Mark shipment as arrived
-    if shipment.arrived_at is None:
-        shipment.arrived_at = timezone.now()
-        shipment.save(update_fields=["arrived_at"])
-        logger.debug(
-            "complete_receipt: shipment %s marked arrived",
-            shipment.pk,
-        )
 
-    # Complete the receipt
-    receipt.status = ReceiptStatus.COMPLETED
-    receipt.completed_at = timezone.now()
-    receipt.completed_by = user
-    receipt.save(update_fields=["status", "completed_at", "completed_by"])
+        for product, product_pois in pois_by_product.items():
+            if product in plans:
+                total_ordered = sum(p.quantity_ordered for p in product_pois)
+                total_received = sum(received[p.pk] for p in product_pois)
+                if total_received == total_ordered:
+                    for poi in product_pois:
+                        if received[poi.pk] != poi.quantity_ordered:
+                            logger.debug(
+                                "complete_receipt: poi %s variant=%s adjusting "
+                                "quantity_ordered %d -> %d (reallocation)",
+                                poi.pk,
+                                poi.product_variant.sku,
+                                poi.quantity_ordered,
+                                received[poi.pk],
+                            )
+                            poi.quantity_ordered = received[poi.pk]
+
+            for poi in product_pois:
+                discrepancy = received[poi.pk] - poi.quantity_ordered
+                if discrepancy == 0:
+                    logger.debug(
+                        "complete_receipt: poi %s variant=%s resolved by "
+                        "reallocation -> RECEIVED",
+                        poi.pk,
+                        poi.product_variant.sku,
+                    )
+                    poi.status = PurchaseOrderItemStatus.RECEIVED
+                else:
+                    reason = (
+                        PurchaseOrderItemAdjustmentReason.DELIVERY_SHORT
+                        if discrepancy < 0
+                        else PurchaseOrderItemAdjustmentReason.CYCLE_COUNT_POSITIVE
+                    )
+                    adjustments_pending.append(
+                        PurchaseOrderItemAdjustment(
+                            purchase_order_item=poi,
+                            quantity_change=discrepancy,
+                            reason=reason,
+                            affects_payable=True,
+                            notes=(
+                                f"Auto-created during receipt completion "
+                                f"(Receipt #{receipt.id})"
+                            ),
+                            created_by=user,
+                        )
+                    )
+                    logger.debug(
+                        "complete_receipt: poi %s variant=%s unresolved "
+                        "discrepancy=%+d (%s) -> REQUIRES_ATTENTION",
+                        poi.pk,
+                        poi.product_variant.sku,
+                        discrepancy,
+                        reason,
+                    )
+                    poi.status = PurchaseOrderItemStatus.REQUIRES_ATTENTION
+
+        now = timezone.now()
+        for poi in all_pois:
+            poi.updated_at = now
+        PurchaseOrderItem.objects.bulk_update(
+            all_pois, ["status", "quantity_ordered", "updated_at"]
+        )
+        PurchaseOrderItem.objects.filter(
+            pk__in=[poi.pk for poi in all_pois]
+        ).refresh_available_quantity()
+        PurchaseOrderItemAdjustment.objects.bulk_create(adjustments_pending)
+        adjustment_created_events(adjustments=adjustments_pending, user=user)
+
+    with record_receipt_completion_phase("purchase_orders"):
+        # Mark shipment as arrived
+        if shipment.arrived_at is None:
+            shipment.arrived_at = timezone.now()
+            shipment.save(update_fields=["arrived_at"])
+            logger.debug(
+                "complete_receipt: shipment %s marked arrived",
+                shipment.pk,
+            )
 
-    # Transition PO status based on how many items are now received.
-    po_ids = list({poi.order_id for poi in all_pois})
-    for po in PurchaseOrder.objects.filter(pk__in=po_ids).select_for_update():
-        unreceived = po.items.exclude(
+        # Complete the receipt
+        receipt.status = ReceiptStatus.COMPLETED
+        receipt.completed_at = timezone.now()
+        receipt.completed_by = user
+        receipt.save(update_fields=["status", "completed_at", "completed_by"])
+
+        # Transition PO status based on how many items are now received.
+        po_ids = {poi.order_id for poi in all_pois}
+        unreceived_items = PurchaseOrderItem.objects.filter(
+            order_id=OuterRef("pk")
+        ).exclude(
             status__in=[
                 PurchaseOrderItemStatus.RECEIVED,
                 PurchaseOrderItemStatus.CANCELLED,
             ]
         )
-        if not unreceived.exists():
-            new_status = PurchaseOrderStatus.RECEIVED
-        else:
-            new_status = PurchaseOrderStatus.PARTIALLY_RECEIVED
-        if po.status != new_status:
-            logger.debug(
-                "complete_receipt: PO %s status %s -> %s",
-                po.pk,
-                po.status,
-                new_status,
-            )
-            po.status = new_status
-            po.save(update_fields=["status", "updated_at"])
+        purchase_orders = (
+            PurchaseOrder.objects.filter(pk__in=po_ids)
+            .annotate(has_unreceived_items=Exists(unreceived_items))
+            .select_for_update()
+            .order_by("pk")
+        )
+        pos_to_update = []
+        for po in purchase_orders:
+            if not po.has_unreceived_items:
+                new_status = PurchaseOrderStatus.RECEIVED
+            else:
+                new_status = PurchaseOrderStatus.PARTIALLY_RECEIVED
+            if po.status != new_status:
+                logger.debug(
+                    "complete_receipt: PO %s status %s -> %s",
+                    po.pk,
+                    po.status,
+                    new_status,
+                )
+                po.status = new_status
+                po.updated_at = now
+                pos_to_update.append(po)
+        PurchaseOrder.objects.bulk_update(pos_to_update, ["status", "updated_at"])
 
     # Create fulfillments only if no pending adjustments
     if not adjustments_pending:
         logger.debug("complete_receipt: no pending adjustments, creating fulfillments")
-        _create_fulfillments_for_shipment(shipment=shipment, user=user, manager=manager)
+        with record_receipt_completion_phase("fulfillments"):
+            _create_fulfillments_for_shipment(
+                shipment=shipment, user=user, manager=manager
+            )
     else:
         logger.debug(
             "complete_receipt: %d pending adjustments, skipping fulfillments",
@@ -942,25 +1149,32 @@ def _create_fulfillments_for_shipment(shipment, user, manager):
 
     from ..order import OrderStatus
     from ..order.actions import OrderFulfillmentLineInfo, create_fulfillments
-    from ..order.models import Order
     from ..plugins.manager import get_plugins_manager
-    from ..warehouse.models import Allocation
 
     fulfill_manager = manager or get_plugins_manager(allow_replica=False)
     site_settings = Site.objects.get_current().settings
 
-    orders_to_fulfill = Order.objects.filter(
-        lines__allocations__allocation_sources__purchase_order_item__shipment=shipment,
-        status=OrderStatus.UNFULFILLED,
-    ).distinct()
+    orders_to_fulfill = list(
+        Order.objects.filter(
+            lines__allocations__allocation_sources__purchase_order_item__shipment=shipment,
+            status=OrderStatus.UNFULFILLED,
+        ).distinct()
+    )
+    if not orders_to_fulfill:
+        return
 
-    for order in orders_to_fulfill:
-        allocations = Allocation.objects.filter(order_line__order=order).select_related(
-            "stock__warehouse", "order_line"
-        )
+    allocations_by_order: dict = defaultdict(list)
+    allocations = (
+        Allocation.objects.filter(order_line__order__in=orders_to_fulfill)
+        .select_related("stock", "order_line")
+        .order_by("pk")
+    )
+    for allocation in allocations:
+        allocations_by_order[allocation.order_line.order_id].append(allocation)
 
+    for order in orders_to_fulfill:
         warehouse_groups: dict = defaultdict(list)
-        for allocation in allocations:
+        for allocation in allocations_by_order[order.pk]:
             warehouse_groups[allocation.stock.warehouse_id].append(allocation)
 
         fulfillment_lines_for_warehouses = {
@@ -1215,15 +1429,21 @@ def resolve_product_discrepancy(
         PurchaseOrderItemAdjustment.objects.filter(
             purchase_order_item__in=pois,
             processed_at__isnull=True,
-        )
+        ).select_related("purchase_order_item__order")
     )
 
     now = timezone.now()
     for adj in adjustments:
         adj.affects_payable = affects_payable
         adj.processed_at = now
-        adj.save(update_fields=["affects_payable", "processed_at"])
-        adjustment_processed_event(adjustment=adj, user=user)
+    # bulk_update skips save(), so refresh the POIs' quantity_available once
+    PurchaseOrderItemAdjustment.objects.bulk_update(
+        adjustments, ["affects_payable", "processed_at"]
+    )
+    PurchaseOrderItem.objects.filter(
+        pk__in={adj.purchase_order_item_id for adj in adjustments}
+    ).refresh_available_quantity()
+    adjustment_processed_events(adjustments=adjustments, user=user)
 
     # Transition POIs to RECEIVED
     for poi in pois:
@@ -166,7 +166,7 @@ def confirm_purchase_order_item(poi: PurchaseOrderItem, user=None, app=None):
     conservation works
     """
 
-    from ..warehouse.management import _allocate_sources_incremental
+    from ..warehouse.management import allocate_sources_in_bulk
 
     if poi.status != PurchaseOrderItemStatus.DRAFT:
         raise InvalidPurchaseOrderItemStatus(poi, PurchaseOrderItemStatus.DRAFT)
@@ -256,6 +256,7 @@ def confirm_purchase_order_item(poi: PurchaseOrderItem, user=None, app=None):
 
     # Move PORA-scoped allocations from source to destination and create AllocationSources.
     # Delete each PORA after its allocation is processed - they are consumed on confirmation.
+    allocations_to_source: list[tuple[Allocation, int]] = []
     for pora in poras:
         allocation = pora.allocation
         available = destination.quantity - destination.quantity_allocated
@@ -263,13 +264,7 @@ def confirm_purchase_order_item(poi: PurchaseOrderItem, user=None, app=None):
             # Move entire allocation to owned warehouse
             allocation.stock = destination
             allocation.save(update_fields=["stock"])
-
-            try:
-                _allocate_sources_incremental(
-                    allocation, allocation.quantity_allocated, poi=poi
-                )
-            except InsufficientStock:
-                raise
+            allocations_to_source.append((allocation, allocation.quantity_allocated))
 
             destination.quantity_allocated += allocation.quantity_allocated
             source.quantity_allocated -= allocation.quantity_allocated
@@ -284,10 +279,7 @@ def confirm_purchase_order_item(poi: PurchaseOrderItem, user=None, app=None):
                 quantity_allocated=move_quantity,
             )
 
-            try:
-                _allocate_sources_incremental(moved_allocation, move_quantity, poi=poi)
-            except InsufficientStock:
-                raise
+            allocations_to_source.append((moved_allocation, move_quantity))
 
             destination.quantity_allocated += move_quantity
             source.quantity_allocated -= move_quantity
@@ -302,6 +294,9 @@ def confirm_purchase_order_item(poi: PurchaseOrderItem, user=None, app=None):
 
         pora.delete()
 
+    # Source every moved allocation from this POI in one batch
+    allocate_sources_in_bulk(allocations_to_source, poi=poi)
+
     source.save(update_fields=["quantity", "quantity_allocated"])
     destination.save(update_fields=["quantity", "quantity_allocated"])
 
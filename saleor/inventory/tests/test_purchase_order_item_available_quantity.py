@@ -0,0 +1,90 @@
+"""Tests for the stored quantity_available on PurchaseOrderItem."""
+
+from django.utils import timezone
+
+from .. import PurchaseOrderItemAdjustmentReason
+from ..models import (
+    PurchaseOrderItem,
+    PurchaseOrderItemAdjustment,
+    available_quantity_expression,
+)
+
+
+def _computed_available_quantity(poi):
+    return (
+        PurchaseOrderItem.objects.filter(pk=poi.pk)
+        .annotate(computed=available_quantity_expression())
+        .values_list("computed", flat=True)
+        .get()
+    )
+
+
+def test_quantity_available_set_on_create(purchase_order_item):
+    # when
+    purchase_order_item.refresh_from_db()
+
+    # then
+    assert purchase_order_item.quantity_available == (
+        purchase_order_item.quantity_ordered - purchase_order_item.quantity_allocated
+    )
+    assert purchase_order_item.quantity_available == _computed_available_quantity(
+        purchase_order_item
+    )
+
+
+def test_quantity_available_follows_saved_quantity_fields(purchase_order_item):
+    # given
+    purchase_order_item.refresh_from_db()
+    purchase_order_item.quantity_allocated = 30
+    purchase_order_item.quantity_fulfilled = 20
+
+    # when
+    purchase_order_item.save(update_fields=["quantity_allocated", "quantity_fulfilled"])
+
+    # then
+    assert purchase_order_item.quantity_available == (
+        purchase_order_item.quantity_ordered - 30 - 20
+    )
+
+
+def test_quantity_available_counts_processed_adjustments_only(
+    purchase_order_item, staff_user
+):
+    # given
+    purchase_order_item.refresh_from_db()
+    available_before = purchase_order_item.quantity_available
+    adjustment = PurchaseOrderItemAdjustment.objects.create(
+        purchase_order_item=purchase_order_item,
+        quantity_change=-5,
+        reason=PurchaseOrderItemAdjustmentReason.DELIVERY_SHORT,
+        created_by=staff_user,
+    )
+    purchase_order_item.refresh_from_db()
+    assert purchase_order_item.quantity_available == available_before
+
+    # when
+    adjustment.processed_at = timezone.now()
+    adjustment.save(update_fields=["processed_at"])
+
+    # then
+    purchase_order_item.refresh_from_db()
+    assert purchase_order_item.quantity_available == available_before - 5
+    assert purchase_order_item.quantity_available == _computed_available_quantity(
+        purchase_order_item
+    )
+
+
+def test_refresh_available_quantity_after_bulk_update(purchase_order_item):
+    # given
+    PurchaseOrderItem.objects.filter(pk=purchase_order_item.pk).update(
+        quantity_allocated=purchase_order_item.quantity_ordered
+    )
+
+    # when
+    PurchaseOrderItem.objects.filter(
+        pk=purchase_order_item.pk
+    ).refresh_available_quantity()
+
+    # then
+    purchase_order_item.refresh_from_db()
+    assert purchase_order_item.quantity_available == 0
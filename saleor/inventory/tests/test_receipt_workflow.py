@@ -1,6 +1,8 @@
 """Tests for receipt workflow (start_receipt, receive_item, complete_receipt, etc)."""
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from ...order import FulfillmentStatus, OrderStatus
@@ -13,15 +15,18 @@ from ..exceptions import (
 )
 from ..models import (
     PurchaseOrderItem,
+    PurchaseOrderItemAdjustment,
     PurchaseOrderRequestedAllocation,
     Receipt,
     ReceiptLine,
 )
 from ..receipt_workflow import (
+    ReceiveItemData,
     complete_receipt,
     delete_receipt,
     delete_receipt_line,
     receive_item,
+    receive_items_batch,
     start_receipt,
 )
 from ..stock_management import confirm_purchase_order_item
@@ -145,6 +150,100 @@ def test_audit_trail_captured(receipt, purchase_order_item, variant, staff_user)
     assert before <= line.received_at <= after
 
 
+# Tests for receive_items_batch function
+
+
+def test_receive_items_batch_creates_lines(
+    receipt, purchase_order_item, variant, staff_user
+):
+    # given: two scans of the same variant
+    scans = [
+        ReceiveItemData(variant, 30, client_event_id="scan-1"),
+        ReceiveItemData(variant, 20, notes="Dented box", client_event_id="scan-2"),
+    ]
+
+    # when: recording them in one batch
+    lines, skipped = receive_items_batch(receipt, scans, user=staff_user)
+
+    # then: a line is created per scan
+    assert skipped == []
+    assert [line.quantity_received for line in lines] == [30, 20]
+    assert receipt.lines.count() == 2
+    assert receipt.lines.get(client_event_id="scan-2").notes == "Dented box"
+    purchase_order_item.refresh_from_db()
+    assert purchase_order_item.quantity_received == 50
+
+
+def test_receive_items_batch_skips_recorded_events(
+    receipt, purchase_order_item, variant, staff_user
+):
+    # given: a batch that was already recorded
+    receive_items_batch(
+        receipt, [ReceiveItemData(variant, 30, client_event_id="scan-1")]
+    )
+
+    # when: the batch is resent with a new scan and a repeated one
+    lines, skipped = receive_items_batch(
+        receipt,
+        [
+            ReceiveItemData(variant, 30, client_event_id="scan-1"),
+            ReceiveItemData(variant, 20, client_event_id="scan-2"),
+            ReceiveItemData(variant, 20, client_event_id="scan-2"),
+        ],
+    )
+
+    # then: only the new scan is recorded
+    assert skipped == ["scan-1", "scan-2"]
+    assert len(lines) == 1
+    purchase_order_item.refresh_from_db()
+    assert purchase_order_item.quantity_received == 50
+
+
+def test_receive_items_batch_records_items_without_client_event_id(
+    receipt, purchase_order_item, variant, staff_user
+):
+    # given: items sent without client event IDs
+    items = [ReceiveItemData(variant, 10), ReceiveItemData(variant, 10)]
+
+    # when: the same batch is sent twice
+    receive_items_batch(receipt, items, user=staff_user)
+    lines, skipped = receive_items_batch(receipt, items, user=staff_user)
+
+    # then: every item is recorded
+    assert skipped == []
+    assert len(lines) == 2
+    assert receipt.lines.count() == 4
+
+
+def test_receive_items_batch_records_nothing_on_invalid_scan(
+    receipt, purchase_order_item, variant, product_variant_factory, staff_user
+):
+    # given: a batch with a variant that is not part of this shipment
+    scans = [
+        ReceiveItemData(variant, 30, client_event_id="scan-1"),
+        ReceiveItemData(product_variant_factory(), 10, client_event_id="scan-2"),
+    ]
+
+    # when/then: the batch is rejected as a whole
+    with pytest.raises(ValueError, match="not found in shipment"):
+        receive_items_batch(receipt, scans, user=staff_user)
+    assert not receipt.lines.exists()
+
+
+def test_receive_items_batch_error_when_receipt_not_in_progress(
+    receipt, variant, staff_user
+):
+    # given: a completed receipt
+    receipt.status = ReceiptStatus.COMPLETED
+    receipt.save()
+
+    # when/then: recording scans raises error
+    with pytest.raises(ReceiptNotInProgress):
+        receive_items_batch(
+            receipt, [ReceiveItemData(variant, 10, client_event_id="scan-1")]
+        )
+
+
 # Tests for complete_receipt function
 
 
@@ -275,6 +374,64 @@ def test_sends_notification_for_pending_adjustments(
     assert call_args[0][0] == "pending_adjustments"
 
 
+def test_complete_receipt_writes_discrepancies_in_bulk(
+    receipt,
+    purchase_order,
+    shipment,
+    staff_user,
+    product_variant_factory,
+    receipt_line_factory,
+):
+    # given: several POIs on the shipment, each delivered short
+    pois = PurchaseOrderItem.objects.bulk_create(
+        [
+            PurchaseOrderItem(
+                order=purchase_order,
+                product_variant=product_variant_factory(),
+                quantity_ordered=10,
+                total_price_amount=100,
+                currency="USD",
+                shipment=shipment,
+                country_of_origin="US",
+                status=PurchaseOrderItemStatus.CONFIRMED,
+            )
+            for _ in range(5)
+        ]
+    )
+    for poi in pois:
+        receipt_line_factory(
+            receipt=receipt,
+            purchase_order_item=poi,
+            quantity_received=8,
+            received_by=staff_user,
+        )
+
+    # when: completing the receipt
+    with CaptureQueriesContext(connection) as ctx:
+        result = complete_receipt(receipt, user=staff_user)
+
+    # then: every POI gets a pending adjustment
+    assert len(result["adjustments_pending"]) == 5
+    assert (
+        PurchaseOrderItemAdjustment.objects.filter(purchase_order_item__in=pois).count()
+        == 5
+    )
+
+    # and: adjustments and statuses are written with one query each
+    adjustment_table = PurchaseOrderItemAdjustment._meta.db_table
+    poi_table = PurchaseOrderItem._meta.db_table
+    queries = [query["sql"] for query in ctx.captured_queries]
+    assert (
+        len([q for q in queries if q.startswith(f'INSERT INTO "{adjustment_table}"')])
+        == 1
+    )
+    assert len([q for q in queries if q.startswith(f'UPDATE "{poi_table}"')]) == 1
+    assert all(
+        poi.status == PurchaseOrderItemStatus.REQUIRES_ATTENTION
+        for poi in PurchaseOrderItem.objects.filter(pk__in=[poi.pk for poi in pois])
+    )
+
+
 def test_error_when_completing_receipt_not_in_progress(receipt, staff_user):
     # given: a completed receipt
     receipt.status = ReceiptStatus.COMPLETED
@@ -8,8 +8,9 @@ from django.db.models import Sum
 from ...order import OrderOrigin
 from ...order.models import Order, OrderLine
 from ...warehouse.models import Allocation, AllocationSource, Stock
-from .. import PurchaseOrderItemStatus, ReceiptStatus
+from .. import PurchaseOrderEvents, PurchaseOrderItemStatus, ReceiptStatus
 from ..models import (
+    PurchaseOrderEvent,
     PurchaseOrderItem,
     PurchaseOrderItemAdjustment,
     Receipt,
@@ -488,6 +489,42 @@ def test_resolve_with_no_existing_allocations(
     assert poi_a.status == PurchaseOrderItemStatus.RECEIVED
 
 
+def test_resolve_processes_adjustments_in_bulk(
+    purchase_order,
+    poi_a,
+    poia_a,
+    variant_a,
+    owned_warehouse,
+    completed_receipt,
+    staff_user,
+):
+    """Processed POIAs count towards the POI's available quantity."""
+    PurchaseOrderItemAdjustment.objects.create(
+        purchase_order_item=poi_a,
+        quantity_change=-1,
+        reason="delivery_short",
+        created_by=staff_user,
+    )
+
+    result = resolve_product_discrepancy(
+        receipt=completed_receipt,
+        product=variant_a.product,
+        resolutions=[],
+        affects_payable=True,
+        user=staff_user,
+    )
+
+    assert len(result) == 2
+    poi_a.refresh_from_db()
+    assert poi_a.quantity_available == 7
+    assert (
+        PurchaseOrderEvent.objects.filter(
+            purchase_order_item=poi_a, type=PurchaseOrderEvents.ADJUSTMENT_PROCESSED
+        ).count()
+        == 2
+    )
+
+
 # ---------------------------------------------------------------------------
 # Tests — get_product_discrepancies
 # ---------------------------------------------------------------------------
@@ -471,8 +471,8 @@ def test_poi_quantity_allocated_updated_after_reallocation(
 ):
     """POI.quantity_allocated is kept in sync with its AllocationSource rows.
 
-    _remove_allocation_source and _add_allocation_source both mutate
-    POI.quantity_allocated, but no existing test checks the post-call value.
+    _apply_reallocation mutates POI.quantity_allocated when it removes and
+    adds sources, but no existing test checks the post-call value.
     INVARIANT: poi.quantity_allocated == sum(AllocationSource.quantity for that POI).
     """
     addr = purchase_order.source_warehouse.address
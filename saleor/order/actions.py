@@ -3,7 +3,7 @@ from collections import defaultdict
 from copy import deepcopy
 from decimal import Decimal
 from functools import partial
-from typing import TYPE_CHECKING, Optional, TypedDict
+from typing import TYPE_CHECKING, NamedTuple, Optional, TypedDict
 from uuid import UUID
 
 import graphene
@@ -2337,6 +2337,32 @@ def start_pick(pick, user=None):
     return pick
 
 
+def _check_pick_in_progress(pick):
+    from . import PickStatus
+
+    if pick.status != PickStatus.IN_PROGRESS:
+        raise ValueError(
+            f"Pick {pick.id} is not in progress. "
+            f"Current status: {pick.get_status_display()}"
+        )
+
+
+def _set_quantity_picked(pick_item, quantity_picked, user, notes):
+    if quantity_picked > pick_item.quantity_to_pick:
+        raise ValueError(
+            f"Quantity picked ({quantity_picked}) cannot exceed "
+            f"quantity to pick ({pick_item.quantity_to_pick})"
+        )
+
+    pick_item.quantity_picked = quantity_picked
+    pick_item.picked_by = user
+    if notes:
+        pick_item.notes = notes
+
+    if pick_item.is_fully_picked and pick_item.picked_at is None:
+        pick_item.picked_at = now()
+
+
 @transaction.atomic
 def update_pick_item(pick_item, quantity_picked, user=None, notes=""):
     """Update quantity picked for a pick item.
@@ -2354,31 +2380,90 @@ def update_pick_item(pick_item, quantity_picked, user=None, notes=""):
         ValueError: If pick is not in progress or quantity exceeds expected
 
     """
-    from . import PickStatus
+    _check_pick_in_progress(pick_item.pick)
+    _set_quantity_picked(pick_item, quantity_picked, user, notes)
+    pick_item.save(update_fields=["quantity_picked", "picked_by", "notes", "picked_at"])
 
-    if pick_item.pick.status != PickStatus.IN_PROGRESS:
-        raise ValueError(
-            f"Pick {pick_item.pick.id} is not in progress. "
-            f"Current status: {pick_item.pick.get_status_display()}"
-        )
+    return pick_item
 
-    if quantity_picked > pick_item.quantity_to_pick:
-        raise ValueError(
-            f"Quantity picked ({quantity_picked}) cannot exceed "
-            f"quantity to pick ({pick_item.quantity_to_pick})"
-        )
 
-    pick_item.quantity_picked = quantity_picked
-    pick_item.picked_by = user
-    if notes:
-        pick_item.notes = notes
+class PickScanData(NamedTuple):
+    client_event_id: str
+    pick_item_id: int
+    quantity_picked: int
+    notes: str = ""
 
-    if pick_item.is_fully_picked and pick_item.picked_at is None:
-        pick_item.picked_at = now()
 
-    pick_item.save(update_fields=["quantity_picked", "picked_by", "notes", "picked_at"])
+@transaction.atomic
+def apply_pick_scans(pick, scans, user=None):
+    """Apply a batch of scans to a pick in one transaction.
 
-    return pick_item
+    Each scan is applied as update_pick_item would, in order. Scans whose
+    client event ID is already recorded for the pick, or repeated earlier in
+    the batch, are skipped, so a client can resend a batch safely.
+
+    Args:
+        pick: Pick the scanned items belong to
+        scans: PickScanData in the order they were scanned
+        user: User who picked the items
+
+    Returns:
+        Client event IDs of the skipped scans
+
+    Raises:
+        ValueError: If pick is not in progress, a pick item is not on the pick
+            or a quantity exceeds expected. No scan is applied then.
+
+    """
+    from .models import Pick, PickItem, PickScan
+
+    # Batches for the same pick are applied one at a time
+    pick = Pick.objects.select_for_update().get(pk=pick.pk)
+    _check_pick_in_progress(pick)
+
+    seen = set(
+        PickScan.objects.filter(
+            pick=pick, client_event_id__in=[scan.client_event_id for scan in scans]
+        ).values_list("client_event_id", flat=True)
+    )
+    pick_items = (
+        PickItem.objects.select_for_update()
+        .order_by("pk")
+        .in_bulk({scan.pick_item_id for scan in scans})
+    )
+
+    skipped = []
+    updated_items = {}
+    pick_scans = []
+    for scan in scans:
+        if scan.client_event_id in seen:
+            skipped.append(scan.client_event_id)
+            continue
+        seen.add(scan.client_event_id)
+
+        pick_item = pick_items.get(scan.pick_item_id)
+        if pick_item is None or pick_item.pick_id != pick.pk:
+            raise ValueError(
+                f"Pick item {scan.pick_item_id} does not belong to pick {pick.id}"
+            )
+        _set_quantity_picked(pick_item, scan.quantity_picked, user, scan.notes)
+        updated_items[pick_item.pk] = pick_item
+        pick_scans.append(
+            PickScan(
+                pick=pick,
+                pick_item=pick_item,
+                client_event_id=scan.client_event_id,
+                quantity_picked=scan.quantity_picked,
+                scanned_by=user,
+            )
+        )
+
+    PickItem.objects.bulk_update(
+        updated_items.values(), ["quantity_picked", "picked_by", "notes", "picked_at"]
+    )
+    PickScan.objects.bulk_create(pick_scans)
+
+    return skipped
 
 
 def assign_shipment_to_fulfillment(fulfillment, shipment, user=None, auto_approve=True):
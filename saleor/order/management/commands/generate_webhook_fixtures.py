@@ -166,6 +166,15 @@ def _gen_check_prepayment_status(query, output_dir, channel, request, stdout):
     )
 
 
+def _gen_check_prepayment_statuses(query, output_dir, channel, request, stdout):
+    _write(
+        output_dir,
+        "xero_check_prepayment_statuses.json",
+        {"prepaymentIds": ["00000000-0000-0000-0000-000000000000"]},
+        stdout,
+    )
+
+
 def _gen_list_payments(query, output_dir, channel, request, stdout):
     _write(
         output_dir,
@@ -312,6 +321,7 @@ EVENT_GENERATORS = {
     "XERO_LIST_BANK_ACCOUNTS": _gen_list_bank_accounts,
     "XERO_LIST_TAX_CODES": _gen_list_tax_codes,
     "XERO_CHECK_PREPAYMENT_STATUS": _gen_check_prepayment_status,
+    "XERO_CHECK_PREPAYMENT_STATUSES": _gen_check_prepayment_statuses,
     "XERO_LIST_PAYMENTS": _gen_list_payments,
     "CUSTOMER_CREATED": _gen_customer_created,
 }
@@ -0,0 +1,66 @@
+from contextlib import AbstractContextManager
+
+from opentelemetry.util.types import AttributeValue
+
+from ..core.telemetry import (
+    DEFAULT_DURATION_BUCKETS,
+    MetricType,
+    Scope,
+    Unit,
+    meter,
+)
+
+# Initialize metrics
+METRIC_XERO_PREPAYMENT_CHECK_DURATION = meter.create_metric(
+    "saleor.order.xero_prepayment_check.duration",
+    scope=Scope.CORE,
+    type=MetricType.HISTOGRAM,
+    unit=Unit.SECOND,
+    description="Duration of a run checking pending Xero prepayments.",
+    bucket_boundaries=DEFAULT_DURATION_BUCKETS,
+)
+
+METRIC_XERO_PREPAYMENT_CHECK_REQUEST_DURATION = meter.create_metric(
+    "saleor.order.xero_prepayment_check.request.duration",
+    scope=Scope.CORE,
+    type=MetricType.HISTOGRAM,
+    unit=Unit.SECOND,
+    description="Duration of a request checking a batch of Xero prepayments.",
+    bucket_boundaries=DEFAULT_DURATION_BUCKETS,
+)
+
+METRIC_XERO_PREPAYMENTS_CHECKED = meter.create_metric(
+    "saleor.order.xero_prepayment_check.checked",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.PREPAYMENT,
+    description="Number of Xero prepayments whose status was checked.",
+)
+
+METRIC_XERO_PREPAYMENT_PAYMENTS_RECORDED = meter.create_metric(
+    "saleor.order.xero_prepayment_check.recorded",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.PAYMENT,
+    description="Number of payments recorded for paid Xero prepayments.",
+)
+
+
+def record_xero_prepayment_check_duration() -> AbstractContextManager[
+    dict[str, AttributeValue]
+]:
+    return meter.record_duration(METRIC_XERO_PREPAYMENT_CHECK_DURATION)
+
+
+def record_xero_prepayment_check_request_duration() -> AbstractContextManager[
+    dict[str, AttributeValue]
+]:
+    return meter.record_duration(METRIC_XERO_PREPAYMENT_CHECK_REQUEST_DURATION)
+
+
+def record_xero_prepayments_checked(amount: int) -> None:
+    meter.record(METRIC_XERO_PREPAYMENTS_CHECKED, amount, Unit.PREPAYMENT)
+
+
+def record_xero_prepayment_payments_recorded(amount: int) -> None:
+    meter.record(METRIC_XERO_PREPAYMENT_PAYMENTS_RECORDED, amount, Unit.PAYMENT)
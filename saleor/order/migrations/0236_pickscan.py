@@ -0,0 +1,71 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("order", "0235_order_allow_variant_reallocation"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PickScan",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "client_event_id",
+                    models.CharField(
+                        help_text="ID the scanning client assigned to this scan",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "quantity_picked",
+                    models.PositiveIntegerField(
+                        help_text="Quantity picked the scan set on the pick item"
+                    ),
+                ),
+                ("scanned_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "pick",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scans",
+                        to="order.pick",
+                    ),
+                ),
+                (
+                    "pick_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scans",
+                        to="order.pickitem",
+                    ),
+                ),
+                (
+                    "scanned_by",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Warehouse staff who scanned this item",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("pick", "client_event_id")},
+            },
+        ),
+    ]
@@ -1313,6 +1313,49 @@ class PickItem(models.Model):
         return f"PickItem #{self.id}: {self.quantity_picked}/{self.quantity_to_pick} for OrderLine #{self.order_line_id}"
 
 
+class PickScan(models.Model):
+    """A scan applied to a pick item, recorded by the client's event ID.
+
+    Scanners send scans in batches and resend them when a response is lost;
+    a scan whose event ID is already recorded for the pick is skipped.
+    """
+
+    pick = models.ForeignKey(
+        Pick,
+        on_delete=models.CASCADE,
+        related_name="scans",
+    )
+
+    pick_item = models.ForeignKey(
+        PickItem,
+        on_delete=models.CASCADE,
+        related_name="scans",
+    )
+
+    client_event_id = models.CharField(
+        max_length=255,
+        help_text="ID the scanning client assigned to this scan",
+    )
+
+    quantity_picked = models.PositiveIntegerField(
+        help_text="Quantity picked the scan set on the pick item"
+    )
+
+    scanned_at = models.DateTimeField(auto_now_add=True)
+
+    scanned_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Warehouse staff who scanned this item",
+    )
+
+    class Meta:
+        unique_together = [["pick", "client_event_id"]]
+
+
 class OrderEvent(models.Model):
     """Model used to store events that happened during the order lifecycle.
 
@@ -1,8 +1,11 @@
 import datetime
 import logging
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
 
 from django.conf import settings
+from django.db import connections
 from django.db.models import Exists, F, Func, OuterRef, Subquery, Value
 from django.db.models.functions import Greatest
 from django.utils import timezone
@@ -21,6 +24,12 @@ from ..webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
 from ..webhook.utils import get_webhooks_for_multiple_events
 from . import OrderEvents, OrderStatus
 from .actions import call_order_event, call_order_events
+from .metrics import (
+    record_xero_prepayment_check_duration,
+    record_xero_prepayment_check_request_duration,
+    record_xero_prepayment_payments_recorded,
+    record_xero_prepayments_checked,
+)
 from .models import Order, OrderEvent
 from .utils import invalidate_order_prices
 
@@ -33,6 +42,11 @@ EXPIRE_ORDER_BATCH_SIZE = 100
 # It takes +/- 8 secs to delete 5000 orders
 DELETE_EXPIRED_ORDER_BATCH_SIZE = 5000
 
+# Prepayment IDs sent per batched Xero status check, and the number of
+# batches checked at the same time
+XERO_PREPAYMENT_CHECK_BATCH_SIZE = 100
+XERO_PREPAYMENT_CHECK_CONCURRENCY = 4
+
 
 @app.task
 @allow_writer()
@@ -241,91 +255,163 @@ def reduce_user_number_of_orders(user_orders_count: dict[int, int]):
             User.objects.bulk_update(users_to_update, ["number_of_orders"])
 
 
+def _reconciled_amount(status: dict | None) -> Decimal | None:
+    reconciled = status.get("reconciledAmount") if status else None
+    if not reconciled or Decimal(str(reconciled)) <= 0:
+        return None
+    return Decimal(str(reconciled))
+
+
+def _check_xero_prepayment_batch(
+    manager, prepayment_ids: list[str]
+) -> dict[str, dict] | None:
+    with record_xero_prepayment_check_request_duration():
+        return manager.xero_check_prepayment_statuses(prepayment_ids)
+
+
+def _check_xero_prepayment_batch_in_thread(
+    manager, prepayment_ids: list[str]
+) -> dict[str, dict] | None:
+    try:
+        return _check_xero_prepayment_batch(manager, prepayment_ids)
+    finally:
+        # Close the connections the worker thread opened, nothing reuses them
+        connections.close_all()
+
+
+def check_xero_prepayment_statuses(
+    manager,
+    prepayment_ids: list[str],
+    batch_size: int = XERO_PREPAYMENT_CHECK_BATCH_SIZE,
+    max_workers: int = XERO_PREPAYMENT_CHECK_CONCURRENCY,
+) -> dict[str, dict]:
+    """Return statuses of the prepayments keyed by prepayment ID.
+
+    Prepayment IDs are sent batch_size at a time, up to max_workers batches at
+    once. When no app handles batched checks, each prepayment is checked with
+    its own request instead.
+    """
+    batches = [
+        prepayment_ids[i : i + batch_size]
+        for i in range(0, len(prepayment_ids), batch_size)
+    ]
+    if not batches:
+        return {}
+
+    # The first batch tells whether any app handles batched checks
+    first_batch_statuses = _check_xero_prepayment_batch(manager, batches[0])
+    if first_batch_statuses is None:
+        statuses = {}
+        for prepayment_id in prepayment_ids:
+            with record_xero_prepayment_check_request_duration():
+                status = manager.xero_check_prepayment_status(prepayment_id)
+            if status:
+                statuses[prepayment_id] = status
+        return statuses
+
+    statuses = dict(first_batch_statuses)
+    if remaining_batches := batches[1:]:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(remaining_batches))
+        ) as executor:
+            futures = [
+                executor.submit(_check_xero_prepayment_batch_in_thread, manager, batch)
+                for batch in remaining_batches
+            ]
+            for future in as_completed(futures):
+                try:
+                    statuses.update(future.result() or {})
+                except Exception:
+                    logger.exception("Failed to check a batch of Xero prepayments.")
+    return statuses
+
+
 @app.task
 @allow_writer()
 def check_xero_prepayment_statuses_task():
     """Hourly CRON: check all pending Xero prepayments and record payments if paid."""
-    from decimal import Decimal
-
-    from ..order.utils import record_external_payment
+    from ..order.utils import record_external_payments_in_bulk
     from ..payment import CustomPaymentChoices, TransactionKind
     from ..webhook.event_types import WebhookEventSyncType
     from ..webhook.utils import get_webhooks_for_event
+    from .actions import try_auto_approve_fulfillment
     from .models import Fulfillment, FulfillmentStatus
 
     manager = get_plugins_manager(allow_replica=False)
 
     if not any(
         get_webhooks_for_event(WebhookEventSyncType.XERO_CHECK_PREPAYMENT_STATUS)
+    ) and not any(
+        get_webhooks_for_event(WebhookEventSyncType.XERO_CHECK_PREPAYMENT_STATUSES)
     ):
         return
 
-    # Check deposit prepayments: orders with a stored Xero prepayment ID and no deposit_paid_at
-    pending_deposit_orders = (
-        Order.objects.filter(
-            xero_deposit_prepayment_id__isnull=False,
-            deposit_paid_at__isnull=True,
-        )
-        .exclude(payments__psp_reference=F("xero_deposit_prepayment_id"))
-        .select_related("channel")
-    )
-
-    for order in pending_deposit_orders:
-        if order.xero_deposit_prepayment_id is None:
-            continue
-        response = manager.xero_check_prepayment_status(
-            order.xero_deposit_prepayment_id
-        )
-        reconciled = response.get("reconciledAmount") if response else None
-        if not reconciled or Decimal(str(reconciled)) <= 0:
-            continue
-        amount = Decimal(str(reconciled))
-        record_external_payment(
-            order=order,
-            amount=amount,
-            gateway=CustomPaymentChoices.XERO,
-            psp_reference=order.xero_deposit_prepayment_id,
-            transaction_kind=TransactionKind.CAPTURE,
-            metadata={"source": "xero_cron"},
-            user=None,
-            app=None,
-            manager=manager,
+    with record_xero_prepayment_check_duration():
+        # Deposit prepayments: orders with a stored Xero prepayment ID and no
+        # deposit_paid_at
+        pending_deposit_orders = list(
+            Order.objects.filter(
+                xero_deposit_prepayment_id__isnull=False,
+                deposit_paid_at__isnull=True,
+            )
+            .exclude(payments__psp_reference=F("xero_deposit_prepayment_id"))
+            .select_related("channel")
         )
-        order.refresh_from_db(fields=["deposit_paid_at"])
-
-    # Check proforma prepayments: fulfillments with a stored Xero prepayment ID
-    # that don't already have a recorded payment for that ID
-    pending_proforma_fulfillments = (
-        Fulfillment.objects.filter(
-            xero_proforma_prepayment_id__isnull=False,
-            status=FulfillmentStatus.WAITING_FOR_APPROVAL,
+        # Proforma prepayments: fulfillments with a stored Xero prepayment ID
+        # that don't already have a recorded payment for that ID
+        pending_proforma_fulfillments = list(
+            Fulfillment.objects.filter(
+                xero_proforma_prepayment_id__isnull=False,
+                status=FulfillmentStatus.WAITING_FOR_APPROVAL,
+            )
+            .exclude(order__payments__psp_reference=F("xero_proforma_prepayment_id"))
+            .select_related("order", "order__channel")
         )
-        .exclude(order__payments__psp_reference=F("xero_proforma_prepayment_id"))
-        .select_related("order", "order__channel")
-    )
+        # Share one instance per order, so payments to the same order add up
+        orders = {order.pk: order for order in pending_deposit_orders}
+        for fulfillment in pending_proforma_fulfillments:
+            fulfillment.order = orders.setdefault(
+                fulfillment.order_id, fulfillment.order
+            )
 
-    for fulfillment in pending_proforma_fulfillments:
-        if fulfillment.xero_proforma_prepayment_id is None:
-            continue
-        response = manager.xero_check_prepayment_status(
-            fulfillment.xero_proforma_prepayment_id
+        pending = [
+            (order, order.xero_deposit_prepayment_id, None)
+            for order in pending_deposit_orders
+        ] + [
+            (fulfillment.order, fulfillment.xero_proforma_prepayment_id, fulfillment)
+            for fulfillment in pending_proforma_fulfillments
+        ]
+        prepayment_ids = list(
+            dict.fromkeys(prepayment_id for _, prepayment_id, _ in pending)
         )
-        reconciled = response.get("reconciledAmount") if response else None
-        if not reconciled or Decimal(str(reconciled)) <= 0:
-            continue
-        order = fulfillment.order
-        amount = Decimal(str(reconciled))
-        record_external_payment(
-            order=order,
-            amount=amount,
+        statuses = check_xero_prepayment_statuses(manager, prepayment_ids)
+
+        order_payments = []
+        paid_fulfillments = []
+        recorded_ids = set()
+        for order, prepayment_id, fulfillment in pending:
+            amount = _reconciled_amount(statuses.get(prepayment_id))
+            if amount is None or prepayment_id in recorded_ids:
+                continue
+            recorded_ids.add(prepayment_id)
+            order_payments.append((order, amount, prepayment_id))
+            if fulfillment:
+                paid_fulfillments.append(fulfillment)
+
+        record_external_payments_in_bulk(
+            order_payments,
             gateway=CustomPaymentChoices.XERO,
-            psp_reference=fulfillment.xero_proforma_prepayment_id,
             transaction_kind=TransactionKind.CAPTURE,
             metadata={"source": "xero_cron"},
-            user=None,
-            app=None,
             manager=manager,
         )
-        from .actions import try_auto_approve_fulfillment
-
-        try_auto_approve_fulfillment(fulfillment)
+        for fulfillment in paid_fulfillments:
+            try_auto_approve_fulfillment(fulfillment)
+
+    record_xero_prepayments_checked(len(prepayment_ids))
+    record_xero_prepayment_payments_recorded(len(order_payments))
+    logger.info(
+        "Checked %d Xero prepayment(s), recorded %d payment(s).",
+        len(prepayment_ids),
+        len(order_payments),
+    )
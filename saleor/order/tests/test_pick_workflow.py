@@ -2,11 +2,14 @@ import pytest
 
 from .. import PickStatus
 from ..actions import (
+    PickScanData,
+    apply_pick_scans,
     auto_create_pick_for_fulfillment,
     complete_pick,
     start_pick,
     update_pick_item,
 )
+from ..models import PickScan
 
 
 def test_auto_creates_pick_when_fulfillment_waiting_for_approval(
@@ -139,3 +142,76 @@ def test_complete_pick_validates_status(fulfillment, staff_user):
 
     with pytest.raises(ValueError, match="cannot be completed"):
         complete_pick(pick, user=staff_user)
+
+
+def test_apply_pick_scans_updates_items(fulfillment, staff_user):
+    pick = auto_create_pick_for_fulfillment(fulfillment, user=staff_user)
+    start_pick(pick, user=staff_user)
+    pick_item = pick.items.first()
+
+    skipped = apply_pick_scans(
+        pick,
+        [
+            PickScanData("scan-1", pick_item.pk, 1),
+            PickScanData("scan-2", pick_item.pk, pick_item.quantity_to_pick),
+        ],
+        user=staff_user,
+    )
+
+    assert skipped == []
+    pick_item.refresh_from_db()
+    assert pick_item.quantity_picked == pick_item.quantity_to_pick
+    assert pick_item.picked_by == staff_user
+    assert pick_item.picked_at is not None
+    assert set(pick.scans.values_list("client_event_id", flat=True)) == {
+        "scan-1",
+        "scan-2",
+    }
+
+
+def test_apply_pick_scans_skips_recorded_events(fulfillment, staff_user):
+    pick = auto_create_pick_for_fulfillment(fulfillment, user=staff_user)
+    start_pick(pick, user=staff_user)
+    pick_item = pick.items.first()
+    apply_pick_scans(pick, [PickScanData("scan-1", pick_item.pk, 1)])
+
+    skipped = apply_pick_scans(
+        pick,
+        [
+            PickScanData("scan-1", pick_item.pk, 1),
+            PickScanData("scan-2", pick_item.pk, 0),
+            PickScanData("scan-2", pick_item.pk, 1),
+        ],
+    )
+
+    assert skipped == ["scan-1", "scan-2"]
+    pick_item.refresh_from_db()
+    assert pick_item.quantity_picked == 0
+    assert PickScan.objects.filter(pick=pick).count() == 2
+
+
+def test_apply_pick_scans_applies_nothing_on_invalid_scan(fulfillment, staff_user):
+    pick = auto_create_pick_for_fulfillment(fulfillment, user=staff_user)
+    start_pick(pick, user=staff_user)
+    pick_item = pick.items.first()
+
+    with pytest.raises(ValueError, match="cannot exceed"):
+        apply_pick_scans(
+            pick,
+            [
+                PickScanData("scan-1", pick_item.pk, 1),
+                PickScanData("scan-2", pick_item.pk, pick_item.quantity_to_pick + 1),
+            ],
+        )
+
+    pick_item.refresh_from_db()
+    assert pick_item.quantity_picked == 0
+    assert not PickScan.objects.filter(pick=pick).exists()
+
+
+def test_apply_pick_scans_validates_pick_in_progress(fulfillment, staff_user):
+    pick = auto_create_pick_for_fulfillment(fulfillment, user=staff_user)
+    pick_item = pick.items.first()
+
+    with pytest.raises(ValueError, match="not in progress"):
+        apply_pick_scans(pick, [PickScanData("scan-1", pick_item.pk, 1)])
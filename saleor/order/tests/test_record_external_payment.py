@@ -6,7 +6,7 @@ from django.utils import timezone
 
 from ...payment import ChargeStatus, CustomPaymentChoices, TransactionKind
 from ...payment.models import Payment, Transaction
-from ..utils import record_external_payment
+from ..utils import record_external_payment, record_external_payments_in_bulk
 
 
 @pytest.mark.django_db
@@ -339,3 +339,93 @@ def test_deposit_paid_at_not_overwritten_if_already_set(order_with_lines):
 
     order.refresh_from_db()
     assert order.deposit_paid_at == existing_ts
+
+
+@pytest.mark.django_db
+class TestRecordExternalPaymentsInBulk:
+    def test_creates_payments_and_transactions(self, order, order_with_lines):
+        payments = record_external_payments_in_bulk(
+            [
+                (order, Decimal("10.00"), "xero-1"),
+                (order_with_lines, Decimal("20.00"), "xero-2"),
+            ],
+            gateway=CustomPaymentChoices.XERO,
+            transaction_kind=TransactionKind.CAPTURE,
+            metadata={"source": "xero_cron"},
+        )
+
+        assert [payment.psp_reference for payment in payments] == ["xero-1", "xero-2"]
+        payment = Payment.objects.get(psp_reference="xero-2")
+        assert payment.order == order_with_lines
+        assert payment.captured_amount == Decimal("20.00")
+        assert payment.metadata == {"source": "xero_cron"}
+        transaction = Transaction.objects.get(payment=payment)
+        assert transaction.kind == TransactionKind.CAPTURE
+        assert transaction.amount == Decimal("20.00")
+        assert transaction.token == "xero-2"
+
+    def test_accumulates_payments_of_the_same_order(self, order):
+        initial_charged = order.total_charged_amount
+
+        record_external_payments_in_bulk(
+            [
+                (order, Decimal("50.00"), "xero-1"),
+                (order, Decimal("30.00"), "xero-2"),
+            ],
+            gateway=CustomPaymentChoices.XERO,
+            transaction_kind=TransactionKind.CAPTURE,
+        )
+
+        order.refresh_from_db()
+        assert order.total_charged_amount == initial_charged + Decimal("80.00")
+
+    def test_stamps_deposit_paid_at_when_threshold_met(self, order_with_lines):
+        order = order_with_lines
+        order.deposit_required = True
+        order.deposit_percentage = Decimal(30)
+        order.total_gross_amount = Decimal(1000)
+        order.deposit_paid_at = None
+        order.save()
+
+        record_external_payments_in_bulk(
+            [(order, Decimal(300), "XERO-DEP-001")],
+            gateway=CustomPaymentChoices.XERO,
+            transaction_kind=TransactionKind.CAPTURE,
+        )
+
+        order.refresh_from_db()
+        assert order.deposit_paid_at is not None
+
+    def test_triggers_webhooks_for_fully_paid_orders_only(
+        self, order, order_with_lines, plugins_manager
+    ):
+        order_with_lines.total_charged_amount = Decimal(0)
+        order_with_lines.save()
+
+        with patch("saleor.order.actions.call_order_events") as mock_webhooks:
+            record_external_payments_in_bulk(
+                [
+                    (order, order.total.gross.amount, "xero-1"),
+                    (
+                        order_with_lines,
+                        order_with_lines.total.gross.amount / 2,
+                        "xero-2",
+                    ),
+                ],
+                gateway=CustomPaymentChoices.XERO,
+                transaction_kind=TransactionKind.CAPTURE,
+                manager=plugins_manager,
+            )
+
+        mock_webhooks.assert_called_once()
+        assert mock_webhooks.call_args.args[2] == order
+
+    def test_does_nothing_without_payments(self):
+        assert (
+            record_external_payments_in_bulk(
+                [],
+                gateway=CustomPaymentChoices.XERO,
+                transaction_kind=TransactionKind.CAPTURE,
+            )
+            == []
+        )
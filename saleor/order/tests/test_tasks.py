@@ -1245,3 +1245,92 @@ def test_check_xero_prepayment_statuses_deposit_exclude_guards_when_deposit_paid
     # then - not re-checked and no duplicate created
     mock_check_status.assert_not_called()
     assert Payment.objects.filter(psp_reference="DEPOSIT-PARTIAL").count() == 1
+
+
+@pytest.mark.django_db
+@patch("saleor.webhook.utils.get_webhooks_for_event")
+@patch("saleor.plugins.manager.PluginsManager.xero_check_prepayment_status")
+@patch("saleor.plugins.manager.PluginsManager.xero_check_prepayment_statuses")
+def test_check_xero_prepayment_statuses_batched(
+    mock_check_statuses, mock_check_status, mock_get_webhooks, order, fulfillment
+):
+    from decimal import Decimal
+
+    from ...order import FulfillmentStatus
+    from ...payment.models import Payment
+
+    # given
+    order.xero_deposit_prepayment_id = "DEPOSIT-BATCH"
+    order.save(update_fields=["xero_deposit_prepayment_id"])
+    fulfillment.xero_proforma_prepayment_id = "PROFORMA-BATCH"
+    fulfillment.status = FulfillmentStatus.WAITING_FOR_APPROVAL
+    fulfillment.save(update_fields=["xero_proforma_prepayment_id", "status"])
+
+    mock_get_webhooks.return_value = [MagicMock()]
+    mock_check_statuses.return_value = {
+        "DEPOSIT-BATCH": {"prepaymentId": "DEPOSIT-BATCH", "reconciledAmount": "150"},
+        "PROFORMA-BATCH": {"prepaymentId": "PROFORMA-BATCH", "reconciledAmount": "0"},
+    }
+
+    # when
+    from ..tasks import check_xero_prepayment_statuses_task
+
+    check_xero_prepayment_statuses_task()
+
+    # then
+    mock_check_statuses.assert_called_once()
+    assert set(mock_check_statuses.call_args.args[0]) == {
+        "DEPOSIT-BATCH",
+        "PROFORMA-BATCH",
+    }
+    mock_check_status.assert_not_called()
+    payment = Payment.objects.get(psp_reference="DEPOSIT-BATCH")
+    assert payment.order == order
+    assert payment.captured_amount == Decimal(150)
+    assert payment.metadata["source"] == "xero_cron"
+    assert not Payment.objects.filter(psp_reference="PROFORMA-BATCH").exists()
+
+
+def test_check_xero_prepayment_statuses_splits_into_batches():
+    # given
+    from ..tasks import check_xero_prepayment_statuses
+
+    manager = MagicMock()
+    manager.xero_check_prepayment_statuses.side_effect = lambda ids: {
+        prepayment_id: {"prepaymentId": prepayment_id} for prepayment_id in ids
+    }
+    prepayment_ids = [f"PREPAYMENT-{i}" for i in range(5)]
+
+    # when
+    statuses = check_xero_prepayment_statuses(
+        manager, prepayment_ids, batch_size=2, max_workers=2
+    )
+
+    # then
+    assert set(statuses) == set(prepayment_ids)
+    assert sorted(
+        len(batch_call.args[0])
+        for batch_call in manager.xero_check_prepayment_statuses.call_args_list
+    ) == [1, 2, 2]
+    manager.xero_check_prepayment_status.assert_not_called()
+
+
+def test_check_xero_prepayment_statuses_falls_back_to_single_checks():
+    # given
+    from ..tasks import check_xero_prepayment_statuses
+
+    manager = MagicMock()
+    manager.xero_check_prepayment_statuses.return_value = None
+    manager.xero_check_prepayment_status.side_effect = lambda prepayment_id: (
+        {"reconciledAmount": "10"} if prepayment_id == "PAID" else None
+    )
+
+    # when
+    statuses = check_xero_prepayment_statuses(
+        manager, ["PAID", "UNPAID", "OTHER"], batch_size=2
+    )
+
+    # then
+    manager.xero_check_prepayment_statuses.assert_called_once_with(["PAID", "UNPAID"])
+    assert manager.xero_check_prepayment_status.call_count == 3
+    assert statuses == {"PAID": {"reconciledAmount": "10"}}
@@ -8,7 +8,7 @@ import graphene
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import QuerySet, Sum
+from django.db.models import QuerySet, Sum, prefetch_related_objects
 from django.template.defaultfilters import pluralize
 from django.utils import timezone
 from prices import Money, TaxedMoney
@@ -1522,3 +1522,116 @@ def record_external_payment(
         )
 
     return payment
+
+
+def record_external_payments_in_bulk(
+    order_payments: list[tuple["Order", Decimal, str]],
+    *,
+    gateway: str,
+    transaction_kind: str,
+    metadata: dict | None = None,
+    manager: Optional["PluginsManager"] = None,
+) -> list["Payment"]:
+    """Record many external payments with a fixed number of queries.
+
+    Bulk counterpart of record_external_payment for callers without a user or
+    app, such as periodic syncs. An order paid more than once must be passed
+    as the same instance each time, so its amounts add up.
+
+    Args:
+        order_payments: (order, amount, psp_reference) of each payment
+        gateway: Gateway the payments were processed by
+        transaction_kind: Kind of the transaction recorded for each payment
+        metadata: Metadata stored on each payment
+        manager: Plugins manager used to send fully paid events
+
+    Returns:
+        Created payments
+
+    """
+    from ..payment import ChargeStatus
+    from ..payment.models import Payment, Transaction
+
+    if not order_payments:
+        return []
+
+    with traced_atomic_transaction():
+        payments = Payment.objects.bulk_create(
+            [
+                Payment(
+                    order=order,
+                    gateway=gateway,
+                    psp_reference=psp_reference,
+                    total=amount,
+                    captured_amount=amount,
+                    charge_status=ChargeStatus.FULLY_CHARGED,
+                    currency=order.currency,
+                    is_active=True,
+                    billing_email=order.user_email,
+                    metadata=metadata or {},
+                )
+                for order, amount, psp_reference in order_payments
+            ]
+        )
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    payment=payment,
+                    kind=transaction_kind,
+                    amount=payment.total,
+                    currency=payment.currency,
+                    is_success=True,
+                    token=payment.psp_reference,
+                    gateway_response={},
+                )
+                for payment in payments
+            ]
+        )
+
+        orders = list({order.pk: order for order, _, _ in order_payments}.values())
+        prefetch_related_objects(
+            orders, "payments", "payment_transactions", "granted_refunds"
+        )
+        now = timezone.now()
+        for order in orders:
+            updates_amounts_for_order(order, save=False)
+            order.updated_at = now
+            if (
+                order.deposit_required
+                and not order.deposit_paid_at
+                and order.deposit_threshold_met
+            ):
+                order.deposit_paid_at = now
+        Order.objects.bulk_update(
+            orders,
+            [
+                "total_charged_amount",
+                "charge_status",
+                "total_authorized_amount",
+                "authorize_status",
+                "deposit_paid_at",
+                "updated_at",
+            ],
+        )
+
+    fully_paid_orders = [order for order in orders if order.is_fully_paid()]
+    if manager and fully_paid_orders:
+        from ..webhook.event_types import WebhookEventAsyncType
+        from ..webhook.utils import get_webhooks_for_multiple_events
+        from . import actions
+
+        webhook_event_map = get_webhooks_for_multiple_events(
+            actions.WEBHOOK_EVENTS_FOR_FULLY_PAID
+        )
+        for order in fully_paid_orders:
+            actions.call_order_events(
+                manager,
+                [
+                    WebhookEventAsyncType.ORDER_FULLY_PAID,
+                    WebhookEventAsyncType.ORDER_UPDATED,
+                ],
+                order,
+                webhook_event_map=webhook_event_map,
+            )
+
+    return payments
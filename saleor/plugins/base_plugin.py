@@ -1935,6 +1935,11 @@ class BasePlugin:
     ) -> dict | None:
         return NotImplemented
 
+    def xero_check_prepayment_statuses(
+        self, prepayment_ids: list[str], previous_value: dict[str, dict] | None
+    ) -> dict[str, dict] | None:
+        return NotImplemented
+
     def xero_list_bank_accounts(self, domain: str, previous_value: list) -> list:
         return NotImplemented
 
@@ -2976,6 +2976,17 @@ class PluginsManager(PaymentInterface):
             "xero_check_prepayment_status", None, prepayment_id, channel_slug=None
         )
 
+    def xero_check_prepayment_statuses(
+        self, prepayment_ids: list[str]
+    ) -> dict[str, dict] | None:
+        """Return statuses of the prepayments keyed by prepayment ID.
+
+        None means no plugin handles the batched check.
+        """
+        return self.__run_method_on_plugins(
+            "xero_check_prepayment_statuses", None, prepayment_ids, channel_slug=None
+        )
+
     def xero_list_bank_accounts(self, domain: str) -> list:
         return self.__run_method_on_plugins(
             "xero_list_bank_accounts", [], domain, channel_slug=None
@@ -0,0 +1,260 @@
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from ...graphql.response_cache import (
+    ALL_RESPONSES_TAG,
+    entity_tag,
+    invalidate_response_cache,
+    list_tag,
+)
+from ...menu.models import Menu, MenuItem
+from ...product.models import Category, Collection, Product, ProductVariant
+from ..base_plugin import BasePlugin
+
+if TYPE_CHECKING:
+    from ...core.utils.translations import Translation
+    from ...discount.models import Promotion, PromotionRule
+    from ...product.models import ProductMedia
+    from ...warehouse.models import Stock
+
+
+class ResponseCachePlugin(BasePlugin):
+    """Invalidate cached GraphQL responses containing objects that changed.
+
+    Installed by GRAPHQL_RESPONSE_CACHE_ENABLED and active by default, like
+    any plugin without a stored configuration. Changes of prices and
+    translations can affect any response, so they invalidate all of them.
+    """
+
+    PLUGIN_ID = "saleor.response_cache"
+    PLUGIN_NAME = "Response cache"
+    DEFAULT_ACTIVE = True
+    CONFIGURATION_PER_CHANNEL = False
+    HIDDEN = True
+
+    def _invalidate(self, tags: Iterable[str], previous_value):
+        invalidate_response_cache(tags)
+        return previous_value
+
+    def _invalidate_products(self, product_ids: Iterable[int], previous_value):
+        return self._invalidate(
+            [entity_tag(Product, pk) for pk in product_ids] + [list_tag(Product)],
+            previous_value,
+        )
+
+    def _invalidate_variants(
+        self,
+        variants: Iterable[ProductVariant],
+        previous_value,
+        *,
+        lists: bool = True,
+    ):
+        # Lists are tagged with the products they contain, so stock changes
+        # need not invalidate all of them
+        tags = [list_tag(Product), list_tag(ProductVariant)] if lists else []
+        for variant in variants:
+            tags.append(entity_tag(ProductVariant, variant.pk))
+            tags.append(entity_tag(Product, variant.product_id))
+        return self._invalidate(tags, previous_value)
+
+    def _invalidate_all(self, previous_value):
+        return self._invalidate([ALL_RESPONSES_TAG], previous_value)
+
+    def product_created(self, product: "Product", previous_value, webhooks=None):
+        return self._invalidate_products([product.pk], previous_value)
+
+    def product_updated(self, product: "Product", previous_value, webhooks=None):
+        return self._invalidate_products([product.pk], previous_value)
+
+    def product_deleted(
+        self, product: "Product", variants: list[int], previous_value, webhooks=None
+    ):
+        return self._invalidate(
+            [
+                entity_tag(Product, product.pk),
+                list_tag(Product),
+                list_tag(ProductVariant),
+                *(entity_tag(ProductVariant, pk) for pk in variants),
+            ],
+            previous_value,
+        )
+
+    def product_metadata_updated(self, product: "Product", previous_value):
+        return self._invalidate_products([product.pk], previous_value)
+
+    def product_media_created(self, media: "ProductMedia", previous_value):
+        return self._invalidate_products([media.product_id], previous_value)
+
+    def product_media_updated(self, media: "ProductMedia", previous_value):
+        return self._invalidate_products([media.product_id], previous_value)
+
+    def product_media_deleted(self, media: "ProductMedia", previous_value):
+        return self._invalidate_products([media.product_id], previous_value)
+
+    def product_variant_created(
+        self, product_variant: "ProductVariant", previous_value, webhooks=None
+    ):
+        return self._invalidate_variants([product_variant], previous_value)
+
+    def product_variant_updated(
+        self,
+        product_variant: "ProductVariant",
+        previous_value,
+        webhooks=None,
+        **kwargs,
+    ):
+        return self._invalidate_variants([product_variant], previous_value)
+
+    def product_variant_deleted(
+        self, product_variant: "ProductVariant", previous_value, webhooks=None
+    ):
+        return self._invalidate_variants([product_variant], previous_value)
+
+    def product_variant_metadata_updated(
+        self, product_variant: "ProductVariant", previous_value
+    ):
+        return self._invalidate_variants([product_variant], previous_value)
+
+    def product_variant_out_of_stock(
+        self, stock: "Stock", previous_value, webhooks=None
+    ):
+        return self._invalidate_variants(
+            [stock.product_variant], previous_value, lists=False
+        )
+
+    def product_variant_back_in_stock(
+        self, stock: "Stock", previous_value, webhooks=None
+    ):
+        return self._invalidate_variants(
+            [stock.product_variant], previous_value, lists=False
+        )
+
+    def product_variant_stocks_updated(
+        self, stocks: list["Stock"], previous_value, webhooks=None
+    ):
+        variant_ids = {stock.product_variant_id for stock in stocks}
+        variants = ProductVariant.objects.filter(pk__in=variant_ids).only(
+            "pk", "product_id"
+        )
+        return self._invalidate_variants(variants, previous_value, lists=False)
+
+    def collection_created(self, collection: "Collection", previous_value):
+        return self._invalidate_collection(collection, previous_value)
+
+    def collection_updated(self, collection: "Collection", previous_value):
+        return self._invalidate_collection(collection, previous_value)
+
+    def collection_deleted(
+        self, collection: "Collection", previous_value, webhooks=None
+    ):
+        return self._invalidate_collection(collection, previous_value)
+
+    def collection_metadata_updated(self, collection: "Collection", previous_value):
+        return self._invalidate_collection(collection, previous_value)
+
+    def _invalidate_collection(self, collection: "Collection", previous_value):
+        return self._invalidate(
+            [entity_tag(Collection, collection.pk), list_tag(Collection)],
+            previous_value,
+        )
+
+    def category_created(self, category: "Category", previous_value):
+        return self._invalidate_category(category, previous_value)
+
+    def category_updated(self, category: "Category", previous_value):
+        return self._invalidate_category(category, previous_value)
+
+    def category_deleted(self, category: "Category", previous_value, webhooks=None):
+        return self._invalidate_category(category, previous_value)
+
+    def _invalidate_category(self, category: "Category", previous_value):
+        return self._invalidate(
+            [entity_tag(Category, category.pk), list_tag(Category)], previous_value
+        )
+
+    def menu_created(self, menu: "Menu", previous_value):
+        return self._invalidate_menu(menu, previous_value)
+
+    def menu_updated(self, menu: "Menu", previous_value):
+        return self._invalidate_menu(menu, previous_value)
+
+    def menu_deleted(self, menu: "Menu", previous_value, webhooks=None):
+        return self._invalidate_menu(menu, previous_value)
+
+    def _invalidate_menu(self, menu: "Menu", previous_value):
+        return self._invalidate(
+            [entity_tag(Menu, menu.pk), list_tag(Menu)], previous_value
+        )
+
+    def menu_item_created(self, menu_item: "MenuItem", previous_value):
+        return self._invalidate_menu_item(menu_item, previous_value)
+
+    def menu_item_updated(self, menu_item: "MenuItem", previous_value):
+        return self._invalidate_menu_item(menu_item, previous_value)
+
+    def menu_item_deleted(self, menu_item: "MenuItem", previous_value, webhooks=None):
+        return self._invalidate_menu_item(menu_item, previous_value)
+
+    def _invalidate_menu_item(self, menu_item: "MenuItem", previous_value):
+        return self._invalidate(
+            [
+                entity_tag(MenuItem, menu_item.pk),
+                entity_tag(Menu, menu_item.menu_id),
+                list_tag(MenuItem),
+            ],
+            previous_value,
+        )
+
+    def sale_created(self, sale: "Promotion", current_catalogue, previous_value):
+        return self._invalidate_all(previous_value)
+
+    def sale_updated(
+        self,
+        sale: "Promotion",
+        previous_catalogue,
+        current_catalogue,
+        previous_value,
+    ):
+        return self._invalidate_all(previous_value)
+
+    def sale_deleted(
+        self, sale: "Promotion", previous_catalogue, previous_value, webhooks=None
+    ):
+        return self._invalidate_all(previous_value)
+
+    def sale_toggle(self, sale: "Promotion", catalogue, previous_value, webhooks=None):
+        return self._invalidate_all(previous_value)
+
+    def promotion_created(self, promotion: "Promotion", previous_value):
+        return self._invalidate_all(previous_value)
+
+    def promotion_updated(self, promotion: "Promotion", previous_value):
+        return self._invalidate_all(previous_value)
+
+    def promotion_deleted(self, promotion: "Promotion", previous_value, webhooks=None):
+        return self._invalidate_all(previous_value)
+
+    def promotion_started(self, promotion: "Promotion", previous_value, webhooks=None):
+        return self._invalidate_all(previous_value)
+
+    def promotion_ended(self, promotion: "Promotion", previous_value, webhooks=None):
+        return self._invalidate_all(previous_value)
+
+    def promotion_rule_created(self, promotion_rule: "PromotionRule", previous_value):
+        return self._invalidate_all(previous_value)
+
+    def promotion_rule_updated(self, promotion_rule: "PromotionRule", previous_value):
+        return self._invalidate_all(previous_value)
+
+    def promotion_rule_deleted(self, promotion_rule: "PromotionRule", previous_value):
+        return self._invalidate_all(previous_value)
+
+    def translations_created(
+        self, translations: list["Translation"], previous_value, webhooks=None
+    ):
+        return self._invalidate_all(previous_value)
+
+    def translations_updated(
+        self, translations: list["Translation"], previous_value, webhooks=None
+    ):
+        return self._invalidate_all(previous_value)
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+from ....graphql.response_cache import ALL_RESPONSES_TAG, entity_tag, list_tag
+from ....product.models import Product, ProductVariant
+from ...manager import get_plugins_manager
+from ...models import PluginConfiguration
+
+RESPONSE_CACHE_PLUGIN = "saleor.plugins.response_cache.plugin.ResponseCachePlugin"
+
+
+@patch("saleor.plugins.response_cache.plugin.invalidate_response_cache")
+def test_product_updated_invalidates_product(mocked_invalidate, settings, product):
+    # given
+    settings.PLUGINS = [RESPONSE_CACHE_PLUGIN]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    manager.product_updated(product)
+
+    # then
+    mocked_invalidate.assert_called_once_with(
+        [entity_tag(Product, product.pk), list_tag(Product)]
+    )
+
+
+@patch("saleor.plugins.response_cache.plugin.invalidate_response_cache")
+def test_product_variant_updated_invalidates_variant_and_product(
+    mocked_invalidate, settings, variant
+):
+    # given
+    settings.PLUGINS = [RESPONSE_CACHE_PLUGIN]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    manager.product_variant_updated(variant)
+
+    # then
+    tags = mocked_invalidate.call_args.args[0]
+    assert entity_tag(ProductVariant, variant.pk) in tags
+    assert entity_tag(Product, variant.product_id) in tags
+
+
+@patch("saleor.plugins.response_cache.plugin.invalidate_response_cache")
+def test_product_variant_stocks_updated_invalidates_products(
+    mocked_invalidate, settings, variant_with_many_stocks
+):
+    # given
+    settings.PLUGINS = [RESPONSE_CACHE_PLUGIN]
+    manager = get_plugins_manager(allow_replica=False)
+    stocks = list(variant_with_many_stocks.stocks.all())
+
+    # when
+    manager.product_variant_stocks_updated(stocks)
+
+    # then
+    tags = mocked_invalidate.call_args.args[0]
+    assert entity_tag(Product, variant_with_many_stocks.product_id) in tags
+    assert list_tag(Product) not in tags
+
+
+@patch("saleor.plugins.response_cache.plugin.invalidate_response_cache")
+def test_product_variant_created_invalidates_lists(
+    mocked_invalidate, settings, variant
+):
+    # given
+    settings.PLUGINS = [RESPONSE_CACHE_PLUGIN]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    manager.product_variant_created(variant)
+
+    # then
+    tags = mocked_invalidate.call_args.args[0]
+    assert list_tag(Product) in tags
+    assert list_tag(ProductVariant) in tags
+
+
+@patch("saleor.plugins.response_cache.plugin.invalidate_response_cache")
+def test_promotion_updated_invalidates_all_responses(
+    mocked_invalidate, settings, catalogue_promotion
+):
+    # given
+    settings.PLUGINS = [RESPONSE_CACHE_PLUGIN]
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    manager.promotion_updated(catalogue_promotion)
+
+    # then
+    mocked_invalidate.assert_called_once_with([ALL_RESPONSES_TAG])
+
+
+@patch("saleor.plugins.response_cache.plugin.invalidate_response_cache")
+def test_inactive_plugin_does_not_invalidate(mocked_invalidate, settings, product):
+    # given
+    settings.PLUGINS = [RESPONSE_CACHE_PLUGIN]
+    PluginConfiguration.objects.create(
+        identifier="saleor.response_cache", active=False, configuration=[]
+    )
+    manager = get_plugins_manager(allow_replica=False)
+
+    # when
+    manager.product_updated(product)
+
+    # then
+    mocked_invalidate.assert_not_called()
@@ -93,6 +93,7 @@ from ...webhook.payloads import (
     generate_transaction_session_payload,
     generate_translation_payload,
     generate_xero_check_prepayment_status_payload,
+    generate_xero_check_prepayment_statuses_payload,
     generate_xero_list_bank_accounts_payload,
     generate_xero_list_payments_payload,
     generate_xero_list_tax_codes_payload,
@@ -3952,6 +3953,33 @@ class WebhookPlugin(BasePlugin):
                 return response_data
         return previous_value
 
+    def xero_check_prepayment_statuses(
+        self, prepayment_ids: list[str], previous_value: dict[str, dict] | None
+    ) -> dict[str, dict] | None:
+        webhooks = get_webhooks_for_event(
+            WebhookEventSyncType.XERO_CHECK_PREPAYMENT_STATUSES
+        )
+        for webhook in webhooks:
+            payload_str = generate_xero_check_prepayment_statuses_payload(
+                prepayment_ids
+            )
+            response_data = trigger_webhook_sync(
+                event_type=WebhookEventSyncType.XERO_CHECK_PREPAYMENT_STATUSES,
+                payload=payload_str,
+                webhook=webhook,
+                allow_replica=False,
+                subscribable_object=None,
+                requestor=self.requestor,
+                pregenerated_subscription_payload=json.loads(payload_str),
+            )
+            if response_data is not None:
+                return {
+                    status["prepaymentId"]: status
+                    for status in response_data.get("prepayments", [])
+                    if status.get("prepaymentId")
+                }
+        return previous_value
+
     def fulfillment_fulfilled(self, fulfillment, previous_value: None) -> None:
         if not self.active:
             return previous_value
@@ -1,16 +1,20 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 
 
 class ProductAppConfig(AppConfig):
     name = "saleor.product"
 
     def ready(self):
+        from ..attribute.models import AssignedProductAttributeValue, AttributeValue
         from .models import Category, Collection, DigitalContent, ProductMedia
         from .signals import (
             delete_background_image,
             delete_digital_content_file,
             delete_product_media_image,
+            update_supplier_key_of_assignment,
+            update_supplier_keys_of_deleted_value,
+            update_supplier_keys_of_value,
         )
 
         # preventing duplicate signals
@@ -34,3 +38,18 @@ class ProductAppConfig(AppConfig):
             sender=DigitalContent,
             dispatch_uid="delete_digital_content_file",
         )
+        post_save.connect(
+            update_supplier_key_of_assignment,
+            sender=AssignedProductAttributeValue,
+            dispatch_uid="update_supplier_key_of_assignment",
+        )
+        post_save.connect(
+            update_supplier_keys_of_value,
+            sender=AttributeValue,
+            dispatch_uid="update_supplier_keys_of_value",
+        )
+        pre_delete.connect(
+            update_supplier_keys_of_deleted_value,
+            sender=AttributeValue,
+            dispatch_uid="update_supplier_keys_of_deleted_value",
+        )
@@ -0,0 +1,542 @@
+"""Benchmarks for product ingestion and price list processing.
+
+Synthetic supplier workbooks are generated with write_supplier_sheet and run
+through ingest_products_from_excel and the process / activate price list
+tasks. StageProfiler wraps the functions making up each stage (parse,
+dedupe, validate, DB write, media, ...) and records wall time, query count
+and peak traced memory per stage, so runs can be compared commit to commit.
+Stages are timed inclusively: a stage called from inside another, such as
+media written during the DB write, counts towards both.
+
+Every scenario runs in a transaction that is rolled back afterwards, so the
+database is left as it was and repeated runs start from the same state.
+Replica reads are pointed at the default connection for the run so they see
+the uncommitted rows. Media files written to storage are not rolled back.
+Exchange rates come from the local source and images are data URIs, so no
+network access is needed. Run it with the benchmark_ingestion command.
+"""
+
+import base64
+import inspect
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from typing import Any
+from unittest import mock
+
+import attrs
+import openpyxl
+from django.core.files import File
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.test.utils import override_settings
+
+BENCHMARK_ROW_COUNTS = (1_000, 10_000, 100_000)
+
+SCENARIO_INGEST = "ingest"
+SCENARIO_PROCESS_PRICE_LIST = "process_price_list"
+SCENARIO_ACTIVATE_PRICE_LIST = "activate_price_list"
+SCENARIOS = (
+    SCENARIO_INGEST,
+    SCENARIO_PROCESS_PRICE_LIST,
+    SCENARIO_ACTIVATE_PRICE_LIST,
+)
+
+CATEGORIES = ("Apparel", "Footwear")
+SIZES = {
+    "Apparel": ("XS", "S", "M", "L", "XL", "2XL", "3XL", "4XL"),
+    "Footwear": tuple(str(size) for size in range(36, 48)),
+}
+SHEET_NAME = "Sheet1"
+SHEET_HEADERS = [
+    "Code",
+    "Brand",
+    "Description",
+    "Category",
+    "Sizes",
+    "RRP",
+    "Price",
+    "Weight",
+    "Image",
+]
+# PriceList.config column_map for SHEET_HEADERS
+PRICE_LIST_COLUMN_MAP = {
+    "0": "product_code",
+    "1": "brand",
+    "2": "description",
+    "3": "category",
+    "4": "sizes",
+    "5": "rrp",
+    "6": "sell_price",
+    "7": "weight_kg",
+    "8": "image_url",
+}
+# Ingestion only accepts GBP sheets, so SheetSpec.currencies are the channel
+# currencies prices get converted into
+SHEET_CURRENCY_SYMBOL = "£"
+# Rates against EUR, served by the local exchange rate source
+EXCHANGE_RATES = {"GBP": 0.85, "USD": 1.08, "AED": 3.97, "HKD": 8.43}
+
+WAREHOUSE_NAME = "Benchmark Warehouse"
+
+
+@attrs.frozen
+class SheetSpec:
+    """Shape of a synthetic supplier workbook.
+
+    duplicate_rate is the share of rows repeating the (code, brand) of an
+    earlier row with other quantities. currencies are the channel currencies
+    prices are converted into. image_rate is the share of rows with an
+    image, drawn from distinct_images different images.
+    """
+
+    rows: int
+    sizes_per_row: int = 5
+    duplicate_rate: float = 0.02
+    currencies: tuple[str, ...] = ("GBP",)
+    image_rate: float = 0.5
+    distinct_images: int = 20
+    seed: int = 0
+
+
+def _image_data_uris(count: int) -> list[str]:
+    from PIL import Image
+
+    uris = []
+    for idx in range(count):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1, 1), (idx % 256, idx // 256 % 256, 0)).save(buffer, "PNG")
+        encoded = base64.b64encode(buffer.getvalue()).decode()
+        uris.append(f"data:image/png;base64,{encoded}")
+    return uris
+
+
+def generate_sheet_rows(spec: SheetSpec, currency_symbol: str = "") -> Iterator[list]:
+    """Yield SHEET_HEADERS rows for the spec, the same for the same seed.
+
+    Prices are numbers, or strings prefixed with currency_symbol if given.
+    """
+    rng = random.Random(spec.seed)
+    images = _image_data_uris(spec.distinct_images) if spec.image_rate else []
+    products: list[tuple[str, str, str, str]] = []
+    for idx in range(spec.rows):
+        if products and rng.random() < spec.duplicate_rate:
+            code, brand, description, category = rng.choice(products)
+        else:
+            category = CATEGORIES[idx % len(CATEGORIES)]
+            code = f"BENCH-{idx:06d}"
+            brand = f"Brand {idx % 50}"
+            description = f"Benchmark {category} {idx}"
+            products.append((code, brand, description, category))
+        sizes = rng.sample(
+            SIZES[category], min(spec.sizes_per_row, len(SIZES[category]))
+        )
+        price = rng.randint(500, 20_000) / 100
+        prices: list[Any] = [price * 2, price]
+        if currency_symbol:
+            prices = [f"{currency_symbol}{value:.2f}" for value in prices]
+        image = rng.choice(images) if images and rng.random() < spec.image_rate else ""
+        yield [
+            code,
+            brand,
+            description,
+            category,
+            ", ".join(f"{size} [{rng.randint(1, 100)}]" for size in sizes),
+            *prices,
+            rng.randint(1, 300) / 100,
+            image,
+        ]
+
+
+def write_supplier_sheet(path: str, spec: SheetSpec, currency_symbol: str = ""):
+    """Write a synthetic supplier workbook to path, streaming rows to disk."""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    sheet.append(SHEET_HEADERS)
+    for row in generate_sheet_rows(spec, currency_symbol):
+        sheet.append(row)
+    workbook.save(path)
+
+
+@attrs.define
+class StageStats:
+    calls: int = 0
+    wall_time: float = 0.0
+    queries: int = 0
+    # Bytes traced above the level at entry, measured on top-level calls only
+    peak_memory: int = 0
+
+
+class StageProfiler:
+    """Time named stages by wrapping the functions that implement them.
+
+    stages maps a stage name to (owner, attribute) pairs, e.g.
+    (ingestion, "deduplicate_products"); the attributes are replaced for the
+    duration of profile(), so functions imported at call time are covered
+    too. Generator functions are timed while they are iterated.
+    """
+
+    def __init__(
+        self, stages: dict[str, list[tuple[Any, str]]], trace_memory: bool = True
+    ):
+        self.stages = stages
+        self.trace_memory = trace_memory
+        self.stats: dict[str, StageStats] = {}
+        self.wall_time = 0.0
+        self.queries = 0
+        self.peak_memory = 0
+        self._active: list[str] = []
+        self._memory_at_entry = 0
+        # Totals of top-level stage calls, which never overlap
+        self._staged_time = 0.0
+        self._staged_queries = 0
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def _stage(self, name: str):
+        stats = self.stats.setdefault(name, StageStats())
+        reentered = name in self._active
+        top_level = not self._active
+        if top_level and self.trace_memory:
+            self._memory_at_entry = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        queries_at_entry = self.queries
+        start = time.perf_counter()
+        self._active.append(name)
+        try:
+            yield
+        finally:
+            self._active.pop()
+            elapsed = time.perf_counter() - start
+            queries = self.queries - queries_at_entry
+            if not reentered:
+                stats.calls += 1
+                stats.wall_time += elapsed
+                stats.queries += queries
+            if top_level:
+                self._staged_time += elapsed
+                self._staged_queries += queries
+                if self.trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    self.peak_memory = max(self.peak_memory, peak)
+                    stats.peak_memory = max(
+                        stats.peak_memory, peak - self._memory_at_entry
+                    )
+
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        if inspect.isgeneratorfunction(func):
+
+            def generator_wrapper(*args, **kwargs):
+                iterator = func(*args, **kwargs)
+                while True:
+                    with self._stage(name):
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                    yield item
+
+            return generator_wrapper
+
+        def wrapper(*args, **kwargs):
+            with self._stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @contextmanager
+    def profile(self):
+        with ExitStack() as stack:
+            for name, targets in self.stages.items():
+                self.stats.setdefault(name, StageStats())
+                for owner, attribute in targets:
+                    func = getattr(owner, attribute)
+                    stack.enter_context(
+                        mock.patch.object(owner, attribute, self._wrap(name, func))
+                    )
+            stack.enter_context(connection.execute_wrapper(self._count_query))
+            started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                yield self
+            finally:
+                self.wall_time = time.perf_counter() - start
+                if self.trace_memory:
+                    self.peak_memory = max(
+                        self.peak_memory, tracemalloc.get_traced_memory()[1]
+                    )
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def report(self) -> dict:
+        """Return the stats as JSON-serializable data.
+
+        The "other" stage holds the time and queries spent outside any stage.
+        peak_memory is None when memory was not traced.
+        """
+        stages: dict[str, dict] = {
+            name: attrs.asdict(stats) for name, stats in self.stats.items()
+        }
+        if not self.trace_memory:
+            for stats in stages.values():
+                stats["peak_memory"] = None
+        stages["other"] = {
+            "calls": None,
+            "wall_time": max(self.wall_time - self._staged_time, 0.0),
+            "queries": self.queries - self._staged_queries,
+            "peak_memory": None,
+        }
+        return {
+            "wall_time": self.wall_time,
+            "queries": self.queries,
+            "peak_memory": self.peak_memory if self.trace_memory else None,
+            "stages": stages,
+        }
+
+
+def setup_catalogue(currencies: tuple[str, ...]):
+    """Create what ingestion validates against: attributes, types, channels.
+
+    Returns the benchmark warehouse and one channel per currency.
+    """
+    from ..attribute import AttributeInputType, AttributeType
+    from ..attribute.models import Attribute
+    from ..channel.models import Channel
+    from ..warehouse.models import Warehouse
+    from .ingestion import create_warehouse_with_address
+    from .models import Category, ProductType
+
+    attributes = {}
+    for name, input_type in [
+        ("Product Code", AttributeInputType.PLAIN_TEXT),
+        ("Brand", AttributeInputType.PLAIN_TEXT),
+        ("RRP", AttributeInputType.NUMERIC),
+        ("Minimum Order Quantity", AttributeInputType.NUMERIC),
+        ("Size", AttributeInputType.DROPDOWN),
+    ]:
+        attributes[name], _ = Attribute.objects.get_or_create(
+            name=name,
+            defaults={
+                "slug": name.lower().replace(" ", "-"),
+                "type": AttributeType.PRODUCT_TYPE,
+                "input_type": input_type,
+            },
+        )
+    for name in CATEGORIES:
+        slug = name.lower()
+        Category.objects.get_or_create(name=name, defaults={"slug": slug})
+        product_type, _ = ProductType.objects.get_or_create(
+            name=name, defaults={"slug": slug, "has_variants": True}
+        )
+        product_type.product_attributes.add(
+            *(attributes[attr] for attr in attributes if attr != "Size")
+        )
+        product_type.variant_attributes.add(attributes["Size"])
+
+    channels = [
+        Channel.objects.get_or_create(
+            slug=f"benchmark-{currency.lower()}",
+            defaults={
+                "name": f"Benchmark {currency}",
+                "currency_code": currency,
+                "default_country": "GB",
+                "is_active": True,
+            },
+        )[0]
+        for currency in currencies
+    ]
+    warehouse = Warehouse.objects.filter(
+        name=WAREHOUSE_NAME
+    ).first() or create_warehouse_with_address(WAREHOUSE_NAME, "1 Benchmark St", "GB")
+    return warehouse, channels
+
+
+def _ingestion_stages() -> dict[str, list[tuple[Any, str]]]:
+    from . import ingestion, search
+    from .utils import variant_prices
+
+    return {
+        "parse": [
+            (ingestion, "read_excel_with_validation"),
+            (ingestion, "process_excel_row"),
+        ],
+        "dedupe": [(ingestion, "deduplicate_products")],
+        "validate": [
+            (ingestion, "validate_product_types"),
+            (ingestion, "validate_categories"),
+            (ingestion, "validate_attributes"),
+            (ingestion, "validate_product_type_attributes"),
+            (ingestion, "check_existing_products"),
+        ],
+        "media": [
+            (ingestion, "fetch_images"),
+            (ingestion, "create_product_media_bulk"),
+        ],
+        "db_write": [
+            (ingestion, "ingest_new_products"),
+            (ingestion, "update_existing_products"),
+            (variant_prices, "update_discounted_prices_for_promotion"),
+        ],
+        "search_index": [(search, "update_products_search_vector")],
+    }
+
+
+def _process_price_list_stages() -> dict[str, list[tuple[Any, str]]]:
+    from . import price_list_parsing, tasks
+    from .models import PriceListItem
+
+    return {
+        "read": [
+            (price_list_parsing, "estimate_sheet_rows"),
+            (price_list_parsing, "iter_sheet_chunks"),
+        ],
+        "parse": [(price_list_parsing, "parse_sheet")],
+        "dedupe": [(tasks, "_dedupe_parsed_rows")],
+        "db_write": [(PriceListItem.objects, "bulk_create")],
+        "link": [(tasks, "_link_price_list_items_to_products")],
+    }
+
+
+def _activate_price_list_stages() -> dict[str, list[tuple[Any, str]]]:
+    from . import ingestion, price_list_activation, search, tasks
+
+    return {
+        "media": [
+            (tasks, "_fetch_price_list_images"),
+            (ingestion, "create_product_media_bulk"),
+        ],
+        "validate": [
+            (ingestion, "get_products_by_code_and_brand"),
+            (tasks, "_load_activation_context"),
+        ],
+        "plan": [(price_list_activation, "plan_activation")],
+        "db_write": [(price_list_activation, "apply_activation_plan")],
+        "search_index": [(search, "update_products_search_vector")],
+    }
+
+
+def _run_ingest(path, warehouse, channels, trace_memory):
+    from .ingestion import (
+        IngestConfig,
+        SpreadsheetColumnMapping,
+        ingest_products_from_excel,
+    )
+
+    config = IngestConfig(
+        warehouse_name=warehouse.name,
+        warehouse_address=warehouse.address.street_address_1,
+        warehouse_country=str(warehouse.address.country),
+        sheet_name=SHEET_NAME,
+        column_mapping=SpreadsheetColumnMapping(),
+        minimum_order_quantity=1,
+        confirm_price_interpretation=True,
+    )
+    profiler = StageProfiler(_ingestion_stages(), trace_memory)
+    with profiler.profile():
+        ingest_products_from_excel(config, path)
+    return profiler.report()
+
+
+def _create_price_list(path, warehouse, channels):
+    from .models import PriceList
+
+    with open(path, "rb") as f:
+        price_list = PriceList.objects.create(
+            warehouse=warehouse,
+            name="Benchmark",
+            excel_file=File(f, name=os.path.basename(path)),
+            config={
+                "sheet_name": SHEET_NAME,
+                "header_row": 0,
+                "column_map": PRICE_LIST_COLUMN_MAP,
+                "default_currency": "GBP",
+            },
+        )
+    price_list.channels.set(channels)
+    return price_list
+
+
+def _run_process_price_list(path, warehouse, channels, trace_memory):
+    from .tasks import process_price_list_task
+
+    price_list = _create_price_list(path, warehouse, channels)
+    try:
+        profiler = StageProfiler(_process_price_list_stages(), trace_memory)
+        with profiler.profile():
+            process_price_list_task(price_list.pk)
+        return profiler.report()
+    finally:
+        price_list.excel_file.delete(save=False)
+
+
+def _run_activate_price_list(path, warehouse, channels, trace_memory):
+    from . import search, tasks
+
+    price_list = _create_price_list(path, warehouse, channels)
+    try:
+        tasks.process_price_list_task(price_list.pk)
+        profiler = StageProfiler(_activate_price_list_stages(), trace_memory)
+        # Search vectors are updated by the beat task in the background;
+        # update them here for the activated products instead
+        with (
+            mock.patch.object(tasks.update_products_search_vector_task, "delay"),
+            profiler.profile(),
+        ):
+            tasks.activate_price_list_task(price_list.pk)
+            search.update_products_search_vector(
+                price_list.current_items()
+                .filter(product__isnull=False)
+                .values_list("product_id", flat=True)
+            )
+        return profiler.report()
+    finally:
+        price_list.excel_file.delete(save=False)
+
+
+SCENARIO_RUNNERS = {
+    SCENARIO_INGEST: _run_ingest,
+    SCENARIO_PROCESS_PRICE_LIST: _run_process_price_list,
+    SCENARIO_ACTIVATE_PRICE_LIST: _run_activate_price_list,
+}
+
+
+def run_benchmark(scenario: str, spec: SheetSpec, trace_memory: bool = True) -> dict:
+    """Run one scenario on a synthetic sheet and roll back everything it wrote.
+
+    Returns the StageProfiler report with the scenario and spec added.
+    """
+    runner = SCENARIO_RUNNERS[scenario]
+    currency_symbol = SHEET_CURRENCY_SYMBOL if scenario == SCENARIO_INGEST else ""
+    with (
+        tempfile.TemporaryDirectory() as tmp_dir,
+        override_settings(
+            EXCHANGE_RATES_SOURCE="local",
+            EXCHANGE_RATES_LOCAL=EXCHANGE_RATES,
+            DATABASE_CONNECTION_REPLICA_NAME=DEFAULT_DB_ALIAS,
+        ),
+    ):
+        path = os.path.join(tmp_dir, "benchmark.xlsx")
+        write_supplier_sheet(path, spec, currency_symbol)
+        with transaction.atomic():
+            try:
+                warehouse, channels = setup_catalogue(spec.currencies)
+                report = runner(path, warehouse, channels, trace_memory)
+            finally:
+                transaction.set_rollback(True)
+    return {
+        "scenario": scenario,
+        "spec": attrs.asdict(spec),
+        "database": connection.vendor,
+        **report,
+    }
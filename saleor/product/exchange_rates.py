@@ -0,0 +1,143 @@
+"""Exchange rates used by product ingestion and price list activation.
+
+Rates map currency codes to their rate against EUR, the Frankfurter API
+base, which itself is left out of the map. convert_price raises
+ExchangeRateMissing for any other currency missing from it, rather than
+converting 1:1.
+
+Fetched rates are kept in the shared Django cache for
+EXCHANGE_RATES_CACHE_TTL so workers do not each call the API. The last
+successful fetch is also kept without expiry and served, with a warning,
+when the API is down. With no rates to fall back on, ExchangeRatesUnavailable
+is raised instead of silently converting 1:1.
+
+Setting EXCHANGE_RATES_SOURCE to "local" serves EXCHANGE_RATES_LOCAL and
+never touches the network, for tests and air-gapped runs.
+"""
+
+import datetime
+import logging
+from typing import TYPE_CHECKING
+
+import attrs
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from .models import PriceList
+
+logger = logging.getLogger(__name__)
+
+FRANKFURTER_URL = "https://api.frankfurter.app/latest"
+FRANKFURTER_TIMEOUT = 10
+
+# Currency the rates are relative to
+BASE_CURRENCY = "EUR"
+
+EXCHANGE_RATES_SOURCE_FRANKFURTER = "frankfurter"
+EXCHANGE_RATES_SOURCE_LOCAL = "local"
+
+CACHE_KEY = "product.exchange_rates"
+LAST_GOOD_CACHE_KEY = "product.exchange_rates.last_good"
+
+
+class ExchangeRatesUnavailable(Exception):
+    """Raised when no exchange rates can be fetched or served from cache."""
+
+
+@attrs.frozen
+class ExchangeRateSnapshot:
+    """Exchange rates published on a given date."""
+
+    date: datetime.date
+    rates: dict[str, float]
+
+    def to_cache(self) -> dict:
+        return {"date": self.date.isoformat(), "rates": self.rates}
+
+    @classmethod
+    def from_cache(cls, data: dict) -> "ExchangeRateSnapshot":
+        return cls(date=datetime.date.fromisoformat(data["date"]), rates=data["rates"])
+
+
+def fetch_frankfurter_rates() -> ExchangeRateSnapshot:
+    """Fetch the latest rates from the Frankfurter API.
+
+    Raises on any network, HTTP or decoding error.
+    """
+    from ..core.http_client import HTTPClient
+
+    response = HTTPClient.send_request(
+        "GET",
+        FRANKFURTER_URL,
+        timeout=FRANKFURTER_TIMEOUT,
+        allow_redirects=True,
+    )
+    response.raise_for_status()
+    data = response.json()
+    return ExchangeRateSnapshot(
+        date=datetime.date.fromisoformat(data["date"]),
+        rates={code: float(rate) for code, rate in data["rates"].items()},
+    )
+
+
+def get_local_rates() -> ExchangeRateSnapshot:
+    return ExchangeRateSnapshot(
+        date=timezone.now().date(), rates=dict(settings.EXCHANGE_RATES_LOCAL)
+    )
+
+
+def get_exchange_rate_snapshot() -> ExchangeRateSnapshot:
+    """Return current exchange rates from the configured source.
+
+    Raises:
+        ExchangeRatesUnavailable: The API failed and no earlier rates are cached
+
+    """
+    if settings.EXCHANGE_RATES_SOURCE == EXCHANGE_RATES_SOURCE_LOCAL:
+        return get_local_rates()
+
+    if cached := cache.get(CACHE_KEY):
+        return ExchangeRateSnapshot.from_cache(cached)
+
+    try:
+        snapshot = fetch_frankfurter_rates()
+    except Exception as e:
+        if last_good := cache.get(LAST_GOOD_CACHE_KEY):
+            snapshot = ExchangeRateSnapshot.from_cache(last_good)
+            logger.warning(
+                "Failed to fetch exchange rates: %s; using rates from %s",
+                e,
+                snapshot.date,
+            )
+            return snapshot
+        raise ExchangeRatesUnavailable(f"Failed to fetch exchange rates: {e}") from e
+
+    logger.info("Fetched exchange rates for %s: %s", snapshot.date, snapshot.rates)
+    cache.set(
+        CACHE_KEY,
+        snapshot.to_cache(),
+        timeout=settings.EXCHANGE_RATES_CACHE_TTL.total_seconds(),
+    )
+    cache.set(LAST_GOOD_CACHE_KEY, snapshot.to_cache(), timeout=None)
+    return snapshot
+
+
+def get_exchange_rates() -> dict[str, float]:
+    """Return current exchange rates, relative to EUR."""
+    return get_exchange_rate_snapshot().rates
+
+
+def get_price_list_exchange_rates(price_list: "PriceList") -> dict[str, float]:
+    """Return the rates snapshotted on the price list, taking one if needed.
+
+    The first activation stores the current rates on the price list, so later
+    activations convert prices identically and need no network.
+    """
+    if price_list.exchange_rates_date is None:
+        snapshot = get_exchange_rate_snapshot()
+        price_list.exchange_rates = snapshot.rates
+        price_list.exchange_rates_date = snapshot.date
+        price_list.save(update_fields=["exchange_rates", "exchange_rates_date"])
+    return price_list.exchange_rates
@@ -1,7 +1,10 @@
 """Product ingestion utilities."""
 
+import hashlib
 import logging
 import re
+from collections.abc import Iterable
+from contextlib import contextmanager
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
@@ -16,6 +19,7 @@ from saleor.attribute.models.product_variant import (
     AssignedVariantAttributeValue,
     AttributeVariant,
 )
+from saleor.product.exchange_rates import BASE_CURRENCY, get_exchange_rates
 from saleor.warehouse.models import Stock, Warehouse
 
 if TYPE_CHECKING:
@@ -32,6 +36,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+IMAGE_FETCH_CONCURRENCY = 8
+IMAGE_FETCH_TIMEOUT = 30
+IMAGE_FETCH_MAX_BYTES = 20 * 1024 * 1024
+IMAGE_FETCH_CHUNK_SIZE = 64 * 1024
+
 
 # ============================================================================
 # Custom Exceptions for Interactive Decision Points
@@ -60,6 +69,10 @@ class CurrencyIncompatible(SheetIntegrityError):
     """The RRP and sell price are DIFFERENT currencies."""
 
 
+class ExchangeRateMissing(CurrencyIncompatible):
+    """A price is in, or converted to, a currency the exchange rates lack."""
+
+
 class DuplicateProducts(SheetIntegrityError):
     """There exists multiple rows with (brand,product_code) matching."""
 
@@ -298,9 +311,32 @@ class ProductData:
     image_url: str | None
 
 
+@attrs.frozen
+class ChunkResult:
+    """Statistics of one committed chunk of a chunked ingestion."""
+
+    index: int
+    created_product_ids: list[int]
+    updated_product_ids: list[int]
+    variants_created: int
+    variants_updated: int
+    skipped_products: int = 0
+
+    def to_dict(self) -> dict:
+        return attrs.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChunkResult":
+        return cls(**data)
+
+
 @attrs.frozen
 class IngestionResult:
-    """Result of product ingestion operation."""
+    """Result of product ingestion operation.
+
+    chunks holds per-chunk statistics of a chunked ingestion; the totals
+    above aggregate them.
+    """
 
     created_products: list["Product"]
     updated_products: list["Product"]
@@ -309,6 +345,7 @@ class IngestionResult:
     total_variants_updated: int
     warehouse: Warehouse
     skipped_products: int = 0
+    chunks: list[ChunkResult] = attrs.Factory(list)
 
 
 def parse_sizes_and_qty(
@@ -467,53 +504,25 @@ def get_products_by_code_and_brand(
         CommandError: If Product Code or Brand attributes not found
 
     """
-    from saleor.attribute.models.product import AssignedProductAttributeValue
-    from saleor.product.models import Product
-
-    # Get Product Code and Brand attributes
-    product_code_attr = Attribute.objects.filter(name="Product Code").first()
-    brand_attr = Attribute.objects.filter(name="Brand").first()
+    from saleor.product.supplier_keys import get_products_by_supplier_key
 
-    if not product_code_attr:
+    attribute_names = set(
+        Attribute.objects.filter(name__in=["Product Code", "Brand"]).values_list(
+            "name", flat=True
+        )
+    )
+    if "Product Code" not in attribute_names:
         raise MissingDatabaseSetup(
             "Product Code attribute not found in database. "
             "Please create a 'Product Code' attribute before ingesting products."
         )
-    if not brand_attr:
+    if "Brand" not in attribute_names:
         raise MissingDatabaseSetup(
             "Brand attribute not found in database. "
             "Please create a 'Brand' attribute before ingesting products."
         )
 
-    matching_codes = AttributeValue.objects.filter(
-        attribute=product_code_attr,
-        name__iregex=r"^(" + "|".join(map(re.escape, product_codes)) + r")$",
-    ).prefetch_related("productvalueassignment__product")
-
-    # Collect all (product, code_name) pairs via the prefetch
-    product_code_pairs: list[tuple[Product, str]] = [
-        (assignment.product, code_value.name)
-        for code_value in matching_codes
-        for assignment in code_value.productvalueassignment.all()
-    ]
-
-    if not product_code_pairs:
-        return {}
-
-    # Batch-fetch all brand assignments in one query
-    product_ids = [product.pk for product, _ in product_code_pairs]
-    brand_map: dict[int, str] = {
-        ba.product_id: ba.value.name
-        for ba in AssignedProductAttributeValue.objects.filter(
-            product_id__in=product_ids, value__attribute=brand_attr
-        ).select_related("value")
-    }
-
-    return {
-        (code_name.lower(), brand_map[product.pk].lower()): product
-        for product, code_name in product_code_pairs
-        if product.pk in brand_map
-    }
+    return get_products_by_supplier_key(product_codes)
 
 
 def validate_warehouse_for_ingestion(warehouse: Warehouse) -> None:
@@ -1554,33 +1563,6 @@ def check_existing_products(
 # ============================================================================
 
 
-def get_exchange_rates() -> dict[str, float]:
-    """Fetch current exchange rates from Frankfurter API.
-
-    Returns:
-        Dictionary mapping currency codes to exchange rates (relative to base currency)
-
-    """
-    from saleor.core.http_client import HTTPClient
-
-    try:
-        response = HTTPClient.send_request(
-            "GET",
-            "https://api.frankfurter.app/latest",
-            timeout=10,
-            allow_redirects=True,
-        )
-        response.raise_for_status()
-        data = response.json()
-        rates = data.get("rates", {})
-        logger.info("Fetched exchange rates: %s", rates)
-        return rates
-    except Exception as e:
-        logger.error("Failed to fetch exchange rates: %s", e)
-        logger.warning("Using default exchange rates (1:1)")
-        return {}
-
-
 def convert_price(
     price: float, from_currency: str, to_currency: str, exchange_rates: dict[str, float]
 ) -> Decimal:
@@ -1590,27 +1572,29 @@ def convert_price(
         price: Price amount to convert
         from_currency: Source currency code (e.g., "GBP")
         to_currency: Target currency code (e.g., "USD")
-        exchange_rates: Dictionary of exchange rates
+        exchange_rates: Rates relative to EUR, from exchange_rates.get_exchange_rates
+            or a price list snapshot
 
     Returns:
         Converted price as Decimal
 
+    Raises:
+        ExchangeRateMissing: The rates lack either currency
+
     """
     if from_currency == to_currency:
         return Decimal(str(price))
 
-    # If no exchange rates available, return as-is
-    if not exchange_rates:
-        logger.warning(
-            "No exchange rates available, using price as-is: %s %s",
-            price,
-            from_currency,
+    # Rates are relative to the base currency, which is left out of them
+    rates = {BASE_CURRENCY: 1.0, **exchange_rates}
+    missing = [code for code in (from_currency, to_currency) if code not in rates]
+    if missing:
+        raise ExchangeRateMissing(
+            f"No exchange rate for {', '.join(missing)}; cannot convert "
+            f"{price} {from_currency} to {to_currency}."
         )
-        return Decimal(str(price))
-
-    # Get rates for both currencies
-    from_rate = exchange_rates.get(from_currency, 1.0)
-    to_rate = exchange_rates.get(to_currency, 1.0)
+    from_rate = rates[from_currency]
+    to_rate = rates[to_currency]
 
     # Convert: price / from_rate * to_rate
     converted = (price / from_rate) * to_rate
@@ -1711,6 +1695,196 @@ def create_product_channel_listing(
     return listing
 
 
+@attrs.frozen
+class FetchedImage:
+    """Image content fetched ahead of the database writes."""
+
+    content: bytes
+    ext: str
+
+    @property
+    def storage_name(self) -> str:
+        """Content-addressed name, so identical images are stored once."""
+        content_hash = hashlib.sha256(self.content).hexdigest()
+        return f"products/{content_hash}.{self.ext}"
+
+
+@attrs.frozen
+class StoredImage:
+    """Fetched image already written to storage, referenced by its file name."""
+
+    name: str
+    ext: str
+
+
+def store_image(image: FetchedImage) -> StoredImage:
+    """Write an image to storage under its content hash, unless already there."""
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+
+    name = image.storage_name
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(image.content))
+    return StoredImage(name=name, ext=image.ext)
+
+
+def fetch_image(image_url: str) -> FetchedImage:
+    """Download an http(s) image or decode a data: URI.
+
+    Raises on any network, HTTP or decoding error, and on images larger than
+    IMAGE_FETCH_MAX_BYTES; a download stops as soon as it exceeds the limit.
+    """
+    import base64
+    import mimetypes
+    from io import BytesIO
+    from urllib.parse import urlparse
+
+    if image_url.startswith("data:"):
+        header, encoded = image_url.split(",", 1)
+        mime_type = header[5:].split(";")[0]
+        ext_with_dot = mimetypes.guess_extension(mime_type) or ".jpg"
+        ext = ext_with_dot.lstrip(".")
+        if ext in ("jpe", "jpeg"):
+            ext = "jpg"
+        if len(encoded) * 3 // 4 > IMAGE_FETCH_MAX_BYTES:
+            raise ValueError(f"Image exceeds {IMAGE_FETCH_MAX_BYTES} bytes")
+        return FetchedImage(content=base64.b64decode(encoded), ext=ext)
+
+    from saleor.core.http_client import HTTPClient
+
+    with HTTPClient.send_request(
+        "GET",
+        image_url,
+        stream=True,
+        timeout=IMAGE_FETCH_TIMEOUT,
+        allow_redirects=True,
+    ) as response:
+        response.raise_for_status()
+        size_error_msg = f"Image exceeds {IMAGE_FETCH_MAX_BYTES} bytes"
+        try:
+            content_length = int(response.headers.get("content-length", 0))
+        except (ValueError, TypeError):
+            content_length = 0
+        if content_length > IMAGE_FETCH_MAX_BYTES:
+            raise ValueError(size_error_msg)
+        content = BytesIO()
+        for chunk in response.iter_content(chunk_size=IMAGE_FETCH_CHUNK_SIZE):
+            content.write(chunk)
+            if content.tell() > IMAGE_FETCH_MAX_BYTES:
+                raise ValueError(size_error_msg)
+
+    url_path = urlparse(image_url).path.split("/")[-1]
+    if "." in url_path and not url_path.startswith("."):
+        ext = url_path.split(".")[-1].split("?")[0]
+    else:
+        ext = "jpg"
+    return FetchedImage(content=content.getvalue(), ext=ext)
+
+
+def _fetch_and_store_image(image_url: str) -> StoredImage:
+    return store_image(fetch_image(image_url))
+
+
+def fetch_images(
+    image_urls: Iterable[str], max_workers: int = IMAGE_FETCH_CONCURRENCY
+) -> dict[str, StoredImage]:
+    """Fetch each distinct image URL once, at most max_workers at a time.
+
+    Meant to run before the ingest transaction opens so slow image hosts do
+    not hold it open. Each image is written to storage as soon as it is
+    downloaded, so at most max_workers images are held in memory. Files of
+    a run that fails later are left in storage and reused by the next one.
+    URLs that fail are logged and left out of the result.
+
+    Args:
+        image_urls: Image URLs, possibly repeated or empty
+        max_workers: Maximum number of concurrent downloads
+
+    Returns:
+        Map of image URL to the stored image
+
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    unique_urls = list(dict.fromkeys(url for url in image_urls if url))
+    images: dict[str, StoredImage] = {}
+    if not unique_urls:
+        return images
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as executor:
+        futures = {
+            executor.submit(_fetch_and_store_image, url): url for url in unique_urls
+        }
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                images[url] = future.result()
+            except Exception as e:
+                logger.error("Failed to fetch image %s: %s", url[:80], e)
+
+    logger.info("Fetched %d of %d unique image(s)", len(images), len(unique_urls))
+    return images
+
+
+def create_product_media_bulk(
+    product_images: list[tuple["Product", str]],
+    images: dict[str, StoredImage],
+) -> list["ProductMedia"]:
+    """Create ProductMedia for (product, image_url) pairs from prefetched images.
+
+    Media rows showing the same image content share its stored file. Pairs
+    whose URL is missing from images (the fetch failed) are skipped, as
+    create_product_media does on fetch errors.
+
+    Args:
+        product_images: Products paired with the image URL to attach
+        images: Result of fetch_images for those URLs
+
+    Returns:
+        Created ProductMedia instances
+
+    """
+    from django.db.models import Max
+
+    from saleor.product.models import ProductMedia
+
+    product_ids = {product.pk for product, _ in product_images}
+    next_sort_order = {
+        row["product_id"]: row["max_sort_order"] + 1
+        for row in ProductMedia.objects.filter(product_id__in=product_ids)
+        .values("product_id")
+        .annotate(max_sort_order=Max("sort_order"))
+        .order_by()
+        if row["max_sort_order"] is not None
+    }
+
+    stored_names: set[str] = set()
+    media = []
+    for product, image_url in product_images:
+        image = images.get(image_url)
+        if image is None:
+            continue
+        stored_names.add(image.name)
+        sort_order = next_sort_order.get(product.pk, 0)
+        next_sort_order[product.pk] = sort_order + 1
+        media.append(
+            ProductMedia(
+                product=product,
+                alt=product.name,
+                image=image.name,
+                sort_order=sort_order,
+            )
+        )
+
+    created = ProductMedia.objects.bulk_create(media)
+    logger.info(
+        "Created %d product media from %d stored image(s)",
+        len(created),
+        len(stored_names),
+    )
+    return created
+
+
 def create_product_media(product: "Product", image_url: str) -> "ProductMedia | None":
     """Create ProductMedia from image URL.
 
@@ -1723,45 +1897,17 @@ def create_product_media(product: "Product", image_url: str) -> "ProductMedia |
         Created ProductMedia instance, or None if fetch failed
 
     """
-    import base64
-    import mimetypes
     import uuid
-    from urllib.parse import urlparse
 
     from django.core.files.base import ContentFile
 
     from saleor.product.models import ProductMedia
 
     try:
-        if image_url.startswith("data:"):
-            header, encoded = image_url.split(",", 1)
-            mime_type = header[5:].split(";")[0]
-            image_data = base64.b64decode(encoded)
-            ext_with_dot = mimetypes.guess_extension(mime_type) or ".jpg"
-            ext = ext_with_dot.lstrip(".")
-            if ext in ("jpe", "jpeg"):
-                ext = "jpg"
-        else:
-            from saleor.core.http_client import HTTPClient
+        image = fetch_image(image_url)
 
-            response = HTTPClient.send_request(
-                "GET",
-                image_url,
-                timeout=30,
-                allow_redirects=True,
-            )
-            response.raise_for_status()
-            image_data = response.content
-
-            parsed_url = urlparse(image_url)
-            url_path = parsed_url.path.split("/")[-1]
-            if "." in url_path and not url_path.startswith("."):
-                ext = url_path.split(".")[-1].split("?")[0]
-            else:
-                ext = "jpg"
-
-        filename = f"{uuid.uuid4()}.{ext}"
-        image_file = ContentFile(image_data, name=filename)
+        filename = f"{uuid.uuid4()}.{image.ext}"
+        image_file = ContentFile(image.content, name=filename)
 
         media = ProductMedia.objects.create(
             product=product,
@@ -2074,6 +2220,7 @@ def ingest_new_products(
     exchange_rates: dict[str, float],
     moq_value: int,
     not_for_web: bool = False,
+    images: dict[str, StoredImage] | None = None,
 ) -> list["Product"]:
     """Ingest new products into the database.
 
@@ -2087,12 +2234,17 @@ def ingest_new_products(
         exchange_rates: Exchange rate dictionary
         moq_value: Minimum order quantity
         not_for_web: If True, mark products as unpublished
+        images: Images prefetched with fetch_images; fetched here if omitted
 
     Returns:
         List of created Product instances
 
     """
+    if images is None:
+        images = fetch_images(p.image_url for p in products if p.image_url)
+
     created_products = []
+    product_images = []
 
     logger.info("Ingesting %d new products...", len(products))
 
@@ -2118,9 +2270,9 @@ def ingest_new_products(
                 available_for_purchase=not not_for_web,
             )
 
-        # 3. Create ProductMedia (if image URL exists)
+        # 3. Queue ProductMedia (if image URL exists), created in bulk below
         if product_data.image_url:
-            create_product_media(product, product_data.image_url)
+            product_images.append((product, product_data.image_url))
 
         # 4. Assign product-level attributes
         assign_product_attributes(product, product_data, attribute_map, moq_value)
@@ -2159,6 +2311,9 @@ def ingest_new_products(
         )
         created_products.append(product)
 
+    if product_images:
+        create_product_media_bulk(product_images, images)
+
     logger.info("Successfully created %d products", len(created_products))
     return created_products
 
@@ -2332,9 +2487,138 @@ def update_existing_products(
     return updated_products
 
 
+def write_products(
+    new_products: list[ProductData],
+    existing_products_map: dict[ProductData, "Product"],
+    product_type_map: dict[str, "ProductType"],
+    category_map: dict[str, "Category"],
+    attribute_map: dict[str, Attribute],
+    channels: list["Channel"],
+    warehouse: Warehouse,
+    exchange_rates: dict[str, float],
+    config: IngestConfig,
+    images: dict[str, StoredImage] | None = None,
+) -> tuple[list["Product"], list["Product"], int]:
+    """Create new products and update existing ones in warehouse.
+
+    Must be called inside a transaction.
+
+    Returns:
+        Tuple of (created_products, updated_products, skipped_products)
+
+    """
+    # Ingest new products
+    created_products = []
+    if new_products:
+        assert config.minimum_order_quantity is not None  # Validated earlier
+        from saleor.product.supplier_keys import defer_supplier_key_updates
+
+        # Index the new products' code/brand in one batch, not product by product
+        with defer_supplier_key_updates():
+            created_products = ingest_new_products(
+                new_products,
+                product_type_map,
+                category_map,
+                attribute_map,
+                channels,
+                warehouse,
+                exchange_rates,
+                config.minimum_order_quantity,
+                config.not_for_web,
+                images=images,
+            )
+
+    # Update existing products
+    updated_products = []
+    skipped_products = 0
+    if existing_products_map:
+        # Separate by warehouse
+        products_in_warehouse, products_elsewhere = (
+            separate_existing_products_by_warehouse(existing_products_map, warehouse)
+        )
+
+        # Update products in this warehouse ONLY
+        if products_in_warehouse:
+            if config.stock_update_mode is None:
+                # Checked up front, but a chunk may run after stock was added
+                raise StockUpdateModeRequired(
+                    list(products_in_warehouse.items()), warehouse.name
+                )
+            updated_products.extend(
+                update_existing_products(
+                    products_in_warehouse,
+                    attribute_map,
+                    channels,
+                    warehouse,
+                    exchange_rates,
+                    config.stock_update_mode,
+                    config.not_for_web,
+                )
+            )
+
+        # Skip products that exist in other warehouses
+        if products_elsewhere:
+            skipped_products = len(products_elsewhere)
+            logger.warning(
+                "Skipping %d product(s) that exist in other warehouses. We only update products already in warehouse '%s'. To add these products to this warehouse, remove them from other warehouses first.",
+                skipped_products,
+                warehouse.name,
+            )
+            for product_data, product in list(products_elsewhere.items())[:5]:
+                logger.warning(
+                    "  - %s (%s): %s",
+                    product_data.product_code,
+                    product_data.brand,
+                    product.name,
+                )
+            if len(products_elsewhere) > 5:
+                logger.warning("  ... and %s more", len(products_elsewhere) - 5)
+
+    # Update discounted prices for all affected products
+    logger.info("\n=== Step 6: Updating Discounted Prices ===")
+    from saleor.product.models import Product
+    from saleor.product.utils.variant_prices import (
+        update_discounted_prices_for_promotion,
+    )
+
+    product_ids = [p.id for p in created_products + updated_products]
+    products_queryset = Product.objects.filter(id__in=product_ids)
+    update_discounted_prices_for_promotion(products_queryset)
+
+    return created_products, updated_products, skipped_products
+
+
+def _log_ingestion_result(result: IngestionResult, config: IngestConfig) -> None:
+    logger.info("%s", "\n" + "=" * 80)
+    logger.info("Ingestion Complete!")
+    logger.info("=" * 80)
+    logger.info(
+        "Created: %d products (%d variants)",
+        len(result.created_products),
+        result.total_variants_created,
+    )
+    logger.info(
+        "Updated: %d products (%d variants)",
+        len(result.updated_products),
+        result.total_variants_updated,
+    )
+    if result.skipped_products > 0:
+        logger.warning(
+            "Skipped: %d products (exist in other warehouses)", result.skipped_products
+        )
+    logger.info("Warehouse: %s", result.warehouse.name)
+    if result.total_products_processed and not config.dry_run:
+        logger.info(
+            "Search indexes will be updated in the background for %d product(s)",
+            result.total_products_processed,
+        )
+    logger.info("=" * 80)
+
+
 def ingest_products_from_excel(
     config: IngestConfig,
     excel_file: str,
+    chunk_size: int | None = None,
 ) -> IngestionResult:
     """Ingest products from Excel file into warehouse.
 
@@ -2345,9 +2629,15 @@ def ingest_products_from_excel(
     4. Performs database operations in a transaction
     5. Returns result
 
+    With chunk_size, step 4 commits chunk_size products at a time and records
+    a checkpoint on a ProductIngestion after each chunk, so a run that fails
+    part way can be resumed with resume_product_ingestion. Dry runs always
+    use a single transaction.
+
     Args:
         config: IngestConfig with all settings
         excel_file: Path to Excel file
+        chunk_size: Number of products committed per chunk
 
     Returns:
         IngestionResult with statistics
@@ -2422,83 +2712,37 @@ def ingest_products_from_excel(
 
     exchange_rates = get_exchange_rates()
 
+    if chunk_size and not config.dry_run:
+        logger.info("\n=== Step 5: Ingesting Products in Chunks of %d ===", chunk_size)
+        ingestion = start_product_ingestion(
+            config, excel_file, warehouse, exchange_rates, chunk_size, prepared
+        )
+        result = _ingest_chunks(ingestion, config, prepared, channels)
+        _log_ingestion_result(result, config)
+        return result
+
+    # Download images up front so slow hosts don't hold the transaction open
+    images = fetch_images(p.image_url for p in prepared.new_products if p.image_url)
+
     # Step 5: Perform database operations in a transaction
     logger.info("\n=== Step 5: Ingesting Products ===")
     if config.dry_run:
         logger.info("DRY-RUN MODE: Changes will be rolled back")
 
     with transaction.atomic():
-        # Ingest new products
-        created_products = []
-        if prepared.new_products:
-            assert config.minimum_order_quantity is not None  # Validated earlier
-            created_products = ingest_new_products(
-                prepared.new_products,
-                prepared.product_type_map,
-                prepared.category_map,
-                prepared.attribute_map,
-                channels,
-                warehouse,
-                exchange_rates,
-                config.minimum_order_quantity,
-                config.not_for_web,
-            )
-
-        # Update existing products
-        updated_products = []
-        skipped_products = 0
-        if prepared.existing_products_map:
-            # Separate by warehouse
-            products_in_warehouse, products_elsewhere = (
-                separate_existing_products_by_warehouse(
-                    prepared.existing_products_map, warehouse
-                )
-            )
-
-            # Update products in this warehouse ONLY
-            if products_in_warehouse:
-                assert config.stock_update_mode is not None  # Validated earlier
-                updated_products.extend(
-                    update_existing_products(
-                        products_in_warehouse,
-                        prepared.attribute_map,
-                        channels,
-                        warehouse,
-                        exchange_rates,
-                        config.stock_update_mode,
-                        config.not_for_web,
-                    )
-                )
-
-            # Skip products that exist in other warehouses
-            if products_elsewhere:
-                skipped_products = len(products_elsewhere)
-                logger.warning(
-                    "Skipping %d product(s) that exist in other warehouses. We only update products already in warehouse '%s'. To add these products to this warehouse, remove them from other warehouses first.",
-                    skipped_products,
-                    warehouse.name,
-                )
-                for product_data, product in list(products_elsewhere.items())[:5]:
-                    logger.warning(
-                        "  - %s (%s): %s",
-                        product_data.product_code,
-                        product_data.brand,
-                        product.name,
-                    )
-                if len(products_elsewhere) > 5:
-                    logger.warning("  ... and %s more", len(products_elsewhere) - 5)
-
-        # Update discounted prices for all affected products
-        logger.info("\n=== Step 6: Updating Discounted Prices ===")
-        from saleor.product.models import Product
-        from saleor.product.utils.variant_prices import (
-            update_discounted_prices_for_promotion,
+        created_products, updated_products, skipped_products = write_products(
+            prepared.new_products,
+            prepared.existing_products_map,
+            prepared.product_type_map,
+            prepared.category_map,
+            prepared.attribute_map,
+            channels,
+            warehouse,
+            exchange_rates,
+            config,
+            images=images,
         )
-
-        all_products = created_products + updated_products
-        product_ids = [p.id for p in all_products]
-        products_queryset = Product.objects.filter(id__in=product_ids)
-        update_discounted_prices_for_promotion(products_queryset)
+        product_ids = [p.id for p in created_products + updated_products]
 
         # Rollback transaction if dry-run
         if config.dry_run:
@@ -2529,34 +2773,7 @@ def ingest_products_from_excel(
         skipped_products=skipped_products,
     )
 
-    logger.info("%s", "\n" + "=" * 80)
-    logger.info("Ingestion Complete!")
-    logger.info("=" * 80)
-    logger.info(
-        "Created: %d products (%d variants)",
-        len(created_products),
-        total_variants_created,
-    )
-    logger.info(
-        "Updated: %d products (%d variants)",
-        len(updated_products),
-        total_variants_updated,
-    )
-    if skipped_products > 0:
-        logger.warning(
-            "Skipped: %d products (exist in other warehouses)", skipped_products
-        )
-    logger.info("Warehouse: %s", warehouse.name)
-    all_product_ids = [p.pk for p in created_products] + [
-        p.pk for p in updated_products
-    ]
-    if all_product_ids and not config.dry_run:
-        logger.info(
-            "Search indexes will be updated in the background for %d product(s)",
-            len(all_product_ids),
-        )
-    logger.info("=" * 80)
-
+    _log_ingestion_result(result, config)
     return result
 
 
@@ -2571,3 +2788,349 @@ def ingest_config_from_dict(data: dict) -> IngestConfig:
     mapping_data = d.pop("column_mapping", None)
     mapping = SpreadsheetColumnMapping(**mapping_data) if mapping_data else None
     return IngestConfig(column_mapping=mapping, **d)
+
+
+def product_data_to_dict(product: ProductData) -> dict:
+    """Serialize ProductData to a JSON-serializable dict, e.g. for task args."""
+    data = attrs.asdict(product)
+    for field in ("rrp", "price", "weight_kg"):
+        if data[field] is not None:
+            data[field] = str(data[field])
+    return data
+
+
+def product_data_from_dict(data: dict) -> ProductData:
+    """Deserialize ProductData from product_data_to_dict output."""
+    d = data.copy()
+    for field in ("rrp", "price", "weight_kg"):
+        if d[field] is not None:
+            d[field] = Decimal(d[field])
+    return ProductData(**{**d, "sizes": tuple(d["sizes"]), "qty": tuple(d["qty"])})
+
+
+# ============================================================================
+# Chunked Ingestion
+# ============================================================================
+# A chunked run is recorded on a ProductIngestion holding the sheet, the
+# config, the exchange rates and the existing products it started with.
+# Products are split into chunks after de-duplication, which is
+# deterministic for a given sheet, so re-reading the stored sheet yields the
+# same chunks. Each chunk commits in its own transaction together with its
+# checkpoint in chunk_results, so a chunk is either fully ingested and
+# recorded or not at all.
+
+
+def chunk_products(
+    products: list[ProductData], chunk_size: int
+) -> list[list[ProductData]]:
+    return [
+        products[start : start + chunk_size]
+        for start in range(0, len(products), chunk_size)
+    ]
+
+
+def start_product_ingestion(
+    config: IngestConfig,
+    excel_file: str,
+    warehouse: Warehouse,
+    exchange_rates: dict[str, float],
+    chunk_size: int,
+    prepared: PreparedProductsData,
+):
+    """Record a chunked ingestion of the prepared products, storing the sheet."""
+    import os
+
+    from django.core.files import File
+
+    from saleor.product.models import ProductIngestion
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    with open(excel_file, "rb") as f:
+        return ProductIngestion.objects.create(
+            warehouse=warehouse,
+            excel_file=File(f, name=os.path.basename(excel_file)),
+            config=ingest_config_to_dict(config),
+            chunk_size=chunk_size,
+            total_chunks=len(chunk_products(prepared.products, chunk_size)),
+            exchange_rates=exchange_rates,
+            existing_product_ids={
+                str(position): prepared.existing_products_map[product].pk
+                for position, product in enumerate(prepared.products)
+                if product in prepared.existing_products_map
+            },
+        )
+
+
+@contextmanager
+def _local_ingestion_file(ingestion):
+    """Copy the stored sheet to a temporary file, which pandas can read."""
+    import os
+    import shutil
+    import tempfile
+
+    suffix = os.path.splitext(ingestion.excel_file.name)[1] or ".xlsx"
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            with ingestion.excel_file.open("rb") as src:
+                shutil.copyfileobj(src, tmp)
+        yield temp_path
+    finally:
+        os.unlink(temp_path)
+
+
+def prepare_product_ingestion_chunks(
+    ingestion,
+) -> tuple[PreparedProductsData, list[list[ProductData]]]:
+    """Re-read the stored sheet of an ingestion and split it into its chunks.
+
+    Raises:
+        SheetIntegrityError: If the sheet no longer splits into total_chunks
+
+    """
+    config = ingest_config_from_dict(ingestion.config)
+    with _local_ingestion_file(ingestion) as path:
+        prepared = prepare_products_for_ingestion(path, config)
+    chunks = chunk_products(prepared.products, ingestion.chunk_size)
+    if len(chunks) != ingestion.total_chunks:
+        raise SheetIntegrityError(
+            f"Ingestion {ingestion.pk} expected {ingestion.total_chunks} chunk(s) "
+            f"but the sheet now splits into {len(chunks)}."
+        )
+    return prepared, chunks
+
+
+def _checkpoint_chunk(ingestion_id: int, result: ChunkResult) -> ChunkResult | None:
+    """Record a chunk as done; must run in the chunk's transaction.
+
+    Returns the existing result instead if the chunk was recorded meanwhile,
+    e.g. by a redelivered task, in which case the caller must roll back.
+    """
+    from django.utils import timezone
+
+    from saleor.product.models import ProductIngestion
+
+    ingestion = ProductIngestion.objects.select_for_update().get(pk=ingestion_id)
+    key = str(result.index)
+    if key in ingestion.chunk_results:
+        return ChunkResult.from_dict(ingestion.chunk_results[key])
+    ingestion.chunk_results[key] = result.to_dict()
+    update_fields = ["chunk_results"]
+    if len(ingestion.chunk_results) == ingestion.total_chunks:
+        ingestion.completed_at = timezone.now()
+        update_fields.append("completed_at")
+    ingestion.save(update_fields=update_fields)
+    return None
+
+
+def _split_chunk_products(
+    ingestion, index: int, products: list[ProductData]
+) -> tuple[list[ProductData], dict[ProductData, "Product"]]:
+    """Split a chunk into new and existing products as recorded at run start.
+
+    Products deleted since then are created again, like in a new run.
+    """
+    from saleor.product.models import Product
+
+    offset = index * ingestion.chunk_size
+    product_ids = {
+        product: ingestion.existing_product_ids[key]
+        for position, product in enumerate(products)
+        if (key := str(offset + position)) in ingestion.existing_product_ids
+    }
+    existing = Product.objects.in_bulk(product_ids.values())
+    existing_products_map = {
+        product: existing[pk] for product, pk in product_ids.items() if pk in existing
+    }
+    new_products = [p for p in products if p not in existing_products_map]
+    return new_products, existing_products_map
+
+
+def _ingest_chunk(
+    ingestion,
+    index: int,
+    products: list[ProductData],
+    config: IngestConfig,
+    product_type_map: dict[str, "ProductType"],
+    category_map: dict[str, "Category"],
+    attribute_map: dict[str, Attribute],
+    channels: list["Channel"],
+) -> ChunkResult:
+    from django.db import transaction
+
+    from saleor.product.models import ProductVariant
+    from saleor.product.search import update_products_search_vector
+
+    if done := ingestion.chunk_results.get(str(index)):
+        return ChunkResult.from_dict(done)
+
+    new_products, existing_products_map = _split_chunk_products(
+        ingestion, index, products
+    )
+    images = fetch_images(p.image_url for p in new_products if p.image_url)
+
+    with transaction.atomic():
+        created_products, updated_products, skipped_products = write_products(
+            new_products,
+            existing_products_map,
+            product_type_map,
+            category_map,
+            attribute_map,
+            channels,
+            ingestion.warehouse,
+            ingestion.exchange_rates,
+            config,
+            images=images,
+        )
+        created_ids = [p.pk for p in created_products]
+        updated_ids = [p.pk for p in updated_products]
+        result = ChunkResult(
+            index=index,
+            created_product_ids=created_ids,
+            updated_product_ids=updated_ids,
+            variants_created=ProductVariant.objects.filter(
+                product_id__in=created_ids
+            ).count(),
+            variants_updated=ProductVariant.objects.filter(
+                product_id__in=updated_ids, channel_listings__channel__in=channels
+            ).count(),
+            skipped_products=skipped_products,
+        )
+        if existing := _checkpoint_chunk(ingestion.pk, result):
+            logger.info("Chunk %d was already ingested; discarding this run", index)
+            transaction.set_rollback(True)
+            return existing
+
+    logger.info(
+        "Chunk %d/%d committed: %d created, %d updated, %d skipped",
+        index + 1,
+        ingestion.total_chunks,
+        len(created_ids),
+        len(updated_ids),
+        skipped_products,
+    )
+    ingestion.chunk_results[str(index)] = result.to_dict()
+    if created_ids or updated_ids:
+        update_products_search_vector(created_ids + updated_ids)
+    return result
+
+
+def _ingest_chunks(
+    ingestion,
+    config: IngestConfig,
+    prepared: PreparedProductsData,
+    channels: list["Channel"],
+) -> IngestionResult:
+    from django.utils import timezone
+
+    from saleor.product.models import ProductIngestion
+
+    chunks = chunk_products(prepared.products, ingestion.chunk_size)
+    try:
+        for index, products in enumerate(chunks):
+            _ingest_chunk(
+                ingestion,
+                index,
+                products,
+                config,
+                prepared.product_type_map,
+                prepared.category_map,
+                prepared.attribute_map,
+                channels,
+            )
+    except Exception:
+        ProductIngestion.objects.filter(pk=ingestion.pk).update(
+            failed_at=timezone.now()
+        )
+        logger.exception(
+            "Ingestion %d failed after %d of %d chunk(s); resume it with "
+            "resume_product_ingestion",
+            ingestion.pk,
+            len(ingestion.chunk_results),
+            ingestion.total_chunks,
+        )
+        raise
+    ingestion.refresh_from_db()
+    return get_product_ingestion_result(ingestion, channels)
+
+
+def ingest_product_chunk(
+    ingestion_id: int, index: int, products: list[ProductData]
+) -> ChunkResult:
+    """Ingest one chunk of a ProductIngestion, unless already checkpointed.
+
+    Used to spread the chunks of an ingestion across workers; products must
+    be the chunk as split by prepare_product_ingestion_chunks.
+    """
+    from saleor.channel.models import Channel
+    from saleor.product.models import ProductIngestion
+
+    ingestion = ProductIngestion.objects.select_related("warehouse").get(
+        pk=ingestion_id
+    )
+    product_type_map = validate_product_types(products)
+    category_map = validate_categories(products)
+    attribute_map = validate_attributes()
+    return _ingest_chunk(
+        ingestion,
+        index,
+        products,
+        ingest_config_from_dict(ingestion.config),
+        product_type_map,
+        category_map,
+        attribute_map,
+        list(Channel.objects.all()),
+    )
+
+
+def resume_product_ingestion(ingestion_id: int) -> IngestionResult:
+    """Ingest the chunks of a ProductIngestion that have no checkpoint yet.
+
+    Safe to call on a completed ingestion, which just returns its result.
+    """
+    from saleor.channel.models import Channel
+    from saleor.product.models import ProductIngestion
+
+    ingestion = ProductIngestion.objects.select_related("warehouse").get(
+        pk=ingestion_id
+    )
+    channels = list(Channel.objects.all())
+    if ingestion.completed_at:
+        return get_product_ingestion_result(ingestion, channels)
+
+    logger.info(
+        "Resuming ingestion %d: %d of %d chunk(s) done",
+        ingestion.pk,
+        len(ingestion.chunk_results),
+        ingestion.total_chunks,
+    )
+    ProductIngestion.objects.filter(pk=ingestion.pk).update(failed_at=None)
+    prepared, _chunks = prepare_product_ingestion_chunks(ingestion)
+    config = ingest_config_from_dict(ingestion.config)
+    return _ingest_chunks(ingestion, config, prepared, channels)
+
+
+def get_product_ingestion_result(
+    ingestion, channels: list["Channel"]
+) -> IngestionResult:
+    """Aggregate the checkpointed chunks of an ingestion into one result."""
+    from saleor.product.models import Product
+
+    chunks = sorted(
+        (ChunkResult.from_dict(data) for data in ingestion.chunk_results.values()),
+        key=lambda chunk: chunk.index,
+    )
+    created_ids = [pk for chunk in chunks for pk in chunk.created_product_ids]
+    updated_ids = [pk for chunk in chunks for pk in chunk.updated_product_ids]
+    return IngestionResult(
+        created_products=list(Product.objects.filter(pk__in=created_ids)),
+        updated_products=list(Product.objects.filter(pk__in=updated_ids)),
+        total_products_processed=len(created_ids) + len(updated_ids),
+        total_variants_created=sum(chunk.variants_created for chunk in chunks),
+        total_variants_updated=sum(chunk.variants_updated for chunk in chunks),
+        warehouse=ingestion.warehouse,
+        skipped_products=sum(chunk.skipped_products for chunk in chunks),
+        chunks=chunks,
+    )
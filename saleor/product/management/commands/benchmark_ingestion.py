@@ -0,0 +1,111 @@
+"""Benchmark product ingestion and price list processing on synthetic sheets.
+
+Each record written is one scenario run on one sheet size, as a JSON line:
+wall time, query count and peak traced memory overall and per stage. Records
+go to stdout, and are appended to --output if given, so runs on different
+commits can be collected in one file and compared.
+
+All database writes are rolled back; see saleor.product.benchmark.
+"""
+
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...benchmark import BENCHMARK_ROW_COUNTS, SCENARIOS, SheetSpec, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark product ingestion and price lists on synthetic supplier sheets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=list(BENCHMARK_ROW_COUNTS),
+            help="Sheet sizes to run, in rows (default: 1000 10000 100000)",
+        )
+        parser.add_argument(
+            "--scenario",
+            choices=SCENARIOS,
+            nargs="+",
+            default=list(SCENARIOS),
+            help="Scenarios to run (default: all)",
+        )
+        parser.add_argument(
+            "--sizes-per-row",
+            type=int,
+            default=5,
+            help="Sizes listed in each row (default: 5)",
+        )
+        parser.add_argument(
+            "--duplicate-rate",
+            type=float,
+            default=0.02,
+            help="Share of rows repeating an earlier product (default: 0.02)",
+        )
+        parser.add_argument(
+            "--currencies",
+            nargs="+",
+            default=["GBP"],
+            help="Currencies to create a channel in (default: GBP)",
+        )
+        parser.add_argument(
+            "--image-rate",
+            type=float,
+            default=0.5,
+            help="Share of rows with an image (default: 0.5)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed for the generated sheets (default: 0)",
+        )
+        parser.add_argument(
+            "--label",
+            type=str,
+            default="",
+            help="Label stored on each record, e.g. the commit being measured",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="File to append the JSON lines to",
+        )
+        parser.add_argument(
+            "--no-trace-memory",
+            action="store_true",
+            help="Skip memory tracing, which slows down the run",
+        )
+
+    def handle(self, *args, **options):
+        for value in (options["duplicate_rate"], options["image_rate"]):
+            if not 0 <= value <= 1:
+                raise CommandError("Rates must be between 0 and 1.")
+
+        # Ingestion logs every product; keep the output to the records
+        logging.getLogger("saleor.product").setLevel(logging.WARNING)
+
+        for rows in options["rows"]:
+            spec = SheetSpec(
+                rows=rows,
+                sizes_per_row=options["sizes_per_row"],
+                duplicate_rate=options["duplicate_rate"],
+                currencies=tuple(c.upper() for c in options["currencies"]),
+                image_rate=options["image_rate"],
+                seed=options["seed"],
+            )
+            for scenario in options["scenario"]:
+                self.stderr.write(f"Running {scenario} on {rows} rows...")
+                record = run_benchmark(
+                    scenario, spec, trace_memory=not options["no_trace_memory"]
+                )
+                record["label"] = options["label"]
+                line = json.dumps(record)
+                self.stdout.write(line)
+                if options["output"]:
+                    with open(options["output"], "a") as f:
+                        f.write(line + "\n")
@@ -78,6 +78,14 @@ class Command(BaseCommand):
             action="store_true",
             help="Validate without making changes",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help=(
+                "Commit products in chunks of this size, checkpointing each, so "
+                "a failed run can be continued with resume_product_ingestion"
+            ),
+        )
 
     def handle(self, *args, **options):
         from django_countries import countries
@@ -90,6 +98,10 @@ class Command(BaseCommand):
         warehouse_address = options["warehouse_address"]
         warehouse_country = options["warehouse_country"].upper()
         not_for_web = options["not_for_web"]
+        chunk_size = options["chunk_size"]
+
+        if chunk_size is not None and chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1.")
 
         # Validate country code
         if warehouse_country not in dict(countries):
@@ -139,7 +151,7 @@ class Command(BaseCommand):
         while True:
             try:
                 # Call main ingestion function
-                result = ingest_products_from_excel(config, excel_file)
+                result = ingest_products_from_excel(config, excel_file, chunk_size)
 
                 # Success! Display results and exit
                 self._display_results(result)
@@ -490,4 +502,7 @@ class Command(BaseCommand):
                 self.style.WARNING(f"\n⚠ Skipped {result.skipped_products} product(s)")
             )
 
+        if result.chunks:
+            self.stdout.write(f"\nIngested in {len(result.chunks)} chunk(s)")
+
         self.stdout.write(f"\n{'=' * 60}")
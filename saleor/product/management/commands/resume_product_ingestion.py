@@ -0,0 +1,41 @@
+"""Resume a chunked product ingestion from its last checkpoint.
+
+Chunked ingestions are started with ingest_products --chunk-size. Chunks
+committed before a failure are skipped; the rest are ingested in order.
+"""
+
+from django.core.management.base import CommandError
+
+from ...ingestion import resume_product_ingestion
+from ...models import ProductIngestion
+from .ingest_products import Command as IngestProductsCommand
+
+
+class Command(IngestProductsCommand):
+    help = "Resume a chunked product ingestion from its last checkpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "ingestion_id",
+            type=int,
+            help="ID of the ProductIngestion to resume",
+        )
+        parser.add_argument(
+            "--fan-out",
+            action="store_true",
+            help="Queue the remaining chunks for Celery workers instead",
+        )
+
+    def handle(self, *args, **options):
+        from ...tasks import ingest_products_task
+
+        ingestion_id = options["ingestion_id"]
+        if not ProductIngestion.objects.filter(pk=ingestion_id).exists():
+            raise CommandError(f"Product ingestion {ingestion_id} does not exist.")
+
+        if options["fan_out"]:
+            ingest_products_task.delay(ingestion_id, fan_out=True)
+            self.stdout.write(f"Queued remaining chunks of ingestion {ingestion_id}")
+            return
+
+        self._display_results(resume_product_ingestion(ingestion_id))
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0208_pricelist_is_processing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pricelist",
+            name="processed_rows",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="pricelist",
+            name="total_rows",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
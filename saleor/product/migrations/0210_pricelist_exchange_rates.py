@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0209_pricelist_processing_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pricelist",
+            name="exchange_rates",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="pricelist",
+            name="exchange_rates_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0210_pricelist_exchange_rates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pricelist",
+            name="replace_delta",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,46 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0211_pricelist_replace_delta"),
+        ("warehouse", "0040_fulfillmentsource"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductIngestion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("excel_file", models.FileField(upload_to="product_ingestions/")),
+                ("config", models.JSONField(default=dict)),
+                ("chunk_size", models.PositiveIntegerField()),
+                ("total_chunks", models.PositiveIntegerField(default=0)),
+                ("exchange_rates", models.JSONField(blank=True, default=dict)),
+                ("chunk_results", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                ("failed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "warehouse",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="product_ingestions",
+                        to="warehouse.warehouse",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
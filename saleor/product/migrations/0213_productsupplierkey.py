@@ -0,0 +1,61 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Take each product's first Product Code and Brand value, as sorted on the
+# product, like supplier_keys.update_product_supplier_keys does
+BACKFILL_SQL = """
+INSERT INTO product_productsupplierkey (product_id, product_code, brand)
+SELECT code.product_id, code.name, brand.name
+FROM (
+    SELECT DISTINCT ON (apv.product_id) apv.product_id, LOWER(av.name) AS name
+    FROM attribute_assignedproductattributevalue apv
+    JOIN attribute_attributevalue av ON av.id = apv.value_id
+    JOIN attribute_attribute a ON a.id = av.attribute_id
+    WHERE a.name = 'Product Code'
+    ORDER BY apv.product_id, apv.sort_order NULLS LAST, apv.id
+) code
+JOIN (
+    SELECT DISTINCT ON (apv.product_id) apv.product_id, LOWER(av.name) AS name
+    FROM attribute_assignedproductattributevalue apv
+    JOIN attribute_attributevalue av ON av.id = apv.value_id
+    JOIN attribute_attribute a ON a.id = av.attribute_id
+    WHERE a.name = 'Brand'
+    ORDER BY apv.product_id, apv.sort_order NULLS LAST, apv.id
+) brand ON brand.product_id = code.product_id
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("attribute", "0055_assignedvariantattributevalue_variant"),
+        ("product", "0212_productingestion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSupplierKey",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="supplier_key",
+                        serialize=False,
+                        to="product.product",
+                    ),
+                ),
+                ("product_code", models.CharField(max_length=250)),
+                ("brand", models.CharField(max_length=250)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["product_code", "brand"],
+                        name="product_supplier_key_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0213_productsupplierkey"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pricelist",
+            name="items_generation",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="pricelistitem",
+            name="generation",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name="pricelistitem",
+            unique_together={("price_list", "generation", "row_index")},
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0214_pricelistitem_generation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productingestion",
+            name="existing_product_ids",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -821,6 +821,20 @@ class PriceList(models.Model):
     processing_completed_at = models.DateTimeField(null=True, blank=True)
     processing_failed_at = models.DateTimeField(null=True, blank=True)
     is_processing = models.BooleanField(default=False)
+    # Progress of the last processing run, updated as each chunk commits.
+    # total_rows is an estimate taken from the sheet's declared dimensions.
+    processed_rows = models.PositiveIntegerField(default=0)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    # Rates used on first activation, reused so re-activation converts prices
+    # identically; see exchange_rates.get_price_list_exchange_rates.
+    exchange_rates = models.JSONField(default=dict, blank=True)
+    exchange_rates_date = models.DateField(null=True, blank=True)
+    # Line and product counts changed by the replace that activated this list.
+    replace_delta = models.JSONField(default=dict, blank=True)
+    # Generation of the items written by the last successful processing run.
+    # A run writes its items under the next generation and swaps them in once
+    # the whole sheet is written; see current_items.
+    items_generation = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
@@ -853,6 +867,14 @@ class PriceList(models.Model):
         )
         replace_price_list_task.delay(self.pk, new_price_list.pk)
 
+    def current_items(self):
+        """Return items of the last successful processing run.
+
+        Items of other generations are being written by a run in progress, or
+        were left by a run that failed.
+        """
+        return self.items.filter(generation=self.items_generation)
+
 
 class PriceListItem(models.Model):
     price_list = models.ForeignKey(
@@ -888,9 +910,68 @@ class PriceListItem(models.Model):
     currency = models.CharField(max_length=3, blank=True, default="")
     is_valid = models.BooleanField(default=True)
     validation_errors = models.JSONField(default=list)
+    generation = models.PositiveIntegerField(default=0)
 
     class Meta:
-        unique_together = [["price_list", "row_index"]]
+        unique_together = [["price_list", "generation", "row_index"]]
         indexes = [
             models.Index(fields=["price_list", "is_valid"]),
         ]
+
+
+class ProductSupplierKey(models.Model):
+    """Lowercased Product Code and Brand attribute values of a product.
+
+    A denormalized copy kept in sync by the supplier_keys module, so products
+    can be found by supplier identity with one indexed query instead of
+    joining through attribute values.
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="supplier_key",
+    )
+    product_code = models.CharField(max_length=250)
+    brand = models.CharField(max_length=250)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["product_code", "brand"], name="product_supplier_key_idx"
+            ),
+        ]
+
+
+class ProductIngestion(models.Model):
+    """Checkpoints of a chunked ingest_products_from_excel run.
+
+    Products are ingested in chunks of chunk_size, each committed on its own;
+    chunk_results gains the chunk's statistics in the same transaction, so an
+    interrupted run can resume from the first chunk without one.
+    """
+
+    warehouse = models.ForeignKey(
+        "warehouse.Warehouse",
+        on_delete=models.PROTECT,
+        related_name="product_ingestions",
+    )
+    excel_file = models.FileField(upload_to="product_ingestions/")
+    # IngestConfig, see ingestion.ingest_config_to_dict
+    config = models.JSONField(default=dict)
+    chunk_size = models.PositiveIntegerField()
+    total_chunks = models.PositiveIntegerField(default=0)
+    # Rates taken when the run started, so every chunk converts prices alike
+    exchange_rates = models.JSONField(default=dict, blank=True)
+    # Chunk index -> ingestion.ChunkResult.to_dict()
+    chunk_results = models.JSONField(default=dict, blank=True)
+    # Position among the sheet's products -> pk of the Product it matched when
+    # the run started, so every chunk tells new from existing products alike
+    existing_product_ids = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
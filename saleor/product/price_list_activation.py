@@ -0,0 +1,628 @@
+"""Set-based activation of PriceList items.
+
+tasks._activate_item creates products, variants, attribute assignments,
+channel listings and stock one item at a time, which costs several queries
+per row. plan_activation computes the same rows up front from the maps
+returned by tasks._load_activation_context, and apply_activation_plan writes
+them with a fixed number of bulk statements per model, so activation time
+scales with the number of models rather than the number of price list rows.
+
+The result matches the per-item path with two deliberate differences:
+- repeated (product_code, brand) items that slipped past processing are
+  merged into one product, adding quantities for sizes listed twice instead
+  of failing on the duplicated variant SKU;
+- prices of existing products are always converted from float, as the
+  per-item path does for new products.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import attrs
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+from measurement.measures import Weight
+
+from ..attribute.models import Attribute, AttributeValue
+from ..attribute.models.product import AssignedProductAttributeValue
+from ..attribute.models.product_variant import (
+    AssignedVariantAttribute,
+    AssignedVariantAttributeValue,
+    AttributeVariant,
+)
+from ..warehouse.models import Stock
+from .models import (
+    PriceListItem,
+    Product,
+    ProductChannelListing,
+    ProductMedia,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from .supplier_keys import update_product_supplier_keys
+
+if TYPE_CHECKING:
+    from ..channel.models import Channel
+    from ..warehouse.models import Warehouse
+    from .ingestion import StoredImage
+    from .models import Category, ProductType
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+
+# (attribute_id, slug) identifies an AttributeValue
+AttributeValueKey = tuple[int, str]
+
+
+@attrs.define
+class ActivationPlan:
+    """Unsaved rows to write for a price list activation.
+
+    Rows reference each other through unsaved instances (e.g. a variant's
+    product), so they must be written in the order apply_activation_plan uses.
+    """
+
+    products: list[Product] = attrs.Factory(list)
+    product_listings: list[ProductChannelListing] = attrs.Factory(list)
+    published_product_ids: set[int] = attrs.Factory(set)
+    attribute_values: dict[AttributeValueKey, AttributeValue] = attrs.Factory(dict)
+    product_attribute_values: list[AssignedProductAttributeValue] = attrs.Factory(list)
+    attribute_variants: list[AttributeVariant] = attrs.Factory(list)
+    variants: list[ProductVariant] = attrs.Factory(list)
+    variant_attributes: list[AssignedVariantAttribute] = attrs.Factory(list)
+    variant_attribute_values: list[AssignedVariantAttributeValue] = attrs.Factory(list)
+    variant_listings: list[ProductVariantChannelListing] = attrs.Factory(list)
+    variant_listings_to_update: list[ProductVariantChannelListing] = attrs.Factory(list)
+    stocks: list[Stock] = attrs.Factory(list)
+    stock_increments: dict[int, int] = attrs.Factory(dict)
+    media: list[tuple[Product, str]] = attrs.Factory(list)
+    # PriceListItem -> Product created for it
+    item_products: list[tuple[PriceListItem, Product]] = attrs.Factory(list)
+
+
+def _item_price(item: PriceListItem, variant_name: str, channel: "Channel", rates):
+    from .ingestion import convert_price
+
+    if item.sell_price is None:
+        raise ValueError(
+            f"Price is required for variant {variant_name}. "
+            f"Use product-level not_for_web flag to mark products as unavailable, "
+            f"but prices must still be set."
+        )
+    return convert_price(
+        float(item.sell_price), item.currency, channel.currency_code, rates
+    )
+
+
+def _unique_slugs(base_slugs: list[str]) -> list[str]:
+    """Return a free slug for each base, as create_product would pick in sequence.
+
+    Each round checks one candidate per still-colliding slug, so the number of
+    queries grows with the deepest collision chain, not with the number of slugs.
+    """
+    result: list[str | None] = [None] * len(base_slugs)
+    counters = [0] * len(base_slugs)
+    taken: set[str] = set()
+    pending = list(range(len(base_slugs)))
+    while pending:
+        candidates = {
+            idx: base_slugs[idx]
+            if not counters[idx]
+            else f"{base_slugs[idx]}-{counters[idx]}"
+            for idx in pending
+        }
+        existing = set(
+            Product.objects.filter(slug__in=candidates.values()).values_list(
+                "slug", flat=True
+            )
+        )
+        next_pending = []
+        for idx in pending:
+            slug = candidates[idx]
+            if slug in existing or slug in taken:
+                counters[idx] += 1
+                next_pending.append(idx)
+            else:
+                taken.add(slug)
+                result[idx] = slug
+        pending = next_pending
+    return [slug for slug in result if slug is not None]
+
+
+class _AttributeValueResolver:
+    """Collects get_or_create lookups of AttributeValue to resolve them in bulk."""
+
+    def __init__(self):
+        self.requested: dict[AttributeValueKey, dict] = {}
+        self.values: dict[AttributeValueKey, AttributeValue] = {}
+
+    def request(self, attribute: Attribute, slug: str, **defaults) -> AttributeValue:
+        key = (attribute.pk, slug)
+        if key not in self.values:
+            self.requested[key] = defaults
+            self.values[key] = AttributeValue(
+                attribute=attribute, slug=slug, **defaults
+            )
+        return self.values[key]
+
+    def resolve(self) -> dict[AttributeValueKey, AttributeValue]:
+        """Swap placeholders for existing values; return the ones to create."""
+        slugs_by_attribute = defaultdict(set)
+        for attribute_id, slug in self.requested:
+            slugs_by_attribute[attribute_id].add(slug)
+        for attribute_id, slugs in slugs_by_attribute.items():
+            for value in AttributeValue.objects.filter(
+                attribute_id=attribute_id, slug__in=slugs
+            ):
+                key = (attribute_id, value.slug)
+                placeholder = self.values[key]
+                # Reuse the placeholder object so planned assignments pick up the pk
+                placeholder.pk = value.pk
+                placeholder.sort_order = value.sort_order
+        return {key: value for key, value in self.values.items() if value.pk is None}
+
+
+def _plan_new_products(
+    plan: ActivationPlan,
+    items: list[PriceListItem],
+    warehouse: "Warehouse",
+    product_type_map: dict[str, "ProductType"],
+    category_map: dict[str, "Category"],
+    attribute_map: dict[str, Attribute],
+    channels: list["Channel"],
+    exchange_rates: dict[str, float],
+    values: _AttributeValueResolver,
+    now,
+):
+    groups: dict[tuple[str, str], list[PriceListItem]] = {}
+    for item in items:
+        groups.setdefault((item.product_code, item.brand), []).append(item)
+
+    for first, *_ in groups.values():
+        if (
+            product_type_map.get(first.category) is None
+            or category_map.get(first.category) is None
+        ):
+            raise ValueError(
+                f"Cannot activate PriceListItem {first.product_code!r}: "
+                f"no ProductType or Category found for '{first.category}'"
+            )
+    if not groups:
+        return
+
+    slugs = _unique_slugs(
+        [
+            slugify(f"{first.description}-{first.product_code}")
+            for first, *_ in groups.values()
+        ]
+    )
+    size_attribute = attribute_map["Size"]
+    attribute_variants: dict[int, AttributeVariant] = {
+        av.product_type_id: av
+        for av in AttributeVariant.objects.filter(
+            attribute=size_attribute,
+            product_type__in={product_type_map[g[0].category] for g in groups.values()},
+        )
+    }
+    next_sort_order = {
+        row["product_type_id"]: row["max_sort_order"] + 1
+        for row in AttributeVariant.objects.filter(
+            product_type__in={product_type_map[g[0].category] for g in groups.values()}
+        )
+        .values("product_type_id")
+        .annotate(max_sort_order=Max("sort_order"))
+        if row["max_sort_order"] is not None
+    }
+
+    for group_items, slug in zip(groups.values(), slugs, strict=True):
+        first = group_items[0]
+        product_type = product_type_map[first.category]
+        product = Product(
+            name=first.description,
+            slug=slug,
+            product_type=product_type,
+            category=category_map[first.category],
+        )
+        plan.products.append(product)
+        plan.item_products.extend((item, product) for item in group_items)
+        plan.product_listings.extend(
+            ProductChannelListing(
+                product=product,
+                channel=channel,
+                currency=channel.currency_code,
+                is_published=True,
+                visible_in_listings=False,
+                available_for_purchase_at=now,
+            )
+            for channel in channels
+        )
+
+        assigned_values = [
+            values.request(
+                attribute_map["Product Code"],
+                slugify(first.product_code),
+                name=first.product_code,
+                plain_text=first.product_code,
+            )
+        ]
+        if first.rrp:
+            assigned_values.append(
+                values.request(
+                    attribute_map["RRP"],
+                    slugify(str(first.rrp)),
+                    name=str(first.rrp),
+                    plain_text=str(first.rrp),
+                )
+            )
+        assigned_values.append(
+            values.request(
+                attribute_map["Minimum Order Quantity"],
+                slugify("1"),
+                name="1",
+                plain_text="1",
+            )
+        )
+        assigned_values.append(
+            values.request(
+                attribute_map["Brand"],
+                slugify(first.brand),
+                name=first.brand,
+                plain_text=first.brand,
+            )
+        )
+        plan.product_attribute_values.extend(
+            AssignedProductAttributeValue(product=product, value=value, sort_order=i)
+            for i, value in enumerate(assigned_values)
+        )
+        if first.image_url:
+            plan.media.append((product, first.image_url))
+
+        attribute_variant = attribute_variants.get(product_type.pk)
+        if attribute_variant is None:
+            sort_order = next_sort_order.get(product_type.pk, 0)
+            next_sort_order[product_type.pk] = sort_order + 1
+            attribute_variant = AttributeVariant(
+                attribute=size_attribute,
+                product_type=product_type,
+                sort_order=sort_order,
+            )
+            attribute_variants[product_type.pk] = attribute_variant
+            plan.attribute_variants.append(attribute_variant)
+
+        weight = Weight(kg=first.weight_kg) if first.weight_kg is not None else None
+        stocks_by_size: dict[str, Stock] = {}
+        for item in group_items:
+            for size, qty in item.sizes_and_qty.items():
+                if size in stocks_by_size:
+                    stocks_by_size[size].quantity += qty
+                    continue
+                variant = ProductVariant(
+                    product=product,
+                    name=size,
+                    sku=f"{slug}-{slugify(size)}",
+                    weight=weight,
+                    sort_order=len(stocks_by_size),
+                )
+                plan.variants.append(variant)
+                assignment = AssignedVariantAttribute(
+                    variant=variant, assignment=attribute_variant
+                )
+                plan.variant_attributes.append(assignment)
+                plan.variant_attribute_values.append(
+                    AssignedVariantAttributeValue(
+                        value=values.request(
+                            size_attribute, slugify(f"size-{size}"), name=size
+                        ),
+                        assignment=assignment,
+                        variant=variant,
+                        sort_order=0,
+                    )
+                )
+                plan.variant_listings.extend(
+                    ProductVariantChannelListing(
+                        variant=variant,
+                        channel=channel,
+                        currency=channel.currency_code,
+                        price_amount=(
+                            price := _item_price(item, size, channel, exchange_rates)
+                        ),
+                        discounted_price_amount=price,
+                    )
+                    for channel in channels
+                )
+                stock = Stock(
+                    product_variant=variant, warehouse=warehouse, quantity=qty
+                )
+                stocks_by_size[size] = stock
+                plan.stocks.append(stock)
+
+
+def _plan_existing_products(
+    plan: ActivationPlan,
+    items: list[PriceListItem],
+    warehouse: "Warehouse",
+    channels: list["Channel"],
+    exchange_rates: dict[str, float],
+    now,
+):
+    if not items:
+        return
+    product_ids = {item.product_id for item in items}
+    products = Product.objects.in_bulk(product_ids)
+    with_media = set(
+        ProductMedia.objects.filter(product_id__in=product_ids)
+        .values_list("product_id", flat=True)
+        .distinct()
+    )
+    for item in items:
+        if item.image_url and item.product_id not in with_media:
+            with_media.add(item.product_id)
+            plan.media.append((products[item.product_id], item.image_url))
+
+    listed = set(
+        ProductChannelListing.objects.filter(
+            product_id__in=product_ids, channel__in=channels
+        ).values_list("product_id", "channel_id")
+    )
+    for product_id in sorted(product_ids):
+        plan.product_listings.extend(
+            ProductChannelListing(
+                product_id=product_id,
+                channel=channel,
+                currency=channel.currency_code,
+                is_published=True,
+                visible_in_listings=False,
+                available_for_purchase_at=now,
+            )
+            for channel in channels
+            if (product_id, channel.pk) not in listed
+        )
+    plan.published_product_ids.update(product_ids)
+
+    # get_or_create(product_id, name) picks the oldest variant on duplicates
+    variants: dict[tuple[int, str], ProductVariant] = {}
+    for variant in ProductVariant.objects.filter(product_id__in=product_ids).order_by(
+        "-pk"
+    ):
+        variants[(variant.product_id, variant.name)] = variant
+    next_sort_order = {
+        row["product_id"]: (row["max_sort_order"] + 1)
+        for row in ProductVariant.objects.filter(product_id__in=product_ids)
+        .values("product_id")
+        .annotate(max_sort_order=Max("sort_order"))
+        .order_by()
+        if row["max_sort_order"] is not None
+    }
+    existing_variant_ids = [variant.pk for variant in variants.values()]
+    stocks = dict(
+        Stock.objects.filter(
+            product_variant_id__in=existing_variant_ids, warehouse=warehouse
+        ).values_list("product_variant_id", "pk")
+    )
+    listings = {
+        (listing.variant_id, listing.channel_id): listing
+        for listing in ProductVariantChannelListing.objects.filter(
+            variant_id__in=existing_variant_ids, channel__in=channels
+        )
+    }
+
+    new_stocks: dict[int, Stock] = {}
+    for item in items:
+        for size, qty in item.sizes_and_qty.items():
+            key = (item.product_id, size)
+            variant = variants.get(key)
+            if variant is None:
+                sort_order = next_sort_order.get(item.product_id, 0)
+                next_sort_order[item.product_id] = sort_order + 1
+                variant = ProductVariant(
+                    product_id=item.product_id,
+                    name=size,
+                    sku=f"pl-{item.product_id}-{size}",
+                    sort_order=sort_order,
+                )
+                variants[key] = variant
+                plan.variants.append(variant)
+
+            if variant.pk is not None and variant.pk in stocks:
+                stock_id = stocks[variant.pk]
+                plan.stock_increments[stock_id] = (
+                    plan.stock_increments.get(stock_id, 0) + qty
+                )
+            elif id(variant) in new_stocks:
+                new_stocks[id(variant)].quantity += qty
+            else:
+                stock = Stock(
+                    product_variant=variant, warehouse=warehouse, quantity=qty
+                )
+                new_stocks[id(variant)] = stock
+                plan.stocks.append(stock)
+
+            for channel in channels:
+                listing_key = (
+                    id(variant) if variant.pk is None else variant.pk,
+                    channel.pk,
+                )
+                listing = listings.get(listing_key)
+                if listing is None:
+                    price = _item_price(item, size, channel, exchange_rates)
+                    listing = ProductVariantChannelListing(
+                        variant=variant,
+                        channel=channel,
+                        currency=channel.currency_code,
+                        price_amount=price,
+                        discounted_price_amount=price,
+                    )
+                    listings[listing_key] = listing
+                    plan.variant_listings.append(listing)
+                elif listing.discounted_price_amount is None:
+                    listing.discounted_price_amount = _item_price(
+                        item, size, channel, exchange_rates
+                    )
+                    plan.variant_listings_to_update.append(listing)
+
+
+def plan_activation(
+    items: list[PriceListItem],
+    warehouse: "Warehouse",
+    product_type_map: dict[str, "ProductType"],
+    category_map: dict[str, "Category"],
+    attribute_map: dict[str, Attribute],
+    channels: list["Channel"],
+    exchange_rates: dict[str, float],
+) -> ActivationPlan:
+    """Compute every row activate_price_list_task needs to create or update.
+
+    Items must have product_id resolved wherever an existing product matches;
+    items left without one get a new product.
+    """
+    plan = ActivationPlan()
+    now = timezone.now()
+    values = _AttributeValueResolver()
+    _plan_new_products(
+        plan,
+        [item for item in items if item.product_id is None],
+        warehouse,
+        product_type_map,
+        category_map,
+        attribute_map,
+        channels,
+        exchange_rates,
+        values,
+        now,
+    )
+    _plan_existing_products(
+        plan,
+        [item for item in items if item.product_id is not None],
+        warehouse,
+        channels,
+        exchange_rates,
+        now,
+    )
+    plan.attribute_values = values.resolve()
+    return plan
+
+
+def _assign_attribute_value_sort_orders(values: Iterable[AttributeValue]):
+    """Reserve sort orders per attribute like AttributeValue.save does, one lock each."""
+    by_attribute = defaultdict(list)
+    for value in values:
+        by_attribute[value.attribute_id].append(value)
+    if not by_attribute:
+        return
+    attributes = Attribute.objects.select_for_update().filter(pk__in=by_attribute)
+    for attribute in attributes.order_by("pk"):
+        current = attribute.max_sort_order
+        if current is None:
+            current = AttributeValue.objects.filter(attribute=attribute).aggregate(
+                Max("sort_order")
+            )["sort_order__max"]
+            current = -1 if current is None else current
+        for value in by_attribute[attribute.pk]:
+            current += 1
+            value.sort_order = current
+        attribute.max_sort_order = current
+    Attribute.objects.bulk_update(
+        [a for a in attributes if a.pk in by_attribute], ["max_sort_order"]
+    )
+
+
+def apply_activation_plan(
+    plan: ActivationPlan, images: dict[str, "StoredImage"] | None = None
+):
+    """Write a plan with a fixed number of bulk statements per model.
+
+    Must be called inside a transaction. Pass images prefetched with
+    ingestion.fetch_images to keep downloads out of it; missing images are
+    fetched here.
+    """
+    from .ingestion import create_product_media_bulk, fetch_images
+
+    _assign_attribute_value_sort_orders(plan.attribute_values.values())
+    AttributeValue.objects.bulk_create(
+        plan.attribute_values.values(), batch_size=BULK_BATCH_SIZE
+    )
+    Product.objects.bulk_create(plan.products, batch_size=BULK_BATCH_SIZE)
+    # Existing products may gain a listing concurrently, like the per-item path
+    # tolerating IntegrityError on create.
+    ProductChannelListing.objects.bulk_create(
+        plan.product_listings, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+    )
+    if plan.published_product_ids:
+        ProductChannelListing.objects.filter(
+            product_id__in=plan.published_product_ids, is_published=False
+        ).update(is_published=True, available_for_purchase_at=timezone.now())
+    AssignedProductAttributeValue.objects.bulk_create(
+        plan.product_attribute_values, batch_size=BULK_BATCH_SIZE
+    )
+    update_product_supplier_keys(product.pk for product in plan.products)
+    AttributeVariant.objects.bulk_create(plan.attribute_variants)
+    ProductVariant.objects.bulk_create(plan.variants, batch_size=BULK_BATCH_SIZE)
+    AssignedVariantAttribute.objects.bulk_create(
+        plan.variant_attributes, batch_size=BULK_BATCH_SIZE
+    )
+    AssignedVariantAttributeValue.objects.bulk_create(
+        plan.variant_attribute_values, batch_size=BULK_BATCH_SIZE
+    )
+    ProductVariantChannelListing.objects.bulk_create(
+        plan.variant_listings, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+    )
+    ProductVariantChannelListing.objects.bulk_update(
+        plan.variant_listings_to_update,
+        ["discounted_price_amount"],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    Stock.objects.bulk_create(plan.stocks, batch_size=BULK_BATCH_SIZE)
+    if plan.stock_increments:
+        stocks = list(
+            Stock.objects.select_for_update(of=("self",))
+            .filter(pk__in=plan.stock_increments)
+            .order_by("pk")
+        )
+        for stock in stocks:
+            stock.quantity += plan.stock_increments[stock.pk]
+        Stock.objects.bulk_update(stocks, ["quantity"], batch_size=BULK_BATCH_SIZE)
+
+    if plan.media:
+        if images is None:
+            images = fetch_images(image_url for _, image_url in plan.media)
+        create_product_media_bulk(plan.media, images)
+
+    for item, product in plan.item_products:
+        item.product_id = product.pk
+
+
+def activate_items_in_bulk(
+    items: list[PriceListItem],
+    warehouse: "Warehouse",
+    product_type_map: dict[str, "ProductType"],
+    category_map: dict[str, "Category"],
+    attribute_map: dict[str, Attribute],
+    channels: list["Channel"],
+    exchange_rates: dict[str, float],
+    images: dict[str, "StoredImage"] | None = None,
+) -> ActivationPlan:
+    """Activate items with set-based writes; sets product_id on new-product items."""
+    plan = plan_activation(
+        items,
+        warehouse,
+        product_type_map,
+        category_map,
+        attribute_map,
+        channels,
+        exchange_rates,
+    )
+    apply_activation_plan(plan, images)
+    logger.info(
+        "Activated %d price list item(s): %d product(s), %d variant(s), "
+        "%d stock row(s) created, %d stock row(s) incremented",
+        len(items),
+        len(plan.products),
+        len(plan.variants),
+        len(plan.stocks),
+        len(plan.stock_increments),
+    )
+    return plan
@@ -0,0 +1,80 @@
+"""Line-level diff between two PriceLists, used by replace_price_list_task.
+
+A line is one size of one item, keyed by (product_code, brand, size) with
+code and brand lowercased as ingestion.get_products_by_code_and_brand does.
+Quantity is the only line field a replace writes to existing variants, so
+lines with equal keys count as changed only when their quantity or resolved
+product differs.
+Most supplier refreshes change a small share of lines, and replace only
+writes the added, changed and removed ones.
+"""
+
+from collections.abc import Iterable
+
+import attrs
+
+from .models import PriceListItem
+
+# (product_code, brand, size)
+LineKey = tuple[str, str, str]
+
+
+@attrs.frozen
+class PriceListLine:
+    item: PriceListItem
+    size: str
+    quantity: int
+
+    @property
+    def product_id(self) -> int | None:
+        return self.item.product_id
+
+
+@attrs.define
+class PriceListDiff:
+    """Lines of the new list that differ from the old one.
+
+    removed holds lines of the old list, the others lines of the new one.
+    """
+
+    added: list[PriceListLine] = attrs.Factory(list)
+    changed: list[PriceListLine] = attrs.Factory(list)
+    removed: list[PriceListLine] = attrs.Factory(list)
+    unchanged: list[PriceListLine] = attrs.Factory(list)
+
+    def delta_counts(self) -> dict[str, int]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": len(self.unchanged),
+        }
+
+
+def _lines_by_key(items: Iterable[PriceListItem]) -> dict[LineKey, PriceListLine]:
+    lines = {}
+    for item in items:
+        code, brand = item.product_code.lower(), item.brand.lower()
+        for size, quantity in item.sizes_and_qty.items():
+            lines[(code, brand, size)] = PriceListLine(item, size, quantity)
+    return lines
+
+
+def diff_price_list_items(
+    old_items: Iterable[PriceListItem], new_items: Iterable[PriceListItem]
+) -> PriceListDiff:
+    old_lines = _lines_by_key(old_items)
+    new_lines = _lines_by_key(new_items)
+    diff = PriceListDiff()
+    for key, line in new_lines.items():
+        old_line = old_lines.get(key)
+        if old_line is None:
+            diff.added.append(line)
+        elif (
+            old_line.quantity != line.quantity or old_line.product_id != line.product_id
+        ):
+            diff.changed.append(line)
+        else:
+            diff.unchanged.append(line)
+    diff.removed = [line for key, line in old_lines.items() if key not in new_lines]
+    return diff
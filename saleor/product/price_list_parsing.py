@@ -2,17 +2,24 @@
 
 Each parser returns (value, errors) so all errors are collected per-row
 rather than failing fast. parse_sheet converts the DataFrame into a list
-of ParsedRow objects ready for bulk insertion.
+of ParsedRow objects ready for bulk insertion, either row by row or, with
+vectorized=True, a whole column at a time. iter_sheet_chunks streams a
+workbook as a sequence of small DataFrames so large sheets can be parsed
+without loading them into memory at once.
 """
 
 import math
 import os
 import re
+from collections.abc import Iterator
 from decimal import Decimal, InvalidOperation
 from urllib.parse import urlparse
 
 import attrs
+import numpy as np
+import openpyxl
 import pandas as pd
+from pandas.io.parsers import TextParser
 
 from .ingestion import SizeQtyUnparseable, parse_sizes_and_qty
 
@@ -36,6 +43,25 @@ VALID_IMAGE_MIME_TYPES = frozenset(
 VALID_HS_CODE_LENGTHS = frozenset({6, 8, 10})
 
 
+def _ascii_case_insensitive(literal: str) -> str:
+    # The IGNORECASE flag would also let e.g. "ı" match "i"
+    return "".join(f"[{c}{c.upper()}]" if c.isalpha() else c for c in literal)
+
+
+# Image URLs parse_image_url accepts without question: an http(s) URL with a
+# plain ASCII host whose last path segment has a name and a valid extension.
+_ACCEPTED_IMAGE_URL_RE = (
+    _ascii_case_insensitive("^https?")
+    + r"://[A-Za-z0-9.\-_~:@%]+"
+    + r"(?:/[^?#;\s]*)?/[^/?#;\s]*[^/.?#;\s][^/?#;\s]*\.(?:"
+    + "|".join(
+        _ascii_case_insensitive(ext.lstrip("."))
+        for ext in sorted(VALID_IMAGE_EXTENSIONS)
+    )
+    + r")(?:[?#]\S*)?$"
+)
+
+
 @attrs.frozen
 class ParsedRow:
     row_index: int
@@ -200,6 +226,163 @@ def parse_sizes(val) -> tuple[dict, list[str]]:
         return {}, [f"sizes: {e}"]
 
 
+# ---------------------------------------------------------------------------
+# Column parsers — vectorized counterparts of the field parsers above.
+# Each takes a whole column (None for empty cells) and returns the parsed
+# values with a {position: errors} map of the rows that failed. Cells the
+# pandas checks cannot accept outright go through the field parser, so the
+# results match parse_row exactly.
+# ---------------------------------------------------------------------------
+
+ColumnResult = tuple[list, dict[int, list[str]]]
+
+_SIZE_QTY_RE = r"([^\[\],\s]+)\s*\[(\d+)\]"
+
+
+def _text_column(col: "pd.Series") -> "pd.Series":
+    return col.map(lambda val: "" if val is None else str(val)).str.strip()
+
+
+def _positions(mask: "pd.Series") -> list[int]:
+    return np.flatnonzero(mask.to_numpy(dtype=bool)).tolist()
+
+
+def _parse_rejected(
+    col: "pd.Series", values: list, accepted: "pd.Series", parser
+) -> ColumnResult:
+    """Re-parse cells outside the accepted mask with the field parser."""
+    errors = {}
+    for pos in _positions(~accepted):
+        values[pos], errs = parser(col.iat[pos])
+        if errs:
+            errors[pos] = errs
+    return values, errors
+
+
+def parse_product_code_column(col: "pd.Series") -> ColumnResult:
+    text = _text_column(col)
+    errors: dict[int, list[str]] = {
+        pos: ["product_code: required"] for pos in _positions(text == "")
+    }
+    for pos in _positions(text.str.contains(" ", regex=False)):
+        errors[pos] = ["product_code: must not contain spaces"]
+    return text.str.lower().tolist(), errors
+
+
+def parse_brand_column(col: "pd.Series") -> ColumnResult:
+    text = _text_column(col)
+    errors = {pos: ["brand: required"] for pos in _positions(text == "")}
+    return text.str.lower().tolist(), errors
+
+
+def parse_category_column(
+    col: "pd.Series", valid_categories: set[str] | None
+) -> ColumnResult:
+    text = _text_column(col)
+    if valid_categories is None:
+        return text.tolist(), {}
+    accepted = (text == "") | text.isin(valid_categories)
+    return _parse_rejected(
+        col,
+        text.tolist(),
+        accepted,
+        lambda val: parse_category(val, valid_categories),
+    )
+
+
+def parse_sizes_column(col: "pd.Series") -> ColumnResult:
+    text = _text_column(col).reset_index(drop=True)
+    matches = text.str.extractall(_SIZE_QTY_RE)
+    sizes: list[dict] = [{} for _ in range(len(text))]
+    for (pos, _), size, qty in zip(
+        matches.index, matches[0], matches[1].map(int), strict=True
+    ):
+        sizes[pos][size] = qty
+
+    errors = {pos: ["sizes: required"] for pos in _positions(text == "")}
+    unmatched = (text != "") & ~text.index.isin(matches.index.get_level_values(0))
+    # The field parser words the error so it reads as in parse_row
+    for pos in _positions(unmatched):
+        _, errors[pos] = parse_sizes(col.iat[pos])
+    return sizes, errors
+
+
+def parse_decimal_column(col: "pd.Series", field_name: str) -> ColumnResult:
+    """Parse a numeric column the way parse_decimal parses a cell.
+
+    Cells are converted through str() as the field parsers do, so a value
+    reads the same as in the spreadsheet rather than as its binary float.
+    Cells pd.to_numeric cannot read as a finite number go through
+    parse_decimal, which reports them or accepts the few spellings pandas
+    does not, e.g. "1_000".
+    """
+    text = _text_column(col)
+    missing = col.isna()
+    numbers = pd.to_numeric(text.mask(missing), errors="coerce")
+    accepted = missing | np.isfinite(numbers.to_numpy(dtype=float, na_value=np.nan))
+    # One Decimal per distinct spelling, so 1 and 1.0 keep their exponents
+    codes, spellings = pd.factorize(text.mask(~accepted | missing))
+    decimals = np.array([None, *map(Decimal, spellings)], dtype=object)
+    return _parse_rejected(
+        col,
+        decimals[codes + 1].tolist(),
+        accepted,
+        lambda val: parse_decimal(val, field_name),
+    )
+
+
+def _negative(values: list) -> "np.ndarray":
+    decimals = np.array(values, dtype=object)
+    present = pd.notna(decimals)
+    decimals[~present] = 0
+    return present & (decimals < 0)
+
+
+def parse_price_column(
+    col: "pd.Series", field_name: str, required: bool = False
+) -> ColumnResult:
+    values, errors = parse_decimal_column(col, field_name)
+    for pos in np.flatnonzero(_negative(values)).tolist():
+        errors[pos] = [f"{field_name}: must not be negative"]
+    if required:
+        for pos in _positions(col.isna()):
+            errors[pos] = [f"{field_name}: required"]
+    return values, errors
+
+
+def parse_weight_kg_column(col: "pd.Series") -> ColumnResult:
+    values, errors = parse_decimal_column(col, "weight_kg")
+    negative = _negative(values)
+    for pos in np.flatnonzero(negative).tolist():
+        errors[pos] = ["weight_kg: must not be negative"]
+    decimals = np.array(values, dtype=object)
+    decimals[~pd.notna(decimals) | negative] = 0
+    for pos in np.flatnonzero(decimals > 1000).tolist():
+        errors[pos] = [
+            f"weight_kg: {values[pos]} exceeds 1000 kg — value may have been "
+            "entered in grams"
+        ]
+    return values, errors
+
+
+def parse_image_url_column(col: "pd.Series") -> ColumnResult:
+    text = _text_column(col)
+    mime_types = text.str.extract(r"^data:([^;,]*)", expand=False)
+    accepted = (
+        (text == "")
+        | mime_types.isin(VALID_IMAGE_MIME_TYPES)
+        | text.str.match(_ACCEPTED_IMAGE_URL_RE)
+    )
+    return _parse_rejected(col, text.tolist(), accepted, parse_image_url)
+
+
+def parse_hs_code_column(col: "pd.Series") -> ColumnResult:
+    text = _text_column(col)
+    digits = text.str.replace(r"\D", "", regex=True)
+    accepted = (text == "") | digits.str.len().isin(VALID_HS_CODE_LENGTHS)
+    return _parse_rejected(col, digits.tolist(), accepted, parse_hs_code)
+
+
 # ---------------------------------------------------------------------------
 # Row and sheet parsers
 # ---------------------------------------------------------------------------
@@ -253,31 +436,208 @@ def parse_row(
     )
 
 
+def parse_columns(
+    sub: "pd.DataFrame",
+    first_row_index: int,
+    currency: str,
+    valid_categories: set[str] | None = None,
+) -> list[ParsedRow]:
+    """Parse pre-normalised columns into ParsedRows, a column at a time.
+
+    Vectorized counterpart of calling parse_row for every row of ``sub``,
+    which must use field-name columns with NaN already replaced with None
+    (handled by parse_sheet). Returns the same rows and errors.
+    """
+    # to_dict("records") keeps the last of repeated column names; do the same
+    sub = sub.loc[:, ~sub.columns.duplicated(keep="last")]
+    empty = pd.Series([None] * len(sub), index=sub.index, dtype=object)
+
+    def column(field):
+        return sub[field] if field in sub.columns else empty
+
+    # Order matches parse_row so errors are listed in the same order
+    parsed = [
+        parse_product_code_column(column("product_code")),
+        parse_brand_column(column("brand")),
+        parse_category_column(column("category"), valid_categories),
+        parse_sizes_column(column("sizes")),
+        parse_price_column(column("rrp"), "rrp"),
+        parse_price_column(column("sell_price"), "sell_price", required=True),
+        parse_price_column(column("buy_price"), "buy_price"),
+        parse_weight_kg_column(column("weight_kg")),
+        parse_image_url_column(column("image_url")),
+        parse_hs_code_column(column("hs_code")),
+    ]
+    descriptions = _text_column(column("description")).tolist()
+    column_errors = [errors for _, errors in parsed]
+    (
+        product_codes,
+        brands,
+        categories,
+        sizes,
+        rrps,
+        sell_prices,
+        buy_prices,
+        weights,
+        image_urls,
+        hs_codes,
+    ) = (values for values, _ in parsed)
+
+    rows = []
+    for pos in range(len(sub)):
+        errors = [err for errs in column_errors for err in errs.get(pos, ())]
+        rows.append(
+            ParsedRow(
+                row_index=first_row_index + pos,
+                product_code=product_codes[pos],
+                brand=brands[pos],
+                description=descriptions[pos],
+                category=categories[pos],
+                sizes_and_qty=sizes[pos],
+                rrp=rrps[pos],
+                sell_price=sell_prices[pos],
+                buy_price=buy_prices[pos],
+                weight_kg=weights[pos],
+                image_url=image_urls[pos],
+                hs_code=hs_codes[pos],
+                currency=currency,
+                is_valid=len(errors) == 0,
+                validation_errors=errors,
+            )
+        )
+    return rows
+
+
 def parse_sheet(
     df: "pd.DataFrame",
     column_map: dict[int, str],
     default_currency: str,
     valid_categories: set[str] | None = None,
     header_row: int = 0,
+    row_offset: int = 0,
+    vectorized: bool = False,
 ) -> list[ParsedRow]:
     """Parse a DataFrame into a list of ParsedRow.
 
-    Uses to_dict('records') rather than iterrows() for performance.
+    Uses to_dict('records') rather than iterrows() for performance, or
+    parse_columns when vectorized is set, which gives the same result.
     NaN values are normalised to None before parsing so individual parsers
     only need to handle None.
 
     row_index is the 1-based Excel row number of the data row, so error
     messages reference the row the user actually sees in their spreadsheet.
+    row_offset is the position of the DataFrame's first row among all data
+    rows of the sheet; it is non-zero for chunks from iter_sheet_chunks.
     """
     valid_cols = sorted(c for c in column_map if c < len(df.columns))
     sub = df.iloc[:, valid_cols].copy()
     sub.columns = pd.Index([column_map[c] for c in valid_cols])
     sub = sub.astype(object).where(pd.notna(sub), other=None)
-    rows = sub.to_dict("records")
     # header_row is 0-based; data rows start one row below it.
     # +2 converts to 1-based Excel row number (1 for header, +1 for data offset).
-    first_data_excel_row = header_row + 2
+    first_data_excel_row = header_row + 2 + row_offset
+    if vectorized:
+        return parse_columns(
+            sub, first_data_excel_row, default_currency, valid_categories
+        )
+    rows = sub.to_dict("records")
     return [
         parse_row(first_data_excel_row + idx, raw, default_currency, valid_categories)
         for idx, raw in enumerate(rows)
     ]
+
+
+# ---------------------------------------------------------------------------
+# Streaming reader
+# ---------------------------------------------------------------------------
+
+
+def _convert_cell(value):
+    """Convert an openpyxl cell value the same way pandas.read_excel does."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _to_dataframe(rows: list[list], width: int) -> "pd.DataFrame":
+    padded = [row + [""] * (width - len(row)) for row in rows]
+    # Same options pandas.read_excel uses, so NA markers come out as they would
+    # from a whole-sheet read. Cells keep their own types instead of being
+    # inferred per column, as that would depend on the rows of the chunk, e.g.
+    # a numeric column with a blank cell would be read as floats.
+    return TextParser(padded, header=None, skip_blank_lines=False, dtype=object).read()
+
+
+def estimate_sheet_rows(path, sheet_name: str, header_row: int = 0) -> int | None:
+    """Return the number of data rows declared by the sheet, if any.
+
+    The declared dimension is only a hint written by the producing
+    application, so the result is suitable for progress reporting only.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            return None
+        max_row = workbook[sheet_name].max_row
+    finally:
+        workbook.close()
+    if max_row is None:
+        return None
+    return max(max_row - header_row - 1, 0)
+
+
+def iter_sheet_chunks(
+    path,
+    sheet_name: str,
+    header_row: int = 0,
+    chunk_size: int = 2000,
+) -> Iterator[tuple[int, "pd.DataFrame"]]:
+    """Stream a worksheet as (row_offset, DataFrame) chunks of at most chunk_size rows.
+
+    The workbook is opened in read-only mode so only the current chunk is held
+    in memory. Columns are positional, matching pd.read_excel(header=header_row)
+    so the chunks can be passed straight to parse_sheet together with their
+    row_offset. Blank rows in the middle of the sheet are kept (they fail
+    validation like any other row) while trailing blank rows are dropped.
+
+    Cells are read as objects, like pd.read_excel(dtype=object), so every chunk
+    parses the same way regardless of the other rows in it.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        sheet = workbook[sheet_name]
+        # Declared dimensions can be wrong; let openpyxl discover the real extent.
+        sheet.reset_dimensions()
+
+        width = 0
+        row_offset = 0
+        chunk: list[list] = []
+        blank_rows: list[list] = []
+        rows = sheet.iter_rows(min_row=header_row + 1, values_only=True)
+        for excel_row, values in enumerate(rows, start=header_row + 1):
+            converted = [_convert_cell(value) for value in values]
+            while converted and converted[-1] == "":
+                converted.pop()
+            width = max(width, len(converted))
+            if excel_row == header_row + 1:
+                # Header row only contributes to the column count.
+                continue
+            if not converted:
+                # Only emitted once a later row proves it is not trailing.
+                blank_rows.append(converted)
+                continue
+            for row in blank_rows + [converted]:
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield row_offset, _to_dataframe(chunk, width)
+                    row_offset += len(chunk)
+                    chunk = []
+            blank_rows = []
+        if chunk:
+            yield row_offset, _to_dataframe(chunk, width)
+    finally:
+        workbook.close()
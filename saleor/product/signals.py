@@ -1,3 +1,7 @@
+from functools import partial
+
+from django.db import transaction
+
 from ..core.tasks import delete_from_storage_task
 
 
@@ -13,4 +17,47 @@ def delete_digital_content_file(sender, instance, **kwargs):
 
 def delete_product_media_image(sender, instance, **kwargs):
     if file := instance.image:
-        delete_from_storage_task.delay(file.name)
+        name = file.name
+        transaction.on_commit(lambda: _delete_unshared_media_image(sender, name))
+
+
+def _delete_unshared_media_image(model, name):
+    # Ingestion stores identical images once and shares the file between media.
+    # Checked once the deletion commits, to see media committed in the meantime.
+    if not model.objects.filter(image=name).exists():
+        delete_from_storage_task.delay(name)
+
+
+def update_supplier_key_of_assignment(sender, instance, **kwargs):
+    from .supplier_keys import update_product_supplier_keys
+
+    update_product_supplier_keys([instance.product_id])
+
+
+def update_supplier_keys_of_value(sender, instance, created, **kwargs):
+    from ..attribute.models import AssignedProductAttributeValue
+    from .supplier_keys import SUPPLIER_KEY_ATTRIBUTES, update_product_supplier_keys
+
+    # New values are not assigned to any product yet
+    if created:
+        return
+    update_product_supplier_keys(
+        AssignedProductAttributeValue.objects.filter(
+            value=instance, value__attribute__name__in=SUPPLIER_KEY_ATTRIBUTES
+        ).values_list("product_id", flat=True)
+    )
+
+
+def update_supplier_keys_of_deleted_value(sender, instance, **kwargs):
+    from ..attribute.models import AssignedProductAttributeValue
+    from .supplier_keys import SUPPLIER_KEY_ATTRIBUTES, update_product_supplier_keys
+
+    product_ids = list(
+        AssignedProductAttributeValue.objects.filter(
+            value=instance, value__attribute__name__in=SUPPLIER_KEY_ATTRIBUTES
+        ).values_list("product_id", flat=True)
+    )
+    # The assignments are deleted in bulk along with the value; sync their
+    # products once that commits rather than for each assignment
+    if product_ids:
+        transaction.on_commit(partial(update_product_supplier_keys, product_ids))
@@ -0,0 +1,162 @@
+"""Lookup of products by supplier identity: lowercased (product code, brand).
+
+ProductSupplierKey holds a product's Product Code and Brand attribute values
+in one indexed row, so a batch of codes resolves with a single query however
+large the catalogue is. Keys are refreshed with update_product_supplier_keys
+by everything that writes or deletes those attribute values in bulk;
+single saves of assignments and attribute values, and deletions of
+attribute values, are handled by signals (see signals.py).
+
+Inside supplier_key_cache() lookups are memoized per code, so a task looking
+up the same codes repeatedly only queries once. Syncing keys clears it.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import Func, Value
+
+if TYPE_CHECKING:
+    from .models import Product
+
+PRODUCT_CODE_ATTRIBUTE = "Product Code"
+BRAND_ATTRIBUTE = "Brand"
+SUPPLIER_KEY_ATTRIBUTES = (PRODUCT_CODE_ATTRIBUTE, BRAND_ATTRIBUTE)
+
+# code -> [(brand, product)], [] for codes known to have no product
+_lookup_cache: ContextVar[dict[str, list[tuple[str, "Product"]]] | None] = ContextVar(
+    "supplier_key_lookup_cache", default=None
+)
+# Product IDs whose keys are synced when the deferring block exits
+_deferred_product_ids: ContextVar[set[int] | None] = ContextVar(
+    "supplier_key_deferred_product_ids", default=None
+)
+
+
+def normalize_supplier_key(value: str) -> str:
+    return value.lower()
+
+
+@contextmanager
+def supplier_key_cache():
+    """Memoize get_products_by_supplier_key lookups within the block."""
+    token = _lookup_cache.set({})
+    try:
+        yield
+    finally:
+        _lookup_cache.reset(token)
+
+
+def _any(values: list[str]) -> Func:
+    # "= ANY(array)" binds the codes as one parameter, however many there are
+    return Func(
+        Value(values, output_field=ArrayField(models.CharField())),
+        function="ANY",
+    )
+
+
+def get_products_by_supplier_key(
+    product_codes: Iterable[str],
+) -> dict[tuple[str, str], "Product"]:
+    """Return products whose code matches case-insensitively, by (code, brand).
+
+    Keys of the result are lowercased.
+    """
+    from .models import ProductSupplierKey
+
+    codes = {normalize_supplier_key(code) for code in product_codes}
+    cache = _lookup_cache.get()
+    if cache is None:
+        cache = {}
+        missing = list(codes)
+    else:
+        missing = [code for code in codes if code not in cache]
+
+    if missing:
+        for code in missing:
+            cache[code] = []
+        keys = ProductSupplierKey.objects.filter(
+            product_code=_any(missing)
+        ).select_related("product")
+        for key in keys:
+            cache[key.product_code].append((key.brand, key.product))
+
+    return {
+        (code, brand): product
+        for code in codes
+        for brand, product in cache.get(code, [])
+    }
+
+
+def update_product_supplier_keys(product_ids: Iterable[int]) -> None:
+    """Recompute the supplier keys of the given products from their attributes.
+
+    Products without both a Product Code and a Brand value lose their key.
+    Inside defer_supplier_key_updates() the products are only recorded.
+    """
+    from ..attribute.models import AssignedProductAttributeValue
+    from .models import ProductSupplierKey
+
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+    if (deferred := _deferred_product_ids.get()) is not None:
+        deferred.update(product_ids)
+        return
+
+    values: dict[int, dict[str, str]] = defaultdict(dict)
+    assignments = (
+        AssignedProductAttributeValue.objects.filter(
+            product_id__in=product_ids,
+            value__attribute__name__in=SUPPLIER_KEY_ATTRIBUTES,
+        )
+        .order_by("sort_order", "pk")
+        .values_list("product_id", "value__attribute__name", "value__name")
+    )
+    for product_id, attribute_name, value_name in assignments:
+        values[product_id].setdefault(attribute_name, value_name)
+
+    keys = [
+        ProductSupplierKey(
+            product_id=product_id,
+            product_code=normalize_supplier_key(attributes[PRODUCT_CODE_ATTRIBUTE]),
+            brand=normalize_supplier_key(attributes[BRAND_ATTRIBUTE]),
+        )
+        for product_id, attributes in values.items()
+        if len(attributes) == len(SUPPLIER_KEY_ATTRIBUTES)
+    ]
+    ProductSupplierKey.objects.filter(product_id__in=product_ids).exclude(
+        product_id__in=[key.product_id for key in keys]
+    ).delete()
+    ProductSupplierKey.objects.bulk_create(
+        keys,
+        update_conflicts=True,
+        unique_fields=["product"],
+        update_fields=["product_code", "brand"],
+    )
+    if (cache := _lookup_cache.get()) is not None:
+        cache.clear()
+
+
+@contextmanager
+def defer_supplier_key_updates():
+    """Collect key updates made in the block and apply them in one batch.
+
+    For code writing attribute values product by product, where the signals
+    would otherwise sync each product on its own.
+    """
+    if _deferred_product_ids.get() is not None:
+        yield
+        return
+    product_ids: set[int] = set()
+    token = _deferred_product_ids.set(product_ids)
+    try:
+        yield
+    finally:
+        _deferred_product_ids.reset(token)
+    update_product_supplier_keys(product_ids)
@@ -1,17 +1,17 @@
 import logging
 import os
+import shutil
 import tempfile
 from collections import defaultdict
 from collections.abc import Iterable
 from uuid import UUID
 
 import attrs
-import pandas as pd
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import IntegrityError, transaction
-from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Exists, F, OuterRef, Q, QuerySet
 from django.utils import timezone
 
 from ..attribute.models import Attribute
@@ -21,7 +21,9 @@ from ..core.exceptions import PreorderAllocationError
 from ..discount import PromotionType
 from ..discount.models import Promotion, PromotionRule
 from ..plugins.manager import get_plugins_manager
+from ..warehouse.availability_store import schedule_product_availability_refresh
 from ..warehouse.management import deactivate_preorder_for_variant
+from ..warehouse.reconciliation import mark_stocks_for_reconciliation
 from ..webhook.event_types import WebhookEventAsyncType
 from ..webhook.utils import get_webhooks_for_event
 from . import PriceListStatus
@@ -32,10 +34,12 @@ from .models import (
     PriceListItem,
     Product,
     ProductChannelListing,
+    ProductMedia,
     ProductType,
     ProductVariant,
 )
 from .search import update_products_search_vector
+from .supplier_keys import defer_supplier_key_updates, supplier_key_cache
 from .utils.product import mark_products_in_channels_as_dirty
 from .utils.variant_prices import update_discounted_prices_for_promotion
 from .utils.variants import (
@@ -53,6 +57,11 @@ VARIANTS_UPDATE_BATCH = 500
 DISCOUNTED_PRODUCT_BATCH = 2000
 # Results in update time ~2s when 600 channels exist
 PROMOTION_RULE_BATCH_SIZE = 50
+# Rows parsed and written per transaction when processing a price list
+PRICE_LIST_CHUNK_SIZE = 2000
+# Retries of a product ingestion chunk that hit a concurrent chunk's writes
+INGESTION_CHUNK_RETRY_BACKOFF = 10
+INGESTION_CHUNK_RETRY_MAX = 5
 
 
 def _variants_in_batches(variants_qs):
@@ -356,10 +365,70 @@ def collection_product_updated_task(product_ids):
         manager.product_updated(product, webhooks=webhooks)
 
 
+def _dedupe_parsed_rows(parsed_rows, seen_keys: set[tuple[str, str]]):
+    """Invalidate repeated (product_code, brand) rows; seen_keys spans all chunks."""
+    deduped = []
+    for row in parsed_rows:
+        if row.is_valid:
+            key = (row.product_code, row.brand)
+            if key in seen_keys:
+                row = attrs.evolve(
+                    row,
+                    is_valid=False,
+                    validation_errors=list(row.validation_errors)
+                    + [
+                        f"duplicate product_code+brand in this sheet: {row.product_code}"
+                    ],
+                )
+            else:
+                seen_keys.add(key)
+        deduped.append(row)
+    return deduped
+
+
+def _link_price_list_items_to_products(items: list[PriceListItem]):
+    """Populate the product FK of valid items that match an existing product."""
+    from .ingestion import MissingDatabaseSetup, get_products_by_code_and_brand
+
+    valid_items = [item for item in items if item.is_valid]
+    if not valid_items:
+        return
+    try:
+        product_map = get_products_by_code_and_brand(
+            [item.product_code for item in valid_items]
+        )
+    except MissingDatabaseSetup:
+        return
+    updates = []
+    for item in valid_items:
+        product = product_map.get((item.product_code.lower(), item.brand.lower()))
+        if product:
+            item.product_id = product.pk
+            updates.append(item)
+    if updates:
+        PriceListItem.objects.bulk_update(updates, ["product_id"])
+
+
 @app.task
 @allow_writer()
+@supplier_key_cache()
 def process_price_list_task(price_list_id: int):
-    from .price_list_parsing import parse_sheet
+    """Parse the price list workbook into PriceListItem rows.
+
+    The sheet is streamed in chunks of PRICE_LIST_CHUNK_SIZE rows; every chunk
+    is parsed, de-duplicated and written in its own transaction, and
+    PriceList.processed_rows is bumped as it commits, so memory use and
+    transaction length do not grow with the size of the sheet.
+
+    Items are written under the next generation and replace the current ones
+    only after the last chunk is written, so a run that fails part way leaves
+    the items of the previous run in place.
+    """
+    from .price_list_parsing import (
+        estimate_sheet_rows,
+        iter_sheet_chunks,
+        parse_sheet,
+    )
 
     price_list = PriceList.objects.get(pk=price_list_id)
 
@@ -370,16 +439,6 @@ def process_price_list_task(price_list_id: int):
         column_map = {int(k): v for k, v in config["column_map"].items()}
         default_currency = config.get("default_currency", "")
 
-        suffix = os.path.splitext(price_list.excel_file.name)[1] or ".xlsx"
-        fd, temp_path = tempfile.mkstemp(suffix=suffix)
-        try:
-            with os.fdopen(fd, "wb") as tmp:
-                with price_list.excel_file.open("rb") as src:
-                    tmp.write(src.read())
-            df = pd.read_excel(temp_path, sheet_name=sheet_name, header=header_row)
-        finally:
-            os.unlink(temp_path)
-
         _raw_categories = set(
             Category.objects.filter(
                 name__in=ProductType.objects.values("name")
@@ -387,84 +446,89 @@ def process_price_list_task(price_list_id: int):
         )
         valid_categories = _raw_categories if _raw_categories else None
 
-        parsed_rows = parse_sheet(
-            df, column_map, default_currency, valid_categories, header_row=header_row
-        )
-
-        # Deduplicate (product_code, brand) in memory before touching the DB
-        seen_keys: set[tuple[str, str]] = set()
-        deduped = []
-        for row in parsed_rows:
-            if row.is_valid:
-                key = (row.product_code, row.brand)
-                if key in seen_keys:
-                    row = attrs.evolve(
-                        row,
-                        is_valid=False,
-                        validation_errors=list(row.validation_errors)
-                        + [
-                            f"duplicate product_code+brand in this sheet: {row.product_code}"
-                        ],
-                    )
-                else:
-                    seen_keys.add(key)
-            deduped.append(row)
+        suffix = os.path.splitext(price_list.excel_file.name)[1] or ".xlsx"
+        fd, temp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                with price_list.excel_file.open("rb") as src:
+                    shutil.copyfileobj(src, tmp)
 
-        with transaction.atomic():
-            PriceListItem.objects.filter(price_list=price_list).delete()
-            PriceListItem.objects.bulk_create(
-                [
-                    PriceListItem(
-                        price_list=price_list,
-                        row_index=row.row_index,
-                        product_code=row.product_code,
-                        brand=row.brand,
-                        description=row.description,
-                        category=row.category,
-                        sizes_and_qty=row.sizes_and_qty,
-                        rrp=row.rrp,
-                        sell_price=row.sell_price,
-                        buy_price=row.buy_price,
-                        weight_kg=row.weight_kg,
-                        image_url=row.image_url,
-                        hs_code=row.hs_code,
-                        currency=row.currency,
-                        is_valid=row.is_valid,
-                        validation_errors=row.validation_errors,
-                    )
-                    for row in deduped
-                ]
+            # Items left by a run that failed or was interrupted
+            price_list.items.exclude(generation=price_list.items_generation).delete()
+            generation = price_list.items_generation + 1
+            PriceList.objects.filter(pk=price_list_id).update(
+                processed_rows=0,
+                total_rows=estimate_sheet_rows(temp_path, sheet_name, header_row),
             )
 
-            # Batch-populate product FK for valid items
-            valid_items = list(price_list.items.filter(is_valid=True))
-            if valid_items:
-                from .ingestion import (
-                    MissingDatabaseSetup,
-                    get_products_by_code_and_brand,
+            # Deduplicate (product_code, brand) across the whole sheet
+            seen_keys: set[tuple[str, str]] = set()
+            processed_rows = 0
+            for row_offset, chunk in iter_sheet_chunks(
+                temp_path, sheet_name, header_row, chunk_size=PRICE_LIST_CHUNK_SIZE
+            ):
+                parsed_rows = parse_sheet(
+                    chunk,
+                    column_map,
+                    default_currency,
+                    valid_categories,
+                    header_row=header_row,
+                    row_offset=row_offset,
+                    vectorized=True,
                 )
+                deduped = _dedupe_parsed_rows(parsed_rows, seen_keys)
+                del chunk, parsed_rows
+
+                with transaction.atomic():
+                    items = PriceListItem.objects.bulk_create(
+                        [
+                            PriceListItem(
+                                price_list=price_list,
+                                row_index=row.row_index,
+                                product_code=row.product_code,
+                                brand=row.brand,
+                                description=row.description,
+                                category=row.category,
+                                sizes_and_qty=row.sizes_and_qty,
+                                rrp=row.rrp,
+                                sell_price=row.sell_price,
+                                buy_price=row.buy_price,
+                                weight_kg=row.weight_kg,
+                                image_url=row.image_url,
+                                hs_code=row.hs_code,
+                                currency=row.currency,
+                                is_valid=row.is_valid,
+                                validation_errors=row.validation_errors,
+                                generation=generation,
+                            )
+                            for row in deduped
+                        ]
+                    )
+                    _link_price_list_items_to_products(items)
+                    processed_rows += len(items)
+                    PriceList.objects.filter(pk=price_list_id).update(
+                        processed_rows=processed_rows
+                    )
+        finally:
+            os.unlink(temp_path)
 
-                try:
-                    codes = [i.product_code for i in valid_items]
-                    product_map = get_products_by_code_and_brand(codes)
-                    updates = []
-                    for item in valid_items:
-                        p = product_map.get(
-                            (item.product_code.lower(), item.brand.lower())
-                        )
-                        if p:
-                            item.product_id = p.pk
-                            updates.append(item)
-                    if updates:
-                        PriceListItem.objects.bulk_update(updates, ["product_id"])
-                except MissingDatabaseSetup:
-                    pass
-
-            price_list.processing_completed_at = timezone.now()
-            price_list.processing_failed_at = None
+        price_list.processing_completed_at = timezone.now()
+        price_list.processing_failed_at = None
+        price_list.processed_rows = processed_rows
+        price_list.total_rows = processed_rows
+        price_list.items_generation = generation
+        # Readers never see the new generation next to a part deleted old one
+        with transaction.atomic():
             price_list.save(
-                update_fields=["processing_completed_at", "processing_failed_at"]
+                update_fields=[
+                    "processing_completed_at",
+                    "processing_failed_at",
+                    "processed_rows",
+                    "total_rows",
+                    "items_generation",
+                ]
             )
+            price_list.items.exclude(generation=generation).delete()
     except Exception:
         price_list.processing_completed_at = None
         price_list.processing_failed_at = timezone.now()
@@ -496,8 +560,9 @@ def _build_product_data_from_item(item):
     )
 
 
-def _load_activation_context(categories, channels):
-    from .ingestion import get_exchange_rates
+def _load_activation_context(categories, channels, price_list=None):
+    """Load lookups for activation; rates come from price_list's snapshot if given."""
+    from .exchange_rates import get_exchange_rates, get_price_list_exchange_rates
     from .models import Category, ProductType
 
     product_type_map = {
@@ -519,10 +584,83 @@ def _load_activation_context(categories, channels):
         attr.name: attr
         for attr in Attribute.objects.filter(name__in=required_attributes)
     }
-    exchange_rates = get_exchange_rates()
+    if price_list is not None:
+        exchange_rates = get_price_list_exchange_rates(price_list)
+    else:
+        exchange_rates = get_exchange_rates()
     return product_type_map, category_map, attribute_map, list(channels), exchange_rates
 
 
+def _fetch_price_list_images(price_list_id: int) -> dict:
+    """Download images activation will attach, before its transaction opens.
+
+    Only items for new products or products without media need an image.
+    """
+    from .ingestion import fetch_images
+
+    image_urls = (
+        PriceListItem.objects.filter(
+            price_list_id=price_list_id,
+            generation=F("price_list__items_generation"),
+            is_valid=True,
+        )
+        .exclude(image_url="")
+        .filter(
+            Q(product__isnull=True)
+            | ~Exists(ProductMedia.objects.filter(product_id=OuterRef("product_id")))
+        )
+        .values_list("image_url", flat=True)
+    )
+    return fetch_images(image_urls)
+
+
+def _can_activate_price_list(price_list_id: int) -> bool:
+    """Tell if activating the price list gets past the checks of the task.
+
+    Read without locking, only to skip downloading images for an activation
+    that is going to return early or fail; the task repeats the checks under
+    lock.
+    """
+    return (
+        PriceList.objects.filter(
+            pk=price_list_id,
+            processing_completed_at__isnull=False,
+            warehouse__is_owned=False,
+        )
+        .exclude(status=PriceListStatus.ACTIVE)
+        .exists()
+    )
+
+
+def _can_replace_price_list(old_id: int, new_id: int) -> bool:
+    """Tell if replacing the price list gets past the checks of the task.
+
+    Like _can_activate_price_list, for replace_price_list_task.
+    """
+    price_lists = PriceList.objects.filter(pk__in=[old_id, new_id]).in_bulk()
+    old_pl, new_pl = price_lists.get(old_id), price_lists.get(new_id)
+    if old_pl is None or new_pl is None:
+        return False
+    return (
+        old_pl.warehouse_id == new_pl.warehouse_id
+        and new_pl.processing_completed_at is not None
+        and new_pl.status != PriceListStatus.ACTIVE
+        and not (
+            old_pl.status == PriceListStatus.INACTIVE
+            and old_pl.replaced_by_id is not None
+        )
+    )
+
+
+def _attach_media(product, image_url, images):
+    from .ingestion import create_product_media, create_product_media_bulk
+
+    if images is None:
+        create_product_media(product, image_url)
+    else:
+        create_product_media_bulk([(product, image_url)], images)
+
+
 def _activate_item(
     item,
     warehouse,
@@ -532,6 +670,7 @@ def _activate_item(
     channels,
     exchange_rates,
     newly_created: dict | None = None,
+    images: dict | None = None,
 ):
     from django.db.models import F
 
@@ -541,7 +680,6 @@ def _activate_item(
         assign_variant_attributes,
         create_product,
         create_product_channel_listing,
-        create_product_media,
         create_variant,
         create_variant_channel_listing,
     )
@@ -570,7 +708,7 @@ def _activate_item(
                 create_product_channel_listing(product, channel)
             assign_product_attributes(product, product_data, attribute_map, moq_value=1)
             if product_data.image_url:
-                create_product_media(product, product_data.image_url)
+                _attach_media(product, product_data.image_url, images)
             item.product_id = product.pk
             if newly_created is not None:
                 newly_created[cache_key] = product
@@ -592,7 +730,7 @@ def _activate_item(
         product = Product.objects.get(pk=item.product_id)
 
         if product_data.image_url and not product.media.exists():
-            create_product_media(product, product_data.image_url)
+            _attach_media(product, product_data.image_url, images)
 
         # Ensure ProductChannelListing exists and is published for each channel
         for channel in channels:
@@ -648,9 +786,18 @@ def _activate_item(
 
 @app.task
 @allow_writer()
+@supplier_key_cache()
 def activate_price_list_task(price_list_id: int):
     from .ingestion import get_products_by_code_and_brand
-
+    from .price_list_activation import activate_items_in_bulk
+
+    # Without prefetched images, activation downloads them itself, in case the
+    # price list changed after the check and passes the checks under lock
+    images = (
+        _fetch_price_list_images(price_list_id)
+        if _can_activate_price_list(price_list_id)
+        else None
+    )
     try:
         with transaction.atomic():
             price_list = (
@@ -671,7 +818,7 @@ def activate_price_list_task(price_list_id: int):
                     f"Warehouse {price_list.warehouse_id} is owned; cannot activate price list"
                 )
 
-            items = list(price_list.items.filter(is_valid=True))
+            items = list(price_list.current_items().filter(is_valid=True))
 
             unresolved = [i for i in items if i.product_id is None]
             if unresolved:
@@ -684,26 +831,23 @@ def activate_price_list_task(price_list_id: int):
 
             categories = {i.category for i in items if i.category}
             product_type_map, category_map, attribute_map, channels, exchange_rates = (
-                _load_activation_context(categories, price_list.channels.all())
-            )
-
-            newly_created: dict = {}
-            updated_items = []
-            for item in items:
-                old_product_id = item.product_id
-                _activate_item(
-                    item,
-                    price_list.warehouse,
-                    product_type_map,
-                    category_map,
-                    attribute_map,
-                    channels,
-                    exchange_rates,
-                    newly_created=newly_created,
+                _load_activation_context(
+                    categories, price_list.channels.all(), price_list
                 )
-                if item.product_id != old_product_id:
-                    updated_items.append(item)
+            )
 
+            unresolved = [i for i in items if i.product_id is None]
+            activate_items_in_bulk(
+                items,
+                price_list.warehouse,
+                product_type_map,
+                category_map,
+                attribute_map,
+                channels,
+                exchange_rates,
+                images=images,
+            )
+            updated_items = [i for i in unresolved if i.product_id is not None]
             if updated_items:
                 PriceListItem.objects.bulk_update(updated_items, ["product_id"])
 
@@ -713,6 +857,7 @@ def activate_price_list_task(price_list_id: int):
             Product.objects.filter(id__in=activated_product_ids).update(
                 search_index_dirty=True
             )
+            schedule_product_availability_refresh(activated_product_ids)
 
             PriceList.objects.filter(pk=price_list_id).update(
                 status=PriceListStatus.ACTIVE,
@@ -805,6 +950,7 @@ def _deallocate_draft_unconfirmed(warehouse, product_ids, size_names=None):
         )
 
     Allocation.objects.filter(pk__in=[a.pk for a in allocations]).delete()
+    mark_stocks_for_reconciliation(deltas)
 
 
 @app.task
@@ -827,7 +973,8 @@ def deactivate_price_list_task(price_list_id: int):
                 return
 
             product_ids = list(
-                price_list.items.filter(is_valid=True, product_id__isnull=False)
+                price_list.current_items()
+                .filter(is_valid=True, product_id__isnull=False)
                 .values_list("product_id", flat=True)
                 .distinct()
             )
@@ -844,6 +991,7 @@ def deactivate_price_list_task(price_list_id: int):
             _hide_zero_stock_products(product_ids)
 
             Product.objects.filter(id__in=product_ids).update(search_index_dirty=True)
+            schedule_product_availability_refresh(product_ids)
 
             PriceList.objects.filter(pk=price_list_id).update(
                 status=PriceListStatus.INACTIVE,
@@ -857,8 +1005,9 @@ def deactivate_price_list_task(price_list_id: int):
 
 @app.task
 @allow_writer()
+@supplier_key_cache()
 def replace_price_list_task(old_id: int, new_id: int):
-    from django.db.models import F, Value
+    from django.db.models import Case, F, IntegerField, Value, When
     from django.db.models.functions import Greatest
 
     from ..warehouse.models import Stock
@@ -867,9 +1016,15 @@ def replace_price_list_task(old_id: int, new_id: int):
         create_variant_channel_listing,
         get_products_by_code_and_brand,
     )
+    from .price_list_diff import diff_price_list_items
 
+    images = (
+        _fetch_price_list_images(new_id)
+        if _can_replace_price_list(old_id, new_id)
+        else None
+    )
     try:
-        with transaction.atomic():
+        with transaction.atomic(), defer_supplier_key_updates():
             # Lock both rows in consistent pk order to prevent deadlock
             pls = {
                 pl.pk: pl
@@ -914,8 +1069,8 @@ def replace_price_list_task(old_id: int, new_id: int):
 
             warehouse = old_pl.warehouse
 
-            old_items = list(old_pl.items.filter(is_valid=True))
-            new_items = list(new_pl.items.filter(is_valid=True))
+            old_items = list(old_pl.current_items().filter(is_valid=True))
+            new_items = list(new_pl.current_items().filter(is_valid=True))
 
             unresolved_new = [i for i in new_items if i.product_id is None]
             if unresolved_new:
@@ -941,16 +1096,15 @@ def replace_price_list_task(old_id: int, new_id: int):
             both = old_product_ids & new_product_ids
             new_only = new_product_ids - old_product_ids
 
+            diff = diff_price_list_items(old_items, new_items)
+
             new_item_by_product = {
                 i.product_id: i for i in new_items if i.product_id is not None
             }
-            old_item_by_product = {
-                i.product_id: i for i in old_items if i.product_id is not None
-            }
 
             categories = {i.category for i in new_items if i.category}
             product_type_map, category_map, attribute_map, channels, exchange_rates = (
-                _load_activation_context(categories, new_pl.channels.all())
+                _load_activation_context(categories, new_pl.channels.all(), new_pl)
             )
 
             if old_only:
@@ -961,67 +1115,114 @@ def replace_price_list_task(old_id: int, new_id: int):
                 ).update(quantity=Greatest(Value(0), F("quantity_allocated")))
                 _hide_zero_stock_products(list(old_only))
 
-            # Prefetch products and existing variants for all `both` products to avoid N+1
-            both_products = (
-                {p.pk: p for p in Product.objects.filter(pk__in=both)} if both else {}
-            )
-            existing_variant_names: set[tuple[int, str]] = (
-                set(
-                    ProductVariant.objects.filter(product_id__in=both).values_list(
-                        "product_id", "name"
+            removed_sizes: dict[int, set[str]] = defaultdict(set)
+            for line in diff.removed:
+                if line.product_id in both:
+                    removed_sizes[line.product_id].add(line.size)
+            if removed_sizes:
+                removed_q = Q()
+                for product_id, sizes in removed_sizes.items():
+                    _deallocate_draft_unconfirmed(
+                        warehouse, [product_id], size_names=sizes
                     )
+                    removed_q |= Q(
+                        product_variant__product_id=product_id,
+                        product_variant__name__in=sizes,
+                    )
+                Stock.objects.filter(removed_q, warehouse=warehouse).update(
+                    quantity=Greatest(Value(0), F("quantity_allocated"))
                 )
-                if both
-                else set()
-            )
 
-            for product_id in both:
-                new_item = new_item_by_product[product_id]
-                old_item = old_item_by_product[product_id]
-                new_sizes = set(new_item.sizes_and_qty.keys())
-                old_sizes = set(old_item.sizes_and_qty.keys())
-
-                removed_sizes = old_sizes - new_sizes
-                if removed_sizes:
-                    _deallocate_draft_unconfirmed(
-                        warehouse, [product_id], size_names=removed_sizes
-                    )
+            # Unchanged lines are compared with live stock below, so stock sold
+            # or zeroed since the old list was activated is restored to the sheet
+            upserted_lines = [
+                line
+                for line in diff.added + diff.changed + diff.unchanged
+                if line.product_id in both
+            ]
+            # New-only products are activated from their items below
+            upserted_product_ids = {
+                line.product_id
+                for line in diff.added + diff.changed
+                if line.product_id in both
+            }
+            line_product_ids = {line.product_id for line in upserted_lines}
+            upserted_products = {
+                p.pk: p for p in Product.objects.filter(pk__in=line_product_ids)
+            }
+            existing_variant_names: set[tuple[int, str]] = set(
+                ProductVariant.objects.filter(
+                    product_id__in=line_product_ids
+                ).values_list("product_id", "name")
+            )
+            live_stocks = {
+                (product_id, name): (pk, quantity, quantity_allocated)
+                for pk, product_id, name, quantity, quantity_allocated in (
                     Stock.objects.filter(
-                        product_variant__product_id=product_id,
-                        product_variant__name__in=removed_sizes,
+                        product_variant__product_id__in=line_product_ids,
                         warehouse=warehouse,
-                    ).update(quantity=Greatest(Value(0), F("quantity_allocated")))
+                    ).values_list(
+                        "pk",
+                        "product_variant__product_id",
+                        "product_variant__name",
+                        "quantity",
+                        "quantity_allocated",
+                    )
+                )
+            }
 
-                product_data = _build_product_data_from_item(new_item)
-                product = both_products.get(product_id)
+            stock_quantities: dict[int, int] = {}
+            restored_product_ids = set()
+            for line in upserted_lines:
+                product_id = line.product_id
+                if (product_id, line.size) in existing_variant_names:
+                    live_stock = live_stocks.get((product_id, line.size))
+                    if live_stock is None:
+                        continue
+                    pk, quantity, quantity_allocated = live_stock
+                    if quantity != max(quantity_allocated, line.quantity):
+                        stock_quantities[pk] = line.quantity
+                        restored_product_ids.add(product_id)
+                    continue
+
+                product = upserted_products.get(product_id)
                 if product is None:
                     raise ValueError(
                         f"replace_price_list_task: Product {product_id} not found "
                         f"while replacing PriceList {old_id} with {new_id}"
                     )
+                upserted_product_ids.add(product_id)
+                product_data = _build_product_data_from_item(line.item)
+                variant = create_variant(
+                    product, line.size, weight_kg=product_data.weight_kg
+                )
+                for channel in channels:
+                    try:
+                        with transaction.atomic():
+                            create_variant_channel_listing(
+                                variant, channel, product_data, exchange_rates
+                            )
+                    except IntegrityError:
+                        pass
+                Stock.objects.create(
+                    product_variant=variant,
+                    warehouse=warehouse,
+                    quantity=line.quantity,
+                )
 
-                for size, qty in new_item.sizes_and_qty.items():
-                    if (product_id, size) in existing_variant_names:
-                        Stock.objects.filter(
-                            product_variant__product_id=product_id,
-                            product_variant__name=size,
-                            warehouse=warehouse,
-                        ).update(quantity=Greatest(F("quantity_allocated"), Value(qty)))
-                    else:
-                        variant = create_variant(
-                            product, size, weight_kg=product_data.weight_kg
-                        )
-                        for channel in channels:
-                            try:
-                                with transaction.atomic():
-                                    create_variant_channel_listing(
-                                        variant, channel, product_data, exchange_rates
-                                    )
-                            except IntegrityError:
-                                pass
-                        Stock.objects.create(
-                            product_variant=variant, warehouse=warehouse, quantity=qty
-                        )
+            if stock_quantities:
+                Stock.objects.filter(pk__in=stock_quantities).update(
+                    quantity=Greatest(
+                        F("quantity_allocated"),
+                        Case(
+                            *(
+                                When(pk=pk, then=Value(quantity))
+                                for pk, quantity in stock_quantities.items()
+                            ),
+                            output_field=IntegerField(),
+                        ),
+                    )
+                )
 
             newly_created: dict = {}
             updated_new_items = []
@@ -1037,6 +1238,7 @@ def replace_price_list_task(old_id: int, new_id: int):
                     channels,
                     exchange_rates,
                     newly_created=newly_created,
+                    images=images,
                 )
                 if new_item.product_id != old_product_id:
                     updated_new_items.append(new_item)
@@ -1054,6 +1256,7 @@ def replace_price_list_task(old_id: int, new_id: int):
                     channels,
                     exchange_rates,
                     newly_created=newly_created,
+                    images=images,
                 )
                 if item.product_id != old_product_id:
                     updated_new_items.append(item)
@@ -1061,10 +1264,31 @@ def replace_price_list_task(old_id: int, new_id: int):
             if updated_new_items:
                 PriceListItem.objects.bulk_update(updated_new_items, ["product_id"])
 
-            all_affected_ids = list(old_product_ids | new_product_ids)
-            Product.objects.filter(id__in=all_affected_ids).update(
+            # Products whose lines are all unchanged keep their search index
+            changed_product_ids = (
+                old_only
+                | new_only
+                | upserted_product_ids
+                | set(removed_sizes)
+                | {i.product_id for i in updated_new_items}
+            )
+            Product.objects.filter(id__in=changed_product_ids).update(
                 search_index_dirty=True
             )
+            schedule_product_availability_refresh(
+                changed_product_ids | restored_product_ids
+            )
+
+            replace_delta = diff.delta_counts() | {
+                "products_added": len(
+                    new_only | {i.product_id for i in updated_new_items}
+                ),
+                "products_removed": len(old_only),
+                "products_changed": len(upserted_product_ids | set(removed_sizes)),
+            }
+            logger.info(
+                "Replacing PriceList %s with %s: %s", old_id, new_id, replace_delta
+            )
 
             now = timezone.now()
             PriceList.objects.filter(pk=old_id).update(
@@ -1076,8 +1300,72 @@ def replace_price_list_task(old_id: int, new_id: int):
                 status=PriceListStatus.ACTIVE,
                 activated_at=now,
                 deactivated_at=None,
+                replace_delta=replace_delta,
             )
 
         update_products_search_vector_task.delay()
     finally:
         PriceList.objects.filter(pk__in=[old_id, new_id]).update(is_processing=False)
+
+
+@app.task
+@allow_writer()
+def ingest_products_task(ingestion_id: int, fan_out: bool = False):
+    """Run or resume a chunked product ingestion.
+
+    Chunks already checkpointed are skipped. With fan_out, the remaining
+    chunks are queued as ingest_products_chunk_task so workers ingest them in
+    parallel; otherwise they are ingested here, in order.
+    """
+    from .ingestion import (
+        prepare_product_ingestion_chunks,
+        product_data_to_dict,
+        resume_product_ingestion,
+    )
+    from .models import ProductIngestion
+
+    if not fan_out:
+        resume_product_ingestion(ingestion_id)
+        return
+
+    ingestion = ProductIngestion.objects.get(pk=ingestion_id)
+    if ingestion.completed_at:
+        return
+    ProductIngestion.objects.filter(pk=ingestion_id).update(failed_at=None)
+    _prepared, chunks = prepare_product_ingestion_chunks(ingestion)
+    for index, products in enumerate(chunks):
+        if str(index) not in ingestion.chunk_results:
+            ingest_products_chunk_task.delay(
+                ingestion_id, index, [product_data_to_dict(p) for p in products]
+            )
+
+
+@app.task(
+    acks_late=True,
+    autoretry_for=(IntegrityError, OperationalError),
+    retry_backoff=INGESTION_CHUNK_RETRY_BACKOFF,
+    retry_kwargs={"max_retries": INGESTION_CHUNK_RETRY_MAX},
+)
+@allow_writer()
+def ingest_products_chunk_task(ingestion_id: int, index: int, products: list[dict]):
+    """Ingest one chunk of a product ingestion.
+
+    Acknowledged only once done, so a chunk lost with its worker is delivered
+    again; the chunk checkpoint makes repeated deliveries no-ops. Conflicts
+    with chunks written concurrently, such as two chunks creating the same
+    attribute value, roll the chunk back and retry it.
+    """
+    from .ingestion import ingest_product_chunk, product_data_from_dict
+    from .models import ProductIngestion
+
+    try:
+        ingest_product_chunk(
+            ingestion_id, index, [product_data_from_dict(p) for p in products]
+        )
+    except (IntegrityError, OperationalError):
+        raise
+    except Exception:
+        ProductIngestion.objects.filter(pk=ingestion_id).update(
+            failed_at=timezone.now()
+        )
+        raise
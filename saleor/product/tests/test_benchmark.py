@@ -0,0 +1,92 @@
+import openpyxl
+import pytest
+
+from saleor.product import benchmark
+from saleor.product.benchmark import (
+    SHEET_HEADERS,
+    SheetSpec,
+    StageProfiler,
+    generate_sheet_rows,
+    run_benchmark,
+    write_supplier_sheet,
+)
+from saleor.product.models import PriceList, Product
+
+
+def test_generated_rows_are_deterministic():
+    spec = SheetSpec(rows=50, duplicate_rate=0.2, seed=1)
+
+    assert list(generate_sheet_rows(spec)) == list(generate_sheet_rows(spec))
+
+
+def test_generated_rows_follow_spec():
+    spec = SheetSpec(rows=200, sizes_per_row=3, duplicate_rate=0.25, image_rate=0)
+
+    rows = list(generate_sheet_rows(spec, currency_symbol="£"))
+
+    codes = [row[0] for row in rows]
+    assert len(rows) == 200
+    assert 0 < len(codes) - len(set(codes)) < 100
+    assert all(len(row[4].split(", ")) == 3 for row in rows)
+    assert all(row[6].startswith("£") for row in rows)
+    assert not any(row[8] for row in rows)
+
+
+def test_write_supplier_sheet(tmp_path):
+    path = str(tmp_path / "sheet.xlsx")
+
+    write_supplier_sheet(path, SheetSpec(rows=10))
+
+    sheet = openpyxl.load_workbook(path, read_only=True).active
+    rows = list(sheet.values)
+    assert list(rows[0]) == SHEET_HEADERS
+    assert len(rows) == 11
+
+
+def test_stage_profiler_reports_nested_stages_once():
+    class Stages:
+        @staticmethod
+        def outer():
+            return Stages.inner()
+
+        @staticmethod
+        def inner():
+            return 1
+
+        @staticmethod
+        def rows():
+            yield from range(3)
+
+    profiler = StageProfiler(
+        {
+            "outer": [(Stages, "outer")],
+            "inner": [(Stages, "inner")],
+            "rows": [(Stages, "rows")],
+        }
+    )
+
+    with profiler.profile():
+        Stages.outer()
+        assert list(Stages.rows()) == [0, 1, 2]
+
+    report = profiler.report()
+    assert report["stages"]["outer"]["calls"] == 1
+    assert report["stages"]["inner"]["calls"] == 1
+    assert report["stages"]["rows"]["calls"] == 4
+    assert report["peak_memory"] > 0
+    assert report["stages"]["other"]["wall_time"] <= report["wall_time"]
+
+
+@pytest.mark.parametrize("scenario", benchmark.SCENARIOS)
+def test_run_benchmark_rolls_back(scenario, db, media_root):
+    spec = SheetSpec(rows=20, currencies=("GBP", "USD"), distinct_images=2)
+
+    record = run_benchmark(scenario, spec)
+
+    assert record["scenario"] == scenario
+    assert record["spec"]["rows"] == 20
+    assert record["queries"] > 0
+    assert set(record["stages"]) >= {"db_write", "other"}
+    assert record["stages"]["db_write"]["calls"] > 0
+    assert not Product.objects.exists()
+    assert not PriceList.objects.exists()
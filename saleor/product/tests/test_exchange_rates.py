@@ -0,0 +1,137 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from saleor.core.http_client import HTTPClient
+from saleor.product.exchange_rates import (
+    ExchangeRateSnapshot,
+    ExchangeRatesUnavailable,
+    get_exchange_rate_snapshot,
+    get_exchange_rates,
+    get_price_list_exchange_rates,
+)
+from saleor.product.ingestion import ExchangeRateMissing, convert_price
+from saleor.product.models import PriceList
+from saleor.settings import get_exchange_rates_from_env
+
+SNAPSHOT = ExchangeRateSnapshot(
+    date=datetime.date(2026, 1, 2), rates={"GBP": 0.85, "USD": 1.08}
+)
+
+
+@pytest.fixture
+def frankfurter_source(settings):
+    settings.EXCHANGE_RATES_SOURCE = "frankfurter"
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_local_source_does_not_fetch(settings, mocker):
+    settings.EXCHANGE_RATES_SOURCE = "local"
+    settings.EXCHANGE_RATES_LOCAL = {"USD": 1.1}
+    send_request = mocker.patch.object(type(HTTPClient), "send_request")
+
+    assert get_exchange_rates() == {"USD": 1.1}
+    send_request.assert_not_called()
+
+
+def test_exchange_rates_from_env_skips_whitespace_and_empty_entries(monkeypatch):
+    monkeypatch.setenv("EXCHANGE_RATES_LOCAL", " GBP : 0.85 ,, USD:1.08, ")
+
+    assert get_exchange_rates_from_env("EXCHANGE_RATES_LOCAL") == {
+        "GBP": 0.85,
+        "USD": 1.08,
+    }
+
+
+@pytest.mark.parametrize("entry", ["USD", "USD:abc", ":1.08", "USD:1:2"])
+def test_exchange_rates_from_env_rejects_malformed_entry(monkeypatch, entry):
+    monkeypatch.setenv("EXCHANGE_RATES_LOCAL", f"GBP:0.85,{entry}")
+
+    with pytest.raises(ImproperlyConfigured, match=entry):
+        get_exchange_rates_from_env("EXCHANGE_RATES_LOCAL")
+
+
+def test_fetch_parses_frankfurter_response(frankfurter_source, mocker):
+    response = Mock()
+    response.json.return_value = {
+        "base": "EUR",
+        "date": "2026-01-02",
+        "rates": {"GBP": 0.85, "USD": 1.08},
+    }
+    mocker.patch.object(type(HTTPClient), "send_request", return_value=response)
+
+    assert get_exchange_rate_snapshot() == SNAPSHOT
+
+
+def test_fetched_rates_are_cached(frankfurter_source, mocker):
+    fetch = mocker.patch(
+        "saleor.product.exchange_rates.fetch_frankfurter_rates",
+        return_value=SNAPSHOT,
+    )
+
+    get_exchange_rates()
+    rates = get_exchange_rates()
+
+    assert rates == SNAPSHOT.rates
+    fetch.assert_called_once()
+
+
+def test_failed_fetch_falls_back_to_last_good_rates(frankfurter_source, mocker):
+    fetch = mocker.patch(
+        "saleor.product.exchange_rates.fetch_frankfurter_rates",
+        return_value=SNAPSHOT,
+    )
+    get_exchange_rates()
+    cache.delete("product.exchange_rates")
+    fetch.side_effect = Exception("Network timeout")
+
+    assert get_exchange_rate_snapshot() == SNAPSHOT
+
+
+def test_failed_fetch_without_cached_rates_raises(frankfurter_source, mocker):
+    mocker.patch(
+        "saleor.product.exchange_rates.fetch_frankfurter_rates",
+        side_effect=Exception("Network timeout"),
+    )
+
+    with pytest.raises(ExchangeRatesUnavailable):
+        get_exchange_rates()
+
+
+def test_price_list_snapshot_is_taken_once(warehouse, mocker):
+    price_list = PriceList.objects.create(warehouse=warehouse, config={})
+    get_snapshot = mocker.patch(
+        "saleor.product.exchange_rates.get_exchange_rate_snapshot",
+        return_value=SNAPSHOT,
+    )
+
+    assert get_price_list_exchange_rates(price_list) == SNAPSHOT.rates
+    price_list.refresh_from_db()
+    assert get_price_list_exchange_rates(price_list) == SNAPSHOT.rates
+
+    get_snapshot.assert_called_once()
+    assert price_list.exchange_rates_date == SNAPSHOT.date
+
+
+def test_convert_price_through_base_currency():
+    assert convert_price(17.0, "GBP", "USD", SNAPSHOT.rates) == Decimal("21.60")
+    assert convert_price(10.8, "USD", "EUR", SNAPSHOT.rates) == Decimal("10.00")
+
+
+@pytest.mark.parametrize(
+    ("from_currency", "to_currency"), [("AED", "EUR"), ("GBP", "AED")]
+)
+def test_convert_price_without_rate_raises(from_currency, to_currency):
+    with pytest.raises(ExchangeRateMissing, match="No exchange rate for AED"):
+        convert_price(10.0, from_currency, to_currency, SNAPSHOT.rates)
+
+
+def test_convert_price_without_rates_raises():
+    with pytest.raises(ExchangeRateMissing, match="No exchange rate for GBP"):
+        convert_price(10.0, "GBP", "EUR", {})
@@ -1,6 +1,6 @@
 """Tests for product ingestion utilities."""
 
-from unittest.mock import Mock
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -13,14 +13,19 @@ from saleor.attribute.models.product_variant import (
 )
 from saleor.core.http_client import HTTPClient
 from saleor.product.ingestion import (
+    FetchedImage,
     IngestConfig,
     MissingDatabaseSetup,
     SizeQtyUnparseable,
     SpreadsheetColumnMapping,
     create_product_media,
+    create_product_media_bulk,
+    fetch_image,
+    fetch_images,
     get_products_by_code_and_brand,
     get_size_to_variant_map,
     parse_sizes_and_qty,
+    store_image,
 )
 from saleor.product.models import Product, ProductMedia, ProductType, ProductVariant
 
@@ -294,6 +299,139 @@ def test_get_products_by_code_and_brand_no_match(
     assert result == {}
 
 
+def _assign_code_and_brand(product, product_code_attribute, brand_attribute, code):
+    from saleor.attribute.models.product import AssignedProductAttributeValue
+
+    code_value = AttributeValue.objects.create(
+        attribute=product_code_attribute, name=code, slug=code.lower()
+    )
+    brand_value, _ = AttributeValue.objects.get_or_create(
+        attribute=brand_attribute, slug="testbrand", defaults={"name": "TestBrand"}
+    )
+    AssignedProductAttributeValue.objects.create(product=product, value=code_value)
+    AssignedProductAttributeValue.objects.create(product=product, value=brand_value)
+    return code_value
+
+
+def test_supplier_key_follows_renamed_code(
+    simple_product, product_code_attribute, brand_attribute
+):
+    code_value = _assign_code_and_brand(
+        simple_product, product_code_attribute, brand_attribute, "TEST-001"
+    )
+
+    code_value.name = "Test-002"
+    code_value.save(update_fields=["name"])
+
+    simple_product.supplier_key.refresh_from_db()
+    assert simple_product.supplier_key.product_code == "test-002"
+    assert simple_product.supplier_key.brand == "testbrand"
+    assert get_products_by_code_and_brand(["test-001"]) == {}
+    assert get_products_by_code_and_brand(["TEST-002"]) == {
+        ("test-002", "testbrand"): simple_product
+    }
+
+
+def test_supplier_key_removed_without_brand(
+    simple_product, product_code_attribute, brand_attribute
+):
+    from saleor.attribute.models.product import AssignedProductAttributeValue
+    from saleor.product.models import ProductSupplierKey
+    from saleor.product.supplier_keys import update_product_supplier_keys
+
+    _assign_code_and_brand(
+        simple_product, product_code_attribute, brand_attribute, "TEST-001"
+    )
+    AssignedProductAttributeValue.objects.filter(
+        product=simple_product, value__attribute=brand_attribute
+    ).delete()
+
+    update_product_supplier_keys([simple_product.pk])
+
+    assert not ProductSupplierKey.objects.filter(product=simple_product).exists()
+
+
+def test_supplier_key_removed_with_deleted_code_value(
+    simple_product,
+    product_code_attribute,
+    brand_attribute,
+    django_capture_on_commit_callbacks,
+):
+    from saleor.product.models import ProductSupplierKey
+
+    code_value = _assign_code_and_brand(
+        simple_product, product_code_attribute, brand_attribute, "TEST-001"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        code_value.delete()
+
+    assert not ProductSupplierKey.objects.filter(product=simple_product).exists()
+    assert get_products_by_code_and_brand(["TEST-001"]) == {}
+
+
+def test_supplier_key_removed_with_unassigned_brand(
+    simple_product, product_code_attribute, brand_attribute
+):
+    from saleor.attribute.utils import associate_attribute_values_to_instance
+
+    _assign_code_and_brand(
+        simple_product, product_code_attribute, brand_attribute, "TEST-001"
+    )
+
+    associate_attribute_values_to_instance(simple_product, {brand_attribute.pk: []})
+
+    assert get_products_by_code_and_brand(["TEST-001"]) == {}
+
+
+def test_deleting_brand_value_syncs_its_products_once(
+    product_list,
+    product_code_attribute,
+    brand_attribute,
+    django_capture_on_commit_callbacks,
+    mocker,
+):
+    for i, product in enumerate(product_list):
+        _assign_code_and_brand(
+            product, product_code_attribute, brand_attribute, f"TEST-00{i}"
+        )
+    brand_value = AttributeValue.objects.get(attribute=brand_attribute)
+    update_keys = mocker.patch(
+        "saleor.product.supplier_keys.update_product_supplier_keys"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        brand_value.delete()
+
+    update_keys.assert_called_once()
+    assert set(update_keys.call_args.args[0]) == {p.pk for p in product_list}
+
+
+def test_get_products_by_supplier_key_batches_and_caches(
+    product_list, product_code_attribute, brand_attribute, django_assert_num_queries
+):
+    from saleor.product.supplier_keys import (
+        get_products_by_supplier_key,
+        supplier_key_cache,
+    )
+
+    for i, product in enumerate(product_list):
+        _assign_code_and_brand(
+            product, product_code_attribute, brand_attribute, f"CODE-{i}"
+        )
+    codes = [f"code-{i}" for i in range(len(product_list))] + ["MISSING"]
+
+    with supplier_key_cache():
+        with django_assert_num_queries(1):
+            result = get_products_by_supplier_key(codes)
+        with django_assert_num_queries(0):
+            assert get_products_by_supplier_key(codes) == result
+
+    assert result == {
+        (f"code-{i}", "testbrand"): product for i, product in enumerate(product_list)
+    }
+
+
 @pytest.fixture
 def size_attribute():
     """Create Size attribute fixture."""
@@ -363,14 +501,20 @@ def product_with_variants(simple_product):
     return product
 
 
+def _image_response(content):
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers = {}
+    response.iter_content.return_value = [content]
+    return response
+
+
 def test_create_product_media_success(simple_product, mocker):
     """Test successful product media creation from URL."""
     image_url = "https://example.com/image.jpg"
     fake_image_data = b"fake-image-data"
 
-    mock_response = Mock()
-    mock_response.content = fake_image_data
-    mock_response.raise_for_status = Mock()
+    mock_response = _image_response(fake_image_data)
 
     mocker.patch.object(type(HTTPClient), "send_request", return_value=mock_response)
 
@@ -387,9 +531,7 @@ def test_create_product_media_with_query_params(simple_product, mocker):
     image_url = "https://example.com/image.jpg?w=800&h=600&fit=crop"
     fake_image_data = b"fake-image-data"
 
-    mock_response = Mock()
-    mock_response.content = fake_image_data
-    mock_response.raise_for_status = Mock()
+    mock_response = _image_response(fake_image_data)
 
     mocker.patch.object(type(HTTPClient), "send_request", return_value=mock_response)
 
@@ -408,9 +550,7 @@ def test_create_product_media_very_long_url(simple_product, mocker):
     image_url = f"{base_url}/{long_path}/image.jpg?param1=value1&param2=value2"
     fake_image_data = b"fake-image-data"
 
-    mock_response = Mock()
-    mock_response.content = fake_image_data
-    mock_response.raise_for_status = Mock()
+    mock_response = _image_response(fake_image_data)
 
     mocker.patch.object(type(HTTPClient), "send_request", return_value=mock_response)
 
@@ -426,7 +566,7 @@ def test_create_product_media_http_error(simple_product, mocker):
     """Test media creation handles HTTP errors gracefully."""
     image_url = "https://example.com/nonexistent.jpg"
 
-    mock_response = Mock()
+    mock_response = _image_response(b"")
     mock_response.raise_for_status.side_effect = Exception("404 Not Found")
 
     mocker.patch.object(type(HTTPClient), "send_request", return_value=mock_response)
@@ -456,9 +596,7 @@ def test_create_product_media_no_extension(simple_product, mocker):
     image_url = "https://example.com/image"
     fake_image_data = b"fake-image-data"
 
-    mock_response = Mock()
-    mock_response.content = fake_image_data
-    mock_response.raise_for_status = Mock()
+    mock_response = _image_response(fake_image_data)
 
     mocker.patch.object(type(HTTPClient), "send_request", return_value=mock_response)
 
@@ -476,9 +614,7 @@ def test_create_product_media_different_extensions(simple_product, mocker):
         image_url = f"https://example.com/image.{ext}"
         fake_image_data = b"fake-image-data"
 
-        mock_response = Mock()
-        mock_response.content = fake_image_data
-        mock_response.raise_for_status = Mock()
+        mock_response = _image_response(fake_image_data)
 
         mocker.patch.object(
             type(HTTPClient), "send_request", return_value=mock_response
@@ -497,9 +633,7 @@ def test_create_product_media_storage_error(simple_product, mocker):
     image_url = "https://example.com/image.jpg"
     fake_image_data = b"fake-image-data"
 
-    mock_response = Mock()
-    mock_response.content = fake_image_data
-    mock_response.raise_for_status = Mock()
+    mock_response = _image_response(fake_image_data)
 
     mocker.patch.object(type(HTTPClient), "send_request", return_value=mock_response)
     mocker.patch(
@@ -542,6 +676,204 @@ def test_create_product_media_data_url_png(simple_product):
     assert media.image.name.endswith(".png")
 
 
+def test_fetch_images_downloads_each_url_once(mocker):
+    """Test repeated image URLs are downloaded a single time."""
+    send_request = mocker.patch.object(
+        type(HTTPClient), "send_request", return_value=_image_response(b"image")
+    )
+    urls = [
+        "https://example.com/a.jpg",
+        "https://example.com/b.png",
+        "https://example.com/a.jpg",
+        "",
+    ]
+
+    images = fetch_images(urls)
+
+    assert send_request.call_count == 2
+    assert set(images) == {"https://example.com/a.jpg", "https://example.com/b.png"}
+    assert images["https://example.com/b.png"].ext == "png"
+
+
+def test_fetch_images_skips_failed_urls(mocker):
+    """Test a failing image host does not stop the other downloads."""
+
+    def send_request(method, url, **kwargs):
+        if "broken" in url:
+            raise Exception("Network timeout")
+        return _image_response(b"image")
+
+    mocker.patch.object(type(HTTPClient), "send_request", side_effect=send_request)
+
+    images = fetch_images(
+        ["https://broken.example.com/a.jpg", "https://example.com/b.jpg"]
+    )
+
+    assert set(images) == {"https://example.com/b.jpg"}
+
+
+def test_fetch_images_bounds_concurrency(mocker):
+    """Test no more than max_workers downloads run at the same time."""
+    import threading
+    import time
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def send_request(method, url, **kwargs):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return _image_response(url.encode())
+
+    mocker.patch.object(type(HTTPClient), "send_request", side_effect=send_request)
+
+    images = fetch_images(
+        [f"https://example.com/{i}.jpg" for i in range(12)], max_workers=3
+    )
+
+    assert len(images) == 12
+    assert 1 < peak <= 3
+
+
+def test_fetch_images_stores_each_image_once_downloaded(mocker):
+    """Test downloaded images are written to storage and only names are kept."""
+    from django.core.files.storage import default_storage
+
+    mocker.patch.object(
+        type(HTTPClient), "send_request", return_value=_image_response(b"stored")
+    )
+
+    images = fetch_images(["https://example.com/a.png"])
+
+    image = images["https://example.com/a.png"]
+    assert image.name == FetchedImage(content=b"stored", ext="png").storage_name
+    assert default_storage.exists(image.name)
+
+
+def test_fetch_image_rejects_oversized_response(mocker):
+    """Test a download stops once it exceeds the size limit."""
+    mocker.patch("saleor.product.ingestion.IMAGE_FETCH_MAX_BYTES", 8)
+    response = _image_response(b"")
+    response.iter_content.return_value = [b"12345", b"67890", b"unread"]
+    mocker.patch.object(type(HTTPClient), "send_request", return_value=response)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        fetch_image("https://example.com/a.jpg")
+
+
+def test_fetch_images_skips_image_with_oversized_content_length(mocker):
+    """Test an image announcing a too large size is not downloaded."""
+    mocker.patch("saleor.product.ingestion.IMAGE_FETCH_MAX_BYTES", 8)
+    response = _image_response(b"small")
+    response.headers = {"content-length": "1024"}
+    mocker.patch.object(type(HTTPClient), "send_request", return_value=response)
+
+    images = fetch_images(["https://example.com/a.jpg"])
+
+    assert images == {}
+    response.iter_content.assert_not_called()
+
+
+def test_create_product_media_bulk_stores_identical_content_once(
+    simple_product, mocker
+):
+    """Test products sharing an image share one stored file."""
+    from django.core.files.storage import default_storage
+
+    other_product = Product.objects.create(
+        name="Other Product",
+        slug="other-product",
+        product_type=simple_product.product_type,
+    )
+    save = mocker.spy(default_storage, "save")
+    images = {
+        "https://example.com/a.jpg": store_image(
+            FetchedImage(content=b"same", ext="jpg")
+        ),
+        "https://cdn.example.com/a.jpg": store_image(
+            FetchedImage(content=b"same", ext="jpg")
+        ),
+    }
+
+    media = create_product_media_bulk(
+        [
+            (simple_product, "https://example.com/a.jpg"),
+            (other_product, "https://cdn.example.com/a.jpg"),
+            (other_product, "https://example.com/missing.jpg"),
+        ],
+        images,
+    )
+
+    assert len(media) == 2
+    assert save.call_count <= 1
+    assert media[0].image.name == media[1].image.name
+    assert media[0].alt == simple_product.name
+    assert media[1].product == other_product
+
+
+def test_create_product_media_bulk_appends_after_existing_media(simple_product):
+    """Test bulk-created media sort after media the product already has."""
+    ProductMedia.objects.create(product=simple_product, alt="existing")
+    image = store_image(FetchedImage(content=b"new", ext="jpg"))
+
+    (media,) = create_product_media_bulk(
+        [(simple_product, "https://example.com/new.jpg")],
+        {"https://example.com/new.jpg": image},
+    )
+
+    assert media.sort_order == 1
+
+
+def test_deleting_shared_product_media_keeps_file(
+    simple_product, mocker, django_capture_on_commit_callbacks
+):
+    """Test a shared image file is removed only with its last media row."""
+    delete_task = mocker.patch("saleor.product.signals.delete_from_storage_task.delay")
+    image = store_image(FetchedImage(content=b"shared", ext="jpg"))
+    first, second = create_product_media_bulk(
+        [
+            (simple_product, "https://example.com/a.jpg"),
+            (simple_product, "https://example.com/a.jpg"),
+        ],
+        {"https://example.com/a.jpg": image},
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    delete_task.assert_not_called()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    delete_task.assert_called_once_with(image.name)
+
+
+def test_deleting_product_media_keeps_file_shared_before_commit(
+    simple_product, mocker, django_capture_on_commit_callbacks
+):
+    """Test the file is kept when media sharing it is created before commit."""
+    delete_task = mocker.patch("saleor.product.signals.delete_from_storage_task.delay")
+    image = store_image(FetchedImage(content=b"shared", ext="jpg"))
+    (media,) = create_product_media_bulk(
+        [(simple_product, "https://example.com/a.jpg")],
+        {"https://example.com/a.jpg": image},
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        media.delete()
+        create_product_media_bulk(
+            [(simple_product, "https://example.com/a.jpg")],
+            {"https://example.com/a.jpg": image},
+        )
+
+    delete_task.assert_not_called()
+
+
 def test_parse_sizes_and_qty_hk_apparel_with_spaces():
     """Test parsing HK sheet apparel sizes in 'XS [20], M [50]' format (space before bracket)."""
     sizes_str = "XS [20], M [50], L [50], XL [50], 3XL [20]"
@@ -670,6 +1002,88 @@ def test_ingest_products_updates_search_vector(db, non_owned_warehouse, channel_
             os.unlink(excel_path)
 
 
+def test_ingest_products_fetches_shared_image_once(
+    db, non_owned_warehouse, channel_USD, mocker
+):
+    """Test products sharing an image URL trigger one download and one file."""
+    import tempfile
+
+    import pandas as pd
+
+    from saleor.product.ingestion import (
+        IngestConfig,
+        SpreadsheetColumnMapping,
+        ingest_products_from_excel,
+    )
+    from saleor.product.models import Category
+
+    product_type = ProductType.objects.create(
+        name="Apparel", slug="apparel", has_variants=True
+    )
+    Category.objects.create(name="Apparel", slug="apparel")
+    for slug, name, input_type in [
+        ("product-code", "Product Code", AttributeInputType.PLAIN_TEXT),
+        ("brand", "Brand", AttributeInputType.PLAIN_TEXT),
+        ("rrp", "RRP", AttributeInputType.PLAIN_TEXT),
+        (
+            "minimum-order-quantity",
+            "Minimum Order Quantity",
+            AttributeInputType.PLAIN_TEXT,
+        ),
+    ]:
+        attr = Attribute.objects.create(
+            slug=slug,
+            name=name,
+            type=AttributeType.PRODUCT_TYPE,
+            input_type=input_type,
+        )
+        product_type.product_attributes.add(attr)
+    size_attr = Attribute.objects.create(
+        slug="size",
+        name="Size",
+        type=AttributeType.PRODUCT_TYPE,
+        input_type=AttributeInputType.DROPDOWN,
+    )
+    product_type.variant_attributes.add(size_attr)
+
+    image_url = "https://example.com/shared.jpg"
+    df = pd.DataFrame(
+        {
+            "Code": ["HK-001", "HK-002"],
+            "Brand": ["Adidas", "Adidas"],
+            "Description": ["Tiro Tracksuit", "Tiro Jacket"],
+            "Category": ["Apparel", "Apparel"],
+            "Sizes": ["M [5]", "L [7]"],
+            "RRP": ["£40.00", "£30.00"],
+            "Price": ["£9.03", "£8.00"],
+            "Weight": ["0.20", "0.30"],
+            "Image": [image_url, image_url],
+        }
+    )
+    mocker.patch("saleor.product.ingestion.get_exchange_rates", return_value={})
+    send_request = mocker.patch.object(
+        type(HTTPClient), "send_request", return_value=_image_response(b"shared")
+    )
+
+    with tempfile.NamedTemporaryFile(suffix=".xlsx") as f:
+        df.to_excel(f.name, index=False)
+        config = IngestConfig(
+            warehouse_name=non_owned_warehouse.name,
+            warehouse_address=non_owned_warehouse.address.street_address_1,
+            warehouse_country=str(non_owned_warehouse.address.country),
+            column_mapping=SpreadsheetColumnMapping(),
+            minimum_order_quantity=1,
+            confirm_price_interpretation=True,
+        )
+        result = ingest_products_from_excel(config, f.name)
+
+    assert len(result.created_products) == 2
+    assert send_request.call_count == 1
+    media = ProductMedia.objects.filter(product__in=result.created_products)
+    assert media.count() == 2
+    assert len({m.image.name for m in media}) == 1
+
+
 def test_create_product_slug_includes_product_code(db):
     from django.utils.text import slugify
 
@@ -743,3 +1157,267 @@ def test_create_product_same_description_different_codes_no_slug_collision(db):
 
     assert product_a.slug != product_b.slug
     assert Product.objects.count() == 2
+
+
+@pytest.fixture
+def apparel_catalogue(db):
+    from saleor.product.models import Category
+
+    product_type = ProductType.objects.create(
+        name="Apparel", slug="apparel", has_variants=True
+    )
+    Category.objects.create(name="Apparel", slug="apparel")
+    for slug, name in [
+        ("product-code", "Product Code"),
+        ("brand", "Brand"),
+        ("rrp", "RRP"),
+        ("minimum-order-quantity", "Minimum Order Quantity"),
+    ]:
+        product_type.product_attributes.add(
+            Attribute.objects.create(
+                slug=slug,
+                name=name,
+                type=AttributeType.PRODUCT_TYPE,
+                input_type=AttributeInputType.PLAIN_TEXT,
+            )
+        )
+    product_type.variant_attributes.add(
+        Attribute.objects.create(
+            slug="size",
+            name="Size",
+            type=AttributeType.PRODUCT_TYPE,
+            input_type=AttributeInputType.DROPDOWN,
+        )
+    )
+    return product_type
+
+
+@pytest.fixture
+def five_product_sheet(tmp_path):
+    import pandas as pd
+
+    path = tmp_path / "products.xlsx"
+    pd.DataFrame(
+        {
+            "Code": [f"HK-00{i}" for i in range(5)],
+            "Brand": ["Adidas"] * 5,
+            "Description": [f"Tiro Tracksuit {i}" for i in range(5)],
+            "Category": ["Apparel"] * 5,
+            "Sizes": ["M [5], L [7]"] * 5,
+            "RRP": ["£40.00"] * 5,
+            "Price": ["£9.03"] * 5,
+            "Weight": ["0.20"] * 5,
+            "Image": [""] * 5,
+        }
+    ).to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def chunked_ingest_config(non_owned_warehouse, mocker):
+    mocker.patch("saleor.product.ingestion.get_exchange_rates", return_value={})
+    return IngestConfig(
+        warehouse_name=non_owned_warehouse.name,
+        warehouse_address=non_owned_warehouse.address.street_address_1,
+        warehouse_country=str(non_owned_warehouse.address.country),
+        column_mapping=SpreadsheetColumnMapping(),
+        minimum_order_quantity=1,
+        confirm_price_interpretation=True,
+    )
+
+
+def test_chunked_ingestion_checkpoints_every_chunk(
+    apparel_catalogue,
+    five_product_sheet,
+    chunked_ingest_config,
+    channel_USD,
+    media_root,
+):
+    from saleor.product.ingestion import ingest_products_from_excel
+    from saleor.product.models import ProductIngestion
+
+    result = ingest_products_from_excel(
+        chunked_ingest_config, five_product_sheet, chunk_size=2
+    )
+
+    ingestion = ProductIngestion.objects.get()
+    assert ingestion.total_chunks == 3
+    assert set(ingestion.chunk_results) == {"0", "1", "2"}
+    assert ingestion.completed_at is not None
+    assert len(result.created_products) == 5
+    assert result.total_variants_created == 10
+    assert [chunk.index for chunk in result.chunks] == [0, 1, 2]
+    assert [len(chunk.created_product_ids) for chunk in result.chunks] == [2, 2, 1]
+
+
+def test_chunked_ingestion_resumes_after_failure(
+    apparel_catalogue,
+    five_product_sheet,
+    chunked_ingest_config,
+    channel_USD,
+    media_root,
+    mocker,
+):
+    from saleor.product import ingestion as ingestion_module
+    from saleor.product.ingestion import (
+        ingest_products_from_excel,
+        resume_product_ingestion,
+    )
+    from saleor.product.models import ProductIngestion
+
+    write_products = ingestion_module.write_products
+    calls = []
+
+    def fail_on_second_chunk(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("Worker lost")
+        return write_products(*args, **kwargs)
+
+    mocker.patch.object(
+        ingestion_module, "write_products", side_effect=fail_on_second_chunk
+    )
+
+    with pytest.raises(RuntimeError):
+        ingest_products_from_excel(
+            chunked_ingest_config, five_product_sheet, chunk_size=2
+        )
+
+    ingestion = ProductIngestion.objects.get()
+    assert set(ingestion.chunk_results) == {"0"}
+    assert ingestion.failed_at is not None
+    assert Product.objects.count() == 2
+
+    mocker.stopall()
+    result = resume_product_ingestion(ingestion.pk)
+
+    ingestion.refresh_from_db()
+    assert ingestion.completed_at is not None
+    assert ingestion.failed_at is None
+    assert Product.objects.count() == 5
+    assert len(result.created_products) == 5
+
+
+def test_ingest_product_chunk_twice_writes_once(
+    apparel_catalogue,
+    five_product_sheet,
+    chunked_ingest_config,
+    non_owned_warehouse,
+    channel_USD,
+    media_root,
+):
+    from saleor.product.ingestion import (
+        ingest_product_chunk,
+        prepare_products_for_ingestion,
+        start_product_ingestion,
+    )
+
+    prepared = prepare_products_for_ingestion(five_product_sheet, chunked_ingest_config)
+    ingestion = start_product_ingestion(
+        chunked_ingest_config, five_product_sheet, non_owned_warehouse, {}, 5, prepared
+    )
+
+    first = ingest_product_chunk(ingestion.pk, 0, prepared.products)
+    second = ingest_product_chunk(ingestion.pk, 0, prepared.products)
+
+    assert first == second
+    assert Product.objects.count() == 5
+
+
+def test_chunks_reuse_existing_products_recorded_at_start(
+    apparel_catalogue,
+    five_product_sheet,
+    chunked_ingest_config,
+    non_owned_warehouse,
+    channel_USD,
+    media_root,
+    mocker,
+):
+    import attrs
+
+    from saleor.product import ingestion as ingestion_module
+    from saleor.product.ingestion import (
+        ingest_product_chunk,
+        ingest_products_from_excel,
+        prepare_products_for_ingestion,
+        start_product_ingestion,
+    )
+
+    ingest_products_from_excel(chunked_ingest_config, five_product_sheet, chunk_size=2)
+    config = attrs.evolve(chunked_ingest_config, stock_update_mode="add")
+    prepared = prepare_products_for_ingestion(five_product_sheet, config)
+    ingestion = start_product_ingestion(
+        config, five_product_sheet, non_owned_warehouse, {}, 2, prepared
+    )
+    check_existing_products = mocker.spy(ingestion_module, "check_existing_products")
+
+    results = [
+        ingest_product_chunk(ingestion.pk, index, prepared.products[start : start + 2])
+        for index, start in enumerate(range(0, 5, 2))
+    ]
+
+    assert len(ingestion.existing_product_ids) == 5
+    check_existing_products.assert_not_called()
+    assert [len(r.updated_product_ids) for r in results] == [2, 2, 1]
+    assert Product.objects.count() == 5
+
+
+def test_chunk_reports_missing_stock_update_mode(
+    apparel_catalogue,
+    five_product_sheet,
+    chunked_ingest_config,
+    non_owned_warehouse,
+    channel_USD,
+    media_root,
+):
+    from saleor.product.ingestion import (
+        StockUpdateModeRequired,
+        ingest_product_chunk,
+        ingest_products_from_excel,
+        prepare_products_for_ingestion,
+        start_product_ingestion,
+    )
+
+    prepared = prepare_products_for_ingestion(five_product_sheet, chunked_ingest_config)
+    ingestion = start_product_ingestion(
+        chunked_ingest_config, five_product_sheet, non_owned_warehouse, {}, 5, prepared
+    )
+    # Another run stocks the products in the warehouse before the chunk runs
+    ingest_products_from_excel(chunked_ingest_config, five_product_sheet)
+    ingestion.existing_product_ids = {
+        str(position): product.pk
+        for position, product in enumerate(Product.objects.order_by("pk"))
+    }
+    ingestion.save(update_fields=["existing_product_ids"])
+
+    with pytest.raises(StockUpdateModeRequired):
+        ingest_product_chunk(ingestion.pk, 0, prepared.products)
+
+    ingestion.refresh_from_db()
+    assert ingestion.chunk_results == {}
+
+
+def test_product_data_dict_round_trip():
+    from decimal import Decimal
+
+    from saleor.product.ingestion import (
+        ProductData,
+        product_data_from_dict,
+        product_data_to_dict,
+    )
+
+    product = ProductData(
+        product_code="HK-001",
+        description="Tiro Tracksuit",
+        category="Apparel",
+        sizes=("M", "L"),
+        qty=(5, 7),
+        brand="Adidas",
+        rrp=Decimal("40.00"),
+        price=Decimal("9.03"),
+        currency="GBP",
+        weight_kg=None,
+        image_url=None,
+    )
+
+    assert product_data_from_dict(product_data_to_dict(product)) == product
@@ -2,12 +2,31 @@
 
 import os
 from decimal import Decimal
+from unittest import mock
 
 import pytest
+from django.db import connection, transaction
 from django.http import Http404
-
-from saleor.product.models import PriceList, PriceListItem
+from django.test.utils import CaptureQueriesContext
+
+from saleor.attribute.models import AttributeValue, AttributeVariant
+from saleor.attribute.models.product import AssignedProductAttributeValue
+from saleor.attribute.models.product_variant import AssignedVariantAttributeValue
+from saleor.product.ingestion import FetchedImage
+from saleor.product.models import (
+    Category,
+    PriceList,
+    PriceListItem,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from saleor.product.price_list_activation import activate_items_in_bulk
 from saleor.product.tasks import (
+    _activate_item,
+    _load_activation_context,
     activate_price_list_task,
     deactivate_price_list_task,
     process_price_list_task,
@@ -455,6 +474,150 @@ def test_process_replaces_items_on_rerun(db, warehouse, hk_excel):
     assert PriceListItem.objects.filter(price_list=price_list).count() == len(HK_ROWS)
 
 
+def test_process_failing_part_way_keeps_previous_items(db, warehouse, hk_excel):
+    from saleor.product import tasks
+
+    price_list = _make_price_list(warehouse, hk_excel)
+    process_price_list_task(price_list.pk)
+    price_list.refresh_from_db()
+    previous_item_ids = set(price_list.current_items().values_list("pk", flat=True))
+    original_link = tasks._link_price_list_items_to_products
+    chunks = []
+
+    def fail_on_second_chunk(items):
+        chunks.append(items)
+        if len(chunks) == 2:
+            raise RuntimeError("Worker lost")
+        original_link(items)
+
+    with (
+        mock.patch.object(tasks, "PRICE_LIST_CHUNK_SIZE", 2),
+        mock.patch.object(
+            tasks,
+            "_link_price_list_items_to_products",
+            side_effect=fail_on_second_chunk,
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        process_price_list_task(price_list.pk)
+
+    price_list.refresh_from_db()
+    assert (
+        set(price_list.current_items().values_list("pk", flat=True))
+        == previous_item_ids
+    )
+
+    process_price_list_task(price_list.pk)
+
+    price_list.refresh_from_db()
+    assert price_list.items.count() == len(HK_ROWS)
+    assert price_list.current_items().count() == len(HK_ROWS)
+    assert not price_list.current_items().filter(pk__in=previous_item_ids).exists()
+
+
+def test_process_failing_to_delete_old_items_keeps_previous_generation(
+    db, warehouse, hk_excel
+):
+    from django.db.models.query import QuerySet
+
+    price_list = _make_price_list(warehouse, hk_excel)
+    process_price_list_task(price_list.pk)
+    price_list.refresh_from_db()
+    previous_generation = price_list.items_generation
+    previous_item_ids = set(price_list.current_items().values_list("pk", flat=True))
+    original_delete = QuerySet.delete
+    item_deletes = []
+
+    def fail_on_old_generation_delete(queryset):
+        if queryset.model is PriceListItem:
+            item_deletes.append(queryset)
+            # The first delete clears leftovers, the second the old generation
+            if len(item_deletes) == 2:
+                raise RuntimeError("Worker lost")
+        return original_delete(queryset)
+
+    with (
+        mock.patch.object(
+            QuerySet, "delete", autospec=True, side_effect=fail_on_old_generation_delete
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        process_price_list_task(price_list.pk)
+
+    price_list.refresh_from_db()
+    assert price_list.items_generation == previous_generation
+    assert (
+        set(price_list.current_items().values_list("pk", flat=True))
+        == previous_item_ids
+    )
+
+
+def test_process_in_chunks_matches_single_chunk(db, warehouse, hk_excel):
+    from saleor.product import tasks
+
+    single = _make_price_list(warehouse, hk_excel)
+    process_price_list_task(single.pk)
+
+    chunked = _make_price_list(warehouse, hk_excel)
+    with mock.patch.object(tasks, "PRICE_LIST_CHUNK_SIZE", 2):
+        process_price_list_task(chunked.pk)
+
+    fields = ["row_index", "product_code", "brand", "sizes_and_qty", "sell_price"]
+    assert list(chunked.items.order_by("row_index").values_list(*fields)) == list(
+        single.items.order_by("row_index").values_list(*fields)
+    )
+
+
+def test_process_records_progress(db, warehouse, hk_excel):
+    from saleor.product import tasks
+
+    price_list = _make_price_list(warehouse, hk_excel)
+    progress = []
+    original_update = tasks._link_price_list_items_to_products
+
+    def record_progress(items):
+        original_update(items)
+        progress.append(len(items))
+
+    with (
+        mock.patch.object(tasks, "PRICE_LIST_CHUNK_SIZE", 2),
+        mock.patch.object(
+            tasks, "_link_price_list_items_to_products", side_effect=record_progress
+        ),
+    ):
+        process_price_list_task(price_list.pk)
+
+    price_list.refresh_from_db()
+    assert progress == [2, 2, 1]
+    assert price_list.processed_rows == len(HK_ROWS)
+    assert price_list.total_rows == len(HK_ROWS)
+
+
+def test_process_dedupes_across_chunks(db, warehouse, tmp_path):
+    import openpyxl
+
+    from saleor.product import tasks
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Sheet1 (1)"
+    ws.append(HK_HEADERS)
+    ws.append(HK_ROWS[0])
+    ws.append(HK_ROWS[1])
+    ws.append(HK_ROWS[0])
+    path = tmp_path / "dupes.xlsx"
+    wb.save(path)
+    price_list = _make_price_list(warehouse, path)
+
+    with mock.patch.object(tasks, "PRICE_LIST_CHUNK_SIZE", 1):
+        process_price_list_task(price_list.pk)
+
+    duplicate = price_list.items.get(row_index=4)
+    assert duplicate.is_valid is False
+    assert any("duplicate" in e for e in duplicate.validation_errors)
+    assert price_list.items.filter(is_valid=True).count() == 2
+
+
 # ---------------------------------------------------------------------------
 # Helpers for activate / deactivate / replace tests
 # ---------------------------------------------------------------------------
@@ -768,6 +931,23 @@ def test_replace_validates_new_is_processed(db, warehouse):
         replace_price_list_task(old_pl.pk, new_pl.pk)
 
 
+def test_replace_with_unprocessed_does_not_download_images(db, warehouse):
+    old_pl, _ = _make_processed_price_list(warehouse, sizes_and_qty={})
+    new_pl, item = _make_processed_price_list(warehouse, sizes_and_qty={"S": 5})
+    item.image_url = "https://example.com/a.jpg"
+    item.save(update_fields=["image_url"])
+    new_pl.processing_completed_at = None
+    new_pl.save(update_fields=["processing_completed_at"])
+
+    with (
+        mock.patch("saleor.product.ingestion.fetch_image") as mock_fetch_image,
+        pytest.raises(ValueError, match="has not completed processing"),
+    ):
+        replace_price_list_task(old_pl.pk, new_pl.pk)
+
+    mock_fetch_image.assert_not_called()
+
+
 def test_replace_diffs_correctly(db, warehouse):
     from django.utils import timezone
 
@@ -966,6 +1146,9 @@ def test_activate_creates_product_when_no_product_fk(
     ).exists()
 
 
+FAKE_IMAGE = FetchedImage(content=b"fake-image-data", ext="jpg")
+
+
 def test_activate_creates_product_media_for_new_product(
     db, warehouse, required_attributes
 ):
@@ -984,13 +1167,14 @@ def test_activate_creates_product_media_for_new_product(
     item.image_url = "https://example.com/image.jpg"
     item.save(update_fields=["image_url"])
 
-    with patch("saleor.product.ingestion.create_product_media") as mock_create_media:
+    with patch(
+        "saleor.product.ingestion.fetch_image", return_value=FAKE_IMAGE
+    ) as mock_fetch_image:
         activate_price_list_task(pl.pk)
 
     item.refresh_from_db()
-    mock_create_media.assert_called_once()
-    call_args = mock_create_media.call_args
-    assert call_args.args[1] == "https://example.com/image.jpg"
+    mock_fetch_image.assert_called_once_with("https://example.com/image.jpg")
+    assert item.product.media.count() == 1
 
 
 def test_activate_creates_product_media_for_existing_product_without_media(
@@ -1007,12 +1191,13 @@ def test_activate_creates_product_media_for_existing_product_without_media(
     item.image_url = "https://example.com/image.jpg"
     item.save(update_fields=["image_url"])
 
-    with patch("saleor.product.ingestion.create_product_media") as mock_create_media:
+    with patch(
+        "saleor.product.ingestion.fetch_image", return_value=FAKE_IMAGE
+    ) as mock_fetch_image:
         activate_price_list_task(pl.pk)
 
-    mock_create_media.assert_called_once()
-    call_args = mock_create_media.call_args
-    assert call_args.args[1] == "https://example.com/image.jpg"
+    mock_fetch_image.assert_called_once_with("https://example.com/image.jpg")
+    assert product.media.count() == 1
 
 
 def test_activate_skips_product_media_for_existing_product_with_media(db, warehouse):
@@ -1029,10 +1214,11 @@ def test_activate_skips_product_media_for_existing_product_with_media(db, wareho
     item.image_url = "https://example.com/image.jpg"
     item.save(update_fields=["image_url"])
 
-    with patch("saleor.product.ingestion.create_product_media") as mock_create_media:
+    with patch("saleor.product.ingestion.fetch_image") as mock_fetch_image:
         activate_price_list_task(pl.pk)
 
-    mock_create_media.assert_not_called()
+    mock_fetch_image.assert_not_called()
+    assert product.media.count() == 1
 
 
 def test_activate_is_idempotent(db, warehouse):
@@ -1053,6 +1239,62 @@ def test_activate_is_idempotent(db, warehouse):
     assert stock.quantity == 10
 
 
+def test_activate_already_active_does_not_download_images(db, warehouse):
+    from saleor.product import PriceListStatus
+
+    pl, item = _make_processed_price_list(warehouse, sizes_and_qty={"S": 5})
+    item.image_url = "https://example.com/a.jpg"
+    item.save(update_fields=["image_url"])
+    pl.status = PriceListStatus.ACTIVE
+    pl.save(update_fields=["status"])
+
+    with mock.patch("saleor.product.ingestion.fetch_image") as mock_fetch_image:
+        activate_price_list_task(pl.pk)
+
+    mock_fetch_image.assert_not_called()
+
+
+def test_activate_snapshots_exchange_rates(db, warehouse):
+    import datetime
+
+    from saleor.product.exchange_rates import ExchangeRateSnapshot
+
+    product, _, _ = _make_product_with_variant_and_stock(warehouse, size="S")
+    pl, _ = _make_processed_price_list(
+        warehouse, sizes_and_qty={"S": 5}, product=product
+    )
+    snapshot = ExchangeRateSnapshot(date=datetime.date(2026, 1, 2), rates={"GBP": 0.85})
+
+    with mock.patch(
+        "saleor.product.exchange_rates.get_exchange_rate_snapshot",
+        return_value=snapshot,
+    ):
+        activate_price_list_task(pl.pk)
+
+    pl.refresh_from_db()
+    assert pl.exchange_rates == {"GBP": 0.85}
+    assert pl.exchange_rates_date == snapshot.date
+
+
+def test_reactivate_uses_exchange_rate_snapshot(db, warehouse):
+    import datetime
+
+    product, _, _ = _make_product_with_variant_and_stock(warehouse, size="S")
+    pl, _ = _make_processed_price_list(
+        warehouse, sizes_and_qty={"S": 5}, product=product
+    )
+    pl.exchange_rates = {"GBP": 0.85}
+    pl.exchange_rates_date = datetime.date(2026, 1, 2)
+    pl.save(update_fields=["exchange_rates", "exchange_rates_date"])
+
+    with mock.patch(
+        "saleor.product.exchange_rates.get_exchange_rate_snapshot"
+    ) as get_snapshot:
+        activate_price_list_task(pl.pk)
+
+    get_snapshot.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Additional deactivate tests
 # ---------------------------------------------------------------------------
@@ -1570,6 +1812,261 @@ def test_activate_matches_existing_product_by_code_and_brand(
 # ---------------------------------------------------------------------------
 
 
+EXCHANGE_RATES = {"GBP": 0.8, "USD": 1.0}
+
+
+@pytest.fixture
+def catalogue(db, required_attributes, channel_USD):
+    from saleor.channel.models import Channel
+
+    ProductType.objects.create(name="Apparel", slug="apparel", has_variants=True)
+    ProductType.objects.create(name="Footwear", slug="footwear", has_variants=True)
+    Category.objects.create(name="Apparel", slug="apparel")
+    Category.objects.create(name="Footwear", slug="footwear")
+    channel_gbp = Channel.objects.create(
+        name="GBP Channel",
+        slug="gbp-channel",
+        currency_code="GBP",
+        default_country="GB",
+    )
+    return [channel_USD, channel_gbp]
+
+
+def _make_items(warehouse, rows):
+    from django.utils import timezone
+
+    price_list = PriceList.objects.create(
+        warehouse=warehouse, config={}, processing_completed_at=timezone.now()
+    )
+    items = []
+    for row_index, row in enumerate(rows):
+        defaults = {
+            "description": "Test Product",
+            "category": "Apparel",
+            "sell_price": Decimal("25.00"),
+            "currency": "GBP",
+            "rrp": Decimal("49.99"),
+            "sizes_and_qty": {"S": 1},
+        }
+        items.append(
+            PriceListItem.objects.create(
+                price_list=price_list,
+                row_index=row_index,
+                is_valid=True,
+                **(defaults | row),
+            )
+        )
+    return items
+
+
+def _rows(count):
+    return [
+        {
+            "product_code": f"CODE-{i}",
+            "brand": "Brand",
+            "description": f"Product {i}",
+            "category": "Apparel" if i % 2 else "Footwear",
+            "sizes_and_qty": {"S": i + 1, "M": 2},
+        }
+        for i in range(count)
+    ]
+
+
+def _activate(items, warehouse, channels, bulk):
+    product_type_map, category_map, attribute_map, channels, _ = (
+        _load_activation_context({i.category for i in items}, channels)
+    )
+    if bulk:
+        activate_items_in_bulk(
+            items,
+            warehouse,
+            product_type_map,
+            category_map,
+            attribute_map,
+            channels,
+            EXCHANGE_RATES,
+        )
+        return
+    newly_created: dict = {}
+    for item in items:
+        _activate_item(
+            item,
+            warehouse,
+            product_type_map,
+            category_map,
+            attribute_map,
+            channels,
+            EXCHANGE_RATES,
+            newly_created=newly_created,
+        )
+
+
+def _snapshot():
+    """Return the activated catalogue keyed by natural keys rather than pks."""
+    return {
+        "products": sorted(
+            Product.objects.values_list(
+                "slug", "name", "product_type__slug", "category__slug"
+            )
+        ),
+        "product_listings": sorted(
+            ProductChannelListing.objects.values_list(
+                "product__slug",
+                "channel__slug",
+                "currency",
+                "is_published",
+                "visible_in_listings",
+            )
+        ),
+        "attribute_values": sorted(
+            AttributeValue.objects.values_list(
+                "attribute__slug", "slug", "name", "plain_text", "sort_order"
+            )
+        ),
+        "product_attributes": sorted(
+            AssignedProductAttributeValue.objects.values_list(
+                "product__slug", "value__attribute__slug", "value__slug", "sort_order"
+            )
+        ),
+        "attribute_variants": sorted(
+            AttributeVariant.objects.values_list(
+                "product_type__slug", "attribute__slug", "sort_order"
+            )
+        ),
+        "variants": sorted(
+            (sku, product, name, sort_order, str(weight))
+            for sku, product, name, sort_order, weight in (
+                ProductVariant.objects.values_list(
+                    "sku", "product__slug", "name", "sort_order", "weight"
+                )
+            )
+        ),
+        "variant_attributes": sorted(
+            AssignedVariantAttributeValue.objects.values_list(
+                "variant__sku",
+                "assignment__assignment__attribute__slug",
+                "value__slug",
+                "sort_order",
+            )
+        ),
+        "variant_listings": sorted(
+            ProductVariantChannelListing.objects.values_list(
+                "variant__sku",
+                "channel__slug",
+                "price_amount",
+                "discounted_price_amount",
+            )
+        ),
+        "stocks": sorted(
+            Stock.objects.values_list(
+                "product_variant__sku", "warehouse__slug", "quantity"
+            )
+        ),
+    }
+
+
+def test_bulk_activation_matches_per_item_activation(db, warehouse, catalogue):
+    # given
+    product_type = ProductType.objects.get(slug="apparel")
+    existing = Product.objects.create(
+        name="Existing", slug="product-1-code-1", product_type=product_type
+    )
+    variant = ProductVariant.objects.create(
+        product=existing, name="S", sku="existing-s"
+    )
+    Stock.objects.create(product_variant=variant, warehouse=warehouse, quantity=3)
+    items = _make_items(
+        warehouse,
+        [
+            *_rows(3),
+            {
+                "product_code": "EXIST-1",
+                "brand": "Brand",
+                "sizes_and_qty": {"S": 4, "L": 6},
+                "product": existing,
+            },
+            {
+                "product_code": "NO-RRP",
+                "brand": "Other",
+                "rrp": None,
+                "weight_kg": Decimal("0.5"),
+                "sizes_and_qty": {"8.5": 1},
+            },
+        ],
+    )
+
+    # jsonb reorders sizes_and_qty keys, so run both paths on items as stored
+    for item in items:
+        item.refresh_from_db()
+    with transaction.atomic():
+        _activate(items, warehouse, catalogue, bulk=False)
+        expected = _snapshot()
+        transaction.set_rollback(True)
+    for item in items:
+        item.refresh_from_db()
+
+    # when
+    _activate(items, warehouse, catalogue, bulk=True)
+
+    # then
+    assert _snapshot() == expected
+    assert all(item.product_id is not None for item in items)
+
+
+def test_bulk_activation_query_count_does_not_grow_with_items(db, warehouse, catalogue):
+    # given
+    few = _make_items(warehouse, _rows(2))
+    many = _make_items(
+        warehouse,
+        [row | {"product_code": f"MANY-{row['product_code']}"} for row in _rows(20)],
+    )
+
+    # when
+    with CaptureQueriesContext(connection) as few_queries:
+        _activate(few, warehouse, catalogue, bulk=True)
+    with CaptureQueriesContext(connection) as many_queries:
+        _activate(many, warehouse, catalogue, bulk=True)
+
+    # then
+    assert len(many_queries) <= len(few_queries)
+    assert Product.objects.count() == 22
+
+
+def test_bulk_activation_merges_duplicate_items(db, warehouse, catalogue):
+    # given
+    rows = [
+        {"product_code": "DUP-1", "brand": "Brand", "sizes_and_qty": {"S": 1}},
+        {"product_code": "DUP-1", "brand": "Brand", "sizes_and_qty": {"S": 2, "M": 5}},
+    ]
+    items = _make_items(warehouse, rows)
+
+    # when
+    _activate(items, warehouse, catalogue, bulk=True)
+
+    # then
+    product = Product.objects.get()
+    assert {item.product_id for item in items} == {product.pk}
+    assert dict(Stock.objects.values_list("product_variant__name", "quantity")) == {
+        "S": 3,
+        "M": 5,
+    }
+
+
+def test_bulk_activation_raises_when_category_missing_product_type(
+    db, warehouse, catalogue
+):
+    # given
+    items = _make_items(
+        warehouse,
+        [{"product_code": "X-1", "brand": "Brand", "category": "Unknown"}],
+    )
+
+    # when & then
+    with pytest.raises(ValueError, match="no ProductType or Category"):
+        _activate(items, warehouse, catalogue, bulk=True)
+    assert not Product.objects.exists()
+
+
 def _make_allocation(stock, order_status, qty):
     """Create an Order → OrderLine → Allocation chain for a given stock row."""
     from decimal import Decimal
@@ -1987,6 +2484,84 @@ def test_replace_marks_all_affected_products_search_index_dirty(db, warehouse):
     mock_delay.assert_called_once()
 
 
+def test_replace_active_list_restores_unchanged_lines_to_sheet(db, warehouse):
+    from saleor.product import PriceListStatus
+    from saleor.product.models import Product, ProductVariant
+
+    unchanged_product, _, unchanged_stock = _make_product_with_variant_and_stock(
+        warehouse, size="S", quantity=10
+    )
+    changed_product, _, changed_stock_s = _make_product_with_variant_and_stock(
+        warehouse, size="S", quantity=10
+    )
+    variant_m = ProductVariant.objects.create(
+        product=changed_product, name="M", sku=f"sku-{changed_product.pk}-M"
+    )
+    changed_stock_m = Stock.objects.create(
+        product_variant=variant_m, warehouse=warehouse, quantity=5
+    )
+    # Sold since the old list was activated; the unchanged line restores it
+    unchanged_stock.quantity = 7
+    unchanged_stock.save(update_fields=["quantity"])
+    Product.objects.update(search_index_dirty=False)
+
+    old_pl = _make_pl_with_item(warehouse, changed_product, {"S": 10, "M": 5})
+    PriceListItem.objects.create(
+        price_list=old_pl,
+        row_index=1,
+        product_code="SAME",
+        brand="B",
+        description="Same",
+        category="Apparel",
+        sizes_and_qty={"S": 10},
+        sell_price=Decimal(10),
+        currency="GBP",
+        is_valid=True,
+        product=unchanged_product,
+    )
+    old_pl.status = PriceListStatus.ACTIVE
+    old_pl.save(update_fields=["status"])
+    new_pl = _make_pl_with_item(warehouse, changed_product, {"S": 25})
+    PriceListItem.objects.create(
+        price_list=new_pl,
+        row_index=1,
+        product_code="same",
+        brand="b",
+        description="Same",
+        category="Apparel",
+        sizes_and_qty={"S": 10},
+        sell_price=Decimal(10),
+        currency="GBP",
+        is_valid=True,
+        product=unchanged_product,
+    )
+
+    replace_price_list_task(old_pl.pk, new_pl.pk)
+
+    unchanged_stock.refresh_from_db()
+    changed_stock_s.refresh_from_db()
+    changed_stock_m.refresh_from_db()
+    assert unchanged_stock.quantity == 10
+    assert changed_stock_s.quantity == 25
+    assert changed_stock_m.quantity == 0
+
+    unchanged_product.refresh_from_db()
+    changed_product.refresh_from_db()
+    assert unchanged_product.search_index_dirty is False
+    assert changed_product.search_index_dirty is True
+
+    new_pl.refresh_from_db()
+    assert new_pl.replace_delta == {
+        "added": 0,
+        "changed": 1,
+        "removed": 1,
+        "unchanged": 1,
+        "products_added": 0,
+        "products_removed": 0,
+        "products_changed": 1,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Duplicate product code deduplication tests
 # ---------------------------------------------------------------------------
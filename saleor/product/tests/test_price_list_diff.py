@@ -0,0 +1,52 @@
+"""Tests for the line-level PriceList diff."""
+
+from saleor.product.models import PriceListItem
+from saleor.product.price_list_diff import diff_price_list_items
+
+
+def _item(product_code, sizes_and_qty, brand="Brand", product_id=None):
+    return PriceListItem(
+        product_code=product_code,
+        brand=brand,
+        sizes_and_qty=sizes_and_qty,
+        product_id=product_id,
+    )
+
+
+def _keys(lines):
+    return {(line.item.product_code, line.size) for line in lines}
+
+
+def test_diff_classifies_lines_by_code_brand_and_size():
+    old_items = [_item("A", {"S": 1, "M": 2}), _item("B", {"S": 3})]
+    new_items = [_item("A", {"S": 1, "M": 5, "L": 1}), _item("C", {"S": 1})]
+
+    diff = diff_price_list_items(old_items, new_items)
+
+    assert _keys(diff.added) == {("A", "L"), ("C", "S")}
+    assert _keys(diff.changed) == {("A", "M")}
+    assert _keys(diff.removed) == {("B", "S")}
+    assert _keys(diff.unchanged) == {("A", "S")}
+    assert diff.delta_counts() == {
+        "added": 2,
+        "changed": 1,
+        "removed": 1,
+        "unchanged": 1,
+    }
+
+
+def test_diff_matches_code_and_brand_case_insensitively():
+    diff = diff_price_list_items(
+        [_item("abc-1", {"S": 1}, brand="adidas")],
+        [_item("ABC-1", {"S": 1}, brand="Adidas")],
+    )
+
+    assert diff.delta_counts()["unchanged"] == 1
+
+
+def test_diff_treats_line_resolved_to_other_product_as_changed():
+    diff = diff_price_list_items(
+        [_item("A", {"S": 1}, product_id=1)], [_item("A", {"S": 1}, product_id=2)]
+    )
+
+    assert _keys(diff.changed) == {("A", "S")}
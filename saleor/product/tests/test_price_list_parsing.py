@@ -7,6 +7,8 @@ import pytest
 
 from saleor.product.price_list_parsing import (
     ParsedRow,
+    estimate_sheet_rows,
+    iter_sheet_chunks,
     parse_category,
     parse_decimal,
     parse_hs_code,
@@ -844,3 +846,292 @@ def test_parse_sheet_skips_unmapped_columns(hk_df):
     assert rows[0].brand == "adidas"
     assert rows[0].rrp is None
     assert rows[0].description == ""
+
+
+def test_parse_sheet_row_offset_shifts_row_index(hk_df):
+    rows = parse_sheet(hk_df, HK_COLUMN_MAP, "GBP", header_row=1, row_offset=10)
+    assert [r.row_index for r in rows] == list(range(13, 13 + len(HK_ROWS)))
+
+
+# ---------------------------------------------------------------------------
+# parse_sheet(vectorized=True)
+# ---------------------------------------------------------------------------
+
+MIXED_ROWS = [
+    # product_code, brand, description, category, sizes, rrp, sell_price,
+    # buy_price, weight_kg, image_url, hs_code
+    [
+        "ABC-1",
+        "Nike",
+        " desc ",
+        "Apparel",
+        "S [1], M [2]",
+        40,
+        9.03,
+        None,
+        0.2,
+        "https://x.com/a.jpg",
+        "1234.56.78",
+    ],
+    [
+        "abc 1",
+        "",
+        None,
+        "Nope",
+        "garbage",
+        "abc",
+        None,
+        -1,
+        5000,
+        "ftp://x/a.jpg",
+        "12",
+    ],
+    [
+        None,
+        " adidas ",
+        3.5,
+        "",
+        "40 [3] 41 [4]",
+        "1_000",
+        "£9.03",
+        "Infinity",
+        -2,
+        "data:text/plain,aa",
+        "1234567",
+    ],
+    [
+        "X1",
+        "Puma",
+        "d",
+        "Footwear",
+        "S [1], M [2]",
+        1.0,
+        "0",
+        1,
+        1000,
+        "HTTP://X.COM/A.JPEG?size=1",
+        "١٢٣٤٥٦",
+    ],
+    [
+        "Y2",
+        "Puma",
+        "d",
+        "Apparel",
+        None,
+        1,
+        True,
+        " 12 ",
+        "nan",
+        "https://x.com/..jpg",
+        "1234567890",
+    ],
+    [
+        "Z3",
+        "Puma",
+        "d",
+        "Apparel",
+        "M [5]",
+        None,
+        9.03,
+        None,
+        None,
+        "data:image/png;base64,AAA",
+        None,
+    ],
+    ["Z4", "Puma", "d", "Apparel", "M [5]", 0, 9, 0, 0, "https://x.com/a;b.jpg", ""],
+    ["Z5", "Puma", "d", "Apparel", "M [5]", 0, 9, 0, 0, "https://x.com/a.gıf", ""],
+]
+MIXED_COLUMN_MAP = dict(
+    enumerate(
+        [
+            "product_code",
+            "brand",
+            "description",
+            "category",
+            "sizes",
+            "rrp",
+            "sell_price",
+            "buy_price",
+            "weight_kg",
+            "image_url",
+            "hs_code",
+        ]
+    )
+)
+
+
+@pytest.mark.parametrize("valid_categories", [None, {"Apparel", "Footwear"}])
+def test_parse_sheet_vectorized_matches_row_by_row(valid_categories):
+    df = pd.DataFrame(MIXED_ROWS)
+
+    rows = parse_sheet(df, MIXED_COLUMN_MAP, "GBP", valid_categories)
+    vectorized_rows = parse_sheet(
+        df, MIXED_COLUMN_MAP, "GBP", valid_categories, vectorized=True
+    )
+
+    assert vectorized_rows == rows
+    # Equal Decimals can still differ in exponent, e.g. 1 and 1.0
+    assert [str(r.rrp) for r in vectorized_rows] == [str(r.rrp) for r in rows]
+    assert any(not r.is_valid for r in rows)
+
+
+def test_parse_sheet_vectorized_matches_row_by_row_on_number_edge_cases():
+    # Spellings pandas reads differently from Decimal, or not at all
+    df = pd.DataFrame(
+        [
+            ["A", "B", "d", "Apparel", "S[1] S[2] M [٣]", "1e400", "9.030", "1.", 1e-9],
+            ["A", "B", "d", "Apparel", " ", "-1e-400", "", "-0.0", "1000.0000001"],
+        ]
+    )
+    column_map = dict(enumerate(list(MIXED_COLUMN_MAP.values())[:9]))
+
+    rows = parse_sheet(df, column_map, "GBP")
+
+    assert parse_sheet(df, column_map, "GBP", vectorized=True) == rows
+    assert rows[0].sizes_and_qty == {"S": 2, "M": 3}
+    assert rows[1].validation_errors[-1].startswith("weight_kg: 1000.0000001 exceeds")
+
+
+def test_parse_sheet_vectorized_matches_row_by_row_on_hk_sheet(hk_df):
+    assert parse_sheet(
+        hk_df, HK_COLUMN_MAP, "GBP", {"Apparel"}, header_row=1, row_offset=4
+    ) == parse_sheet(
+        hk_df,
+        HK_COLUMN_MAP,
+        "GBP",
+        {"Apparel"},
+        header_row=1,
+        row_offset=4,
+        vectorized=True,
+    )
+
+
+def test_parse_sheet_vectorized_missing_columns(hk_df):
+    minimal = {0: "brand", 1: "product_code", 13: "sizes"}
+
+    rows = parse_sheet(hk_df, minimal, "GBP", vectorized=True)
+
+    assert rows == parse_sheet(hk_df, minimal, "GBP")
+    assert rows[0].sell_price is None
+    assert rows[0].validation_errors == ["sell_price: required"]
+
+
+def test_parse_sheet_vectorized_empty_dataframe():
+    df = pd.DataFrame([], columns=HK_HEADERS)
+    assert parse_sheet(df, HK_COLUMN_MAP, "GBP", vectorized=True) == []
+
+
+def test_parse_sheet_vectorized_rows_do_not_share_sizes(hk_df):
+    df = pd.concat([hk_df.iloc[:1]] * 2, ignore_index=True)
+
+    first, second = parse_sheet(df, HK_COLUMN_MAP, "GBP", vectorized=True)
+
+    assert first.sizes_and_qty == second.sizes_and_qty
+    assert first.sizes_and_qty is not second.sizes_and_qty
+
+
+# ---------------------------------------------------------------------------
+# iter_sheet_chunks
+# ---------------------------------------------------------------------------
+
+
+def _write_workbook(path, rows, sheet_name="Sheet1"):
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet_name
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _parse_in_chunks(path, chunk_size, header_row=0):
+    return [
+        row
+        for row_offset, chunk in iter_sheet_chunks(
+            path, "Sheet1", header_row, chunk_size=chunk_size
+        )
+        for row in parse_sheet(
+            chunk, HK_COLUMN_MAP, "GBP", header_row=header_row, row_offset=row_offset
+        )
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_iter_sheet_chunks_matches_read_excel(tmp_path, chunk_size):
+    path = _write_workbook(tmp_path / "sheet.xlsx", [HK_HEADERS, *HK_ROWS])
+    expected = parse_sheet(
+        pd.read_excel(path, sheet_name="Sheet1", header=0), HK_COLUMN_MAP, "GBP"
+    )
+
+    assert _parse_in_chunks(path, chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [2, 100])
+def test_iter_sheet_chunks_same_types_with_blank_cell_in_one_chunk(
+    tmp_path, chunk_size
+):
+    rows = [list(row) for row in HK_ROWS]
+    rows[0][1] = 123456
+    rows[1][1] = None
+    rows[2][1] = 123457
+    path = _write_workbook(tmp_path / "sheet.xlsx", [HK_HEADERS, *rows])
+    expected = parse_sheet(
+        pd.read_excel(path, sheet_name="Sheet1", header=0, dtype=object),
+        HK_COLUMN_MAP,
+        "GBP",
+    )
+
+    parsed = _parse_in_chunks(path, chunk_size)
+
+    assert parsed == expected
+    assert [r.product_code for r in parsed] == ["123456", "", "123457"]
+
+
+def test_iter_sheet_chunks_respects_chunk_size(tmp_path):
+    path = _write_workbook(tmp_path / "sheet.xlsx", [HK_HEADERS, *HK_ROWS])
+
+    chunks = list(iter_sheet_chunks(path, "Sheet1", chunk_size=2))
+
+    assert [(offset, len(df)) for offset, df in chunks] == [(0, 2), (2, 1)]
+
+
+def test_iter_sheet_chunks_keeps_inner_and_drops_trailing_blank_rows(tmp_path):
+    rows = [HK_HEADERS, HK_ROWS[0], [], HK_ROWS[1], [], []]
+    path = _write_workbook(tmp_path / "sheet.xlsx", rows)
+    expected = parse_sheet(
+        pd.read_excel(path, sheet_name="Sheet1", header=0), HK_COLUMN_MAP, "GBP"
+    )
+
+    parsed = _parse_in_chunks(path, chunk_size=1)
+
+    assert parsed == expected
+    assert [r.row_index for r in parsed] == [2, 3, 4]
+    assert parsed[1].is_valid is False
+
+
+def test_iter_sheet_chunks_header_row(tmp_path):
+    path = _write_workbook(
+        tmp_path / "sheet.xlsx", [["Supplier deal sheet"], HK_HEADERS, *HK_ROWS]
+    )
+
+    parsed = _parse_in_chunks(path, chunk_size=2, header_row=1)
+
+    assert [r.product_code for r in parsed] == ["is1637", "hy4520", "h59015"]
+    assert [r.row_index for r in parsed] == [3, 4, 5]
+
+
+def test_iter_sheet_chunks_missing_sheet(tmp_path):
+    path = _write_workbook(tmp_path / "sheet.xlsx", [HK_HEADERS, *HK_ROWS])
+
+    with pytest.raises(ValueError, match="Missing"):
+        list(iter_sheet_chunks(path, "Missing"))
+
+
+def test_estimate_sheet_rows(tmp_path):
+    path = _write_workbook(tmp_path / "sheet.xlsx", [HK_HEADERS, *HK_ROWS])
+
+    assert estimate_sheet_rows(path, "Sheet1") == len(HK_ROWS)
+    assert estimate_sheet_rows(path, "Missing") is None
@@ -505,12 +505,17 @@ def test_costs_get_margin_for_variant_channel_listing(
 
 
 @patch("saleor.product.signals.delete_from_storage_task.delay")
-def test_product_media_delete(delete_from_storage_task_mock, product_with_image):
+def test_product_media_delete(
+    delete_from_storage_task_mock,
+    product_with_image,
+    django_capture_on_commit_callbacks,
+):
     # given
     media = product_with_image.media.first()
 
     # when
-    media.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        media.delete()
 
     # then
     delete_from_storage_task_mock.assert_called_once_with(media.image.name)
@@ -73,6 +73,24 @@ def get_url_from_env(name, *, schemes=None) -> str | None:
     return None
 
 
+def get_exchange_rates_from_env(name) -> dict[str, float]:
+    """Parse comma-separated CODE:RATE pairs, e.g. "GBP:0.85,USD:1.08"."""
+    rates = {}
+    for entry in get_list(os.environ.get(name, "")):
+        if not entry:
+            continue
+        message = f"{entry!r} is an invalid entry for {name}, expected CODE:RATE."
+        code, separator, rate = entry.partition(":")
+        code = code.strip()
+        if not code or not separator:
+            raise ImproperlyConfigured(message)
+        try:
+            rates[code] = float(rate)
+        except ValueError as e:
+            raise ImproperlyConfigured(message) from e
+    return rates
+
+
 # Possibility to set memory limits for the process. Function `validate_and_set_rlimit` set the
 # maximum size of the process's heap(`resource.RLIMIT_DATA`). If you set the memory limit and process will try to
 # allocate more memory than the limit, it will raise `MemoryError`.
@@ -659,6 +677,22 @@ BEAT_UPDATE_SEARCH_SEC = parse(
 )
 BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC = BEAT_UPDATE_SEARCH_SEC
 
+# Defines how often expired reservations and empty allocations are swept, and
+# after how many seconds the sweep triggered by the Celery beat entry
+# 'sweep-reservations-and-allocations' expires if it wasn't picked up by a worker.
+BEAT_SWEEP_RESERVATIONS_SEC = parse(
+    os.environ.get("BEAT_SWEEP_RESERVATIONS_FREQUENCY", "1 minute")
+)
+BEAT_SWEEP_RESERVATIONS_EXPIRE_AFTER_SEC = BEAT_SWEEP_RESERVATIONS_SEC
+
+# Defines how often stocks whose allocations changed are reconciled, and after
+# how many seconds the task triggered by the Celery beat entry
+# 'reconcile-stocks-quantity-allocated' expires if it wasn't picked up by a worker.
+BEAT_RECONCILE_STOCKS_SEC = parse(
+    os.environ.get("BEAT_RECONCILE_STOCKS_FREQUENCY", "5 minutes")
+)
+BEAT_RECONCILE_STOCKS_EXPIRE_AFTER_SEC = BEAT_RECONCILE_STOCKS_SEC
+
 BEAT_PRICE_RECALCULATION_SCHEDULE = parse(
     os.environ.get("BEAT_PRICE_RECALCULATION_SCHEDULE", "30 seconds")
 )
@@ -671,18 +705,15 @@ BEAT_PRICE_RECALCULATION_SCHEDULE_EXPIRE_AFTER_SEC = BEAT_PRICE_RECALCULATION_SC
 # the expiration value. This makes sure if the task or scheduling is wrapped
 # by custom code (e.g., a Saleor fork), the expiration is still present.
 CELERY_BEAT_SCHEDULE = {
-    "delete-empty-allocations": {
-        "task": "saleor.warehouse.tasks.delete_empty_allocations_task",
-        "schedule": datetime.timedelta(days=1),
+    "sweep-reservations-and-allocations": {
+        "task": "saleor.warehouse.tasks.sweep_reservations_and_allocations_task",
+        "schedule": datetime.timedelta(seconds=BEAT_SWEEP_RESERVATIONS_SEC),
+        "options": {"expires": BEAT_SWEEP_RESERVATIONS_EXPIRE_AFTER_SEC},
     },
     "deactivate-preorder-for-variants": {
         "task": "saleor.product.tasks.deactivate_preorder_for_variants_task",
         "schedule": datetime.timedelta(hours=1),
     },
-    "delete-expired-reservations": {
-        "task": "saleor.warehouse.tasks.delete_expired_reservations_task",
-        "schedule": datetime.timedelta(days=1),
-    },
     "delete-expired-checkouts": {
         "task": "saleor.checkout.tasks.delete_expired_checkouts",
         "schedule": crontab(hour=0, minute=0),
@@ -699,9 +730,15 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.giftcard.tasks.deactivate_expired_cards_task",
         "schedule": crontab(hour=0, minute=0),
     },
+    "reconcile-stocks-quantity-allocated": {
+        "task": "saleor.warehouse.tasks.reconcile_stocks_quantity_allocated_task",
+        "schedule": datetime.timedelta(seconds=BEAT_RECONCILE_STOCKS_SEC),
+        "options": {"expires": BEAT_RECONCILE_STOCKS_EXPIRE_AFTER_SEC},
+    },
+    # Full recompute, catching writes that bypass the reconciliation records
     "update-stocks-quantity-allocated": {
         "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
-        "schedule": crontab(hour=0, minute=0),
+        "schedule": crontab(hour=0, minute=0, day_of_week=0),
     },
     "delete-old-export-files": {
         "task": "saleor.csv.tasks.delete_old_export_files",
@@ -879,6 +916,15 @@ def SENTRY_INIT(dsn: str, sentry_opts: dict):
 
 
 GRAPHQL_PAGINATION_LIMIT = 100
+# Connections whose number of rows, as estimated by the database query planner,
+# is at least this threshold return the estimate as their total count instead
+# of counting all rows. Set to 0 to always count rows.
+GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD", 0)
+)
+# Whether data requested for nodes of connection pages, e.g. variants and channel
+# listings of products, is loaded up front to prime their dataloaders
+GRAPHQL_PREFETCH_ENABLED = get_bool_from_env("GRAPHQL_PREFETCH_ENABLED", True)
 GRAPHQL_MIDDLEWARE: list[str] = []
 
 # Set GRAPHQL_QUERY_MAX_COMPLEXITY=0 in env to disable (not recommended)
@@ -886,6 +932,32 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
 )
 
+# Whether clients can send the SHA-256 hash of a query sent before instead of its
+# text (automatic persisted queries, as in the persistedQuery extension of Apollo).
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", True
+)
+# How long persisted queries and their computed costs are kept in the cache.
+GRAPHQL_PERSISTED_QUERY_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERY_CACHE_TIMEOUT", 60 * 60 * 24 * 7)
+)
+
+# Whether responses to queries sent without an auth token are cached, for queries
+# whose root fields are all listed below. Cached responses are invalidated when
+# the objects they contain change.
+GRAPHQL_RESPONSE_CACHE_ENABLED = get_bool_from_env(
+    "GRAPHQL_RESPONSE_CACHE_ENABLED", False
+)
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 300)
+)
+GRAPHQL_RESPONSE_CACHE_ROOT_FIELDS = get_list(
+    os.environ.get(
+        "GRAPHQL_RESPONSE_CACHE_ROOT_FIELDS",
+        "categories,category,collections,collection,menus,menu,products,product",
+    )
+)
+
 # Max number entities that can be requested in single query by Apollo Federation
 # Federation protocol implements no securities on its own part - malicious actor
 # may build a query that requests for potentially few thousands of entities.
@@ -909,6 +981,10 @@ BUILTIN_PLUGINS = [
     "saleor.plugins.openid_connect.plugin.OpenIDConnectPlugin",
 ]
 
+# Invalidates cached responses when the objects they contain change
+if GRAPHQL_RESPONSE_CACHE_ENABLED:
+    BUILTIN_PLUGINS.append("saleor.plugins.response_cache.plugin.ResponseCachePlugin")
+
 # Plugin discovery
 EXTERNAL_PLUGINS = []
 installed_plugins = importlib.metadata.entry_points(group="saleor.plugins")
@@ -1086,6 +1162,18 @@ WEBHOOK_WAITING_FOR_RESPONSE_TIMEOUT = 18
 WEBHOOK_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, WEBHOOK_WAITING_FOR_RESPONSE_TIMEOUT)
 WEBHOOK_SYNC_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, WEBHOOK_WAITING_FOR_RESPONSE_TIMEOUT)
 
+# Max number of target hosts a worker process keeps open webhook connections to.
+# Connections to the least recently used host are closed when the limit is hit.
+WEBHOOK_CONNECTION_POOL_MAX_HOSTS = int(
+    os.environ.get("WEBHOOK_CONNECTION_POOL_MAX_HOSTS", 100)
+)
+
+# Number of deliveries of an app's batch a worker sends at the same time. 1 sends
+# them one after another.
+WEBHOOK_ASYNC_DELIVERY_CONCURRENCY = int(
+    os.environ.get("WEBHOOK_ASYNC_DELIVERY_CONCURRENCY", 1)
+)
+
 # The max number of rules with order_predicate defined
 ORDER_RULES_LIMIT = os.environ.get("ORDER_RULES_LIMIT", 100)
 
@@ -1106,6 +1194,14 @@ ENABLE_LIMITING_WEBHOOKS_FOR_IDENTICAL_PAYLOADS = get_bool_from_env(
 )
 
 
+# Whether pack allocation reads variant availability from the materialized
+# VariantChannelAvailability rows instead of computing it from stocks. Rebuild the
+# rows with `check_variant_availability --fix` before enabling it.
+VARIANT_AVAILABILITY_STORE_ENABLED = get_bool_from_env(
+    "VARIANT_AVAILABILITY_STORE_ENABLED", False
+)
+
+
 # Transaction items limit for PaymentGatewayInitialize / TransactionInitialize.
 # That setting limits the allowed number of transaction items for single entity.
 TRANSACTION_ITEMS_LIMIT = 100
@@ -1152,6 +1248,17 @@ TELEMETRY_SLOW_GRAPHQL_OPERATION_THRESHOLD = float(
 # For development envs, where schema may change often, it may be convenient to set it to e.g. commit hash value.
 GRAPHQL_CACHE_SUFFIX = os.environ.get("GRAPHQL_CACHE_SUFFIX", "")
 
+# Source of exchange rates for product ingestion and price list activation:
+# "frankfurter" fetches them from the Frankfurter API, "local" serves
+# EXCHANGE_RATES_LOCAL without network access. Local rates are given as
+# comma-separated CODE:RATE pairs relative to EUR, e.g. "GBP:0.85,USD:1.08".
+EXCHANGE_RATES_SOURCE = os.environ.get("EXCHANGE_RATES_SOURCE", "frankfurter")
+EXCHANGE_RATES_LOCAL = get_exchange_rates_from_env("EXCHANGE_RATES_LOCAL")
+# How long fetched exchange rates are shared between workers before refetching.
+EXCHANGE_RATES_CACHE_TTL = datetime.timedelta(
+    seconds=parse(os.environ.get("EXCHANGE_RATES_CACHE_TTL", "1 hour"))
+)
+
 # Library `google-i18n-address` use `AddressValidationMetadata` form Google to provide address validation rules.
 # Patch `i18n` module to allows to override the default address rules.
 i18n_rules_override()
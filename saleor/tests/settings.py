@@ -44,6 +44,16 @@ OBSERVABILITY_REPORT_ALL_API_CALLS = False
 
 PLUGINS = []
 
+EXCHANGE_RATES_SOURCE = "local"
+# Flat rates, so prices converted between test channels keep their amounts
+EXCHANGE_RATES_LOCAL: dict[str, float] = {
+    "AED": 1.0,
+    "GBP": 1.0,
+    "JPY": 1.0,
+    "PLN": 1.0,
+    "USD": 1.0,
+}
+
 PATTERNS_IGNORED_IN_QUERY_CAPTURES: list[Pattern | SimpleLazyObject] = [
     lazy_re_compile(r"^SET\s+")
 ]
@@ -0,0 +1,38 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_save
+
+
+class WarehouseAppConfig(AppConfig):
+    name = "saleor.warehouse"
+
+    def ready(self):
+        from .models import Allocation, Stock
+        from .signals import (
+            mark_allocation_stock_for_reconciliation,
+            mark_stock_for_reconciliation,
+            refresh_allocation_availability,
+            refresh_stock_availability,
+        )
+
+        # Bulk writes schedule the refresh themselves, see availability_store
+        post_save.connect(
+            refresh_stock_availability,
+            sender=Stock,
+            dispatch_uid="refresh_stock_availability",
+        )
+        post_save.connect(
+            refresh_allocation_availability,
+            sender=Allocation,
+            dispatch_uid="refresh_allocation_availability",
+        )
+        # Bulk writes record the stocks themselves, see reconciliation
+        post_save.connect(
+            mark_stock_for_reconciliation,
+            sender=Stock,
+            dispatch_uid="mark_stock_for_reconciliation",
+        )
+        post_save.connect(
+            mark_allocation_stock_for_reconciliation,
+            sender=Allocation,
+            dispatch_uid="mark_allocation_stock_for_reconciliation",
+        )
@@ -17,6 +17,7 @@ from ..checkout.error_codes import CheckoutErrorCode
 from ..checkout.fetch import DeliveryMethodBase
 from ..core.exceptions import InsufficientStock, InsufficientStockData
 from ..product.models import ProductVariantChannelListing
+from .availability_store import get_stored_available_quantities
 from .models import Reservation, Stock, StockQuerySet
 from .reservations import get_listings_reservations
 
@@ -242,11 +243,47 @@ def check_stock_quantity_bulk(
     replace=False,
     check_reservations: bool = False,
     database_connection_name: str = settings.DATABASE_CONNECTION_DEFAULT_NAME,
+    use_availability_store: bool = False,
 ):
     """Validate if there is stock available for given variants in given country.
 
+    With use_availability_store, quantities are read from the materialized
+    VariantChannelAvailability rows when the check covers exactly the
+    warehouses they are computed for: a known delivery method that is not a
+    collection point, and no additional filters.
+
     :raises InsufficientStock: when there is not enough items in stock for a variant.
     """
+    variants = list(variants)
+    checkout_lines = [line.line for line in existing_lines] if existing_lines else []
+    if (
+        use_availability_store
+        and additional_filter_lookup is None
+        and delivery_method_info is not None
+        and delivery_method_info.delivery_method
+        and not delivery_method_info.warehouse_pk
+    ):
+        stored = get_stored_available_quantities(
+            [variant.pk for variant in variants],
+            country_code,
+            channel_slug,
+            checkout_lines,
+            check_reservations,
+            database_connection_name,
+        )
+        # A variant without a row may simply not be stored yet
+        if all(variant.pk in stored for variant in variants):
+            _check_available_quantities(
+                variants,
+                quantities,
+                global_quantity_limit,
+                stored,
+                set(stored),
+                existing_lines,
+                replace,
+            )
+            return
+
     filter_lookup = {"product_variant__in": variants}
     if additional_filter_lookup is not None:
         filter_lookup.update(additional_filter_lookup)
@@ -280,12 +317,39 @@ def check_stock_quantity_bulk(
 
     if check_reservations:
         variant_reservations = get_reserved_stock_quantity_bulk(
-            all_variants_stocks,
-            [line.line for line in existing_lines] if existing_lines else [],
+            all_variants_stocks, checkout_lines
         )
     else:
         variant_reservations = defaultdict(int)
 
+    available_quantities = {}
+    for variant in variants:
+        stocks = variant_stocks.get(variant.pk, [])
+        available_quantity = sum([stock.available_quantity for stock in stocks])  # type: ignore[attr-defined]
+        available_quantities[variant.pk] = max(
+            available_quantity - variant_reservations[variant.pk], 0
+        )
+
+    _check_available_quantities(
+        variants,
+        quantities,
+        global_quantity_limit,
+        available_quantities,
+        set(variant_stocks),
+        existing_lines,
+        replace,
+    )
+
+
+def _check_available_quantities(
+    variants: list["ProductVariant"],
+    quantities: Iterable[int],
+    global_quantity_limit: int | None,
+    available_quantities: dict[int, int],
+    variants_with_stock: set[int],
+    existing_lines: list["CheckoutLineInfo"] | None,
+    replace: bool,
+):
     insufficient_stocks: list[InsufficientStockData] = []
     variants_quantities = {
         line.variant.pk: line.line.quantity for line in existing_lines or []
@@ -294,11 +358,7 @@ def check_stock_quantity_bulk(
         if not replace:
             quantity += variants_quantities.get(variant.pk, 0)
 
-        stocks = variant_stocks.get(variant.pk, [])
-        available_quantity = sum([stock.available_quantity for stock in stocks])  # type: ignore[attr-defined]
-        available_quantity = max(
-            available_quantity - variant_reservations[variant.pk], 0
-        )
+        available_quantity = available_quantities.get(variant.pk, 0)
 
         if quantity > 0:
             _check_quantity_limits(variant, quantity, global_quantity_limit)
@@ -306,7 +366,7 @@ def check_stock_quantity_bulk(
             if not variant.track_inventory:
                 continue
 
-            if not stocks:
+            if variant.pk not in variants_with_stock:
                 insufficient_stocks.append(
                     InsufficientStockData(
                         variant=variant, available_quantity=available_quantity
@@ -525,8 +585,19 @@ def get_available_quantity(
     checkout_lines: list["CheckoutLine"] | None = None,
     check_reservations: bool = False,
     warehouse_ids: list[str] | None = None,
+    use_availability_store: bool = False,
 ) -> int:
-    """Return available quantity for given product in given country."""
+    """Return available quantity for given product in given country.
+
+    With use_availability_store the quantity is read from the materialized
+    VariantChannelAvailability row when there is one.
+    """
+    if use_availability_store and warehouse_ids is None:
+        stored = get_stored_available_quantities(
+            [variant.pk], country_code, channel_slug, checkout_lines, check_reservations
+        )
+        if variant.pk in stored:
+            return stored[variant.pk]
     stocks = Stock.objects.get_variant_stocks_for_country(
         country_code, channel_slug, variant
     )
@@ -537,6 +608,61 @@ def get_available_quantity(
     return _get_available_quantity(stocks, checkout_lines, check_reservations)
 
 
+def get_available_quantities(
+    variants: Iterable["ProductVariant"],
+    country_code: str,
+    channel_slug: str,
+    checkout_lines: list["CheckoutLine"] | None = None,
+    check_reservations: bool = False,
+    warehouse_ids: list[str] | None = None,
+    use_availability_store: bool = False,
+    database_connection_name: str = settings.DATABASE_CONNECTION_DEFAULT_NAME,
+) -> dict[int, int]:
+    """Return available quantities of given variants in given country by variant ID.
+
+    Bulk version of get_available_quantity: stocks of all variants are fetched
+    with one query, and reservations with one more, however many variants
+    are given.
+    """
+    quantities = {variant.pk: 0 for variant in variants}
+    variant_ids = list(quantities)
+    if use_availability_store and warehouse_ids is None:
+        stored = get_stored_available_quantities(
+            variant_ids,
+            country_code,
+            channel_slug,
+            checkout_lines,
+            check_reservations,
+            database_connection_name,
+        )
+        quantities.update(stored)
+        variant_ids = [pk for pk in variant_ids if pk not in stored]
+    if not variant_ids:
+        return quantities
+
+    stocks = Stock.objects.using(database_connection_name).for_channel_and_country(
+        channel_slug, country_code
+    )
+    stocks = stocks.filter(product_variant_id__in=variant_ids)
+    if warehouse_ids is not None:
+        stocks = stocks.filter(warehouse_id__in=warehouse_ids)
+    variants_stocks = list(stocks.annotate_available_quantity())
+
+    if check_reservations:
+        variant_reservations = get_reserved_stock_quantity_bulk(
+            variants_stocks, checkout_lines or []
+        )
+    else:
+        variant_reservations = defaultdict(int)
+
+    variant_quantities: dict[int, int] = defaultdict(int)
+    for stock in variants_stocks:
+        variant_quantities[stock.product_variant_id] += stock.available_quantity  # type: ignore[attr-defined]
+    for variant_id, quantity in variant_quantities.items():
+        quantities[variant_id] = max(quantity - variant_reservations[variant_id], 0)
+    return quantities
+
+
 def is_product_in_stock(
     product: "Product", country_code: str, channel_slug: str
 ) -> bool:
@@ -0,0 +1,307 @@
+"""Materialized per-channel, per-country variant availability.
+
+VariantChannelAvailability rows hold what get_available_quantity computes
+on every call: the quantity of a variant's stocks minus their allocations,
+summed over the warehouses that ship to a country in a channel. Reads that
+opt in (use_availability_store=True) fetch one row instead of joining
+stocks, allocations, channels and shipping zones; reservations expire on
+their own, so they are still subtracted live.
+
+When VARIANT_AVAILABILITY_STORE_ENABLED is set, rows are refreshed in a
+Celery task for the variants whose stocks or allocations change, once the
+transaction commits (see schedule_variant_availability_refresh, which also
+invalidates cached GraphQL responses with the variants). Rows are not
+kept up to date while the setting is off, and changes to channel, warehouse
+or shipping zone assignments are not tracked; rebuild with
+`check_variant_availability --fix` after enabling it or making them. The same
+command measures how far stored rows have drifted from the live computation.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from contextvars import ContextVar
+from functools import partial
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from ..channel.models import Channel
+from ..product.models import ProductVariant
+from ..shipping.models import ShippingZone
+from .models import Reservation, Stock, VariantChannelAvailability
+
+if TYPE_CHECKING:
+    from ..checkout.models import CheckoutLine
+
+REFRESH_BATCH_SIZE = 1000
+
+# (database alias, refresh stored rows) -> variant IDs waiting for the commit
+_pending_variant_ids: ContextVar[dict[tuple[str, bool], set[int]] | None] = ContextVar(
+    "variant_availability_pending_ids", default=None
+)
+
+
+class AvailabilityDrift(NamedTuple):
+    variant_id: int
+    channel_id: int
+    country_code: str
+    stored_quantity: int | None
+    live_quantity: int | None
+
+
+def get_zone_warehouses() -> dict[tuple[int, str], frozenset[UUID]]:
+    """Return the warehouses shipping to each (channel, country).
+
+    Mirrors StockQuerySet.for_channel_and_country with a country given: the
+    warehouse must be in the channel and in one of its shipping zones that
+    covers the country.
+    """
+    ShippingZoneChannel = Channel.shipping_zones.through
+    WarehouseShippingZone = ShippingZone.warehouses.through
+    WarehouseChannel = Channel.warehouses.through
+
+    channel_warehouses: dict[int, set[UUID]] = defaultdict(set)
+    for channel_id, warehouse_id in WarehouseChannel.objects.values_list(
+        "channel_id", "warehouse_id"
+    ):
+        channel_warehouses[channel_id].add(warehouse_id)
+    zone_warehouses: dict[int, set[UUID]] = defaultdict(set)
+    for zone_id, warehouse_id in WarehouseShippingZone.objects.values_list(
+        "shippingzone_id", "warehouse_id"
+    ):
+        zone_warehouses[zone_id].add(warehouse_id)
+    zone_countries = {
+        zone.pk: [country.code for country in zone.countries]
+        for zone in ShippingZone.objects.only("countries")
+    }
+
+    warehouses: dict[tuple[int, str], set[UUID]] = defaultdict(set)
+    for channel_id, zone_id in ShippingZoneChannel.objects.values_list(
+        "channel_id", "shippingzone_id"
+    ):
+        zone_channel_warehouses = (
+            zone_warehouses[zone_id] & channel_warehouses[channel_id]
+        )
+        if not zone_channel_warehouses:
+            continue
+        for country_code in zone_countries.get(zone_id, []):
+            warehouses[channel_id, country_code] |= zone_channel_warehouses
+    return {key: frozenset(ids) for key, ids in warehouses.items()}
+
+
+def refresh_variant_availability(
+    variant_ids: Iterable[int],
+    zone_warehouses: dict[tuple[int, str], frozenset[UUID]] | None = None,
+) -> None:
+    """Recompute the stored availability of the given variants.
+
+    A row exists for every (channel, country) where the variant has a stock
+    in one of the warehouses; rows of zones it no longer has stock in are
+    removed.
+    """
+    variant_ids = sorted(set(variant_ids))
+    if not variant_ids:
+        return
+    if zone_warehouses is None:
+        zone_warehouses = get_zone_warehouses()
+
+    for start in range(0, len(variant_ids), REFRESH_BATCH_SIZE):
+        _refresh_batch(variant_ids[start : start + REFRESH_BATCH_SIZE], zone_warehouses)
+
+
+def _refresh_batch(
+    variant_ids: list[int],
+    zone_warehouses: dict[tuple[int, str], frozenset[UUID]],
+) -> None:
+    stock_quantities: dict[int, dict[UUID, int]] = defaultdict(dict)
+    for variant_id, warehouse_id, quantity in (
+        Stock.objects.filter(product_variant_id__in=variant_ids)
+        .annotate_available_quantity()
+        .values_list("product_variant_id", "warehouse_id", "available_quantity")
+    ):
+        stock_quantities[variant_id][warehouse_id] = quantity
+
+    rows = []
+    for variant_id, quantities in stock_quantities.items():
+        stock_warehouses = quantities.keys()
+        for (channel_id, country_code), warehouse_ids in zone_warehouses.items():
+            if warehouse_ids.isdisjoint(stock_warehouses):
+                continue
+            rows.append(
+                VariantChannelAvailability(
+                    product_variant_id=variant_id,
+                    channel_id=channel_id,
+                    country_code=country_code,
+                    warehouse_ids=sorted(warehouse_ids),
+                    quantity=sum(
+                        quantities[warehouse_id]
+                        for warehouse_id in warehouse_ids & stock_warehouses
+                    ),
+                )
+            )
+
+    with transaction.atomic():
+        existing = VariantChannelAvailability.objects.filter(
+            product_variant_id__in=variant_ids
+        )
+        kept = {(r.product_variant_id, r.channel_id, r.country_code) for r in rows}
+        stale_ids = [
+            pk
+            for pk, *key in existing.values_list(
+                "pk", "product_variant_id", "channel_id", "country_code"
+            )
+            if tuple(key) not in kept
+        ]
+        if stale_ids:
+            VariantChannelAvailability.objects.filter(pk__in=stale_ids).delete()
+        VariantChannelAvailability.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["product_variant", "channel", "country_code"],
+            update_fields=["warehouse_ids", "quantity", "updated_at"],
+        )
+
+
+def _flush_pending_refresh(using: str) -> None:
+    from ..graphql.response_cache import invalidate_variant_responses
+    from .tasks import refresh_variant_availability_task
+
+    pending = _pending_variant_ids.get()
+    if not pending:
+        return
+    stored_ids = pending.pop((using, True), set())
+    variant_ids = stored_ids | pending.pop((using, False), set())
+    if stored_ids:
+        refresh_variant_availability_task.delay(sorted(stored_ids))
+    if variant_ids:
+        invalidate_variant_responses(variant_ids, using=using)
+
+
+def schedule_variant_availability_refresh(
+    variant_ids: Iterable[int], using: str = DEFAULT_DB_ALIAS, *, stored: bool = True
+) -> None:
+    """Refresh the availability of variants once the transaction commits.
+
+    Cached GraphQL responses with the variants are invalidated. With
+    VARIANT_AVAILABILITY_STORE_ENABLED set, their stored rows are refreshed too,
+    in a Celery task; variants scheduled within one transaction are sent in a
+    single task. Reservation writes pass stored=False, as the rows do not
+    include reservations. Outside a transaction this happens immediately.
+    """
+    refresh_stored = stored and settings.VARIANT_AVAILABILITY_STORE_ENABLED
+    if not refresh_stored and not settings.GRAPHQL_RESPONSE_CACHE_ENABLED:
+        return
+    variant_ids = set(variant_ids)
+    if not variant_ids:
+        return
+    pending = _pending_variant_ids.get()
+    if pending is None:
+        pending = {}
+        _pending_variant_ids.set(pending)
+    pending.setdefault((using, refresh_stored), set()).update(variant_ids)
+    # Every call registers its own flush, so variants stay scheduled when a
+    # savepoint holding an earlier flush rolls back; the first flush to run
+    # handles them all and the rest find nothing pending. Variants left over
+    # from a rolled back transaction are refreshed with the next one.
+    transaction.on_commit(partial(_flush_pending_refresh, using), using=using)
+
+
+def schedule_product_availability_refresh(
+    product_ids: Iterable[int], using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """Schedule a refresh of every variant of the given products."""
+    schedule_variant_availability_refresh(
+        ProductVariant.objects.using(using)
+        .filter(product_id__in=product_ids)
+        .values_list("pk", flat=True),
+        using=using,
+    )
+
+
+def get_stored_available_quantities(
+    variant_ids: Iterable[int],
+    country_code: str,
+    channel_slug: str,
+    checkout_lines: list["CheckoutLine"] | None = None,
+    check_reservations: bool = False,
+    database_connection_name: str = settings.DATABASE_CONNECTION_DEFAULT_NAME,
+) -> dict[int, int]:
+    """Return the stored available quantity of variants that have a row.
+
+    Variants without a row are left out; they have no stock in the zone, or
+    have not been refreshed yet, and callers fall back to the live path.
+    """
+    rows = list(
+        VariantChannelAvailability.objects.using(database_connection_name)
+        .filter(
+            product_variant_id__in=variant_ids,
+            channel__slug=channel_slug,
+            country_code=country_code,
+        )
+        .values_list("product_variant_id", "warehouse_ids", "quantity")
+    )
+    if not rows:
+        return {}
+
+    reserved: dict[int, int] = defaultdict(int)
+    if check_reservations:
+        reserved.update(
+            Reservation.objects.using(database_connection_name)
+            .filter(
+                stock__product_variant_id__in=[row[0] for row in rows],
+                stock__warehouse_id__in={pk for row in rows for pk in row[1]},
+            )
+            .not_expired()
+            .exclude_checkout_lines(checkout_lines)
+            .values("stock__product_variant_id")
+            .annotate(total=Coalesce(Sum("quantity_reserved"), 0))
+            .values_list("stock__product_variant_id", "total")
+        )
+    return {
+        variant_id: max(quantity - reserved[variant_id], 0)
+        for variant_id, _, quantity in rows
+    }
+
+
+def find_availability_drift(variant_ids: Iterable[int]) -> list[AvailabilityDrift]:
+    """Compare stored rows of the variants with the live computation.
+
+    The live side uses StockQuerySet.for_channel_and_country, the query the
+    availability checks run, so a shipping setup that the store models
+    differently shows up as drift too.
+    """
+    variant_ids = list(variant_ids)
+    stored = {
+        (variant_id, channel_id, country_code): quantity
+        for variant_id, channel_id, country_code, quantity in (
+            VariantChannelAvailability.objects.filter(
+                product_variant_id__in=variant_ids
+            ).values_list(
+                "product_variant_id", "channel_id", "country_code", "quantity"
+            )
+        )
+    }
+
+    live: dict[tuple[int, int, str], int] = defaultdict(int)
+    channel_slugs = dict(Channel.objects.values_list("pk", "slug"))
+    for channel_id, country_code in get_zone_warehouses():
+        stocks = (
+            Stock.objects.for_channel_and_country(
+                channel_slugs[channel_id], country_code
+            )
+            .filter(product_variant_id__in=variant_ids)
+            .annotate_available_quantity()
+            .values_list("product_variant_id", "available_quantity")
+        )
+        for variant_id, quantity in stocks:
+            live[variant_id, channel_id, country_code] += quantity
+
+    return [
+        AvailabilityDrift(*key, stored.get(key), live.get(key))
+        for key in sorted(stored.keys() | live.keys())
+        if stored.get(key) != live.get(key)
+    ]
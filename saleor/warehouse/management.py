@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Any, NamedTuple, cast
 from uuid import UUID
 
 from django.db import transaction
-from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
 from django.db.models.expressions import Exists, OuterRef
 from django.db.models.functions import Coalesce
 
@@ -25,6 +25,7 @@ from ..order.fetch import OrderLineInfo
 from ..order.models import OrderLine
 from ..plugins.manager import PluginsManager
 from ..product.models import ProductVariant, ProductVariantChannelListing
+from .availability_store import schedule_variant_availability_refresh
 from .lock_objects import (
     allocation_with_stock_qs_select_for_update,
     stock_qs_select_for_update,
@@ -40,6 +41,7 @@ from .models import (
     Stock,
     Warehouse,
 )
+from .reconciliation import mark_stocks_for_reconciliation
 
 if TYPE_CHECKING:
     from ..channel.models import Channel
@@ -54,6 +56,11 @@ class StockData(NamedTuple):
 
 def delete_stocks(stock_pks_to_delete: list[int]):
     with transaction.atomic():
+        schedule_variant_availability_refresh(
+            Stock.objects.filter(id__in=stock_pks_to_delete).values_list(
+                "product_variant_id", flat=True
+            )
+        )
         return Stock.objects.filter(
             id__in=Stock.objects.order_by("pk")
             .select_for_update(of=["self"])
@@ -70,6 +77,9 @@ def stock_bulk_update(stocks: list[Stock], fields_to_update: list[str]):
             .values_list("id", flat=True)
         )
         Stock.objects.bulk_update(stocks, fields_to_update)
+        schedule_variant_availability_refresh(
+            stock.product_variant_id for stock in stocks
+        )
 
 
 def delete_allocations(allocation_pks_to_delete: list[int]):
@@ -88,6 +98,12 @@ def delete_allocations(allocation_pks_to_delete: list[int]):
             if allocation.stock.warehouse.is_owned:
                 deallocate_sources(allocation, allocation.quantity_allocated)
 
+        schedule_variant_availability_refresh(
+            allocation.stock.product_variant_id for allocation in allocations
+        )
+        mark_stocks_for_reconciliation(
+            allocation.stock_id for allocation in allocations
+        )
         # Delete allocations
         return Allocation.objects.filter(id__in=[a.id for a in allocations]).delete()
 
@@ -142,103 +158,172 @@ def _allocate_sources_incremental(
     Raises:
         InsufficientStock: If there are not enough POI batches.
 
+    """
+    allocate_sources_in_bulk([(allocation, quantity)], poi=poi)
+
+
+def _lock_fifo_purchase_order_items(
+    allocations: Iterable[Allocation],
+) -> dict[tuple[int, int], list["PurchaseOrderItem"]]:
+    """Lock available POIs of the allocations' stocks, by (warehouse, variant).
+
+    Every list is in FIFO order: RECEIVED before CONFIRMED, then oldest first.
+    All rows are locked by one query in that order with pk as the tie-breaker,
+    so concurrent batches lock shared rows in the same order.
     """
     from ..inventory import PurchaseOrderItemStatus
     from ..inventory.models import PurchaseOrderItem
 
-    if poi is not None:
-        pois = PurchaseOrderItem.objects.select_for_update().filter(pk=poi.pk)
-    else:
-        # Floor stock path: FIFO across available POIs, RECEIVED before CONFIRMED.
-        # NOTE: Cannot use annotate_available_quantity() with select_for_update()
-        # because PostgreSQL doesn't allow FOR UPDATE with GROUP BY clause.
-        pois = (
-            PurchaseOrderItem.objects.filter(
-                order__destination_warehouse=allocation.stock.warehouse,
-                product_variant=allocation.stock.product_variant,
-                status__in=PurchaseOrderItemStatus.ACTIVE_STATUSES,
-                quantity_ordered__gt=F("quantity_allocated"),
-            )
-            .select_for_update()
-            .annotate(
-                status_priority=Case(
-                    When(
-                        status=PurchaseOrderItemStatus.RECEIVED,
-                        then=Value(0),
-                    ),
-                    default=Value(1),
-                    output_field=IntegerField(),
-                )
-            )
-            .order_by("status_priority", "confirmed_at", "created_at")
+    stock_keys = {
+        (allocation.stock.warehouse_id, allocation.stock.product_variant_id)
+        for allocation in allocations
+    }
+    lookup = Q()
+    for warehouse_id, variant_id in stock_keys:
+        lookup |= Q(
+            order__destination_warehouse_id=warehouse_id,
+            product_variant_id=variant_id,
+        )
+    # The stored quantity_available is locked along with the row, so it is
+    # exact for as long as the transaction holds the lock
+    pois = (
+        PurchaseOrderItem.objects.filter(
+            lookup,
+            status__in=PurchaseOrderItemStatus.ACTIVE_STATUSES,
+            quantity_available__gt=0,
+        )
+        .select_for_update()
+        .annotate(
+            destination_warehouse_id=F("order__destination_warehouse_id"),
+            status_priority=Case(
+                When(
+                    status=PurchaseOrderItemStatus.RECEIVED,
+                    then=Value(0),
+                ),
+                default=Value(1),
+                output_field=IntegerField(),
+            ),
         )
+        .order_by("status_priority", "confirmed_at", "created_at", "pk")
+    )
+    pois_by_stock_key: dict[tuple[int, int], list[PurchaseOrderItem]] = defaultdict(
+        list
+    )
+    for poi in pois:
+        pois_by_stock_key[poi.destination_warehouse_id, poi.product_variant_id].append(
+            poi
+        )
+    return pois_by_stock_key
 
-    remaining = quantity
-    sources_to_update = {}  # POI ID -> AllocationSource
-    pois_to_update = []
 
-    # Get existing sources for this allocation to update them instead of creating duplicates
-    existing_sources = {
-        source.purchase_order_item_id: source
-        for source in allocation.allocation_sources.select_for_update()
-    }
+def allocate_sources_in_bulk(
+    allocation_quantities: Iterable[tuple[Allocation, int]],
+    poi: "PurchaseOrderItem | None" = None,
+):
+    """Allocate sources for incremental quantities of many allocations at once.
 
-    for poi in pois:
-        available = poi.available_quantity
-        assert available > 0, (
-            "Despite checking available quantity > 0 in query poi has <0 available quantity"
-        )
+    Assigns sources as calling _allocate_sources_incremental for every
+    (allocation, quantity) pair in turn would, but the POIs of each
+    (warehouse, variant) are locked and read once, and sources and POI
+    quantities are written with one bulk statement per model.
 
-        consume = min(remaining, available)
+    Args:
+        allocation_quantities: Allocations paired with the quantity to allocate.
+        poi: If provided, pin all sources to this POI rather than using FIFO.
 
-        # Check if we already have a source for this POI - update it instead of creating new
-        if poi.id in existing_sources:
-            source = existing_sources[poi.id]
-            source.quantity = F("quantity") + consume
-            sources_to_update[poi.id] = source
-        else:
-            # Create new source
-            source = AllocationSource(
-                allocation=allocation,
-                purchase_order_item=poi,
-                quantity=consume,
-            )
-            sources_to_update[poi.id] = source
+    Raises:
+        InsufficientStock: If there are not enough POI batches for any of the
+            allocations. Nothing is written in that case.
 
-        # Update POI quantity_allocated
-        poi.quantity_allocated = F("quantity_allocated") + consume
-        pois_to_update.append(poi)
-        remaining -= consume
+    """
+    from ..inventory.models import PurchaseOrderItem
 
-        if remaining == 0:
-            break
+    allocation_quantities = [
+        (allocation, quantity)
+        for allocation, quantity in allocation_quantities
+        if quantity > 0
+    ]
+    if not allocation_quantities:
+        return
+
+    allocations = [allocation for allocation, _ in allocation_quantities]
+    if poi is not None:
+        pinned = list(PurchaseOrderItem.objects.select_for_update().filter(pk=poi.pk))
+        pois_by_stock_key: dict[tuple[int, int], list[PurchaseOrderItem]] = defaultdict(
+            lambda: pinned
+        )
+        locked_pois = pinned
+    else:
+        pois_by_stock_key = _lock_fifo_purchase_order_items(allocations)
+        locked_pois = [p for pois in pois_by_stock_key.values() for p in pois]
+
+    # Read with the lock, so it reflects every committed allocation
+    available = {p.pk: p.quantity_available for p in locked_pois}
+
+    # Existing sources are updated instead of creating duplicates
+    sources = {
+        (source.allocation_id, source.purchase_order_item_id): source
+        for source in AllocationSource.objects.select_for_update().filter(
+            allocation_id__in=[allocation.pk for allocation in allocations]
+        )
+    }
+    changed_sources: dict[tuple[int, int], AllocationSource] = {}
+    consumed: dict[int, int] = defaultdict(int)
+    insufficient_stock = []
+
+    for allocation, quantity in allocation_quantities:
+        stock = allocation.stock
+        remaining = quantity
+        for candidate in pois_by_stock_key[
+            stock.warehouse_id, stock.product_variant_id
+        ]:
+            free = available[candidate.pk] - consumed[candidate.pk]
+            if free <= 0:
+                continue
+            consume = min(remaining, free)
+
+            key = (allocation.pk, candidate.pk)
+            source = sources.get(key)
+            if source is None:
+                source = sources[key] = AllocationSource(
+                    allocation=allocation, purchase_order_item=candidate, quantity=0
+                )
+            source.quantity += consume
+            changed_sources[key] = source
+
+            consumed[candidate.pk] += consume
+            remaining -= consume
+            if remaining == 0:
+                break
 
-    if remaining > 0:
-        raise InsufficientStock(
-            [
+        if remaining > 0:
+            insufficient_stock.append(
                 InsufficientStockData(
-                    variant=allocation.stock.product_variant,
+                    variant=stock.product_variant,
                     order_line=allocation.order_line,
                     available_quantity=quantity - remaining,
                 )
-            ]
-        )
+            )
 
-    # Save all sources (both new and updated)
-    sources_to_create = []
-    sources_to_save = []
-    for _poi_id, source in sources_to_update.items():
-        if source.pk:  # Existing source - update
-            sources_to_save.append(source)
-        else:  # New source - create
-            sources_to_create.append(source)
+    if insufficient_stock:
+        raise InsufficientStock(insufficient_stock)
 
-    if sources_to_create:
-        AllocationSource.objects.bulk_create(sources_to_create)
-    if sources_to_save:
-        AllocationSource.objects.bulk_update(sources_to_save, ["quantity"])
-    if pois_to_update:
-        PurchaseOrderItem.objects.bulk_update(pois_to_update, ["quantity_allocated"])
+    AllocationSource.objects.bulk_create(
+        [source for source in changed_sources.values() if source.pk is None]
+    )
+    AllocationSource.objects.bulk_update(
+        [source for source in changed_sources.values() if source.pk is not None],
+        ["quantity"],
+    )
+    pois_to_update = []
+    for locked_poi in locked_pois:
+        if consumed[locked_poi.pk]:
+            locked_poi.quantity_allocated += consumed[locked_poi.pk]
+            locked_poi.quantity_available -= consumed[locked_poi.pk]
+            pois_to_update.append(locked_poi)
+    PurchaseOrderItem.objects.bulk_update(
+        pois_to_update, ["quantity_allocated", "quantity_available"]
+    )
 
 
 def allocate_sources(allocation: Allocation):
@@ -399,14 +484,21 @@ def allocate_stocks(
         # Track orders to check for auto-confirmation
         orders_to_check = set()
 
-        for allocation in allocations:
-            if allocation.stock_id in owned_stock_ids:
-                allocate_sources(allocation)
-                # Check if order can be auto-confirmed after adding sources
-                from ..order import OrderStatus
+        owned_allocations = [
+            allocation
+            for allocation in allocations
+            if allocation.stock_id in owned_stock_ids
+        ]
+        allocate_sources_in_bulk(
+            (allocation, allocation.quantity_allocated)
+            for allocation in owned_allocations
+        )
+        for allocation in owned_allocations:
+            # Check if order can be auto-confirmed after adding sources
+            from ..order import OrderStatus
 
-                if allocation.order_line.order.status == OrderStatus.UNCONFIRMED:
-                    orders_to_check.add(allocation.order_line.order)
+            if allocation.order_line.order.status == OrderStatus.UNCONFIRMED:
+                orders_to_check.add(allocation.order_line.order)
 
         # Auto-confirm orders that now have all allocations with sources
         # Only auto-confirm if channel setting allows it
@@ -443,6 +535,10 @@ def allocate_stocks(
             stock.quantity_allocated = F("quantity_allocated") + quantity
 
         Stock.objects.bulk_update(stocks_to_update_map.values(), ["quantity_allocated"])
+        schedule_variant_availability_refresh(
+            stock.product_variant_id for stock in stocks_to_update_map.values()
+        )
+        mark_stocks_for_reconciliation(stocks_to_update_map)
 
         for allocation in allocations:
             allocated_stock = (
@@ -715,6 +811,9 @@ def deallocate_sources(allocation, quantity_to_deallocate, fulfillment_line=None
         PurchaseOrderItem.objects.bulk_update(
             pois_to_update_map.values(), update_fields
         )
+        PurchaseOrderItem.objects.filter(
+            pk__in=pois_to_update_map
+        ).refresh_available_quantity()
 
 
 def deallocate_stock(
@@ -810,6 +909,10 @@ def deallocate_stock(
             )
 
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    schedule_variant_availability_refresh(
+        stock.product_variant_id for stock in stocks_to_update
+    )
+    mark_stocks_for_reconciliation(stock.pk for stock in stocks_to_update)
 
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
@@ -920,6 +1023,10 @@ def increase_allocations(
 
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    schedule_variant_availability_refresh(
+        stock.product_variant_id for stock in stocks_to_update
+    )
+    mark_stocks_for_reconciliation(stock.pk for stock in stocks_to_update)
 
     order = lines_info[0].line.order
     country_code = get_active_country(
@@ -969,6 +1076,12 @@ def decrease_allocations(
         Allocation.objects.filter(id__in=[a.id for a in allocations]).update(
             quantity_allocated=0
         )
+        schedule_variant_availability_refresh(
+            allocation.stock.product_variant_id for allocation in allocations
+        )
+        mark_stocks_for_reconciliation(
+            allocation.stock_id for allocation in allocations
+        )
 
 
 @traced_atomic_transaction()
@@ -1096,6 +1209,9 @@ def _decrease_stocks_quantity(
         raise InsufficientStock(insufficient_stocks)
 
     Stock.objects.bulk_update(stocks_to_update, ["quantity"])
+    schedule_variant_availability_refresh(
+        stock.product_variant_id for stock in stocks_to_update
+    )
 
 
 def _get_variant_for_order_line_info(
@@ -1184,6 +1300,10 @@ def deallocate_stock_for_orders(orders_ids: list[UUID], manager: PluginsManager)
 
     Allocation.objects.filter(id__in=[a.id for a in allocations]).delete()
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    schedule_variant_availability_refresh(
+        stock.product_variant_id for stock in stocks_to_update
+    )
+    mark_stocks_for_reconciliation(stock.pk for stock in stocks_to_update)
 
 
 @traced_atomic_transaction()
@@ -1395,15 +1515,22 @@ def deactivate_preorder_for_variant(product_variant: ProductVariant):
 
     if allocations_to_create:
         Allocation.objects.bulk_create(allocations_to_create)
+        mark_stocks_for_reconciliation(
+            allocation.stock.pk for allocation in allocations_to_create
+        )
 
         # Create AllocationSources for owned warehouses
-        for allocation in allocations_to_create:
-            if allocation.stock.warehouse.is_owned:
-                allocate_sources(allocation)
+        allocate_sources_in_bulk(
+            (allocation, allocation.quantity_allocated)
+            for allocation in allocations_to_create
+            if allocation.stock.warehouse.is_owned
+        )
 
     if preorder_allocations:
         preorder_allocations.delete()
 
+    schedule_variant_availability_refresh([product_variant.pk])
+
     product_variant.preorder_global_threshold = None
     product_variant.preorder_end_date = None
     product_variant.is_preorder = False
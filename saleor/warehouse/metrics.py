@@ -0,0 +1,84 @@
+from contextlib import AbstractContextManager
+
+from opentelemetry.util.types import AttributeValue
+
+from ..core.telemetry import (
+    DEFAULT_DURATION_BUCKETS,
+    MetricType,
+    Scope,
+    Unit,
+    meter,
+    saleor_attributes,
+)
+
+# Initialize metrics
+METRIC_SWEEP_DURATION = meter.create_metric(
+    "saleor.warehouse.sweep.duration",
+    scope=Scope.CORE,
+    type=MetricType.HISTOGRAM,
+    unit=Unit.SECOND,
+    description="Duration of sweeping a table of expired rows.",
+    bucket_boundaries=DEFAULT_DURATION_BUCKETS,
+)
+
+METRIC_SWEEP_DELETED_COUNT = meter.create_metric(
+    "saleor.warehouse.sweep.deleted",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.ROW,
+    description="Number of expired rows deleted by the sweeper.",
+)
+
+BACKLOG_BUCKETS = [0, 100, 1000, 2000, 5000, 10000, 25000, 50000, 100000]
+METRIC_SWEEP_BACKLOG = meter.create_metric(
+    "saleor.warehouse.sweep.backlog",
+    scope=Scope.CORE,
+    type=MetricType.HISTOGRAM,
+    unit=Unit.ROW,
+    description="Number of expired rows left after a sweep.",
+    bucket_boundaries=BACKLOG_BUCKETS,
+)
+
+
+def record_sweep_duration(
+    table: str,
+) -> AbstractContextManager[dict[str, AttributeValue]]:
+    attributes: dict[str, AttributeValue] = {
+        saleor_attributes.SALEOR_SWEEPER_TABLE: table
+    }
+    return meter.record_duration(METRIC_SWEEP_DURATION, attributes=attributes)
+
+
+def record_sweep_deleted_count(table: str, amount: int) -> None:
+    attributes = {saleor_attributes.SALEOR_SWEEPER_TABLE: table}
+    meter.record(METRIC_SWEEP_DELETED_COUNT, amount, Unit.ROW, attributes=attributes)
+
+
+def record_sweep_backlog(table: str, amount: int) -> None:
+    attributes = {saleor_attributes.SALEOR_SWEEPER_TABLE: table}
+    meter.record(METRIC_SWEEP_BACKLOG, amount, Unit.ROW, attributes=attributes)
+
+
+METRIC_RECONCILED_STOCKS = meter.create_metric(
+    "saleor.warehouse.reconciliation.stocks",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.ROW,
+    description="Number of stocks whose quantity allocated was re-aggregated.",
+)
+
+METRIC_CORRECTED_STOCKS = meter.create_metric(
+    "saleor.warehouse.reconciliation.corrected",
+    scope=Scope.CORE,
+    type=MetricType.COUNTER,
+    unit=Unit.ROW,
+    description="Number of stocks whose quantity allocated had drifted and was corrected.",
+)
+
+
+def record_reconciled_stocks(amount: int) -> None:
+    meter.record(METRIC_RECONCILED_STOCKS, amount, Unit.ROW)
+
+
+def record_corrected_stocks(amount: int) -> None:
+    meter.record(METRIC_CORRECTED_STOCKS, amount, Unit.ROW)
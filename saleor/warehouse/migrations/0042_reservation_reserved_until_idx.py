@@ -0,0 +1,35 @@
+from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+from django.db.models import Q
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("warehouse", "0041_variantchannelavailability"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=BTreeIndex(
+                fields=["reserved_until"], name="reservation_reserved_until_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="preorderreservation",
+            index=BTreeIndex(
+                fields=["reserved_until"], name="preorder_reserved_until_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="allocation",
+            index=BTreeIndex(
+                condition=Q(quantity_allocated=0),
+                fields=["id"],
+                name="allocation_empty_idx",
+            ),
+        ),
+    ]
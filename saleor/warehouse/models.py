@@ -4,6 +4,7 @@ from collections import defaultdict
 from collections.abc import Iterable
 from typing import TYPE_CHECKING, TypedDict, TypeVar, cast
 
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import BTreeIndex
 from django.db import models
 from django.db.models import Exists, F, OuterRef, Prefetch, Q, Sum
@@ -563,6 +564,13 @@ class Allocation(models.Model):
     class Meta:
         unique_together = [["order_line", "stock"]]
         ordering = ("pk",)
+        indexes = [
+            BTreeIndex(
+                fields=["id"],
+                name="allocation_empty_idx",
+                condition=Q(quantity_allocated=0),
+            ),
+        ]
 
 
 class AllocationSource(models.Model):
@@ -691,6 +699,7 @@ class PreorderReservation(models.Model):
         unique_together = [["checkout_line", "product_variant_channel_listing"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            BTreeIndex(fields=["reserved_until"], name="preorder_reserved_until_idx"),
         ]
         ordering = ("pk",)
 
@@ -725,5 +734,53 @@ class Reservation(models.Model):
         unique_together = [["checkout_line", "stock"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            BTreeIndex(
+                fields=["reserved_until"], name="reservation_reserved_until_idx"
+            ),
         ]
         ordering = ("pk",)
+
+
+class VariantChannelAvailability(models.Model):
+    """Stock of a variant available to a channel in a country.
+
+    A denormalized copy of the stock quantity minus allocations in warehouses
+    that ship to the country in the channel, kept up to date by the
+    availability_store module. Reservations expire on their own, so they are
+    not stored but subtracted when the quantity is read.
+    """
+
+    product_variant = models.ForeignKey(
+        ProductVariant,
+        on_delete=models.CASCADE,
+        related_name="channel_availabilities",
+    )
+    channel = models.ForeignKey(
+        Channel,
+        on_delete=models.CASCADE,
+        related_name="variant_availabilities",
+    )
+    country_code = models.CharField(max_length=2)
+    # All warehouses shipping to the country in the channel
+    warehouse_ids = ArrayField(models.UUIDField())
+    quantity = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["product_variant", "channel", "country_code"]]
+        ordering = ("pk",)
+
+
+class StockAllocationChange(models.Model):
+    """A stock whose allocations changed since it was last reconciled.
+
+    Appended by the write paths changing allocations (see the reconciliation
+    module) and consumed by the reconciler, which re-aggregates
+    quantity_allocated only for the stocks listed here.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        ordering = ("pk",)
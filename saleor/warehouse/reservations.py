@@ -11,6 +11,7 @@ from django.utils import timezone
 from ..core.exceptions import InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
 from ..product.models import ProductVariant, ProductVariantChannelListing
+from .availability_store import schedule_variant_availability_refresh
 from .lock_objects import stock_qs_select_for_update
 from .management import sort_stocks
 from .models import Allocation, PreorderReservation, Reservation
@@ -185,6 +186,9 @@ def reserve_stocks(
         if replace:
             Reservation.objects.filter(checkout_line__in=checkout_lines).delete()
         Reservation.objects.bulk_create(reservations)
+        schedule_variant_availability_refresh(
+            {line.variant_id for line in checkout_lines}, stored=False
+        )
 
 
 def _create_stock_reservations(
@@ -325,6 +329,9 @@ def reserve_preorders(
                 checkout_line__in=checkout_lines_to_reserve
             ).delete()
         PreorderReservation.objects.bulk_create(reservations)
+        schedule_variant_availability_refresh(
+            {line.variant_id for line in checkout_lines_to_reserve}, stored=False
+        )
 
 
 def _create_preorder_reservation(
@@ -0,0 +1,28 @@
+from .availability_store import schedule_variant_availability_refresh
+from .models import Allocation, Stock
+from .reconciliation import mark_stocks_for_reconciliation
+
+
+def refresh_stock_availability(sender, instance, **kwargs):
+    schedule_variant_availability_refresh([instance.product_variant_id])
+
+
+def refresh_allocation_availability(sender, instance, **kwargs):
+    if Allocation.stock.is_cached(instance):
+        variant_ids = [instance.stock.product_variant_id]
+    else:
+        variant_ids = Stock.objects.filter(pk=instance.stock_id).values_list(
+            "product_variant_id", flat=True
+        )
+    schedule_variant_availability_refresh(variant_ids)
+
+
+def mark_stock_for_reconciliation(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return
+    if update_fields is None or "quantity_allocated" in update_fields:
+        mark_stocks_for_reconciliation([instance.pk])
+
+
+def mark_allocation_stock_for_reconciliation(sender, instance, **kwargs):
+    mark_stocks_for_reconciliation([instance.stock_id])
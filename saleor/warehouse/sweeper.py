@@ -0,0 +1,97 @@
+"""Continuous cleanup of expired reservations and empty allocations.
+
+Availability checks skip expired reservations and allocations of nothing, but
+while the rows exist every check scans past them. The sweeper deletes them in
+bounded batches, each in its own short transaction. A batch claims its rows
+with SELECT ... FOR UPDATE SKIP LOCKED, so workers sweeping at the same time
+delete disjoint rows instead of waiting on each other.
+"""
+
+from typing import NamedTuple
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .management import delete_allocations
+from .metrics import (
+    record_sweep_backlog,
+    record_sweep_deleted_count,
+    record_sweep_duration,
+)
+from .models import Allocation, PreorderReservation, Reservation
+
+# Backlogs are counted up to this many rows, to keep counting cheap when
+# the sweeper falls far behind
+BACKLOG_COUNT_LIMIT = 100_000
+
+
+class SweepResult(NamedTuple):
+    deleted: int
+    has_more: bool
+
+
+def _expired_reservations(model: type[models.Model], now) -> models.QuerySet:
+    return model.objects.filter(reserved_until__lt=now).order_by("reserved_until")
+
+
+def _empty_allocations() -> models.QuerySet:
+    return Allocation.objects.filter(quantity_allocated=0).order_by("pk")
+
+
+def _sweep(
+    table: str,
+    queryset: models.QuerySet,
+    delete_batch,
+    batch_size: int,
+    batch_count: int,
+) -> SweepResult:
+    deleted = 0
+    has_more = True
+    with record_sweep_duration(table):
+        for _batch_number in range(batch_count):
+            with transaction.atomic():
+                ids = list(
+                    queryset.select_for_update(skip_locked=True).values_list(
+                        "pk", flat=True
+                    )[:batch_size]
+                )
+                if ids:
+                    delete_batch(ids)
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                has_more = False
+                break
+
+    record_sweep_deleted_count(table, deleted)
+    record_sweep_backlog(table, queryset[:BACKLOG_COUNT_LIMIT].count())
+    return SweepResult(deleted, has_more)
+
+
+def sweep_expired_reservations(batch_size: int, batch_count: int) -> SweepResult:
+    """Delete expired stock and preorder reservations, batch_size at a time."""
+    now = timezone.now()
+    results = [
+        _sweep(
+            model._meta.db_table,
+            _expired_reservations(model, now),
+            lambda ids, model=model: model.objects.filter(pk__in=ids).delete(),
+            batch_size,
+            batch_count,
+        )
+        for model in (Reservation, PreorderReservation)
+    ]
+    return SweepResult(
+        sum(result.deleted for result in results),
+        any(result.has_more for result in results),
+    )
+
+
+def sweep_empty_allocations(batch_size: int, batch_count: int) -> SweepResult:
+    """Delete allocations with nothing allocated, batch_size at a time."""
+    return _sweep(
+        Allocation._meta.db_table,
+        _empty_allocations(),
+        delete_allocations,
+        batch_size,
+        batch_count,
+    )
@@ -5,8 +5,11 @@ from django.utils import timezone
 
 from ..celeryconf import app
 from ..core.db.connection import allow_writer
+from .availability_store import refresh_variant_availability
 from .management import delete_allocations, stock_bulk_update
 from .models import Allocation, PreorderReservation, Reservation, Stock
+from .reconciliation import reconcile_stock_quantity_allocated
+from .sweeper import sweep_empty_allocations, sweep_expired_reservations
 
 task_logger = get_task_logger(__name__)
 
@@ -40,6 +43,53 @@ def delete_expired_reservations_task():
         )
 
 
+@app.task
+@allow_writer()
+def sweep_reservations_and_allocations_task(
+    batch_size: int = 2000,
+    batch_count: int = 10,
+    invocation_count: int = 1,
+    invocation_limit: int = 100,
+) -> tuple[int, bool]:
+    """Delete expired reservations and empty allocations in bounded batches.
+
+    Scheduled every BEAT_SWEEP_RESERVATIONS_SEC; safe to run on several workers
+    at once, see saleor.warehouse.sweeper.
+
+    :param batch_size: The maximum row count deleted per transaction.
+    :param batch_count: How many batches of each table a single task deletes.
+    :param invocation_count: How many times the task re-triggered itself up.
+    :param invocation_limit: The maximum times the task can re-trigger itself up
+        in order to limit how long it may run.
+
+    :return: A tuple containing row count deleted (int)
+             and whether there is more to delete (bool).
+    """
+    reservations = sweep_expired_reservations(batch_size, batch_count)
+    allocations = sweep_empty_allocations(batch_size, batch_count)
+    total_deleted = reservations.deleted + allocations.deleted
+    has_more = reservations.has_more or allocations.has_more
+
+    if total_deleted:
+        task_logger.debug(
+            "Swept %d reservations and %d allocations.",
+            reservations.deleted,
+            allocations.deleted,
+        )
+
+    if has_more:
+        if invocation_count < invocation_limit:
+            sweep_reservations_and_allocations_task.delay(
+                batch_size=batch_size,
+                batch_count=batch_count,
+                invocation_count=invocation_count + 1,
+                invocation_limit=invocation_limit,
+            )
+        else:
+            task_logger.warning("Invocation limit reached, aborting task")
+    return total_deleted, has_more
+
+
 @app.task
 @allow_writer()
 def update_stocks_quantity_allocated_task():
@@ -66,3 +116,61 @@ def update_stocks_quantity_allocated_task():
         "Finished updating quantity_allocated on stocks, %d were corrected.",
         len(stocks_to_update),
     )
+
+
+@app.task
+@allow_writer()
+def reconcile_stocks_quantity_allocated_task(
+    batch_size: int = 1000,
+    batch_count: int = 10,
+    invocation_count: int = 1,
+    invocation_limit: int = 100,
+) -> tuple[int, bool]:
+    """Correct quantity_allocated of stocks whose allocations changed.
+
+    Only stocks recorded since the previous run are re-aggregated, see
+    saleor.warehouse.reconciliation.
+
+    :param batch_size: The maximum number of change records handled per transaction.
+    :param batch_count: How many batches a single task handles.
+    :param invocation_count: How many times the task re-triggered itself up.
+    :param invocation_limit: The maximum times the task can re-trigger itself up
+        in order to limit how long it may run.
+
+    :return: A tuple containing the number of corrected stocks (int)
+             and whether there are more changes to reconcile (bool).
+    """
+    corrected = 0
+    has_more = False
+    for _batch_number in range(batch_count):
+        result = reconcile_stock_quantity_allocated(batch_size)
+        for correction in result.corrections:
+            task_logger.info(
+                "Mismatch updating quantity_allocated: stock %d had "
+                "%d allocated, but should have %d.",
+                correction.stock_id,
+                correction.stored_quantity,
+                correction.allocated_quantity,
+            )
+        corrected += len(result.corrections)
+        has_more = result.has_more
+        if not has_more:
+            break
+
+    if has_more:
+        if invocation_count < invocation_limit:
+            reconcile_stocks_quantity_allocated_task.delay(
+                batch_size=batch_size,
+                batch_count=batch_count,
+                invocation_count=invocation_count + 1,
+                invocation_limit=invocation_limit,
+            )
+        else:
+            task_logger.warning("Invocation limit reached, aborting task")
+    return corrected, has_more
+
+
+@app.task
+@allow_writer()
+def refresh_variant_availability_task(variant_ids: list[int]):
+    refresh_variant_availability(variant_ids)
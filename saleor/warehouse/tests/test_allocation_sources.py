@@ -21,6 +21,7 @@ from ...order.fetch import OrderLineInfo
 from ...plugins.manager import get_plugins_manager
 from ...shipping import ShipmentType
 from ..management import (
+    allocate_sources_in_bulk,
     allocate_stocks,
     deallocate_stock,
     increase_stock,
@@ -626,3 +627,92 @@ def test_allocate_sources_prefers_received_poi_over_confirmed(
     # And received quantity must be > 0 so the line is not shown as 'Out of Stock'
     received_qty = get_received_quantity_for_order_line(order_line)
     assert received_qty > 0
+
+
+def _allocate_two_lines(order, order_line, owned_warehouse, quantities):
+    variant = order_line.variant
+    stock, _ = Stock.objects.get_or_create(
+        warehouse=owned_warehouse,
+        product_variant=variant,
+        defaults={"quantity": 0},
+    )
+    order_line_2 = order.lines.create(
+        product_name=order_line.product_name,
+        variant_name=order_line.variant_name,
+        product_sku=order_line.product_sku,
+        variant=variant,
+        quantity=quantities[1],
+        unit_price_gross_amount=10,
+        unit_price_net_amount=10,
+        total_price_gross_amount=10,
+        total_price_net_amount=10,
+        currency="USD",
+        is_shipping_required=False,
+        is_gift_card=False,
+    )
+    return [
+        Allocation.objects.create(
+            order_line=line, stock=stock, quantity_allocated=quantity
+        )
+        for line, quantity in zip([order_line, order_line_2], quantities, strict=True)
+    ]
+
+
+def test_allocate_sources_in_bulk_shares_fifo_pois_between_allocations(
+    order, order_line, owned_warehouse, multiple_purchase_order_items
+):
+    """Batched allocations consume POIs in FIFO order, one after another."""
+    # given
+    poi_oldest, poi_middle, poi_newest = multiple_purchase_order_items
+    first, second = _allocate_two_lines(order, order_line, owned_warehouse, [150, 100])
+
+    # when
+    allocate_sources_in_bulk([(first, 150), (second, 100)])
+
+    # then
+    assert dict(
+        first.allocation_sources.values_list("purchase_order_item_id", "quantity")
+    ) == {poi_oldest.pk: 100, poi_middle.pk: 50}
+    assert dict(
+        second.allocation_sources.values_list("purchase_order_item_id", "quantity")
+    ) == {poi_middle.pk: 50, poi_newest.pk: 50}
+    for poi, allocated in [(poi_oldest, 100), (poi_middle, 100), (poi_newest, 50)]:
+        poi.refresh_from_db()
+        assert poi.quantity_allocated == allocated
+
+
+def test_allocate_sources_in_bulk_updates_existing_sources(
+    order, order_line, owned_warehouse, multiple_purchase_order_items
+):
+    # given
+    poi_oldest = multiple_purchase_order_items[0]
+    first, second = _allocate_two_lines(order, order_line, owned_warehouse, [10, 5])
+    allocate_sources_in_bulk([(first, 10)])
+
+    # when
+    allocate_sources_in_bulk([(first, 20), (second, 5)])
+
+    # then
+    source = first.allocation_sources.get()
+    assert source.purchase_order_item == poi_oldest
+    assert source.quantity == 30
+    poi_oldest.refresh_from_db()
+    assert poi_oldest.quantity_allocated == 35
+
+
+def test_allocate_sources_in_bulk_insufficient_writes_nothing(
+    order, order_line, owned_warehouse, multiple_purchase_order_items
+):
+    # given - 300 units across the three POIs
+    first, second = _allocate_two_lines(order, order_line, owned_warehouse, [200, 101])
+
+    # when
+    with pytest.raises(InsufficientStock) as exc:
+        allocate_sources_in_bulk([(first, 200), (second, 101)])
+
+    # then
+    assert [data.available_quantity for data in exc.value.items] == [100]
+    assert not AllocationSource.objects.filter(allocation__in=[first, second]).exists()
+    for poi in multiple_purchase_order_items:
+        poi.refresh_from_db()
+        assert poi.quantity_allocated == 0
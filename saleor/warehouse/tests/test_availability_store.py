@@ -0,0 +1,274 @@
+import datetime
+from unittest.mock import patch
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ...graphql.response_cache import entity_tag, list_tag
+from ...product.models import Product, ProductVariant
+from ..availability import get_available_quantity
+from ..availability_store import (
+    find_availability_drift,
+    refresh_variant_availability,
+    schedule_variant_availability_refresh,
+)
+from ..models import Allocation, Stock, VariantChannelAvailability
+from ..reservations import reserve_stocks
+
+COUNTRY_CODE = "US"
+
+
+def test_refresh_variant_availability(variant_with_many_stocks, channel_USD):
+    # when
+    refresh_variant_availability([variant_with_many_stocks.pk])
+
+    # then
+    row = VariantChannelAvailability.objects.get(
+        product_variant=variant_with_many_stocks,
+        channel=channel_USD,
+        country_code=COUNTRY_CODE,
+    )
+    assert row.quantity == 7
+    assert set(row.warehouse_ids) >= set(
+        variant_with_many_stocks.stocks.values_list("warehouse_id", flat=True)
+    )
+
+
+def test_refresh_variant_availability_subtracts_allocations(
+    variant_with_many_stocks, order_line_with_allocation_in_many_stocks, channel_USD
+):
+    # when
+    refresh_variant_availability([variant_with_many_stocks.pk])
+
+    # then
+    row = VariantChannelAvailability.objects.get(
+        product_variant=variant_with_many_stocks,
+        channel=channel_USD,
+        country_code=COUNTRY_CODE,
+    )
+    assert row.quantity == get_available_quantity(
+        variant_with_many_stocks, COUNTRY_CODE, channel_USD.slug
+    )
+
+
+def test_refresh_variant_availability_removes_stale_rows(
+    variant_with_many_stocks, channel_USD
+):
+    # given
+    refresh_variant_availability([variant_with_many_stocks.pk])
+    Stock.objects.filter(product_variant=variant_with_many_stocks).delete()
+
+    # when
+    refresh_variant_availability([variant_with_many_stocks.pk])
+
+    # then
+    assert not VariantChannelAvailability.objects.filter(
+        product_variant=variant_with_many_stocks
+    ).exists()
+
+
+def test_get_available_quantity_uses_availability_store(
+    variant_with_many_stocks, channel_USD
+):
+    # given
+    refresh_variant_availability([variant_with_many_stocks.pk])
+    VariantChannelAvailability.objects.filter(
+        product_variant=variant_with_many_stocks
+    ).update(quantity=2)
+
+    # when
+    available = get_available_quantity(
+        variant_with_many_stocks,
+        COUNTRY_CODE,
+        channel_USD.slug,
+        use_availability_store=True,
+    )
+
+    # then
+    assert available == 2
+
+
+def test_get_available_quantity_falls_back_without_stored_row(
+    variant_with_many_stocks, channel_USD
+):
+    # when
+    available = get_available_quantity(
+        variant_with_many_stocks,
+        COUNTRY_CODE,
+        channel_USD.slug,
+        use_availability_store=True,
+    )
+
+    # then
+    assert available == 7
+
+
+def test_schedule_variant_availability_refresh_on_commit(
+    variant_with_many_stocks,
+    order_line,
+    channel_USD,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.VARIANT_AVAILABILITY_STORE_ENABLED = True
+    refresh_variant_availability([variant_with_many_stocks.pk])
+    stock = variant_with_many_stocks.stocks.first()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        Allocation.objects.create(
+            order_line=order_line, stock=stock, quantity_allocated=2
+        )
+        schedule_variant_availability_refresh([variant_with_many_stocks.pk])
+
+    # then
+    assert callbacks
+    row = VariantChannelAvailability.objects.get(
+        product_variant=variant_with_many_stocks,
+        channel=channel_USD,
+        country_code=COUNTRY_CODE,
+    )
+    assert row.quantity == 5
+
+
+@patch("saleor.warehouse.tasks.refresh_variant_availability_task.delay")
+def test_schedule_variant_availability_refresh_sends_one_task_per_transaction(
+    mocked_refresh_task,
+    product_variant_list,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.VARIANT_AVAILABILITY_STORE_ENABLED = True
+    first, second, *_ = product_variant_list
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        schedule_variant_availability_refresh([first.pk])
+        schedule_variant_availability_refresh([first.pk, second.pk])
+
+    # then
+    mocked_refresh_task.assert_called_once_with(sorted([first.pk, second.pk]))
+
+
+@patch("saleor.warehouse.tasks.refresh_variant_availability_task.delay")
+def test_schedule_variant_availability_refresh_survives_savepoint_rollback(
+    mocked_refresh_task,
+    product_variant_list,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.VARIANT_AVAILABILITY_STORE_ENABLED = True
+    first, second, *_ = product_variant_list
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        try:
+            with transaction.atomic():
+                schedule_variant_availability_refresh([first.pk])
+                raise IntegrityError
+        except IntegrityError:
+            pass
+        schedule_variant_availability_refresh([second.pk])
+
+    # then
+    mocked_refresh_task.assert_called_once()
+    assert second.pk in mocked_refresh_task.call_args.args[0]
+
+
+@patch("saleor.warehouse.tasks.refresh_variant_availability_task.delay")
+def test_schedule_variant_availability_refresh_disabled(
+    mocked_refresh_task,
+    variant,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.VARIANT_AVAILABILITY_STORE_ENABLED = False
+    settings.GRAPHQL_RESPONSE_CACHE_ENABLED = False
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        schedule_variant_availability_refresh([variant.pk])
+
+    # then
+    assert not callbacks
+    mocked_refresh_task.assert_not_called()
+
+
+@patch("saleor.graphql.response_cache.invalidate_response_cache")
+def test_allocation_invalidates_cached_responses(
+    mocked_invalidate,
+    variant_with_many_stocks,
+    order_line,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_ENABLED = True
+    settings.VARIANT_AVAILABILITY_STORE_ENABLED = False
+    stock = variant_with_many_stocks.stocks.first()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        Allocation.objects.create(
+            order_line=order_line, stock=stock, quantity_allocated=2
+        )
+
+    # then
+    tags = mocked_invalidate.call_args.args[0]
+    assert entity_tag(ProductVariant, variant_with_many_stocks.pk) in tags
+    assert entity_tag(Product, variant_with_many_stocks.product_id) in tags
+    assert list_tag(Product) not in tags
+
+
+@patch("saleor.graphql.response_cache.invalidate_response_cache")
+@patch("saleor.warehouse.tasks.refresh_variant_availability_task.delay")
+def test_reservation_invalidates_cached_responses_without_refreshing_rows(
+    mocked_refresh_task,
+    mocked_invalidate,
+    checkout_line,
+    channel_USD,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_ENABLED = True
+    settings.VARIANT_AVAILABILITY_STORE_ENABLED = True
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        reserve_stocks(
+            [checkout_line],
+            [checkout_line.variant],
+            COUNTRY_CODE,
+            channel_USD,
+            timezone.now() + datetime.timedelta(minutes=5),
+        )
+
+    # then
+    mocked_refresh_task.assert_not_called()
+    tags = mocked_invalidate.call_args.args[0]
+    assert entity_tag(ProductVariant, checkout_line.variant_id) in tags
+
+
+def test_find_availability_drift(variant_with_many_stocks, channel_USD):
+    # given
+    refresh_variant_availability([variant_with_many_stocks.pk])
+    assert find_availability_drift([variant_with_many_stocks.pk]) == []
+    Stock.objects.filter(product_variant=variant_with_many_stocks).update(quantity=10)
+
+    # when
+    drift = find_availability_drift([variant_with_many_stocks.pk])
+
+    # then
+    drifted = [
+        row
+        for row in drift
+        if (row.channel_id, row.country_code) == (channel_USD.pk, COUNTRY_CODE)
+    ]
+    assert len(drifted) == 1
+    assert drifted[0].stored_quantity == 7
+    assert drifted[0].live_quantity == 20
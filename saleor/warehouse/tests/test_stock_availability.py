@@ -6,6 +6,7 @@ from ..availability import (
     _get_available_quantity,
     check_stock_quantity,
     check_stock_quantity_bulk,
+    get_available_quantities,
     get_available_quantity,
 )
 from ..models import Allocation
@@ -152,6 +153,42 @@ def test_get_available_quantity_with_reservations(
     assert available_quantity == 2
 
 
+def test_get_available_quantities(
+    variant_with_many_stocks,
+    product_with_two_variants,
+    order_line_with_one_allocation,
+    checkout_line_with_one_reservation,
+    channel_USD,
+):
+    # given
+    other_variants = list(product_with_two_variants.variants.all())
+    variants = [variant_with_many_stocks, *other_variants]
+
+    # when
+    available_quantities = get_available_quantities(
+        variants, COUNTRY_CODE, channel_USD.slug, check_reservations=True
+    )
+
+    # then
+    assert available_quantities == {
+        variant.pk: get_available_quantity(
+            variant, COUNTRY_CODE, channel_USD.slug, check_reservations=True
+        )
+        for variant in variants
+    }
+    assert available_quantities[variant_with_many_stocks.pk] == 4
+
+
+def test_get_available_quantities_without_stocks(variant, channel_USD):
+    # when
+    available_quantities = get_available_quantities(
+        [variant], COUNTRY_CODE, channel_USD.slug
+    )
+
+    # then
+    assert available_quantities == {variant.pk: 0}
+
+
 def test_get_available_quantity_with_allocations_and_reservations(
     variant_with_many_stocks,
     order_line_with_one_allocation,
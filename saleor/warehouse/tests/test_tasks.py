@@ -1,12 +1,21 @@
 import datetime
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
 
-from ..models import Allocation, PreorderReservation, Reservation
+from ..models import (
+    Allocation,
+    PreorderReservation,
+    Reservation,
+    Stock,
+    StockAllocationChange,
+)
 from ..tasks import (
     delete_empty_allocations_task,
     delete_expired_reservations_task,
+    reconcile_stocks_quantity_allocated_task,
+    sweep_reservations_and_allocations_task,
     update_stocks_quantity_allocated_task,
 )
 
@@ -67,6 +76,84 @@ def test_delete_expired_reservations_task_skips_active_preorder_reservations(
     assert PreorderReservation.objects.count() == reservations_count
 
 
+def test_sweep_reservations_and_allocations_task(
+    checkout_line_with_reservation_in_many_stocks,
+    checkout_line_with_reserved_preorder_item,
+    allocations,
+):
+    # given
+    Reservation.objects.update(
+        reserved_until=timezone.now() - datetime.timedelta(seconds=1)
+    )
+    PreorderReservation.objects.update(
+        reserved_until=timezone.now() - datetime.timedelta(seconds=1)
+    )
+    empty_allocation = allocations[0]
+    empty_allocation.quantity_allocated = 0
+    empty_allocation.save(update_fields=["quantity_allocated"])
+
+    # when
+    deleted, has_more = sweep_reservations_and_allocations_task()
+
+    # then
+    assert not Reservation.objects.exists()
+    assert not PreorderReservation.objects.exists()
+    assert not Allocation.objects.filter(id=empty_allocation.id).exists()
+    assert Allocation.objects.count() == len(allocations) - 1
+    assert has_more is False
+
+
+def test_sweep_reservations_and_allocations_task_skips_active_rows(
+    checkout_line_with_reservation_in_many_stocks,
+    checkout_line_with_reserved_preorder_item,
+    allocations,
+):
+    # given
+    reservations_count = Reservation.objects.count()
+    preorder_reservations_count = PreorderReservation.objects.count()
+    Reservation.objects.update(
+        reserved_until=timezone.now() + datetime.timedelta(seconds=1)
+    )
+    PreorderReservation.objects.update(
+        reserved_until=timezone.now() + datetime.timedelta(seconds=1)
+    )
+
+    # when
+    deleted, has_more = sweep_reservations_and_allocations_task()
+
+    # then
+    assert deleted == 0
+    assert has_more is False
+    assert Reservation.objects.count() == reservations_count
+    assert PreorderReservation.objects.count() == preorder_reservations_count
+    assert Allocation.objects.count() == len(allocations)
+
+
+@patch("saleor.warehouse.tasks.sweep_reservations_and_allocations_task.delay")
+def test_sweep_reservations_and_allocations_task_requeues_with_backlog(
+    mocked_delay, checkout_line_with_reservation_in_many_stocks
+):
+    # given
+    reservations_count = Reservation.objects.count()
+    assert reservations_count > 1
+    Reservation.objects.update(
+        reserved_until=timezone.now() - datetime.timedelta(seconds=1)
+    )
+
+    # when
+    deleted, has_more = sweep_reservations_and_allocations_task(
+        batch_size=1, batch_count=1
+    )
+
+    # then
+    assert deleted == 1
+    assert has_more is True
+    assert Reservation.objects.count() == reservations_count - 1
+    mocked_delay.assert_called_once_with(
+        batch_size=1, batch_count=1, invocation_count=2, invocation_limit=100
+    )
+
+
 @pytest.mark.parametrize(
     ("allocation_allocated", "stock_allocated", "expected"),
     [
@@ -104,3 +191,54 @@ def test_update_stocks_quantity_allocated_task_stock_without_allocations(stock):
 
     stock.refresh_from_db()
     assert stock.quantity_allocated == 0
+
+
+def test_reconcile_stocks_quantity_allocated_task(allocation):
+    # given
+    stock = allocation.stock
+    assert StockAllocationChange.objects.filter(stock=stock).exists()
+    Stock.objects.filter(pk=stock.pk).update(
+        quantity_allocated=allocation.quantity_allocated + 3
+    )
+
+    # when
+    corrected, has_more = reconcile_stocks_quantity_allocated_task()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated
+    assert corrected == 1
+    assert has_more is False
+    assert not StockAllocationChange.objects.exists()
+
+
+def test_reconcile_stocks_quantity_allocated_task_skips_unchanged_stocks(allocation):
+    # given
+    StockAllocationChange.objects.all().delete()
+    stock = allocation.stock
+    Stock.objects.filter(pk=stock.pk).update(
+        quantity_allocated=allocation.quantity_allocated + 3
+    )
+
+    # when
+    corrected, has_more = reconcile_stocks_quantity_allocated_task()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated + 3
+    assert corrected == 0
+    assert has_more is False
+
+
+def test_allocation_save_marks_stock_for_reconciliation(allocation):
+    # given
+    StockAllocationChange.objects.all().delete()
+
+    # when
+    allocation.quantity_allocated = 1
+    allocation.save(update_fields=["quantity_allocated"])
+
+    # then
+    assert list(StockAllocationChange.objects.values_list("stock_id", flat=True)) == [
+        allocation.stock_id
+    ]
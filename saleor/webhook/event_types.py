@@ -852,6 +852,7 @@ class WebhookEventSyncType:
     XERO_FULFILLMENT_CREATED = "xero_fulfillment_created"
     XERO_FULFILLMENT_APPROVED = "xero_fulfillment_approved"
     XERO_CHECK_PREPAYMENT_STATUS = "xero_check_prepayment_status"
+    XERO_CHECK_PREPAYMENT_STATUSES = "xero_check_prepayment_statuses"
 
     EVENT_MAP: dict[str, dict[str, Any]] = {
         PAYMENT_LIST_GATEWAYS: {
@@ -974,6 +975,10 @@ class WebhookEventSyncType:
             "name": "Xero: check prepayment payment status.",
             "permission": OrderPermissions.MANAGE_ORDERS,
         },
+        XERO_CHECK_PREPAYMENT_STATUSES: {
+            "name": "Xero: check payment status of multiple prepayments.",
+            "permission": OrderPermissions.MANAGE_ORDERS,
+        },
     }
 
     CHOICES = [
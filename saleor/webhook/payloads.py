@@ -1603,5 +1603,9 @@ def generate_xero_check_prepayment_status_payload(prepayment_id: str) -> str:
     return json.dumps({"prepaymentId": prepayment_id})
 
 
+def generate_xero_check_prepayment_statuses_payload(prepayment_ids: list[str]) -> str:
+    return json.dumps({"prepaymentIds": prepayment_ids})
+
+
 def generate_xero_list_tax_codes_payload(domain: str) -> str:
     return json.dumps({"domain": domain})
@@ -214,3 +214,37 @@ def test_send_webhooks_async_for_app_last_retry_failed(
     mock_send_webhooks_async_for_app_apply_async.assert_called_once_with(
         kwargs={"app_id": app.id, "telemetry_context": ANY},
     )
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhooks_async_for_app.apply_async"
+)
+def test_send_multiple_webhooks_async_for_app_concurrently(
+    mock_send_webhooks_async_for_app_apply_async,
+    mock_send_webhook_using_scheme_method,
+    app,
+    event_deliveries,
+    settings,
+):
+    # given
+    settings.WEBHOOK_ASYNC_DELIVERY_CONCURRENCY = 3
+    mock_send_webhook_using_scheme_method.return_value = WebhookResponse(
+        content="", status=EventDeliveryStatus.FAILED
+    )
+
+    # when
+    send_webhooks_async_for_app(app_id=app.id)
+
+    # then
+    assert mock_send_webhook_using_scheme_method.call_count == 3
+    assert EventDelivery.objects.filter(status=EventDeliveryStatus.PENDING).count() == 3
+    assert (
+        EventDeliveryAttempt.objects.filter(status=EventDeliveryStatus.FAILED).count()
+        == 3
+    )
+    mock_send_webhooks_async_for_app_apply_async.assert_called_once_with(
+        kwargs={"app_id": app.id, "telemetry_context": ANY},
+    )
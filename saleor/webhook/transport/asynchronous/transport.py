@@ -3,6 +3,8 @@ import json
 import logging
 from collections import defaultdict
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from dataclasses import asdict, dataclass
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
@@ -783,6 +785,32 @@ def send_webhook_request_async(
     clear_successful_delivery(delivery)
 
 
+def _send_delivery(
+    delivery: EventDelivery,
+    data: bytes,
+    domain: str,
+    telemetry_context: TelemetryTaskContext,
+) -> WebhookResponse | ValueError:
+    webhook = delivery.webhook
+    try:
+        with webhooks_otel_trace(
+            delivery.event_type,
+            len(data),
+            webhook.app,
+            span_links=telemetry_context.links,
+        ):
+            return send_webhook_using_scheme_method(
+                webhook.target_url,
+                domain,
+                webhook.secret_key,
+                delivery.event_type,
+                data,
+                webhook.custom_headers,
+            )
+    except ValueError as e:
+        return e
+
+
 @app.task(
     queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
     bind=True,
@@ -806,46 +834,64 @@ def send_webhooks_async_for_app(
     failed_deliveries_attempts = []
     successful_deliveries = []
 
+    payloads: dict[int, bytes | ValueError] = {}
+    for delivery_id, delivery_with_count in deliveries.items():
+        delivery = delivery_with_count.delivery
+        if not delivery.payload:
+            payloads[delivery_id] = ValueError(
+                f"Event delivery id: {delivery_id} has no payload."
+            )
+            continue
+        data = delivery.payload.get_payload()
+        # Convert payload to bytes if it's not already.
+        payloads[delivery_id] = (
+            data if isinstance(data, bytes) else data.encode("utf-8")
+        )
+        if delivery_with_count.count == 0:
+            record_first_delivery_attempt_delay(
+                delivery.created_at, delivery.event_type, delivery.webhook.app
+            )
+
+    def send(delivery_id: int) -> WebhookResponse | ValueError:
+        delivery = deliveries[delivery_id].delivery
+        data = payloads[delivery_id]
+        if isinstance(data, ValueError):
+            return data
+        return _send_delivery(delivery, data, domain, telemetry_context)
+
+    max_workers = min(settings.WEBHOOK_ASYNC_DELIVERY_CONCURRENCY, len(deliveries))
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Each send runs in a copy of the current context to keep tracing
+            futures = {
+                delivery_id: executor.submit(copy_context().run, send, delivery_id)
+                for delivery_id in deliveries
+            }
+            results = {
+                delivery_id: future.result() for delivery_id, future in futures.items()
+            }
+    else:
+        results = {delivery_id: send(delivery_id) for delivery_id in deliveries}
+
     for delivery_id, delivery_with_count in deliveries.items():
         delivery = delivery_with_count.delivery
         attempt_count = delivery_with_count.count
         attempt = attempts_for_deliveries[delivery_id]
-
         webhook = delivery.webhook
+        response = results[delivery_id]
 
-        try:
-            if not delivery.payload:
-                raise ValueError(f"Event delivery id: {delivery_id} has no payload.")
-            data = delivery.payload.get_payload()
-            # Convert payload to bytes if it's not already.
-            data = data if isinstance(data, bytes) else data.encode("utf-8")
-            # Count payload size in bytes.
-            payload_size = len(data)
-
-            if attempt_count == 0:
-                record_first_delivery_attempt_delay(
-                    delivery.created_at, delivery.event_type, webhook.app
-                )
-            with webhooks_otel_trace(
-                delivery.event_type,
-                payload_size,
-                webhook.app,
-                span_links=telemetry_context.links,
-            ):
-                response = send_webhook_using_scheme_method(
-                    webhook.target_url,
-                    domain,
-                    webhook.secret_key,
-                    delivery.event_type,
-                    data,
-                    webhook.custom_headers,
-                )
-
+        if isinstance(response, ValueError):
+            response = WebhookResponse(
+                content=str(response), status=EventDeliveryStatus.FAILED
+            )
+            attempt_update(attempt, response, with_save=False)
+            failed_deliveries_attempts.append((delivery, attempt, attempt_count))
+        else:
             record_external_request(
                 delivery.event_type,
                 webhook.target_url,
                 response,
-                payload_size,
+                len(payloads[delivery_id]),
                 webhook.app,
                 sync=False,
             )
@@ -863,12 +909,6 @@ def send_webhooks_async_for_app(
                 delivery.status = EventDeliveryStatus.SUCCESS
                 # update attempt without save to provide proper data in observability
                 attempt_update(attempt, response, with_save=False)
-        except ValueError as e:
-            response = WebhookResponse(
-                content=str(e), status=EventDeliveryStatus.FAILED
-            )
-            attempt_update(attempt, response, with_save=False)
-            failed_deliveries_attempts.append((delivery, attempt, attempt_count))
 
         observability.report_event_delivery_attempt(attempt)
         successful_deliveries.append(delivery)
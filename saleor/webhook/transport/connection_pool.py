@@ -0,0 +1,66 @@
+"""Reusable HTTP sessions for webhook delivery.
+
+HTTPClient.send_request opens a new session, and so a new connection, for
+every request. Webhook bursts to the same app then pay a TCP and TLS handshake
+per delivery. Sessions here are kept per target host for the life of the
+worker process, so deliveries to a host reuse its keep-alive connections.
+Sessions come from HTTPClient, with its IP filtering and other hardening.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+from django.conf import settings
+from requests import Session
+
+from ...core.http_client import HTTPClient
+
+
+class SessionPool:
+    """Sessions keyed by target scheme and host, least recently used first."""
+
+    def __init__(self, max_hosts: int):
+        self.max_hosts = max_hosts
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[tuple[str, str], Session] = OrderedDict()
+        self._pid = os.getpid()
+
+    def get(self, target_url: str) -> Session:
+        """Return the session used to send requests to the host of target_url."""
+        parts = urlparse(target_url)
+        key = (parts.scheme.lower(), parts.netloc.lower())
+        with self._lock:
+            # Connections must not be shared with a forked process
+            if self._pid != os.getpid():
+                self._sessions.clear()
+                self._pid = os.getpid()
+
+            if session := self._sessions.get(key):
+                self._sessions.move_to_end(key)
+                return session
+
+            session = self._sessions[key] = _create_session()
+            while len(self._sessions) > self.max_hosts:
+                _, evicted = self._sessions.popitem(last=False)
+                evicted.close()
+            return session
+
+    def close(self) -> None:
+        """Close all sessions and their connections."""
+        with self._lock:
+            while self._sessions:
+                _, session = self._sessions.popitem()
+                session.close()
+
+
+def _create_session() -> Session:
+    session = HTTPClient.get_session()
+    # Cookies set by one delivery must not be sent with the next ones
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+session_pool = SessionPool(max_hosts=settings.WEBHOOK_CONNECTION_POOL_MAX_HOSTS)
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from ..connection_pool import SessionPool
+
+
+def test_session_pool_reuses_session_per_host():
+    # given
+    pool = SessionPool(max_hosts=10)
+
+    # when
+    session = pool.get("https://example.com/webhook")
+
+    # then
+    assert pool.get("https://EXAMPLE.com/other-webhook") is session
+    assert pool.get("http://example.com/webhook") is not session
+    assert pool.get("https://example.org/webhook") is not session
+
+
+def test_session_pool_evicts_least_recently_used_host():
+    # given
+    pool = SessionPool(max_hosts=2)
+    first = pool.get("https://first.example.com/")
+    second = pool.get("https://second.example.com/")
+    pool.get("https://first.example.com/")
+
+    # when
+    with patch.object(second, "close") as mock_close:
+        pool.get("https://third.example.com/")
+
+    # then
+    mock_close.assert_called_once_with()
+    assert pool.get("https://first.example.com/") is first
+    assert pool.get("https://second.example.com/") is not second
+
+
+def test_session_pool_resets_after_fork():
+    # given
+    pool = SessionPool(max_hosts=10)
+    session = pool.get("https://example.com/")
+
+    # when
+    with patch("os.getpid", return_value=-1):
+        forked_session = pool.get("https://example.com/")
+
+    # then
+    assert forked_session is not session
+
+
+def test_session_pool_does_not_store_cookies():
+    # given
+    pool = SessionPool(max_hosts=10)
+    session = pool.get("https://example.com/")
+
+    # then
+    assert session.cookies.get_policy().allowed_domains() == ()
@@ -27,7 +27,6 @@ from requests_hardened.ip_filter import InvalidIPAddress
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
 from ...app.models import App
 from ...core.db.connection import allow_writer
-from ...core.http_client import HTTPClient
 from ...core.models import (
     EventDelivery,
     EventDeliveryAttempt,
@@ -42,6 +41,7 @@ from .. import observability
 from ..const import APP_ID_PREFIX
 from ..models import Webhook
 from . import signature_for_payload
+from .connection_pool import session_pool
 
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(f"{__name__}.celery")
@@ -168,7 +168,7 @@ def send_webhook_using_http(
         headers.update(custom_headers)
 
     try:
-        response = HTTPClient.send_request(
+        response = session_pool.get(target_url).request(
             "POST",
             target_url,
             data=message,